@@ -6,7 +6,10 @@ from openai import AsyncOpenAI
 
 from . import _config
 from .agent import Agent, ToolsToFinalOutputFunction, ToolsToFinalOutputResult
+from .agent_graph import AgentGraph, CompiledAgent
 from .agent_output import AgentOutputSchema, AgentOutputSchemaBase
+from .batch import BatchInput, BatchRun, BatchRunItem, BatchRunStats
+from .checkpoint import CheckpointStore, JSONLCheckpointStore
 from .computer import AsyncComputer, Button, Computer, Environment
 from .exceptions import (
     AgentsException,
@@ -14,18 +17,38 @@ from .exceptions import (
     MaxTurnsExceeded,
     ModelBehaviorError,
     OutputGuardrailTripwireTriggered,
+    StreamingOutputGuardrailTripwireTriggered,
     UserError,
 )
+from .fanout import (
+    FanoutBranchResult,
+    FanoutOutcome,
+    FanoutPolicy,
+    FirstValidOutput,
+    MergeOutputs,
+    Quorum,
+)
 from .guardrail import (
     GuardrailFunctionOutput,
     InputGuardrail,
     InputGuardrailResult,
     OutputGuardrail,
     OutputGuardrailResult,
+    StreamedOutputChunk,
+    StreamingOutputGuardrail,
+    StreamingOutputGuardrailResult,
     input_guardrail,
     output_guardrail,
+    streaming_output_guardrail,
 )
 from .handoffs import Handoff, HandoffInputData, HandoffInputFilter, handoff
+from .history import (
+    DropToolOutputsPolicy,
+    HistoryPolicy,
+    SlidingWindowPolicy,
+    SummarizingPolicy,
+)
+from .instructions import InstructionsCache, InstructionsCacheScope
 from .items import (
     HandoffCallItem,
     HandoffOutputItem,
@@ -53,16 +76,42 @@ from .stream_events import (
     RunItemStreamEvent,
     StreamEvent,
 )
+from .timings import LatencyHistogram, PhaseHistograms, PhaseTiming, RunTimings
+from .tokens import (
+    HeuristicTokenizer,
+    TiktokenTokenizer,
+    TokenEstimate,
+    TokenEstimator,
+    Tokenizer,
+    get_default_token_estimator,
+    set_default_token_estimator,
+    set_default_tokenizer,
+)
 from .tool import (
     ComputerTool,
     FileSearchTool,
     FunctionTool,
     FunctionToolResult,
     Tool,
+    ToolExecutor,
     WebSearchTool,
     default_tool_error_function,
     function_tool,
 )
+from .tool_cache import (
+    DiskToolCacheBackend,
+    InMemoryToolCacheBackend,
+    ToolCache,
+    ToolCacheBackend,
+)
+from .tool_output import (
+    HeadTailReducer,
+    JsonSummaryReducer,
+    LineWindowReducer,
+    ToolOutputBudget,
+    ToolOutputReducer,
+    ToolOutputStore,
+)
 from .tracing import (
     AgentSpanData,
     CustomSpanData,
@@ -71,6 +120,7 @@ from .tracing import (
     GuardrailSpanData,
     HandoffSpanData,
     MCPListToolsSpanData,
+    MetricsTracingProcessor,
     Span,
     SpanData,
     SpanError,
@@ -149,7 +199,17 @@ __all__ = [
     "Agent",
     "ToolsToFinalOutputFunction",
     "ToolsToFinalOutputResult",
+    "InstructionsCache",
+    "InstructionsCacheScope",
+    "AgentGraph",
+    "CompiledAgent",
     "Runner",
+    "BatchInput",
+    "BatchRun",
+    "BatchRunItem",
+    "BatchRunStats",
+    "CheckpointStore",
+    "JSONLCheckpointStore",
     "Model",
     "ModelProvider",
     "ModelTracing",
@@ -166,6 +226,7 @@ __all__ = [
     "AgentsException",
     "InputGuardrailTripwireTriggered",
     "OutputGuardrailTripwireTriggered",
+    "StreamingOutputGuardrailTripwireTriggered",
     "MaxTurnsExceeded",
     "ModelBehaviorError",
     "UserError",
@@ -173,13 +234,27 @@ __all__ = [
     "InputGuardrailResult",
     "OutputGuardrail",
     "OutputGuardrailResult",
+    "StreamingOutputGuardrail",
+    "StreamingOutputGuardrailResult",
+    "StreamedOutputChunk",
     "GuardrailFunctionOutput",
     "input_guardrail",
     "output_guardrail",
+    "streaming_output_guardrail",
     "handoff",
+    "FanoutPolicy",
+    "FanoutBranchResult",
+    "FanoutOutcome",
+    "FirstValidOutput",
+    "Quorum",
+    "MergeOutputs",
     "Handoff",
     "HandoffInputData",
     "HandoffInputFilter",
+    "HistoryPolicy",
+    "SlidingWindowPolicy",
+    "DropToolOutputsPolicy",
+    "SummarizingPolicy",
     "TResponseInputItem",
     "MessageOutputItem",
     "ModelResponse",
@@ -207,8 +282,31 @@ __all__ = [
     "ComputerTool",
     "FileSearchTool",
     "Tool",
+    "ToolExecutor",
     "WebSearchTool",
     "function_tool",
+    "ToolCache",
+    "ToolCacheBackend",
+    "InMemoryToolCacheBackend",
+    "DiskToolCacheBackend",
+    "ToolOutputBudget",
+    "ToolOutputReducer",
+    "ToolOutputStore",
+    "HeadTailReducer",
+    "LineWindowReducer",
+    "JsonSummaryReducer",
+    "TokenEstimate",
+    "TokenEstimator",
+    "Tokenizer",
+    "HeuristicTokenizer",
+    "TiktokenTokenizer",
+    "get_default_token_estimator",
+    "set_default_token_estimator",
+    "set_default_tokenizer",
+    "PhaseTiming",
+    "RunTimings",
+    "LatencyHistogram",
+    "PhaseHistograms",
     "Usage",
     "add_trace_processor",
     "agent_span",
@@ -228,6 +326,7 @@ __all__ = [
     "trace",
     "Trace",
     "TracingProcessor",
+    "MetricsTracingProcessor",
     "SpanError",
     "Span",
     "SpanData",
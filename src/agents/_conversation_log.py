@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from .items import RunItem, TResponseInputItem
+
+
+class ConversationLog:
+    """An append-only log of the items that make up the model input for a run.
+
+    The runner used to rebuild the model input on every turn by deep-copying the original input and
+    re-serializing every generated item. The log instead converts each item exactly once and grows
+    incrementally as new items are generated, so the per-turn cost of assembling the input no
+    longer depends on the length of the history.
+
+    The log is copy-on-write: `to_input_list()` hands out a new list that shares the (read-only)
+    converted items, so callers can append to or reorder it without affecting the log. When the
+    history is rewritten (e.g. by a handoff input filter), `sync()` rebuilds the log from the new
+    history, reusing the conversions cached on each surviving `RunItem`.
+    """
+
+    def __init__(self, original_input: str | list[TResponseInputItem]) -> None:
+        self._original_input: str | list[TResponseInputItem] = original_input
+        self._input_items: list[TResponseInputItem] = self._convert_original_input(original_input)
+        self._original_len = len(self._input_items)
+        self._run_items: list[RunItem] = []
+
+    @property
+    def original_input(self) -> str | list[TResponseInputItem]:
+        """The original input the log was built from."""
+        return self._original_input
+
+    @property
+    def run_items(self) -> Sequence[RunItem]:
+        """The run items that have been appended to the log, in order."""
+        return self._run_items
+
+    def __len__(self) -> int:
+        return len(self._input_items)
+
+    def append(self, items: Sequence[RunItem]) -> None:
+        """Append newly generated items to the log."""
+        for item in items:
+            self._run_items.append(item)
+            self._input_items.append(item.to_input_item())
+
+    def sync(
+        self,
+        original_input: str | list[TResponseInputItem],
+        generated_items: Sequence[RunItem],
+    ) -> None:
+        """Bring the log in line with the given history.
+
+        In the common case the history is the previous history plus some new items, and only the
+        new items are appended. If the original input was replaced or previously logged items were
+        removed (e.g. by a handoff input filter), the log is rebuilt. Rebuilding is still cheap,
+        since each `RunItem` caches its own input item.
+        """
+        if original_input is not self._original_input:
+            self._original_input = original_input
+            self._input_items = self._convert_original_input(original_input)
+            self._original_len = len(self._input_items)
+            self._run_items = []
+
+        logged = len(self._run_items)
+        if len(generated_items) < logged or any(
+            logged_item is not item for logged_item, item in zip(self._run_items, generated_items)
+        ):
+            del self._input_items[self._original_len :]
+            self._run_items = []
+            logged = 0
+
+        self.append(generated_items[logged:])
+
+    def to_input_list(self) -> list[TResponseInputItem]:
+        """Returns the current model input as a new list. The items themselves are shared with the
+        log and must not be mutated in place."""
+        return list(self._input_items)
+
+    @staticmethod
+    def _convert_original_input(
+        original_input: str | list[TResponseInputItem],
+    ) -> list[TResponseInputItem]:
+        if isinstance(original_input, str):
+            return [{"content": original_input, "role": "user"}]
+        return list(original_input)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import contextlib
 import dataclasses
 import inspect
+import time
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, cast
@@ -31,8 +34,22 @@ from openai.types.responses.response_reasoning_item import ResponseReasoningItem
 from .agent import Agent, ToolsToFinalOutputResult
 from .agent_output import AgentOutputSchemaBase
 from .computer import AsyncComputer, Computer
-from .exceptions import AgentsException, ModelBehaviorError, UserError
-from .guardrail import InputGuardrail, InputGuardrailResult, OutputGuardrail, OutputGuardrailResult
+from .exceptions import (
+    AgentsException,
+    ModelBehaviorError,
+    StreamingOutputGuardrailTripwireTriggered,
+    UserError,
+)
+from .fanout import FanoutBranchResult, FanoutOutcome, FirstValidOutput
+from .guardrail import (
+    InputGuardrail,
+    InputGuardrailResult,
+    OutputGuardrail,
+    OutputGuardrailResult,
+    StreamedOutputChunk,
+    StreamingOutputGuardrail,
+    StreamingOutputGuardrailResult,
+)
 from .handoffs import Handoff, HandoffInputData
 from .items import (
     HandoffCallItem,
@@ -52,17 +69,25 @@ from .model_settings import ModelSettings
 from .models.interface import ModelTracing
 from .run_context import RunContextWrapper, TContext
 from .stream_events import RunItemStreamEvent, StreamEvent
+from .timings import record_phase
 from .tool import ComputerTool, FunctionTool, FunctionToolResult, Tool
+from .tool_output import estimate_tokens_saved
 from .tracing import (
+    FunctionSpanData,
+    Span,
     SpanError,
     Trace,
+    custom_span,
     function_span,
     get_current_trace,
     guardrail_span,
     handoff_span,
     trace,
 )
+from .usage import Usage
 from .util import _coro, _error_tracing
+from .util._concurrency import ConcurrencyLimit
+from .util._executors import track_workers
 
 if TYPE_CHECKING:
     from .run import RunConfig
@@ -76,6 +101,10 @@ QUEUE_COMPLETE_SENTINEL = QueueCompleteSentinel()
 
 _NOT_FINAL_OUTPUT = ToolsToFinalOutputResult(is_final_output=False, final_output=None)
 
+# Tasks that hold the concurrency slots of timed out tool calls until their workers finish. Kept
+# here so they aren't garbage collected while they wait.
+_held_tool_slots: set[asyncio.Task[None]] = set()
+
 
 @dataclass
 class AgentToolUseTracker:
@@ -94,6 +123,176 @@ class AgentToolUseTracker:
         return existing_data is not None and len(existing_data[1]) > 0
 
 
+class EagerToolRuns:
+    """Starts function tools as soon as their calls are complete in a model stream, instead of
+    waiting for the whole response. The resulting tasks are claimed when the turn's tool calls are
+    executed, so the results end up in the normal `SingleStepResult`.
+    """
+
+    def __init__(
+        self,
+        *,
+        agent: Agent[Any],
+        all_tools: list[Tool],
+        handoffs: list[Handoff],
+        hooks: RunHooks[Any],
+        context_wrapper: RunContextWrapper[Any],
+        config: RunConfig,
+        parent_span: Span[Any] | None,
+    ):
+        self.agent = agent
+        self.hooks = hooks
+        self.context_wrapper = context_wrapper
+        self.config = config
+        self.parent_span = parent_span
+        handoff_names = {handoff.tool_name for handoff in handoffs}
+        self._function_map = {
+            tool.name: tool
+            for tool in all_tools
+            if isinstance(tool, FunctionTool) and tool.name not in handoff_names
+        }
+        self._runs: dict[
+            str, tuple[ResponseFunctionToolCall, asyncio.Task[FunctionToolResult]]
+        ] = {}
+
+    def maybe_start(self, tool_call: ResponseFunctionToolCall) -> None:
+        """Starts the tool for a completed function call, if it is a known function tool."""
+        func_tool = self._function_map.get(tool_call.name)
+        if func_tool is None or tool_call.call_id in self._runs:
+            return
+
+        task = asyncio.create_task(
+            RunImpl.run_single_function_tool(
+                agent=self.agent,
+                func_tool=func_tool,
+                tool_call=tool_call,
+                hooks=self.hooks,
+                context_wrapper=self.context_wrapper,
+                config=self.config,
+                parent_span=self.parent_span,
+            )
+        )
+        self._runs[tool_call.call_id] = (tool_call, task)
+
+    def claim(self, tool_call: ResponseFunctionToolCall) -> asyncio.Task[FunctionToolResult] | None:
+        """Returns the task started for this tool call, if any.
+
+        Raises:
+            ModelBehaviorError: If the call in the final response differs from the one that was
+                started. The tool may already have had side effects, so it isn't run again.
+        """
+        run = self._runs.pop(tool_call.call_id, None)
+        if run is None:
+            return None
+        started_call, task = run
+        if started_call.name != tool_call.name or started_call.arguments != tool_call.arguments:
+            task.cancel()
+            raise ModelBehaviorError(
+                f"Tool call {tool_call.call_id} changed after it was started: the model streamed "
+                f"{started_call.name}({started_call.arguments}), but the final response has "
+                f"{tool_call.name}({tool_call.arguments})"
+            )
+        return task
+
+    def cancel_unfinished(self) -> None:
+        """Cancels every tool that is still running, e.g. because the turn was abandoned."""
+        for _, task in self._runs.values():
+            if task.done():
+                if not task.cancelled():
+                    # Retrieve the exception so it isn't reported as never retrieved.
+                    task.exception()
+            else:
+                task.cancel()
+        self._runs.clear()
+
+
+class StreamingGuardrailChecks:
+    """Runs streaming output guardrails over the text of a model stream as it arrives. Each
+    guardrail splits the text into chunks at its own checkpoints, and checks every chunk exactly
+    once, in a background task, so the stream isn't slowed down by the checks.
+    """
+
+    def __init__(
+        self,
+        *,
+        agent: Agent[Any],
+        guardrails: list[StreamingOutputGuardrail[Any]],
+        context_wrapper: RunContextWrapper[Any],
+        results: list[StreamingOutputGuardrailResult],
+    ):
+        self.agent = agent
+        self.context_wrapper = context_wrapper
+        self.results = results
+        """Where the results of the checks are appended, in the order they finish."""
+        # Per guardrail, the offset and text of the output that hasn't been checked yet.
+        self._pending: list[tuple[StreamingOutputGuardrail[Any], int, str]] = [
+            (guardrail, 0, "") for guardrail in guardrails
+        ]
+        self._tasks: list[asyncio.Task[StreamingOutputGuardrailResult]] = []
+        self._error: BaseException | None = None
+
+    def add_text(self, delta: str) -> None:
+        """Adds a text delta, and starts checking the guardrails whose checkpoint was reached."""
+        for i, (guardrail, offset, pending) in enumerate(self._pending):
+            pending += delta
+            end = guardrail.checkpoint(pending)
+            if end:
+                self._start(guardrail, StreamedOutputChunk(pending[:end], offset, final=False))
+                offset, pending = offset + end, pending[end:]
+            self._pending[i] = (guardrail, offset, pending)
+
+    def raise_if_tripped(self) -> None:
+        """Raises the first tripwire or error of the checks that have finished."""
+        if self._error is None:
+            return
+        if isinstance(self._error, StreamingOutputGuardrailTripwireTriggered):
+            _error_tracing.attach_error_to_current_span(
+                SpanError(
+                    message="Guardrail tripwire triggered",
+                    data={"guardrail": self._error.guardrail_result.guardrail.get_name()},
+                )
+            )
+        raise self._error
+
+    async def finish(self) -> None:
+        """Checks the text after the last checkpoint, waits for all checks and raises if any of
+        them tripped.
+        """
+        for guardrail, offset, pending in self._pending:
+            if pending:
+                self._start(guardrail, StreamedOutputChunk(pending, offset, final=True))
+        self._pending = []
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.raise_if_tripped()
+
+    def cancel_unfinished(self) -> None:
+        """Cancels every check that is still running, e.g. because the turn was abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def _start(self, guardrail: StreamingOutputGuardrail[Any], chunk: StreamedOutputChunk) -> None:
+        task = asyncio.create_task(
+            RunImpl.run_single_streaming_output_guardrail(
+                guardrail, self.agent, chunk, self.context_wrapper
+            )
+        )
+        task.add_done_callback(self._on_done)
+        self._tasks.append(task)
+
+    def _on_done(self, task: asyncio.Task[StreamingOutputGuardrailResult]) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self._error = self._error or exc
+            return
+        result = task.result()
+        self.results.append(result)
+        if result.output.tripwire_triggered and self._error is None:
+            self._error = StreamingOutputGuardrailTripwireTriggered(result)
+
+
 @dataclass
 class ToolRunHandoff:
     handoff: Handoff
@@ -199,6 +398,9 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
+        # The turns the run has left after the current one
+        remaining_turns: int,
+        eager_tool_runs: EagerToolRuns | None = None,
     ) -> SingleStepResult:
         # Make a copy of the generated items
         pre_step_items = list(pre_step_items)
@@ -214,6 +416,7 @@ class RunImpl:
                 hooks=hooks,
                 context_wrapper=context_wrapper,
                 config=run_config,
+                eager_tool_runs=eager_tool_runs,
             ),
             cls.execute_computer_actions(
                 agent=agent,
@@ -238,6 +441,7 @@ class RunImpl:
                 hooks=hooks,
                 context_wrapper=context_wrapper,
                 run_config=run_config,
+                remaining_turns=remaining_turns,
             )
 
         # Third, we'll check if the tool use should result in a final output
@@ -420,32 +624,38 @@ class RunImpl:
         )
 
     @classmethod
-    async def execute_function_tool_calls(
+    async def run_single_function_tool(
         cls,
         *,
         agent: Agent[TContext],
-        tool_runs: list[ToolRunFunction],
+        func_tool: FunctionTool,
+        tool_call: ResponseFunctionToolCall,
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         config: RunConfig,
-    ) -> list[FunctionToolResult]:
-        async def run_single_tool(
-            func_tool: FunctionTool, tool_call: ResponseFunctionToolCall
-        ) -> Any:
-            with function_span(func_tool.name) as span_fn:
-                if config.trace_include_sensitive_data:
-                    span_fn.span_data.input = tool_call.arguments
-                try:
-                    _, _, result = await asyncio.gather(
-                        hooks.on_tool_start(context_wrapper, agent, func_tool),
-                        (
-                            agent.hooks.on_tool_start(context_wrapper, agent, func_tool)
-                            if agent.hooks
-                            else _coro.noop_coroutine()
-                        ),
-                        func_tool.on_invoke_tool(context_wrapper, tool_call.arguments),
-                    )
+        parent_span: Span[Any] | None = None,
+    ) -> FunctionToolResult:
+        with function_span(func_tool.name, parent=parent_span) as span_fn:
+            if config.trace_include_sensitive_data:
+                span_fn.span_data.input = tool_call.arguments
+            try:
+                _, _, result = await asyncio.gather(
+                    hooks.on_tool_start(context_wrapper, agent, func_tool),
+                    (
+                        agent.hooks.on_tool_start(context_wrapper, agent, func_tool)
+                        if agent.hooks
+                        else _coro.noop_coroutine()
+                    ),
+                    cls._invoke_function_tool(
+                        func_tool=func_tool,
+                        tool_call=tool_call,
+                        context_wrapper=context_wrapper,
+                        config=config,
+                        span=span_fn,
+                    ),
+                )
 
+                with record_phase("hooks"):
                     await asyncio.gather(
                         hooks.on_tool_end(context_wrapper, agent, func_tool, result),
                         (
@@ -454,40 +664,182 @@ class RunImpl:
                             else _coro.noop_coroutine()
                         ),
                     )
-                except Exception as e:
-                    _error_tracing.attach_error_to_current_span(
-                        SpanError(
-                            message="Error running tool",
-                            data={"tool_name": func_tool.name, "error": str(e)},
-                        )
+            except Exception as e:
+                _error_tracing.attach_error_to_current_span(
+                    SpanError(
+                        message="Error running tool",
+                        data={"tool_name": func_tool.name, "error": str(e)},
                     )
-                    if isinstance(e, AgentsException):
-                        raise e
-                    raise UserError(f"Error running tool {func_tool.name}: {e}") from e
+                )
+                if isinstance(e, AgentsException):
+                    raise e
+                raise UserError(f"Error running tool {func_tool.name}: {e}") from e
 
-                if config.trace_include_sensitive_data:
-                    span_fn.span_data.output = result
-            return result
+            if config.trace_include_sensitive_data:
+                span_fn.span_data.output = result
 
-        tasks = []
-        for tool_run in tool_runs:
-            function_tool = tool_run.function_tool
-            tasks.append(run_single_tool(function_tool, tool_run.tool_call))
+            model_output = cls._apply_output_budget(
+                func_tool=func_tool,
+                output=str(result),
+                context_wrapper=context_wrapper,
+                config=config,
+                span=span_fn,
+            )
+        return FunctionToolResult(
+            tool=func_tool,
+            output=result,
+            run_item=ToolCallOutputItem(
+                output=result,
+                raw_item=ItemHelpers.tool_call_output_item(tool_call, model_output),
+                agent=agent,
+            ),
+        )
 
-        results = await asyncio.gather(*tasks)
+    @classmethod
+    def _apply_output_budget(
+        cls,
+        *,
+        func_tool: FunctionTool,
+        output: str,
+        context_wrapper: RunContextWrapper[TContext],
+        config: RunConfig,
+        span: Span[FunctionSpanData],
+    ) -> str:
+        budget = func_tool.output_budget
+        if budget is None and not func_tool.exempt_from_output_budget:
+            budget = config.tool_output_budget
+        if budget is None:
+            return output
+
+        reduced, ref = budget.apply(output)
+        if reduced is output:
+            return output
+
+        tokens_saved = estimate_tokens_saved(output, reduced)
+        context_wrapper.usage.add(Usage(tool_output_tokens_saved=tokens_saved))
+        span.span_data.output_budget = {
+            "original_chars": len(output),
+            "reduced_chars": len(reduced),
+            "tokens_saved": tokens_saved,
+            "reducer": type(budget.reducer).__name__,
+            "ref": ref,
+        }
+        return reduced
 
-        return [
-            FunctionToolResult(
-                tool=tool_run.function_tool,
-                output=result,
-                run_item=ToolCallOutputItem(
-                    output=result,
-                    raw_item=ItemHelpers.tool_call_output_item(tool_run.tool_call, str(result)),
-                    agent=agent,
-                ),
+    @classmethod
+    async def _invoke_function_tool(
+        cls,
+        *,
+        func_tool: FunctionTool,
+        tool_call: ResponseFunctionToolCall,
+        context_wrapper: RunContextWrapper[TContext],
+        config: RunConfig,
+        span: Span[FunctionSpanData],
+    ) -> Any:
+        limits = cls._get_tool_limits(func_tool, config)
+        timeout = func_tool.timeout if func_tool.timeout is not None else config.tool_timeout
+        if not limits and timeout is None:
+            with record_phase("tool", func_tool.name):
+                return await func_tool.on_invoke_tool(context_wrapper, tool_call.arguments)
+
+        async with contextlib.AsyncExitStack() as stack:
+            wait_time = 0.0
+            # Limits are always acquired in the same order, so calls can't deadlock on each other.
+            for limit in limits:
+                wait_time += await stack.enter_async_context(limit.acquire())
+            if limits:
+                span.span_data.wait_time = wait_time
+
+            start = time.monotonic()
+            try:
+                with record_phase("tool", func_tool.name), track_workers() as workers:
+                    return await asyncio.wait_for(
+                        func_tool.on_invoke_tool(context_wrapper, tool_call.arguments), timeout
+                    )
+            except asyncio.TimeoutError:
+                running = [worker for worker in workers if not worker.done()]
+                if running and limits:
+                    # A synchronous tool can't be stopped once it runs in a thread or process, so
+                    # it keeps its slots until it actually returns.
+                    cls._hold_slots_until_done(stack.pop_all(), running)
+                logger.debug(f"Tool {func_tool.name} timed out after {timeout} seconds")
+                _error_tracing.attach_error_to_current_span(
+                    SpanError(
+                        message="Tool timed out",
+                        data={"tool_name": func_tool.name, "timeout": timeout},
+                    )
+                )
+                return f"Tool {func_tool.name} timed out after {timeout} seconds."
+            finally:
+                span.span_data.execution_time = time.monotonic() - start
+
+    @classmethod
+    def _hold_slots_until_done(
+        cls, slots: contextlib.AsyncExitStack, workers: list[concurrent.futures.Future[Any]]
+    ) -> None:
+        async def release_when_done() -> None:
+            try:
+                await asyncio.gather(
+                    *(asyncio.wrap_future(worker) for worker in workers), return_exceptions=True
+                )
+            finally:
+                await slots.aclose()
+
+        task = asyncio.create_task(release_when_done())
+        _held_tool_slots.add(task)
+        task.add_done_callback(_held_tool_slots.discard)
+
+    @classmethod
+    def _get_tool_limits(cls, func_tool: FunctionTool, config: RunConfig) -> list[ConcurrencyLimit]:
+        limits = []
+        if func_tool._concurrency_limit is not None:
+            limits.append(func_tool._concurrency_limit)
+        if config.tool_concurrency_limits and func_tool.name in config.tool_concurrency_limits:
+            limit = config.tool_concurrency_limits[func_tool.name]
+            # Keyed by the tool itself, so that unrelated tools with the same name, e.g. on two
+            # agents, don't share slots.
+            limits.append(
+                config._concurrency_limits.get(("tool", id(func_tool)), limit, owner=func_tool)
             )
-            for tool_run, result in zip(tool_runs, results)
-        ]
+        if config.max_concurrent_tool_calls is not None:
+            limits.append(
+                config._concurrency_limits.get(("tool_calls",), config.max_concurrent_tool_calls)
+            )
+        return limits
+
+    @classmethod
+    async def execute_function_tool_calls(
+        cls,
+        *,
+        agent: Agent[TContext],
+        tool_runs: list[ToolRunFunction],
+        hooks: RunHooks[TContext],
+        context_wrapper: RunContextWrapper[TContext],
+        config: RunConfig,
+        eager_tool_runs: EagerToolRuns | None = None,
+    ) -> list[FunctionToolResult]:
+        tasks: list[Awaitable[FunctionToolResult]] = []
+        for tool_run in tool_runs:
+            started = eager_tool_runs.claim(tool_run.tool_call) if eager_tool_runs else None
+            if started is not None:
+                tasks.append(started)
+            else:
+                tasks.append(
+                    cls.run_single_function_tool(
+                        agent=agent,
+                        func_tool=tool_run.function_tool,
+                        tool_call=tool_run.tool_call,
+                        hooks=hooks,
+                        context_wrapper=context_wrapper,
+                        config=config,
+                    )
+                )
+
+        if eager_tool_runs:
+            # Anything that was started but isn't part of the final response is no longer needed.
+            eager_tool_runs.cancel_unfinished()
+
+        return list(await asyncio.gather(*tasks))
 
     @classmethod
     async def execute_computer_actions(
@@ -527,7 +879,24 @@ class RunImpl:
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
+        remaining_turns: int,
     ) -> SingleStepResult:
+        if (run_config.fanout_policy and len(run_handoffs) > 1) or any(
+            run_handoff.handoff.fanout > 1 for run_handoff in run_handoffs
+        ):
+            return await cls.execute_fanout_handoffs(
+                agent=agent,
+                original_input=original_input,
+                pre_step_items=pre_step_items,
+                new_step_items=new_step_items,
+                new_response=new_response,
+                run_handoffs=run_handoffs,
+                hooks=hooks,
+                context_wrapper=context_wrapper,
+                run_config=run_config,
+                remaining_turns=remaining_turns,
+            )
+
         # If there is more than one handoff, add tool responses that reject those handoffs
         multiple_handoffs = len(run_handoffs) > 1
         if multiple_handoffs:
@@ -594,53 +963,238 @@ class RunImpl:
                 ),
             )
 
-            # If there's an input filter, filter the input for the next agent
-            input_filter = handoff.input_filter or (
-                run_config.handoff_input_filter if run_config else None
+            original_input, pre_step_items, new_step_items = cls._filter_handoff_input(
+                handoff, run_config, span_handoff, original_input, pre_step_items, new_step_items
             )
-            if input_filter:
-                logger.debug("Filtering inputs for handoff")
-                handoff_input_data = HandoffInputData(
-                    input_history=tuple(original_input)
-                    if isinstance(original_input, list)
-                    else original_input,
-                    pre_handoff_items=tuple(pre_step_items),
-                    new_items=tuple(new_step_items),
+
+        return SingleStepResult(
+            original_input=original_input,
+            model_response=new_response,
+            pre_step_items=pre_step_items,
+            new_step_items=new_step_items,
+            next_step=NextStepHandoff(new_agent),
+        )
+
+    @classmethod
+    async def execute_fanout_handoffs(
+        cls,
+        *,
+        agent: Agent[TContext],
+        original_input: str | list[TResponseInputItem],
+        pre_step_items: list[RunItem],
+        new_step_items: list[RunItem],
+        new_response: ModelResponse,
+        run_handoffs: list[ToolRunHandoff],
+        hooks: RunHooks[TContext],
+        context_wrapper: RunContextWrapper[TContext],
+        run_config: RunConfig,
+        remaining_turns: int,
+    ) -> SingleStepResult:
+        """Runs the targets of all requested handoffs concurrently, as sub-runs, and combines their
+        outputs with the fan-out policy into the final output of the run. Each branch may use at
+        most the turns the run has left.
+        """
+        from .run import Runner, sub_run_config  # avoid circular import
+
+        policy = run_config.fanout_policy or FirstValidOutput()
+
+        targets: list[tuple[ToolRunHandoff, Agent[Any]]] = []
+        for run_handoff in run_handoffs:
+            with handoff_span(from_agent=agent.name) as span_handoff:
+                handoff = run_handoff.handoff
+                new_agent: Agent[Any] = await handoff.on_invoke_handoff(
+                    context_wrapper, run_handoff.tool_call.arguments
                 )
-                if not callable(input_filter):
-                    _error_tracing.attach_error_to_span(
-                        span_handoff,
-                        SpanError(
-                            message="Invalid input filter",
-                            data={"details": "not callable()"},
-                        ),
-                    )
-                    raise UserError(f"Invalid input filter: {input_filter}")
-                filtered = input_filter(handoff_input_data)
-                if not isinstance(filtered, HandoffInputData):
-                    _error_tracing.attach_error_to_span(
-                        span_handoff,
-                        SpanError(
-                            message="Invalid input filter result",
-                            data={"details": "not a HandoffInputData"},
+                span_handoff.span_data.to_agent = new_agent.name
+                targets.append((run_handoff, new_agent))
+
+                # Every handoff call gets an output, so that each branch sees a valid conversation.
+                new_step_items.append(
+                    HandoffOutputItem(
+                        agent=agent,
+                        raw_item=ItemHelpers.tool_call_output_item(
+                            run_handoff.tool_call,
+                            handoff.get_transfer_message(new_agent),
                         ),
+                        source_agent=agent,
+                        target_agent=new_agent,
                     )
-                    raise UserError(f"Invalid input filter result: {filtered}")
+                )
 
-                original_input = (
-                    filtered.input_history
-                    if isinstance(filtered.input_history, str)
-                    else list(filtered.input_history)
+                await asyncio.gather(
+                    hooks.on_handoff(
+                        context=context_wrapper,
+                        from_agent=agent,
+                        to_agent=new_agent,
+                    ),
+                    (
+                        agent.hooks.on_handoff(
+                            context_wrapper,
+                            agent=new_agent,
+                            source=agent,
+                        )
+                        if agent.hooks
+                        else _coro.noop_coroutine()
+                    ),
                 )
-                pre_step_items = list(filtered.pre_handoff_items)
-                new_step_items = list(filtered.new_items)
 
-        return SingleStepResult(
+        # The run's output guardrails run on the combined output instead.
+        branch_config = sub_run_config(run_config)
+        branches: list[
+            tuple[FanoutBranchResult, list[TResponseInputItem], RunContextWrapper[TContext]]
+        ] = []
+        for run_handoff, new_agent in targets:
+            branch_input, branch_pre_items, branch_new_items = cls._filter_handoff_input(
+                run_handoff.handoff,
+                run_config,
+                None,
+                original_input,
+                pre_step_items,
+                new_step_items,
+            )
+            input_items = ItemHelpers.input_to_new_input_list(branch_input) + [
+                item.to_input_item() for item in branch_pre_items + branch_new_items
+            ]
+            for _ in range(run_handoff.handoff.fanout):
+                branch = FanoutBranchResult(
+                    agent=new_agent,
+                    handoff=run_handoff.handoff,
+                    index=len(branches),
+                    result=None,
+                )
+                branch_context: RunContextWrapper[TContext] = RunContextWrapper(
+                    context=context_wrapper.context, usage=branch.usage
+                )
+                branches.append((branch, input_items, branch_context))
+
+        async def run_branch(
+            branch: FanoutBranchResult,
+            input_items: list[TResponseInputItem],
+            branch_context: RunContextWrapper[TContext],
+        ) -> FanoutBranchResult:
+            with custom_span(
+                name=f"Fan-out branch {branch.index}", data={"agent": branch.agent.name}
+            ) as span_branch:
+                try:
+                    branch.result = await Runner._run(
+                        branch.agent,
+                        input_items,
+                        context=context_wrapper.context,
+                        max_turns=remaining_turns,
+                        hooks=hooks,
+                        run_config=branch_config,
+                        previous_response_id=None,
+                        context_wrapper=branch_context,
+                        # The branches continue this run, whose input was already checked.
+                        run_input_guardrails=False,
+                    )
+                except asyncio.CancelledError:
+                    span_branch.set_error(SpanError(message="Fan-out branch cancelled", data={}))
+                    raise
+                except Exception as e:
+                    span_branch.set_error(
+                        SpanError(message="Fan-out branch failed", data={"error": str(e)})
+                    )
+                    branch.error = e
+            return branch
+
+        tasks = [asyncio.create_task(run_branch(*branch)) for branch in branches]
+        finished: list[FanoutBranchResult] = []
+        outcome: FanoutOutcome | None = None
+        try:
+            pending: set[asyncio.Task[FanoutBranchResult]] = set(tasks)
+            while outcome is None:
+                if not pending:
+                    raise UserError(
+                        f"{type(policy).__name__} did not decide after every branch finished"
+                    )
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.index):
+                    finished.append(task.result())
+                    outcome = await policy.decide(finished, len(tasks))
+                    if outcome is not None:
+                        break
+        finally:
+            # Cancel the branches that lost, and wait for them so they can clean up.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for _, _, branch_context in branches:
+                context_wrapper.add_sub_run_usage(branch_context)
+
+        for branch in outcome.branches:
+            if branch.result is not None:
+                new_step_items.extend(branch.result.new_items)
+
+        return await cls.execute_final_output(
+            agent=agent,
             original_input=original_input,
-            model_response=new_response,
+            new_response=new_response,
             pre_step_items=pre_step_items,
             new_step_items=new_step_items,
-            next_step=NextStepHandoff(new_agent),
+            final_output=outcome.final_output,
+            hooks=hooks,
+            context_wrapper=context_wrapper,
+        )
+
+    @classmethod
+    def _attach_error(cls, span: Span[Any] | None, error: SpanError) -> None:
+        if span is None:
+            _error_tracing.attach_error_to_current_span(error)
+        else:
+            _error_tracing.attach_error_to_span(span, error)
+
+    @classmethod
+    def _filter_handoff_input(
+        cls,
+        handoff: Handoff[Any],
+        run_config: RunConfig,
+        span_handoff: Span[Any] | None,
+        original_input: str | list[TResponseInputItem],
+        pre_step_items: list[RunItem],
+        new_step_items: list[RunItem],
+    ) -> tuple[str | list[TResponseInputItem], list[RunItem], list[RunItem]]:
+        # If there's an input filter, filter the input for the next agent
+        input_filter = handoff.input_filter or (
+            run_config.handoff_input_filter if run_config else None
+        )
+        if not input_filter:
+            return original_input, pre_step_items, new_step_items
+
+        logger.debug("Filtering inputs for handoff")
+        handoff_input_data = HandoffInputData(
+            input_history=tuple(original_input)
+            if isinstance(original_input, list)
+            else original_input,
+            pre_handoff_items=tuple(pre_step_items),
+            new_items=tuple(new_step_items),
+        )
+        if not callable(input_filter):
+            cls._attach_error(
+                span_handoff,
+                SpanError(
+                    message="Invalid input filter",
+                    data={"details": "not callable()"},
+                ),
+            )
+            raise UserError(f"Invalid input filter: {input_filter}")
+        filtered = input_filter(handoff_input_data)
+        if not isinstance(filtered, HandoffInputData):
+            cls._attach_error(
+                span_handoff,
+                SpanError(
+                    message="Invalid input filter result",
+                    data={"details": "not a HandoffInputData"},
+                ),
+            )
+            raise UserError(f"Invalid input filter result: {filtered}")
+
+        return (
+            filtered.input_history
+            if isinstance(filtered.input_history, str)
+            else list(filtered.input_history),
+            list(filtered.pre_handoff_items),
+            list(filtered.new_items),
         )
 
     @classmethod
@@ -675,12 +1229,13 @@ class RunImpl:
         context_wrapper: RunContextWrapper[TContext],
         final_output: Any,
     ):
-        await asyncio.gather(
-            hooks.on_agent_end(context_wrapper, agent, final_output),
-            agent.hooks.on_end(context_wrapper, agent, final_output)
-            if agent.hooks
-            else _coro.noop_coroutine(),
-        )
+        with record_phase("hooks"):
+            await asyncio.gather(
+                hooks.on_agent_end(context_wrapper, agent, final_output),
+                agent.hooks.on_end(context_wrapper, agent, final_output)
+                if agent.hooks
+                else _coro.noop_coroutine(),
+            )
 
     @classmethod
     async def run_single_input_guardrail(
@@ -691,7 +1246,8 @@ class RunImpl:
         context: RunContextWrapper[TContext],
     ) -> InputGuardrailResult:
         with guardrail_span(guardrail.get_name()) as span_guardrail:
-            result = await guardrail.run(agent, input, context)
+            with record_phase("input_guardrail", guardrail.get_name()):
+                result = await guardrail.run(agent, input, context)
             span_guardrail.span_data.triggered = result.output.tripwire_triggered
             return result
 
@@ -704,7 +1260,24 @@ class RunImpl:
         context: RunContextWrapper[TContext],
     ) -> OutputGuardrailResult:
         with guardrail_span(guardrail.get_name()) as span_guardrail:
-            result = await guardrail.run(agent=agent, agent_output=agent_output, context=context)
+            with record_phase("output_guardrail", guardrail.get_name()):
+                result = await guardrail.run(
+                    agent=agent, agent_output=agent_output, context=context
+                )
+            span_guardrail.span_data.triggered = result.output.tripwire_triggered
+            return result
+
+    @classmethod
+    async def run_single_streaming_output_guardrail(
+        cls,
+        guardrail: StreamingOutputGuardrail[TContext],
+        agent: Agent[Any],
+        chunk: StreamedOutputChunk,
+        context: RunContextWrapper[TContext],
+    ) -> StreamingOutputGuardrailResult:
+        with guardrail_span(guardrail.get_name()) as span_guardrail:
+            with record_phase("output_guardrail", guardrail.get_name()):
+                result = await guardrail.run(context=context, agent=agent, chunk=chunk)
             span_guardrail.span_data.triggered = result.output.tripwire_triggered
             return result
 
@@ -830,15 +1403,16 @@ class ComputerAction:
             else cls._get_screenshot_sync(action.computer_tool.computer, action.tool_call)
         )
 
-        _, _, output = await asyncio.gather(
-            hooks.on_tool_start(context_wrapper, agent, action.computer_tool),
-            (
-                agent.hooks.on_tool_start(context_wrapper, agent, action.computer_tool)
-                if agent.hooks
-                else _coro.noop_coroutine()
-            ),
-            output_func,
-        )
+        with record_phase("tool", action.computer_tool.name):
+            _, _, output = await asyncio.gather(
+                hooks.on_tool_start(context_wrapper, agent, action.computer_tool),
+                (
+                    agent.hooks.on_tool_start(context_wrapper, agent, action.computer_tool)
+                    if agent.hooks
+                    else _coro.noop_coroutine()
+                ),
+                output_func,
+            )
 
         await asyncio.gather(
             hooks.on_tool_end(context_wrapper, agent, action.computer_tool, output),
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import contextvars
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .run import RunConfig
+
+_current_run_config: contextvars.ContextVar[RunConfig | None] = contextvars.ContextVar(
+    "current_run_config", default=None
+)
+
+
+def get_current_run_config() -> RunConfig | None:
+    """Returns the config of the run that the current task belongs to, or None outside of a run.
+    Lets code that only receives a `RunContextWrapper`, such as tools, read run-level settings."""
+    return _current_run_config.get()
+
+
+def set_current_run_config(
+    run_config: RunConfig | None,
+) -> contextvars.Token[RunConfig | None]:
+    return _current_run_config.set(run_config)
+
+
+def reset_current_run_config(token: contextvars.Token[RunConfig | None]) -> None:
+    _current_run_config.reset(token)
@@ -1,30 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import dataclasses
 import inspect
+import json
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, cast
 
 from typing_extensions import NotRequired, TypeAlias, TypedDict
 
+from ._run_scope import get_current_run_config
 from .agent_output import AgentOutputSchemaBase
-from .guardrail import InputGuardrail, OutputGuardrail
+from .guardrail import InputGuardrail, OutputGuardrail, StreamingOutputGuardrail
 from .handoffs import Handoff
+from .instructions import InstructionsCache
 from .items import ItemHelpers
 from .logger import logger
 from .mcp import MCPUtil
 from .model_settings import ModelSettings
 from .models.interface import Model
 from .run_context import RunContextWrapper, TContext
-from .tool import FunctionToolResult, Tool, function_tool
+from .tool import FunctionToolResult, Tool, default_tool_error_function, function_tool
+from .tool_cache import ToolCache
 from .util import _transforms
+from .util._concurrency import ConcurrencyLimit
 from .util._types import MaybeAwaitable
 
 if TYPE_CHECKING:
     from .lifecycle import AgentHooks
     from .mcp import MCPServer
     from .result import RunResult
+    from .run import RunConfig
 
 
 @dataclass
@@ -62,6 +70,11 @@ class MCPConfig(TypedDict):
     best-effort conversion, so some schemas may not be convertible. Defaults to False.
     """
 
+    list_tools_timeout: NotRequired[float]
+    """The maximum number of seconds to wait for each MCP server to list its tools. The servers are
+    listed concurrently. Defaults to no timeout.
+    """
+
 
 @dataclass
 class Agent(Generic[TContext]):
@@ -94,6 +107,11 @@ class Agent(Generic[TContext]):
     return a string.
     """
 
+    instructions_cache: InstructionsCache | None = None
+    """How long the result of an instructions function is reused for. By default, the function is
+    called on every turn. See `InstructionsCache`.
+    """
+
     handoff_description: str | None = None
     """A description of the agent. This is used when the agent is used as a handoff, so that an
     LLM knows what it does and when to invoke it.
@@ -142,6 +160,13 @@ class Agent(Generic[TContext]):
     Runs only if the agent produces a final output.
     """
 
+    streaming_output_guardrails: list[StreamingOutputGuardrail[TContext]] = field(
+        default_factory=list
+    )
+    """A list of checks that run on the agent's output text while it is streamed, in chunks, and
+    can stop the stream early. Only used by `Runner.run_streamed()`.
+    """
+
     output_type: type[Any] | AgentOutputSchemaBase | None = None
     """The type of the output object. If not provided, the output will be `str`. In most cases,
     you should pass a regular Python type (e.g. a dataclass, Pydantic model, TypedDict, etc).
@@ -191,6 +216,12 @@ class Agent(Generic[TContext]):
         tool_name: str | None,
         tool_description: str | None,
         custom_output_extractor: Callable[[RunResult], Awaitable[str]] | None = None,
+        *,
+        run_config: RunConfig | None = None,
+        max_turns: int | None = None,
+        cache: ToolCache | None = None,
+        max_concurrency: int | None = None,
+        batched: bool = False,
     ) -> Tool:
         """Transform this agent into a tool, callable by other agents.
 
@@ -200,31 +231,91 @@ class Agent(Generic[TContext]):
         2. In handoffs, the new agent takes over the conversation. In this tool, the new agent is
            called as a tool, and the conversation is continued by the original agent.
 
+        Each call runs the agent in a sub-run, whose usage is added to the usage of the calling run.
+
         Args:
             tool_name: The name of the tool. If not provided, the agent's name will be used.
             tool_description: The description of the tool, which should indicate what it does and
                 when to use it.
             custom_output_extractor: A function that extracts the output from the agent. If not
                 provided, the last message from the agent will be used.
+            run_config: The run config of the sub-runs. If not provided, they inherit the config of
+                the calling run, except for its run-level guardrails and checkpointing.
+            max_turns: The maximum number of turns of each sub-run. Defaults to the runner's
+                default.
+            cache: If provided, outputs are memoized in this cache, keyed on the tool name and the
+                input, so repeated inputs don't run the agent again. Identical calls that run at
+                the same time share a single sub-run.
+            max_concurrency: The maximum number of sub-runs of this tool in flight at once, across
+                all calls and runs.
+            batched: If True, the tool takes a list of inputs instead of a single one, runs a
+                sub-run for each of them concurrently, and returns their outputs as a JSON list in
+                the same order. An input whose sub-run fails gets an error message instead.
         """
+        name = tool_name or _transforms.transform_string_function_style(self.name)
+        limit = ConcurrencyLimit(max_concurrency) if max_concurrency is not None else None
+
+        async def run_once(context: RunContextWrapper[Any], input: str) -> str:
+            from .run import DEFAULT_MAX_TURNS, Runner, sub_run_config  # avoid circular import
+
+            parent_config = get_current_run_config()
+            config = run_config or (sub_run_config(parent_config) if parent_config else None)
+            sub_context: RunContextWrapper[Any] = RunContextWrapper(context=context.context)
+            try:
+                async with contextlib.AsyncExitStack() as stack:
+                    if limit is not None:
+                        await stack.enter_async_context(limit.acquire())
+                    output = await Runner._run(
+                        self,
+                        input,
+                        context=context.context,
+                        max_turns=max_turns or DEFAULT_MAX_TURNS,
+                        hooks=None,
+                        run_config=config,
+                        previous_response_id=None,
+                        context_wrapper=sub_context,
+                    )
+            finally:
+                context.add_sub_run_usage(sub_context)
 
-        @function_tool(
-            name_override=tool_name or _transforms.transform_string_function_style(self.name),
-            description_override=tool_description or "",
-        )
-        async def run_agent(context: RunContextWrapper, input: str) -> str:
-            from .run import Runner
-
-            output = await Runner.run(
-                starting_agent=self,
-                input=input,
-                context=context.context,
-            )
             if custom_output_extractor:
                 return await custom_output_extractor(output)
 
             return ItemHelpers.text_message_outputs(output.new_items)
 
+        async def run_input(context: RunContextWrapper[Any], input: str) -> str:
+            if cache is None:
+                return await run_once(context, input)
+            return cast(
+                str,
+                await cache.get_or_call(
+                    name, json.dumps({"input": input}), lambda: run_once(context, input)
+                ),
+            )
+
+        if batched:
+
+            @function_tool(name_override=name, description_override=tool_description or "")
+            async def run_agent_batch(context: RunContextWrapper, inputs: list[str]) -> str:
+                results = await asyncio.gather(
+                    *(run_input(context, input) for input in inputs), return_exceptions=True
+                )
+                outputs: list[str] = []
+                for result in results:
+                    if isinstance(result, Exception):
+                        outputs.append(default_tool_error_function(context, result))
+                    elif isinstance(result, BaseException):
+                        raise result
+                    else:
+                        outputs.append(result)
+                return json.dumps(outputs, ensure_ascii=False)
+
+            return run_agent_batch
+
+        @function_tool(name_override=name, description_override=tool_description or "")
+        async def run_agent(context: RunContextWrapper, input: str) -> str:
+            return await run_input(context, input)
+
         return run_agent
 
     async def get_system_prompt(self, run_context: RunContextWrapper[TContext]) -> str | None:
@@ -244,7 +335,11 @@ class Agent(Generic[TContext]):
     async def get_mcp_tools(self) -> list[Tool]:
         """Fetches the available tools from the MCP servers."""
         convert_schemas_to_strict = self.mcp_config.get("convert_schemas_to_strict", False)
-        return await MCPUtil.get_all_function_tools(self.mcp_servers, convert_schemas_to_strict)
+        return await MCPUtil.get_all_function_tools(
+            self.mcp_servers,
+            convert_schemas_to_strict,
+            self.mcp_config.get("list_tools_timeout"),
+        )
 
     async def get_all_tools(self) -> list[Tool]:
         """All agent tools, including MCP tools and function tools."""
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic
+
+from .agent import Agent
+from .agent_output import AgentOutputSchema, AgentOutputSchemaBase
+from .handoffs import Handoff, handoff
+from .models.interface import Model, ModelProvider
+from .run_context import TContext
+from .tool import Tool
+
+if TYPE_CHECKING:
+    from .run import RunConfig
+
+
+def get_output_schema(agent: Agent[Any]) -> AgentOutputSchemaBase | None:
+    """Returns the output schema for an agent, or None if the agent outputs plain text."""
+    if agent.output_type is None or agent.output_type is str:
+        return None
+    elif isinstance(agent.output_type, AgentOutputSchemaBase):
+        return agent.output_type
+
+    return AgentOutputSchema(agent.output_type)
+
+
+def get_handoffs(agent: Agent[Any]) -> list[Handoff]:
+    """Returns the handoffs for an agent, wrapping any `Agent` handoffs in a `Handoff`."""
+    handoffs = []
+    for handoff_item in agent.handoffs:
+        if isinstance(handoff_item, Handoff):
+            handoffs.append(handoff_item)
+        elif isinstance(handoff_item, Agent):
+            handoffs.append(handoff(handoff_item))
+    return handoffs
+
+
+def resolve_model(agent: Agent[Any], run_config: RunConfig) -> Model:
+    """Resolves the model for an agent, taking the run config's overrides into account."""
+    if isinstance(run_config.model, Model):
+        return run_config.model
+    elif isinstance(run_config.model, str):
+        return run_config.model_provider.get_model(run_config.model)
+    elif isinstance(agent.model, Model):
+        return agent.model
+
+    return run_config.model_provider.get_model(agent.model)
+
+
+def _same_items(a: Sequence[Any], b: Sequence[Any]) -> bool:
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+
+
+@dataclass
+class CompiledAgent(Generic[TContext]):
+    """The static, per-agent structures the runner needs on every turn, computed once."""
+
+    agent: Agent[TContext]
+    """The agent that was compiled."""
+
+    output_schema: AgentOutputSchemaBase | None
+    """The output schema of the agent, or None if the agent outputs plain text."""
+
+    handoffs: list[Handoff]
+    """The handoffs of the agent, with `Agent` handoffs wrapped in a `Handoff`."""
+
+    _output_type: Any = field(repr=False)
+    _handoff_items: tuple[Any, ...] = field(repr=False)
+    _tools: tuple[Tool, ...] = field(repr=False)
+    _mcp_servers: tuple[Any, ...] = field(repr=False)
+    _models: weakref.WeakKeyDictionary[ModelProvider, dict[str | None, Model]] = field(
+        default_factory=weakref.WeakKeyDictionary, repr=False
+    )
+
+    @classmethod
+    def compile(cls, agent: Agent[TContext]) -> CompiledAgent[TContext]:
+        return cls(
+            agent=agent,
+            output_schema=get_output_schema(agent),
+            handoffs=get_handoffs(agent),
+            _output_type=agent.output_type,
+            _handoff_items=tuple(agent.handoffs),
+            _tools=tuple(agent.tools),
+            _mcp_servers=tuple(agent.mcp_servers),
+        )
+
+    def is_stale(self) -> bool:
+        """Whether the agent has been mutated in a way that affects the compiled structures."""
+        agent = self.agent
+        return (
+            agent.output_type is not self._output_type
+            or not _same_items(agent.handoffs, self._handoff_items)
+            or not _same_items(agent.tools, self._tools)
+            or not _same_items(agent.mcp_servers, self._mcp_servers)
+        )
+
+    async def get_all_tools(self, stable_order: bool = False) -> list[Tool]:
+        """All tools available to the agent. Function tools are precomputed; MCP tools are dynamic,
+        so they are fetched from the servers every time.
+
+        Args:
+            stable_order: Sort the tools by name, so that their order doesn't depend on the order
+                in which MCP servers list them.
+        """
+        tools = list(self._tools) if not self._mcp_servers else await self.agent.get_all_tools()
+        if stable_order:
+            tools.sort(key=lambda tool: tool.name)
+        return tools
+
+    def get_handoffs(self, stable_order: bool = False) -> list[Handoff]:
+        """The handoffs of the agent, optionally sorted by tool name."""
+        if stable_order:
+            return sorted(self.handoffs, key=lambda h: h.tool_name)
+        return self.handoffs
+
+    def get_model(self, run_config: RunConfig) -> Model:
+        """Resolves the model for the agent. Models looked up by name are cached per provider, so
+        the provider is only asked once per model name."""
+        if isinstance(run_config.model, Model):
+            return run_config.model
+        if run_config.model is None and isinstance(self.agent.model, Model):
+            return self.agent.model
+
+        model_name = run_config.model if isinstance(run_config.model, str) else self.agent.model
+        provider = run_config.model_provider
+        try:
+            models = self._models.setdefault(provider, {})
+        except TypeError:
+            # Unhashable providers can't be used as cache keys, so we skip caching for them.
+            return resolve_model(self.agent, run_config)
+
+        model = models.get(model_name)  # type: ignore[arg-type]
+        if model is None:
+            model = resolve_model(self.agent, run_config)
+            models[model_name] = model  # type: ignore[index]
+        return model
+
+
+class AgentGraph:
+    """A compiled view of an agent and every agent reachable from it via handoffs.
+
+    Building output schemas, wrapping handoffs and resolving models is relatively expensive, and the
+    results only depend on the agent definitions. Compiling the graph once and passing it to each
+    run via `RunConfig.agent_graph` lets many runs share that work:
+
+    ```python
+    graph = AgentGraph.compile(triage_agent)
+    result = await Runner.run(triage_agent, input, run_config=RunConfig(agent_graph=graph))
+    ```
+
+    Agents are tracked by identity. An agent created with `Agent.clone()` is a new agent, so it is
+    compiled separately the first time it runs. An agent whose output type, handoffs, tools or MCP
+    servers are replaced after compilation is recompiled on its next use. The graph keeps at most
+    `max_agents` agents compiled, dropping the least recently used first, so that a shared graph
+    that sees clones or agents created per request doesn't grow without bound.
+    """
+
+    def __init__(self, max_agents: int | None = 1024) -> None:
+        """
+        Args:
+            max_agents: The maximum number of agents to keep compiled. If None, every agent the
+                graph sees is kept, for as long as the graph lives.
+        """
+        self.max_agents = max_agents
+        # Keyed by `id(agent)`. Each node holds its agent, so an id can't be reused by another
+        # agent while its node is in the graph.
+        self._nodes: OrderedDict[int, CompiledAgent[Any]] = OrderedDict()
+
+    @classmethod
+    def compile(cls, starting_agent: Agent[Any]) -> AgentGraph:
+        """Compiles the given agent and every agent reachable from it via `Agent` handoffs."""
+        graph = cls()
+        seen: set[int] = set()
+        queue: deque[Agent[Any]] = deque([starting_agent])
+        while queue:
+            agent = queue.popleft()
+            if id(agent) in seen:
+                continue
+            seen.add(id(agent))
+            graph.get(agent)
+            queue.extend(item for item in agent.handoffs if isinstance(item, Agent))
+        return graph
+
+    @property
+    def agents(self) -> list[Agent[Any]]:
+        """The agents that have been compiled into this graph."""
+        return [node.agent for node in self._nodes.values()]
+
+    def get(self, agent: Agent[TContext]) -> CompiledAgent[TContext]:
+        """Returns the compiled structures for the given agent, compiling it if it isn't part of
+        the graph yet or has changed since it was compiled."""
+        node = self._nodes.get(id(agent))
+        if node is None or node.agent is not agent or node.is_stale():
+            node = CompiledAgent.compile(agent)
+            self._nodes[id(agent)] = node
+        self._nodes.move_to_end(id(agent))
+        while self.max_agents is not None and len(self._nodes) > self.max_agents:
+            self._nodes.popitem(last=False)
+        return node
+
+    def __contains__(self, agent: object) -> bool:
+        node = self._nodes.get(id(agent))
+        return node is not None and node.agent is agent
+
+    def __len__(self) -> int:
+        return len(self._nodes)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Union
+
+from .items import TResponseInputItem
+from .logger import logger
+from .result import RunResult
+
+BatchInput = Union[str, list[TResponseInputItem]]
+"""A single input to a batch run: a user message, or a list of input items."""
+
+
+@dataclass
+class BatchRunItem:
+    """The outcome of a single run in a batch."""
+
+    index: int
+    """The position of the input in the batch."""
+
+    input: str | list[TResponseInputItem]
+    """The input the run was started with."""
+
+    result: RunResult | None
+    """The result of the run, or None if the run failed."""
+
+    error: Exception | None
+    """The exception raised by the run, or None if the run succeeded."""
+
+    latency: float
+    """How long the run took, in seconds."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the run completed successfully."""
+        return self.error is None
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolation percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+@dataclass
+class BatchRunStats:
+    """Aggregate statistics for the runs in a batch that have completed so far."""
+
+    completed: int
+    """The number of runs that have finished, successfully or not."""
+
+    failed: int
+    """The number of runs that raised an exception."""
+
+    wall_time: float
+    """Seconds since the batch started, or the total duration once the batch is complete."""
+
+    throughput: float
+    """Completed runs per second of wall time."""
+
+    latency_p50: float
+    """The median run latency, in seconds."""
+
+    latency_p90: float
+    """The 90th percentile run latency, in seconds."""
+
+    latency_p99: float
+    """The 99th percentile run latency, in seconds."""
+
+    @property
+    def succeeded(self) -> int:
+        """The number of runs that completed successfully."""
+        return self.completed - self.failed
+
+
+class _BatchComplete:
+    pass
+
+
+@dataclass
+class BatchRun:
+    """A batch of runs started with `Runner.run_many()`. Use `stream_results()` to receive each
+    run's outcome as soon as it finishes, and `stats` for aggregate throughput and latency.
+
+    A failing run never affects the rest of the batch: its exception is reported on the
+    corresponding `BatchRunItem` instead of being raised.
+    """
+
+    max_concurrency: int
+    """The maximum number of runs in flight at once."""
+
+    items: list[BatchRunItem] = field(default_factory=list)
+    """The outcomes received so far, in completion order."""
+
+    is_complete: bool = False
+    """Whether every run in the batch has finished."""
+
+    _run: Callable[[BatchInput], Awaitable[RunResult]] | None = field(default=None, repr=False)
+    _queue: asyncio.Queue[BatchRunItem | _BatchComplete] = field(
+        default_factory=asyncio.Queue, repr=False
+    )
+    _workers: list[asyncio.Task[Any]] = field(default_factory=list, repr=False)
+    _started_at: float = field(default_factory=time.monotonic, repr=False)
+    _finished_at: float | None = field(default=None, repr=False)
+    _latencies: list[float] = field(default_factory=list, repr=False)
+    _active_workers: int = field(default=0, repr=False)
+
+    def _start(
+        self, run: Callable[[BatchInput], Awaitable[RunResult]], inputs: Iterable[BatchInput]
+    ) -> None:
+        self._run = run
+        # Workers pull from a shared iterator, so inputs are only consumed as capacity frees up.
+        iterator = iter(enumerate(inputs))
+        self._active_workers = self.max_concurrency
+        self._workers = [
+            asyncio.create_task(self._worker(iterator)) for _ in range(self.max_concurrency)
+        ]
+
+    async def _worker(self, iterator: Iterable[tuple[int, BatchInput]]) -> None:
+        assert self._run is not None
+        try:
+            for index, input in iterator:
+                start = time.monotonic()
+                try:
+                    result = await self._run(input)
+                    item = BatchRunItem(
+                        index=index,
+                        input=input,
+                        result=result,
+                        error=None,
+                        latency=time.monotonic() - start,
+                    )
+                except Exception as e:
+                    logger.debug(f"Run {index} in batch failed: {e}")
+                    item = BatchRunItem(
+                        index=index,
+                        input=input,
+                        result=None,
+                        error=e,
+                        latency=time.monotonic() - start,
+                    )
+                self._queue.put_nowait(item)
+        finally:
+            self._active_workers -= 1
+            if self._active_workers == 0:
+                self._queue.put_nowait(_BatchComplete())
+
+    async def stream_results(self) -> AsyncIterator[BatchRunItem]:
+        """Yields the outcome of each run as it completes. The order is completion order, not
+        input order; use `BatchRunItem.index` to correlate outcomes with inputs."""
+        while not self.is_complete:
+            item = await self._queue.get()
+            if isinstance(item, _BatchComplete):
+                self._finished_at = time.monotonic()
+                self.is_complete = True
+                logger.debug(f"Batch complete: {self.stats}")
+                break
+            self.items.append(item)
+            self._latencies.append(item.latency)
+            yield item
+
+    def cancel(self) -> None:
+        """Cancels every run that is still in flight, and stops starting new ones."""
+        for worker in self._workers:
+            worker.cancel()
+
+    @property
+    def stats(self) -> BatchRunStats:
+        """Throughput and latency percentiles for the runs received so far."""
+        end = self._finished_at if self._finished_at is not None else time.monotonic()
+        wall_time = end - self._started_at
+        latencies = sorted(self._latencies)
+        completed = len(latencies)
+        return BatchRunStats(
+            completed=completed,
+            failed=sum(1 for item in self.items if not item.ok),
+            wall_time=wall_time,
+            throughput=completed / wall_time if wall_time > 0 else 0.0,
+            latency_p50=_percentile(latencies, 0.5),
+            latency_p90=_percentile(latencies, 0.9),
+            latency_p99=_percentile(latencies, 0.99),
+        )
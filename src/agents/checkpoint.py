@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import re
+import threading
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
+
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem
+from pydantic import TypeAdapter
+from pydantic_core import PydanticSerializationError, to_jsonable_python
+
+from ._run_impl import (
+    AgentToolUseTracker,
+    NextStepFinalOutput,
+    NextStepHandoff,
+    SingleStepResult,
+)
+from .agent_graph import get_output_schema
+from .agent_output import _WRAPPER_DICT_KEY, AgentOutputSchema
+from .exceptions import AgentsException, UserError
+from .items import (
+    HandoffCallItem,
+    HandoffOutputItem,
+    MessageOutputItem,
+    ModelResponse,
+    ReasoningItem,
+    RunItem,
+    ToolCallItem,
+    ToolCallItemTypes,
+    ToolCallOutputItem,
+    TResponseInputItem,
+)
+from .logger import logger
+from .usage import Usage
+
+if TYPE_CHECKING:
+    from .agent import Agent
+
+_FORMAT_VERSION = 1
+_CHECKPOINT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_\-][A-Za-z0-9_.\-]*$")
+
+_tool_call_adapter: TypeAdapter[ToolCallItemTypes] = TypeAdapter(ToolCallItemTypes)
+
+
+def new_checkpoint_id() -> str:
+    """Returns a new, random checkpoint ID."""
+    return f"run_{uuid.uuid4().hex}"
+
+
+class CheckpointStore(abc.ABC):
+    """Durably stores run checkpoints. A checkpoint is an append-only sequence of JSON records,
+    one per completed turn; the runner appends a single record after each turn."""
+
+    @abc.abstractmethod
+    async def append(self, checkpoint_id: str, records: list[dict[str, Any]]) -> None:
+        """Appends records to a checkpoint, creating it if needed. The records must be durable
+        once this returns, and a crash must not leave a partially written record behind that
+        `load` would return.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def load(self, checkpoint_id: str) -> list[dict[str, Any]] | None:
+        """Returns the records of a checkpoint in the order they were appended, or None if there
+        is no such checkpoint."""
+        pass
+
+
+class JSONLCheckpointStore(CheckpointStore):
+    """Stores each checkpoint as a JSON Lines file in a directory. Every append is a single write
+    followed by an `fsync`, so a turn costs one disk flush. A record that was only partially
+    written when the process died is ignored on load.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], fsync: bool = True) -> None:
+        """
+        Args:
+            directory: The directory to store checkpoints in. Created if it doesn't exist.
+            fsync: Whether to flush appends to disk before returning. Turning this off makes
+                checkpoints survive a crash of the process, but not of the machine.
+        """
+        self.directory = os.fspath(directory)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+    def path(self, checkpoint_id: str) -> str:
+        """Returns the path of the file that stores the checkpoint."""
+        if not _CHECKPOINT_ID_PATTERN.match(checkpoint_id):
+            raise UserError(f"Invalid checkpoint ID: {checkpoint_id!r}")
+        return os.path.join(self.directory, f"{checkpoint_id}.jsonl")
+
+    def list_checkpoints(self) -> list[str]:
+        """Returns the IDs of the stored checkpoints."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[: -len(".jsonl")] for name in os.listdir(self.directory) if name.endswith(".jsonl")
+        )
+
+    def delete(self, checkpoint_id: str) -> None:
+        """Deletes a checkpoint, if it exists."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path(checkpoint_id))
+
+    async def append(self, checkpoint_id: str, records: list[dict[str, Any]]) -> None:
+        path = self.path(checkpoint_id)
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        await asyncio.to_thread(self._write, path, data.encode())
+
+    async def load(self, checkpoint_id: str) -> list[dict[str, Any]] | None:
+        return await asyncio.to_thread(self._read, self.path(checkpoint_id))
+
+    def _write(self, path: str, data: bytes) -> None:
+        with self._lock:
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(self.directory, exist_ok=True)
+            with open(path, "a+b") as f:
+                _truncate_partial_record(f)
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            if created and self.fsync:
+                _fsync_directory(self.directory)
+
+    def _read(self, path: str) -> list[dict[str, Any]] | None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        lines = data.split(b"\n")
+        # A complete file ends with a newline, so the last element is empty unless the last write
+        # was cut short.
+        if lines[-1]:
+            logger.warning(f"Ignoring a partially written record at the end of {path}")
+        records = []
+        for number, line in enumerate(lines[:-1], start=1):
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise AgentsException(f"Corrupt checkpoint record at {path}:{number}: {e}") from e
+        return records
+
+
+def _truncate_partial_record(f: BinaryIO) -> None:
+    # Drops the remains of a write that was cut short, so that the next record starts on a line
+    # of its own.
+    size = f.seek(0, os.SEEK_END)
+    if size == 0:
+        return
+    f.seek(size - 1)
+    if f.read(1) != b"\n":
+        f.seek(0)
+        f.truncate(f.read().rfind(b"\n") + 1)
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes the creation of a new file durable. Not supported on every platform.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class RestoredRun:
+    """The state of a run, as of the last turn in its checkpoint."""
+
+    agent: Agent[Any]
+    """The agent to run next, or the last agent if the run is complete."""
+
+    original_input: str | list[TResponseInputItem]
+    generated_items: list[RunItem]
+    model_responses: list[ModelResponse]
+    usage: Usage
+    tool_use_tracker: AgentToolUseTracker
+    turn: int
+    max_turns: int
+    previous_response_id: str | None
+
+    handed_off: bool
+    """Whether the last turn was a handoff, in which case the new agent hasn't started yet."""
+
+    is_complete: bool = False
+    """Whether the last turn produced a final output."""
+
+    final_output: Any = None
+
+    usage_by_agent: dict[str, Usage] = field(default_factory=dict)
+
+
+class RunCheckpointer:
+    """Appends a record to a checkpoint after each turn of a run. Each record only contains what
+    changed during the turn, so the cost of a turn doesn't grow with the length of the run."""
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        checkpoint_id: str,
+        *,
+        max_turns: int,
+        previous_response_id: str | None,
+        restored: RestoredRun | None = None,
+    ) -> None:
+        self.store = store
+        self.checkpoint_id = checkpoint_id
+        self.max_turns = max_turns
+        self.previous_response_id = previous_response_id
+        self._saved_items: list[RunItem] = list(restored.generated_items) if restored else []
+        self._saved_input: Any = restored.original_input if restored else None
+
+    async def save_turn(
+        self,
+        turn: int,
+        agent: Agent[Any],
+        turn_result: SingleStepResult,
+        usage: Usage,
+        tool_use_tracker: AgentToolUseTracker,
+        usage_by_agent: Mapping[str, Usage] | None = None,
+    ) -> None:
+        """Durably records a completed turn.
+
+        Args:
+            turn: The number of the turn, starting at 1.
+            agent: The agent that ran the turn.
+            turn_result: The result of the turn.
+            usage: The usage of the run so far.
+            tool_use_tracker: The tools used by each agent so far.
+            usage_by_agent: The usage of the run so far, per agent name.
+        """
+        items = turn_result.generated_items
+        # Handoff input filters can replace earlier items, so we record where the new items start.
+        unchanged = 0
+        for saved, item in zip(self._saved_items, items):
+            if saved is not item:
+                break
+            unchanged += 1
+
+        next_step = turn_result.next_step
+        record: dict[str, Any] = {
+            "type": "turn",
+            "version": _FORMAT_VERSION,
+            "turn": turn,
+            "agent": (
+                next_step.new_agent.name if isinstance(next_step, NextStepHandoff) else agent.name
+            ),
+            "max_turns": self.max_turns,
+            "previous_response_id": self.previous_response_id,
+            "items_from": unchanged,
+            "items": [_dump_item(item) for item in items[unchanged:]],
+            "model_response": turn_result.model_response.to_json_dict(),
+            "usage": dataclasses.asdict(usage),
+            "usage_by_agent": {
+                name: dataclasses.asdict(agent_usage)
+                for name, agent_usage in (usage_by_agent or {}).items()
+            },
+            "tool_use": [
+                [tool_agent.name, list(tool_names)]
+                for tool_agent, tool_names in tool_use_tracker.agent_to_tools
+            ],
+            "next_step": (
+                "handoff"
+                if isinstance(next_step, NextStepHandoff)
+                else "final_output"
+                if isinstance(next_step, NextStepFinalOutput)
+                else "run_again"
+            ),
+        }
+        if turn_result.original_input is not self._saved_input:
+            record["input"] = turn_result.original_input
+        if isinstance(next_step, NextStepFinalOutput):
+            try:
+                record["final_output"] = to_jsonable_python(next_step.output)
+            except PydanticSerializationError:
+                logger.warning(
+                    f"The final output of checkpoint {self.checkpoint_id} can't be serialized, so "
+                    "resuming it will fail"
+                )
+
+        await self.store.append(self.checkpoint_id, [record])
+        self._saved_items = list(items)
+        self._saved_input = turn_result.original_input
+
+
+def restore_run(
+    records: list[dict[str, Any]], agent_registry: Mapping[str, Agent[Any]]
+) -> RestoredRun:
+    """Rebuilds the state of a run from its checkpoint records.
+
+    Args:
+        records: The records of the checkpoint.
+        agent_registry: The agents of the run, keyed by name.
+    """
+
+    def get_agent(name: str) -> Agent[Any]:
+        agent = agent_registry.get(name)
+        if agent is None:
+            raise UserError(f"Agent {name!r} from the checkpoint is not in the agent registry")
+        return agent
+
+    turns = [record for record in records if record.get("type") == "turn"]
+    if not turns:
+        raise UserError("The checkpoint has no completed turns to resume from")
+
+    original_input: Any = None
+    items: list[RunItem] = []
+    responses: list[ModelResponse] = []
+    for record in turns:
+        if record.get("version") != _FORMAT_VERSION:
+            raise UserError(f"Unsupported checkpoint format version: {record.get('version')}")
+        if "input" in record:
+            original_input = record["input"]
+        items = items[: record["items_from"]] + [
+            _load_item(data, get_agent) for data in record["items"]
+        ]
+        responses.append(ModelResponse.from_json_dict(record["model_response"]))
+
+    last = turns[-1]
+    tool_use_tracker = AgentToolUseTracker()
+    for name, tool_names in last["tool_use"]:
+        tool_use_tracker.add_tool_use(get_agent(name), list(tool_names))
+
+    restored = RestoredRun(
+        agent=get_agent(last["agent"]),
+        original_input=original_input,
+        generated_items=items,
+        model_responses=responses,
+        usage=_load_usage(last["usage"]),
+        usage_by_agent={
+            name: _load_usage(data) for name, data in last.get("usage_by_agent", {}).items()
+        },
+        tool_use_tracker=tool_use_tracker,
+        turn=last["turn"],
+        max_turns=last["max_turns"],
+        previous_response_id=last["previous_response_id"],
+        handed_off=last["next_step"] == "handoff",
+    )
+    if last["next_step"] == "final_output":
+        if "final_output" not in last:
+            raise UserError("The run is complete, but its final output was not checkpointed")
+        restored.is_complete = True
+        restored.final_output = _load_final_output(restored.agent, last["final_output"])
+    return restored
+
+
+def _dump_item(item: RunItem) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "type": item.type,
+        "agent": item.agent.name,
+        # Already computed (and cached) for the model input.
+        "raw_item": item.to_input_item(),
+    }
+    if isinstance(item, ToolCallOutputItem):
+        try:
+            data["output"] = to_jsonable_python(item.output)
+        except PydanticSerializationError:
+            data["output"] = str(item.output)
+    elif isinstance(item, HandoffOutputItem):
+        data["source_agent"] = item.source_agent.name
+        data["target_agent"] = item.target_agent.name
+    return data
+
+
+def _load_item(data: dict[str, Any], get_agent: Callable[[str], Agent[Any]]) -> RunItem:
+    agent = get_agent(data["agent"])
+    raw_item = data["raw_item"]
+    item_type = data["type"]
+    if item_type == "message_output_item":
+        return MessageOutputItem(
+            agent=agent, raw_item=ResponseOutputMessage.model_validate(raw_item)
+        )
+    if item_type == "handoff_call_item":
+        return HandoffCallItem(
+            agent=agent, raw_item=ResponseFunctionToolCall.model_validate(raw_item)
+        )
+    if item_type == "tool_call_item":
+        return ToolCallItem(agent=agent, raw_item=_tool_call_adapter.validate_python(raw_item))
+    if item_type == "reasoning_item":
+        return ReasoningItem(agent=agent, raw_item=ResponseReasoningItem.model_validate(raw_item))
+    if item_type == "tool_call_output_item":
+        return ToolCallOutputItem(agent=agent, raw_item=raw_item, output=data["output"])
+    if item_type == "handoff_output_item":
+        return HandoffOutputItem(
+            agent=agent,
+            raw_item=raw_item,
+            source_agent=get_agent(data["source_agent"]),
+            target_agent=get_agent(data["target_agent"]),
+        )
+    raise AgentsException(f"Unknown item type in checkpoint: {item_type}")
+
+
+def _load_usage(data: dict[str, Any]) -> Usage:
+    # Ignores unknown fields, and defaults missing ones, so that checkpoints outlive changes to
+    # `Usage`.
+    names = {f.name for f in dataclasses.fields(Usage)}
+    return Usage(**{key: value for key, value in data.items() if key in names})
+
+
+def _load_final_output(agent: Agent[Any], value: Any) -> Any:
+    # Validated the way the runner validates the model's output, so that custom output schemas
+    # and wrapped output types are restored to what the run originally produced.
+    output_schema = get_output_schema(agent)
+    if output_schema is None or output_schema.is_plain_text():
+        return value
+    if isinstance(output_schema, AgentOutputSchema) and output_schema._is_wrapped:
+        value = {_WRAPPER_DICT_KEY: value}
+    return output_schema.validate_json(json.dumps(value))
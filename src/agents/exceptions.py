@@ -1,7 +1,11 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .guardrail import InputGuardrailResult, OutputGuardrailResult
+    from .guardrail import (
+        InputGuardrailResult,
+        OutputGuardrailResult,
+        StreamingOutputGuardrailResult,
+    )
 
 
 class AgentsException(Exception):
@@ -61,3 +65,16 @@ class OutputGuardrailTripwireTriggered(AgentsException):
         super().__init__(
             f"Guardrail {guardrail_result.guardrail.__class__.__name__} triggered tripwire"
         )
+
+
+class StreamingOutputGuardrailTripwireTriggered(AgentsException):
+    """Exception raised when a streaming output guardrail tripwire is triggered."""
+
+    guardrail_result: "StreamingOutputGuardrailResult"
+    """The result data of the guardrail that was triggered, including the chunk it checked."""
+
+    def __init__(self, guardrail_result: "StreamingOutputGuardrailResult"):
+        self.guardrail_result = guardrail_result
+        super().__init__(
+            f"Guardrail {guardrail_result.guardrail.__class__.__name__} triggered tripwire"
+        )
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import IO, Any, Literal, get_args
+
+from pydantic import BaseModel, TypeAdapter
+
+from ...agent_output import AgentOutputSchemaBase
+from ...exceptions import UserError
+from ...handoffs import Handoff
+from ...items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from ...model_settings import ModelSettings
+from ...models.interface import Model, ModelProvider, ModelTracing
+from ...tokens import TokenEstimate
+from ...tool import FunctionTool, Tool
+
+_stream_event_adapter: TypeAdapter[TResponseStreamEvent] = TypeAdapter(TResponseStreamEvent)
+
+
+def _stream_event_types() -> dict[str, type[BaseModel]]:
+    # Validating against the union tries each of its dozens of members in turn, so we dispatch on
+    # the event type instead.
+    types: dict[str, type[BaseModel]] = {}
+    # `TResponseStreamEvent` is an `Annotated` union.
+    union = get_args(TResponseStreamEvent)[0]
+    for event_cls in get_args(union):
+        type_field = getattr(event_cls, "model_fields", {}).get("type")
+        if type_field is not None:
+            for value in get_args(type_field.annotation):
+                types[value] = event_cls
+    return types
+
+
+_STREAM_EVENT_TYPES = _stream_event_types()
+
+
+def request_key(
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    tools: list[Tool],
+    output_schema: AgentOutputSchemaBase | None,
+    handoffs: list[Handoff],
+    previous_response_id: str | None,
+) -> str:
+    """Returns a hash that identifies a model request. Requests that only differ in ways the model
+    can't observe get the same key: a string input is equivalent to a single user message, and the
+    IDs of input items are ignored.
+    """
+    if isinstance(input, str):
+        input = [{"role": "user", "content": input}]
+    normalized = {
+        "system_instructions": system_instructions,
+        "input": [
+            {k: v for k, v in item.items() if k != "id"} if isinstance(item, dict) else item
+            for item in input
+        ],
+        "model_settings": {k: v for k, v in model_settings.to_json_dict().items() if v is not None},
+        "tools": [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.params_json_schema,
+                "strict": tool.strict_json_schema,
+            }
+            if isinstance(tool, FunctionTool)
+            else {"name": tool.name}
+            for tool in tools
+        ],
+        "output_schema": (
+            output_schema.json_schema()
+            if output_schema and not output_schema.is_plain_text()
+            else None
+        ),
+        "handoffs": [
+            {"name": handoff.tool_name, "parameters": handoff.input_json_schema}
+            for handoff in handoffs
+        ],
+        "previous_response_id": previous_response_id,
+    }
+    data = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+
+@dataclass
+class Exchange:
+    """A recorded model request and its response."""
+
+    key: str
+    """The `request_key` of the request."""
+
+    latency: float
+    """The number of seconds the model took to respond, or to finish streaming."""
+
+    response: ModelResponse | None = None
+    """The response, for requests made with `get_response`."""
+
+    events: list[tuple[float, TResponseStreamEvent]] = field(default_factory=list)
+    """The stream events, for requests made with `stream_response`, each with the number of
+    seconds since the start of the request."""
+
+    @property
+    def streamed(self) -> bool:
+        return self.response is None
+
+    def to_json_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"key": self.key, "latency": round(self.latency, 6)}
+        if self.response is not None:
+            data["response"] = self.response.to_json_dict()
+        else:
+            data["events"] = [
+                [round(offset, 6), event.model_dump(mode="json", exclude_unset=True)]
+                for offset, event in self.events
+            ]
+        return data
+
+    @classmethod
+    def from_json_dict(cls, data: dict[str, Any]) -> Exchange:
+        if "response" in data:
+            return cls(
+                key=data["key"],
+                latency=data["latency"],
+                response=ModelResponse.from_json_dict(data["response"]),
+            )
+        return cls(
+            key=data["key"],
+            latency=data["latency"],
+            events=[(offset, _load_stream_event(event)) for offset, event in data["events"]],
+        )
+
+
+def _load_stream_event(data: dict[str, Any]) -> TResponseStreamEvent:
+    event_cls = _STREAM_EVENT_TYPES.get(data.get("type", ""))
+    if event_cls is None:
+        return _stream_event_adapter.validate_python(data)
+    return event_cls.model_validate(data)  # type: ignore[return-value]
+
+
+class Cassette:
+    """A file of recorded model exchanges, in JSON Lines format. Files whose name ends in `.gz`
+    are compressed."""
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        """
+        Args:
+            path: The file that recorded exchanges are appended to. If None, exchanges are only
+                kept in memory.
+        """
+        self.path = os.fspath(path) if path is not None else None
+        self.exchanges: list[Exchange] = []
+        self._by_key: dict[str, list[Exchange]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> Cassette:
+        """Loads a cassette from a file. Exchanges recorded with it are appended to the file."""
+        cassette = cls(path)
+        with _open(os.fspath(path), "rt") as f:
+            for line in f:
+                if line.strip():
+                    cassette._add(Exchange.from_json_dict(json.loads(line)))
+        return cassette
+
+    def record(self, exchange: Exchange) -> None:
+        """Adds an exchange to the cassette, and appends it to the file."""
+        with self._lock:
+            self._add(exchange)
+            if self.path is not None:
+                line = json.dumps(exchange.to_json_dict(), separators=(",", ":"))
+                with _open(self.path, "at") as f:
+                    f.write(line + "\n")
+
+    def find(self, key: str) -> list[Exchange]:
+        """Returns the exchanges recorded for a request key, in the order they were recorded."""
+        return self._by_key.get(key, [])
+
+    def _add(self, exchange: Exchange) -> None:
+        self.exchanges.append(exchange)
+        self._by_key[exchange.key].append(exchange)
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordingModel(Model):
+    """Wraps a model, and records every successful exchange with it to a cassette. Streamed
+    responses are recorded with the time at which each event arrived."""
+
+    def __init__(self, model: Model, cassette: Cassette) -> None:
+        self.model = model
+        self.cassette = cassette
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> ModelResponse:
+        # The input is keyed before the call, in case the model modifies it.
+        key = request_key(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            previous_response_id,
+        )
+        start = time.perf_counter()
+        response = await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+        )
+        self.cassette.record(
+            Exchange(key=key, latency=time.perf_counter() - start, response=response)
+        )
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = request_key(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            previous_response_id,
+        )
+        events: list[tuple[float, TResponseStreamEvent]] = []
+        start = time.perf_counter()
+        async for event in self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+        ):
+            events.append((time.perf_counter() - start, event))
+            yield event
+        # Streams that fail or are abandoned are not recorded.
+        self.cassette.record(Exchange(key=key, latency=time.perf_counter() - start, events=events))
+
+    def estimate_input_tokens(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> TokenEstimate | None:
+        return self.model.estimate_input_tokens(
+            system_instructions, input, tools, output_schema, handoffs
+        )
+
+
+class ReplayModel(Model):
+    """Serves the exchanges recorded in a cassette, without calling a model.
+
+    Requests are matched by their `request_key`. If the same request was recorded several times,
+    the recorded responses are served in order, starting over once all have been served, so that a
+    recorded run can be replayed repeatedly.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        timing: Literal["instant", "recorded"] = "instant",
+        speed: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            cassette: The cassette to replay.
+            timing: Whether to respond instantly, or with the latency (and, for streams, the
+                timing of each event) of the recording.
+            speed: With recorded timing, how many times faster than the recording to respond.
+        """
+        self.cassette = cassette
+        self.timing = timing
+        self.speed = speed
+        self._served: dict[tuple[str, bool], int] = defaultdict(int)
+
+    def _next_exchange(self, key: str, streamed: bool) -> Exchange:
+        exchanges = [e for e in self.cassette.find(key) if e.streamed == streamed]
+        if not exchanges:
+            kind = "streamed" if streamed else "non-streamed"
+            raise UserError(
+                f"No {kind} exchange with request key {key} in the cassette. The request differs "
+                "from every recorded one, e.g. because the agent or its tools changed."
+            )
+        index = self._served[(key, streamed)]
+        self._served[(key, streamed)] = index + 1
+        return exchanges[index % len(exchanges)]
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> ModelResponse:
+        key = request_key(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            previous_response_id,
+        )
+        exchange = self._next_exchange(key, streamed=False)
+        assert exchange.response is not None
+        if self.timing == "recorded":
+            await asyncio.sleep(exchange.latency / self.speed)
+        # Callers may hold on to the response, so every replay gets its own copy.
+        return dataclasses.replace(exchange.response, output=list(exchange.response.output))
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = request_key(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            previous_response_id,
+        )
+        exchange = self._next_exchange(key, streamed=True)
+        start = time.perf_counter()
+        for offset, event in exchange.events:
+            if self.timing == "recorded":
+                delay = offset / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield event
+
+
+class RecordingModelProvider(ModelProvider):
+    """Wraps a model provider, so that every model it provides records to a cassette."""
+
+    def __init__(self, provider: ModelProvider, cassette: Cassette) -> None:
+        self.provider = provider
+        self.cassette = cassette
+
+    def get_model(self, model_name: str | None) -> Model:
+        return RecordingModel(self.provider.get_model(model_name), self.cassette)
+
+
+class ReplayModelProvider(ModelProvider):
+    """Provides models that replay a cassette, whatever the model name."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        timing: Literal["instant", "recorded"] = "instant",
+        speed: float = 1.0,
+    ) -> None:
+        self._model = ReplayModel(cassette, timing=timing, speed=speed)
+
+    def get_model(self, model_name: str | None) -> Model:
+        return self._model
@@ -38,6 +38,7 @@ from ...models.chatcmpl_helpers import HEADERS
 from ...models.chatcmpl_stream_handler import ChatCmplStreamHandler
 from ...models.fake_id import FAKE_RESPONSES_ID
 from ...models.interface import Model, ModelTracing
+from ...timings import add_phase
 from ...tool import Tool
 from ...tracing import generation_span
 from ...tracing.span_data import GenerationSpanData
@@ -105,7 +106,14 @@ class LitellmModel(Model):
                     Usage(
                         requests=1,
                         input_tokens=response_usage.prompt_tokens,
+                        cached_input_tokens=(
+                            getattr(response_usage.prompt_tokens_details, "cached_tokens", 0) or 0
+                        ),
                         output_tokens=response_usage.completion_tokens,
+                        reasoning_tokens=(
+                            getattr(response_usage.completion_tokens_details, "reasoning_tokens", 0)
+                            or 0
+                        ),
                         total_tokens=response_usage.total_tokens,
                     )
                     if response.usage
@@ -163,7 +171,9 @@ class LitellmModel(Model):
             )
 
             final_response: Response | None = None
-            async for chunk in ChatCmplStreamHandler.handle_stream(response, stream):
+            async for chunk in ChatCmplStreamHandler.handle_stream(
+                response, stream, emit_tool_calls_early=bool(model_settings.emit_tool_calls_early)
+            ):
                 yield chunk
 
                 if chunk.type == "response.completed":
@@ -218,6 +228,7 @@ class LitellmModel(Model):
         tracing: ModelTracing,
         stream: bool = False,
     ) -> litellm.types.utils.ModelResponse | tuple[Response, AsyncStream[ChatCompletionChunk]]:
+        start = time.perf_counter()
         converted_messages = Converter.items_to_messages(input)
 
         if system_instructions:
@@ -228,6 +239,9 @@ class LitellmModel(Model):
                     "role": "system",
                 },
             )
+        add_phase("convert_input", start)
+
+        start = time.perf_counter()
         if tracing.include_data():
             span.span_data.input = converted_messages
 
@@ -269,6 +283,7 @@ class LitellmModel(Model):
             extra_kwargs["extra_query"] = model_settings.extra_query
         if model_settings.metadata:
             extra_kwargs["metadata"] = model_settings.metadata
+        add_phase("build_request", start)
 
         ret = await litellm.acompletion(
             model=self.model,
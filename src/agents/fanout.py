@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import abc
+import inspect
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+from .exceptions import ModelBehaviorError, UserError
+from .usage import Usage
+from .util._types import MaybeAwaitable
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .handoffs import Handoff
+    from .result import RunResult
+
+
+@dataclass
+class FanoutBranchResult:
+    """The result of one branch of a fan-out handoff, i.e. a sub-run of one of the target agents."""
+
+    agent: Agent[Any]
+    """The agent that the branch started with."""
+
+    handoff: Handoff[Any]
+    """The handoff that started the branch."""
+
+    index: int
+    """The position of the branch among all branches of the fan-out, in the order they started."""
+
+    result: RunResult | None
+    """The result of the sub-run, or None if it raised an exception."""
+
+    error: Exception | None = None
+    """The exception the sub-run raised, if any."""
+
+    usage: Usage = field(default_factory=Usage)
+    """The usage of the sub-run. Also added to the usage of the parent run."""
+
+    @property
+    def final_output(self) -> Any:
+        """The final output of the sub-run, or None if it raised an exception."""
+        return self.result.final_output if self.result is not None else None
+
+
+@dataclass
+class FanoutOutcome:
+    """The combined output of a fan-out handoff, as decided by a `FanoutPolicy`."""
+
+    final_output: Any
+    """The final output of the run."""
+
+    branches: list[FanoutBranchResult]
+    """The branches the output came from. Their new items are added to the run's items."""
+
+
+class FanoutPolicy(abc.ABC):
+    """Decides the output of a fan-out handoff from the results of its branches. Once a policy has
+    decided, the branches that are still running are cancelled.
+    """
+
+    @abc.abstractmethod
+    async def decide(
+        self, finished: list[FanoutBranchResult], num_branches: int
+    ) -> FanoutOutcome | None:
+        """Called every time a branch finishes.
+
+        Args:
+            finished: The branches that have finished so far, in the order they finished.
+            num_branches: The total number of branches.
+
+        Returns:
+            The outcome, or None to wait for more branches. Must return an outcome or raise once
+            every branch has finished.
+        """
+        pass
+
+
+def _no_outcome(finished: list[FanoutBranchResult], reason: str) -> Exception:
+    errors = [branch.error for branch in finished if branch.error is not None]
+    if errors and len(errors) == len(finished):
+        return errors[0]
+    return ModelBehaviorError(reason)
+
+
+class FirstValidOutput(FanoutPolicy):
+    """Uses the output of the first branch that finishes without an error and with a valid output.
+
+    Args:
+        is_valid: Decides whether an output is valid. By default, every output is.
+    """
+
+    def __init__(self, is_valid: Callable[[Any], bool] | None = None) -> None:
+        self.is_valid = is_valid
+
+    async def decide(
+        self, finished: list[FanoutBranchResult], num_branches: int
+    ) -> FanoutOutcome | None:
+        branch = finished[-1]
+        if branch.error is None and (self.is_valid is None or self.is_valid(branch.final_output)):
+            return FanoutOutcome(final_output=branch.final_output, branches=[branch])
+        if len(finished) == num_branches:
+            raise _no_outcome(finished, "No fan-out branch produced a valid output")
+        return None
+
+
+class Quorum(FanoutPolicy):
+    """Uses an output once `size` branches have produced an equal output.
+
+    Args:
+        size: The number of branches that have to agree.
+        key: Maps an output to the value that is compared. Defaults to the output itself, which
+            must then be hashable.
+    """
+
+    def __init__(self, size: int, key: Callable[[Any], Hashable] | None = None) -> None:
+        if size < 1:
+            raise UserError("Quorum size must be at least 1")
+        self.size = size
+        self.key = key
+
+    async def decide(
+        self, finished: list[FanoutBranchResult], num_branches: int
+    ) -> FanoutOutcome | None:
+        groups: dict[Hashable, list[FanoutBranchResult]] = {}
+        for branch in finished:
+            if branch.error is None:
+                output = branch.final_output
+                groups.setdefault(self.key(output) if self.key else output, []).append(branch)
+
+        largest = max((len(group) for group in groups.values()), default=0)
+        for group in groups.values():
+            if len(group) >= self.size:
+                return FanoutOutcome(final_output=group[0].final_output, branches=[group[0]])
+        if largest + num_branches - len(finished) < self.size:
+            raise _no_outcome(finished, f"Fan-out branches did not reach a quorum of {self.size}")
+        return None
+
+
+class MergeOutputs(FanoutPolicy):
+    """Waits for every branch, and merges the outputs of the branches that succeeded.
+
+    Args:
+        merge: A sync or async function that receives the successful branches, in the order they
+            started, and returns the final output.
+    """
+
+    def __init__(self, merge: Callable[[list[FanoutBranchResult]], MaybeAwaitable[Any]]) -> None:
+        self.merge = merge
+
+    async def decide(
+        self, finished: list[FanoutBranchResult], num_branches: int
+    ) -> FanoutOutcome | None:
+        if len(finished) < num_branches:
+            return None
+        succeeded = sorted(
+            (branch for branch in finished if branch.error is None), key=lambda b: b.index
+        )
+        if not succeeded:
+            raise _no_outcome(finished, "Every fan-out branch failed")
+        output = self.merge(succeeded)
+        if inspect.isawaitable(output):
+            output = await output
+        return FanoutOutcome(final_output=output, branches=succeeded)
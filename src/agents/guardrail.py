@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import inspect
+import re
 from collections.abc import Awaitable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Callable, Generic, Union, overload
@@ -10,6 +11,7 @@ from typing_extensions import TypeVar
 from .exceptions import UserError
 from .items import TResponseInputItem
 from .run_context import RunContextWrapper, TContext
+from .tokens import get_default_tokenizer
 from .util._types import MaybeAwaitable
 
 if TYPE_CHECKING:
@@ -179,6 +181,133 @@ class OutputGuardrail(Generic[TContext]):
         )
 
 
+@dataclass
+class StreamedOutputChunk:
+    """A chunk of a model's streamed output text, checked by a `StreamingOutputGuardrail`."""
+
+    text: str
+    """The text of the chunk. For agents with an `output_type`, this is a piece of the raw JSON
+    that the model is generating.
+    """
+
+    offset: int
+    """Where the chunk starts in the text the model has streamed in the current turn."""
+
+    final: bool
+    """Whether this is the last chunk of the turn, i.e. the model stream has finished."""
+
+
+@dataclass
+class StreamingOutputGuardrailResult:
+    """The result of a streaming output guardrail run on a single chunk."""
+
+    guardrail: StreamingOutputGuardrail[Any]
+    """
+    The guardrail that was run.
+    """
+
+    agent: Agent[Any]
+    """
+    The agent whose output was checked by the guardrail.
+    """
+
+    chunk: StreamedOutputChunk
+    """
+    The chunk that was checked.
+    """
+
+    output: GuardrailFunctionOutput
+    """The output of the guardrail function."""
+
+
+# Sentence ending punctuation, optionally followed by closing quotes or brackets, then whitespace.
+# Requiring the whitespace keeps numbers like 3.14 and abbreviations inside words in one chunk.
+_SENTENCE_BOUNDARY = re.compile(r"[.!?][\"')\]]*\s+|\n+")
+
+
+@dataclass
+class StreamingOutputGuardrail(Generic[TContext]):
+    """Streaming output guardrails check a model's output text while it is streamed, so a run can
+    be stopped as soon as the output violates a policy, instead of after it has been generated
+    (and shown) in full. Stopping early also stops the model from generating further output tokens.
+
+    The streamed text is split into chunks at checkpoints: at sentence boundaries by default, or
+    every `every_n_tokens` tokens. Each chunk is checked exactly once, in the background while the
+    stream continues. When the stream finishes, the remaining text is checked as a final chunk.
+    Streaming output guardrails only run in `Runner.run_streamed()`, on the text of every turn.
+
+    You can use the `@streaming_output_guardrail()` decorator to turn a function into a
+    `StreamingOutputGuardrail`, or create a `StreamingOutputGuardrail` manually.
+
+    If `result.tripwire_triggered` is `True` for any chunk, the model stream is closed and a
+    `StreamingOutputGuardrailTripwireTriggered` exception is raised.
+    """
+
+    guardrail_function: Callable[
+        [RunContextWrapper[TContext], Agent[Any], StreamedOutputChunk],
+        MaybeAwaitable[GuardrailFunctionOutput],
+    ]
+    """A function that receives the context, the agent and a chunk of its streamed output, and
+    returns a `GuardrailFunctionOutput`.
+    """
+
+    name: str | None = None
+    """The name of the guardrail, used for tracing. If not provided, we'll use the guardrail
+    function's name.
+    """
+
+    every_n_tokens: int | None = None
+    """If set, the output is checked every time this many new tokens have been streamed, as
+    counted by the default tokenizer. If not set, the output is checked at sentence boundaries.
+    """
+
+    def __post_init__(self) -> None:
+        if self.every_n_tokens is not None and self.every_n_tokens < 1:
+            raise UserError("every_n_tokens must be at least 1")
+
+    def get_name(self) -> str:
+        if self.name:
+            return self.name
+
+        return self.guardrail_function.__name__
+
+    def checkpoint(self, pending: str) -> int:
+        """Returns how much of the pending, not yet checked text should be checked now, or 0 to
+        wait for more text.
+        """
+        if self.every_n_tokens is not None:
+            if get_default_tokenizer().count(pending) >= self.every_n_tokens:
+                return len(pending)
+            return 0
+
+        end = 0
+        for match in _SENTENCE_BOUNDARY.finditer(pending):
+            end = match.end()
+        return end
+
+    async def run(
+        self, context: RunContextWrapper[TContext], agent: Agent[Any], chunk: StreamedOutputChunk
+    ) -> StreamingOutputGuardrailResult:
+        if not callable(self.guardrail_function):
+            raise UserError(f"Guardrail function must be callable, got {self.guardrail_function}")
+
+        output = self.guardrail_function(context, agent, chunk)
+        if inspect.isawaitable(output):
+            return StreamingOutputGuardrailResult(
+                guardrail=self,
+                agent=agent,
+                chunk=chunk,
+                output=await output,
+            )
+
+        return StreamingOutputGuardrailResult(
+            guardrail=self,
+            agent=agent,
+            chunk=chunk,
+            output=output,
+        )
+
+
 TContext_co = TypeVar("TContext_co", bound=Any, covariant=True)
 
 # For InputGuardrail
@@ -318,3 +447,83 @@ def output_guardrail(
 
     # Decorator used with keyword arguments
     return decorator
+
+
+_StreamingOutputGuardrailFuncSync = Callable[
+    [RunContextWrapper[TContext_co], "Agent[Any]", StreamedOutputChunk],
+    GuardrailFunctionOutput,
+]
+_StreamingOutputGuardrailFuncAsync = Callable[
+    [RunContextWrapper[TContext_co], "Agent[Any]", StreamedOutputChunk],
+    Awaitable[GuardrailFunctionOutput],
+]
+
+
+@overload
+def streaming_output_guardrail(
+    func: _StreamingOutputGuardrailFuncSync[TContext_co],
+) -> StreamingOutputGuardrail[TContext_co]: ...
+
+
+@overload
+def streaming_output_guardrail(
+    func: _StreamingOutputGuardrailFuncAsync[TContext_co],
+) -> StreamingOutputGuardrail[TContext_co]: ...
+
+
+@overload
+def streaming_output_guardrail(
+    *,
+    name: str | None = None,
+    every_n_tokens: int | None = None,
+) -> Callable[
+    [
+        _StreamingOutputGuardrailFuncSync[TContext_co]
+        | _StreamingOutputGuardrailFuncAsync[TContext_co]
+    ],
+    StreamingOutputGuardrail[TContext_co],
+]: ...
+
+
+def streaming_output_guardrail(
+    func: _StreamingOutputGuardrailFuncSync[TContext_co]
+    | _StreamingOutputGuardrailFuncAsync[TContext_co]
+    | None = None,
+    *,
+    name: str | None = None,
+    every_n_tokens: int | None = None,
+) -> (
+    StreamingOutputGuardrail[TContext_co]
+    | Callable[
+        [
+            _StreamingOutputGuardrailFuncSync[TContext_co]
+            | _StreamingOutputGuardrailFuncAsync[TContext_co]
+        ],
+        StreamingOutputGuardrail[TContext_co],
+    ]
+):
+    """
+    Decorator that transforms a sync or async function into a `StreamingOutputGuardrail`.
+    It can be used directly (no parentheses) or with keyword args, e.g.:
+
+        @streaming_output_guardrail
+        def my_sync_guardrail(...): ...
+
+        @streaming_output_guardrail(name="guardrail_name", every_n_tokens=50)
+        async def my_async_guardrail(...): ...
+    """
+
+    def decorator(
+        f: _StreamingOutputGuardrailFuncSync[TContext_co]
+        | _StreamingOutputGuardrailFuncAsync[TContext_co],
+    ) -> StreamingOutputGuardrail[TContext_co]:
+        return StreamingOutputGuardrail(
+            guardrail_function=f, name=name, every_n_tokens=every_n_tokens
+        )
+
+    if func is not None:
+        # Decorator was used without parentheses
+        return decorator(func)
+
+    # Decorator used with keyword arguments
+    return decorator
@@ -98,6 +98,12 @@ class Handoff(Generic[TContext]):
     True, as it increases the likelihood of correct JSON input.
     """
 
+    fanout: int = 1
+    """How many copies of the agent to run concurrently when the handoff is invoked. With more than
+    one, the copies run as sub-runs, e.g. to race them at a non-zero temperature, and their outputs
+    are combined by `RunConfig.fanout_policy` (by default, the first output wins).
+    """
+
     def get_transfer_message(self, agent: Agent[Any]) -> str:
         base = f"{{'assistant': '{agent.name}'}}"
         return base
@@ -121,6 +127,7 @@ def handoff(
     tool_name_override: str | None = None,
     tool_description_override: str | None = None,
     input_filter: Callable[[HandoffInputData], HandoffInputData] | None = None,
+    fanout: int = 1,
 ) -> Handoff[TContext]: ...
 
 
@@ -133,6 +140,7 @@ def handoff(
     tool_description_override: str | None = None,
     tool_name_override: str | None = None,
     input_filter: Callable[[HandoffInputData], HandoffInputData] | None = None,
+    fanout: int = 1,
 ) -> Handoff[TContext]: ...
 
 
@@ -144,6 +152,7 @@ def handoff(
     tool_description_override: str | None = None,
     tool_name_override: str | None = None,
     input_filter: Callable[[HandoffInputData], HandoffInputData] | None = None,
+    fanout: int = 1,
 ) -> Handoff[TContext]: ...
 
 
@@ -154,6 +163,7 @@ def handoff(
     on_handoff: OnHandoffWithInput[THandoffInput] | OnHandoffWithoutInput | None = None,
     input_type: type[THandoffInput] | None = None,
     input_filter: Callable[[HandoffInputData], HandoffInputData] | None = None,
+    fanout: int = 1,
 ) -> Handoff[TContext]:
     """Create a handoff from an agent.
 
@@ -166,7 +176,11 @@ def handoff(
         input_type: the type of the input to the handoff. If provided, the input will be validated
             against this type. Only relevant if you pass a function that takes an input.
         input_filter: a function that filters the inputs that are passed to the next agent.
+        fanout: How many copies of the agent to run concurrently when the handoff is invoked. See
+            `Handoff.fanout`.
     """
+    if fanout < 1:
+        raise UserError("fanout must be at least 1")
     assert (on_handoff and input_type) or not (on_handoff and input_type), (
         "You must provide either both on_input and input_type, or neither"
     )
@@ -233,4 +247,5 @@ def handoff(
         on_invoke_handoff=_invoke_handoff,
         input_filter=input_filter,
         agent_name=agent.name,
+        fanout=fanout,
     )
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import abc
+import hashlib
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Callable, cast
+
+from .items import TResponseInputItem
+from .logger import logger
+from .model_settings import ModelSettings
+from .models.interface import Model
+from .tokens import get_default_token_estimator
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .run import RunConfig
+    from .run_context import RunContextWrapper
+
+TokenCounter = Callable[[TResponseInputItem], int]
+"""Returns the number of tokens an input item takes up in the model input."""
+
+_CALL_TYPES = ("function_call", "computer_call")
+_OUTPUT_TYPES = ("function_call_output", "computer_call_output")
+
+
+def estimate_item_tokens(item: TResponseInputItem) -> int:
+    """Estimates the number of tokens an input item takes up, with the default token estimator."""
+    return get_default_token_estimator().count_item(item)
+
+
+def group_items(items: Sequence[TResponseInputItem]) -> list[list[int]]:
+    """Splits the input into groups of items that must be kept or dropped together, and returns
+    the indices of the items in each group, ordered by their first item.
+
+    A tool call and its output are in the same group, so that dropping history never leaves a call
+    without its output (or an output without its call), which both the Responses and the Chat
+    Completions APIs reject. A reasoning item is grouped with the item that follows it, since the
+    Responses API rejects reasoning items on their own. Every other item is a group by itself. The
+    items in a group need not be adjacent, e.g. when the model made parallel tool calls.
+    """
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int) -> None:
+        a, b = find(a), find(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    calls: dict[str, int] = {}
+    for i, item in enumerate(items):
+        item_dict = cast(dict[str, Any], item)
+        item_type = item_dict.get("type")
+        if item_type in _CALL_TYPES or item_type in _OUTPUT_TYPES:
+            call_id = item_dict.get("call_id")
+            if call_id is not None:
+                if call_id in calls:
+                    union(calls[call_id], i)
+                else:
+                    calls[call_id] = i
+        if item_type == "reasoning" and i + 1 < len(items):
+            union(i, i + 1)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+class HistoryPolicy(abc.ABC):
+    """Decides what part of the conversation history is sent to the model. Set one on
+    `RunConfig.history_policy`, and it will be applied to the input before every model call.
+
+    Policies only change what is sent to the model: the items of the run, and the history returned
+    by `RunResult.to_input_list()`, are left as they were.
+    """
+
+    @abc.abstractmethod
+    async def compact(
+        self,
+        items: list[TResponseInputItem],
+        *,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> list[TResponseInputItem]:
+        """Returns the input to send to the model.
+
+        The items are shared with the run and must not be mutated in place; return new items for
+        any that should change. The returned input must keep every tool call together with its
+        output, see `group_items()`.
+
+        Args:
+            items: The full input for this turn, oldest first.
+            agent: The agent about to be called.
+            context_wrapper: The context of the run.
+            run_config: The run config.
+        """
+        pass
+
+
+class _BudgetPolicy(HistoryPolicy):
+    def __init__(self, max_tokens: int, token_counter: TokenCounter | None) -> None:
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter if token_counter is not None else estimate_item_tokens
+
+
+class SlidingWindowPolicy(_BudgetPolicy):
+    """Keeps the first items of the conversation (usually the user's request) and as many of the
+    most recent items as fit in the budget, and drops the ones in between. Tool calls are never
+    separated from their outputs."""
+
+    def __init__(
+        self,
+        max_tokens: int,
+        keep_first: int = 1,
+        token_counter: TokenCounter | None = None,
+    ) -> None:
+        """
+        Args:
+            max_tokens: The budget for the input items. The system prompt and tool definitions
+                don't count towards it.
+            keep_first: The number of leading groups of items (see `group_items()`) to always keep.
+            token_counter: Counts the tokens in an item. Defaults to `estimate_item_tokens`.
+        """
+        super().__init__(max_tokens, token_counter)
+        self.keep_first = keep_first
+
+    async def compact(
+        self,
+        items: list[TResponseInputItem],
+        *,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> list[TResponseInputItem]:
+        counts = [self.token_counter(item) for item in items]
+        if sum(counts) <= self.max_tokens:
+            return items
+
+        groups = group_items(items)
+        first, rest = groups[: self.keep_first], groups[self.keep_first :]
+        kept = [i for group in first for i in group]
+        used = sum(counts[i] for i in kept)
+        recent: list[list[int]] = []
+        for group in reversed(rest):
+            cost = sum(counts[i] for i in group)
+            # The most recent group is always kept, even if it doesn't fit on its own.
+            if recent and used + cost > self.max_tokens:
+                break
+            recent.append(group)
+            used += cost
+        for group in recent:
+            kept.extend(group)
+
+        logger.debug(f"Sliding window kept {len(kept)} of {len(items)} history items")
+        return [items[i] for i in sorted(kept)]
+
+
+class DropToolOutputsPolicy(_BudgetPolicy):
+    """Replaces the outputs of old function tool calls with a short placeholder, oldest first,
+    until the history fits in the budget. The calls themselves are kept, so the model still knows
+    what it did. If that isn't enough, the `fallback` policy is applied to the result."""
+
+    def __init__(
+        self,
+        max_tokens: int,
+        keep_recent: int = 1,
+        placeholder: str = "[Output removed to save space.]",
+        fallback: HistoryPolicy | None = None,
+        token_counter: TokenCounter | None = None,
+    ) -> None:
+        """
+        Args:
+            max_tokens: The budget for the input items. The system prompt and tool definitions
+                don't count towards it.
+            keep_recent: The number of most recent tool outputs that are never replaced.
+            placeholder: The text that replaces a dropped output.
+            fallback: A policy to apply when the history is still over budget once every eligible
+                output has been replaced, e.g. a `SlidingWindowPolicy`.
+            token_counter: Counts the tokens in an item. Defaults to `estimate_item_tokens`.
+        """
+        super().__init__(max_tokens, token_counter)
+        self.keep_recent = keep_recent
+        self.placeholder = placeholder
+        self.fallback = fallback
+
+    async def compact(
+        self,
+        items: list[TResponseInputItem],
+        *,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> list[TResponseInputItem]:
+        counts = [self.token_counter(item) for item in items]
+        total = sum(counts)
+        if total <= self.max_tokens:
+            return items
+
+        outputs = [
+            i
+            for i, item in enumerate(items)
+            if cast(dict[str, Any], item).get("type") == "function_call_output"
+        ]
+        eligible = outputs[: max(0, len(outputs) - self.keep_recent)]
+        compacted = list(items)
+        dropped = 0
+        for i in eligible:
+            if total <= self.max_tokens:
+                break
+            if cast(dict[str, Any], items[i]).get("output") == self.placeholder:
+                continue
+            replacement = cast(TResponseInputItem, {**items[i], "output": self.placeholder})
+            new_count = self.token_counter(replacement)
+            total -= counts[i] - new_count
+            compacted[i] = replacement
+            dropped += 1
+
+        logger.debug(f"Dropped {dropped} old tool outputs from the history")
+        if total > self.max_tokens and self.fallback is not None:
+            return await self.fallback.compact(
+                compacted, agent=agent, context_wrapper=context_wrapper, run_config=run_config
+            )
+        return compacted
+
+
+DEFAULT_SUMMARY_INSTRUCTIONS = (
+    "You compress the history of a conversation between a user and an AI assistant that uses "
+    "tools. Write a concise summary of the transcript you are given, keeping every fact, "
+    "decision, tool result and open task that the assistant may need to continue the work. "
+    "Don't address the user. If the transcript starts with an earlier summary, fold it into "
+    "yours."
+)
+
+_SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class SummarizingPolicy(_BudgetPolicy):
+    """Replaces older turns with a summary written by a (usually small and cheap) model, keeping
+    the first items of the conversation and the most recent ones verbatim.
+
+    Summaries are cached, and extended incrementally as the conversation grows, so the summary
+    model is only called when new turns have to be folded in. Its usage is added to the run's
+    usage.
+    """
+
+    def __init__(
+        self,
+        model: str | Model,
+        max_tokens: int,
+        keep_recent_tokens: int | None = None,
+        keep_first: int = 1,
+        instructions: str = DEFAULT_SUMMARY_INSTRUCTIONS,
+        model_settings: ModelSettings | None = None,
+        max_output_chars: int = 2000,
+        token_counter: TokenCounter | None = None,
+        max_cached_summaries: int = 64,
+    ) -> None:
+        """
+        Args:
+            model: The model that writes the summaries. Model names are looked up with the run's
+                `model_provider`.
+            max_tokens: The budget for the input items. The system prompt and tool definitions
+                don't count towards it. Nothing is summarized until the history exceeds it.
+            keep_recent_tokens: How much of the most recent history to keep verbatim when
+                summarizing. Defaults to half of `max_tokens`.
+            keep_first: The number of leading groups of items (see `group_items()`) to keep
+                verbatim.
+            instructions: The system prompt of the summary model.
+            model_settings: The model settings of the summary model.
+            max_output_chars: Tool outputs are cut to this many characters in the transcript given
+                to the summary model.
+            token_counter: Counts the tokens in an item. Defaults to `estimate_item_tokens`.
+            max_cached_summaries: The number of summaries to keep for reuse.
+        """
+        super().__init__(max_tokens, token_counter)
+        self.model = model
+        self.keep_recent_tokens = (
+            keep_recent_tokens if keep_recent_tokens is not None else max_tokens // 2
+        )
+        self.keep_first = keep_first
+        self.instructions = instructions
+        self.model_settings = model_settings or ModelSettings()
+        self.max_output_chars = max_output_chars
+        self.max_cached_summaries = max_cached_summaries
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+
+    async def compact(
+        self,
+        items: list[TResponseInputItem],
+        *,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> list[TResponseInputItem]:
+        counts = [self.token_counter(item) for item in items]
+        if sum(counts) <= self.max_tokens:
+            return items
+
+        groups = group_items(items)
+        first, rest = groups[: self.keep_first], groups[self.keep_first :]
+        recent_count = 0
+        used = 0
+        for group in reversed(rest):
+            cost = sum(counts[i] for i in group)
+            if recent_count and used + cost > self.keep_recent_tokens:
+                break
+            recent_count += 1
+            used += cost
+        older = rest[: len(rest) - recent_count]
+        if not older:
+            return items
+
+        summary = await self._summarize(items, older, agent, context_wrapper, run_config)
+        summary_item = cast(
+            TResponseInputItem, {"role": "user", "content": _SUMMARY_PREFIX + summary}
+        )
+
+        first_indices = sorted(i for group in first for i in group)
+        recent_indices = sorted(i for group in rest[len(older) :] for i in group)
+        logger.debug(f"Summarized {sum(len(group) for group in older)} history items")
+        return (
+            [items[i] for i in first_indices] + [summary_item] + [items[i] for i in recent_indices]
+        )
+
+    async def _summarize(
+        self,
+        items: list[TResponseInputItem],
+        groups: list[list[int]],
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> str:
+        tool_names = {
+            item_dict.get("call_id"): item_dict.get("name")
+            for item_dict in (cast(dict[str, Any], item) for item in items)
+            if item_dict.get("type") == "function_call"
+        }
+        chunks = ["\n".join(self._render(items[i], tool_names) for i in group) for group in groups]
+
+        # The key of each prefix of the groups, so that the summary of a shorter history can be
+        # extended rather than recomputed.
+        keys: list[str] = []
+        digest = hashlib.sha256(self.instructions.encode())
+        for chunk in chunks:
+            digest.update(chunk.encode())
+            digest.update(b"\0")
+            keys.append(digest.hexdigest())
+
+        if keys[-1] in self._summaries:
+            self._summaries.move_to_end(keys[-1])
+            return self._summaries[keys[-1]]
+
+        start = 0
+        previous: str | None = None
+        for i in range(len(keys) - 1, -1, -1):
+            if keys[i] in self._summaries:
+                start, previous = i + 1, self._summaries[keys[i]]
+                break
+
+        transcript = "\n\n".join(chunks[start:])
+        if previous is not None:
+            transcript = f"Earlier summary:\n{previous}\n\nLater conversation:\n{transcript}"
+
+        summary = await self._call_model(transcript, agent, context_wrapper, run_config)
+        self._summaries[keys[-1]] = summary
+        while len(self._summaries) > self.max_cached_summaries:
+            self._summaries.popitem(last=False)
+        return summary
+
+    async def _call_model(
+        self,
+        transcript: str,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        run_config: RunConfig,
+    ) -> str:
+        from ._run_impl import get_model_tracing_impl
+        from .items import ItemHelpers
+
+        model = (
+            self.model
+            if isinstance(self.model, Model)
+            else run_config.model_provider.get_model(self.model)
+        )
+        response = await model.get_response(
+            system_instructions=self.instructions,
+            input=[{"role": "user", "content": transcript}],
+            model_settings=self.model_settings,
+            tools=[],
+            output_schema=None,
+            handoffs=[],
+            tracing=get_model_tracing_impl(
+                run_config.tracing_disabled, run_config.trace_include_sensitive_data
+            ),
+            previous_response_id=None,
+        )
+        # The summary is written on behalf of the agent whose history is compacted.
+        context_wrapper.add_usage(response.usage, agent.name)
+        return "\n".join(
+            text
+            for text in (ItemHelpers.extract_last_text(item) for item in response.output)
+            if text
+        )
+
+    def _render(self, item: TResponseInputItem, tool_names: dict[Any, Any]) -> str:
+        item_dict = cast(dict[str, Any], item)
+        item_type = item_dict.get("type")
+        if item_type == "function_call":
+            return f"assistant called {item_dict.get('name')}({item_dict.get('arguments')})"
+        if item_type == "function_call_output":
+            output = str(item_dict.get("output"))
+            if len(output) > self.max_output_chars:
+                output = output[: self.max_output_chars] + " [...]"
+            name = tool_names.get(item_dict.get("call_id"), "tool")
+            return f"{name} returned: {output}"
+        if "role" in item_dict and item_type in (None, "message"):
+            return f"{item_dict['role']}: {_message_text(item_dict.get('content'))}"
+        return f"[{item_type} item]"
+
+
+def _message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if not isinstance(part, dict):
+                continue
+            if "text" in part:
+                parts.append(str(part["text"]))
+            elif "refusal" in part:
+                parts.append(str(part["refusal"]))
+            else:
+                parts.append(f"[{part.get('type')}]")
+        return " ".join(parts)
+    return ""
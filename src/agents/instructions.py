@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Literal
+
+from .exceptions import UserError
+from .tracing import AgentSpanData, get_current_span
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .run_context import RunContextWrapper
+
+
+InstructionsCacheScope = Literal["run", "activation", "ttl"]
+
+
+@dataclass
+class InstructionsCache:
+    """Declares how long an agent's dynamic instructions are reused for, instead of calling the
+    instructions function on every turn:
+
+    ```python
+    agent = Agent(
+        name="Support",
+        instructions=render_instructions,
+        instructions_cache=InstructionsCache(
+            scope="ttl", ttl=300, key=lambda ctx, agent: ctx.context.user_id
+        ),
+    )
+    ```
+
+    Cache hits and misses are recorded on the agent span.
+    """
+
+    scope: InstructionsCacheScope = "run"
+    """How long the resolved instructions are reused for:
+
+    - `"run"`: for the rest of the run.
+    - `"activation"`: until the agent hands off; an agent that is handed back to resolves its
+      instructions again.
+    - `"ttl"`: for `ttl` seconds, across runs. Entries are shared by every run that uses this
+      cache, and are keyed on the agent name, its instructions and `key`, so clones with other
+      instructions don't share entries.
+    """
+
+    ttl: float | None = None
+    """The number of seconds the instructions are reused for. Required for the `"ttl"` scope."""
+
+    key: Callable[[RunContextWrapper[Any], Agent[Any]], Hashable] | None = None
+    """Computes an invalidation key from the run context. The instructions are resolved again
+    whenever the key changes, in every scope."""
+
+    max_size: int = 1024
+    """The maximum number of entries kept for the `"ttl"` scope. The least recently used entry is
+    evicted when the cache is full."""
+
+    _entries: OrderedDict[tuple[str, Any, Hashable], tuple[str | None, float]] = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.scope == "ttl" and (self.ttl is None or self.ttl <= 0):
+            raise UserError("The 'ttl' instructions cache scope requires a positive ttl")
+        if self.max_size < 1:
+            raise UserError("max_size must be at least 1")
+
+    def invalidate(self) -> None:
+        """Drops every entry of the `"ttl"` scope, so that the instructions are resolved again."""
+        self._entries.clear()
+
+    async def get_system_prompt(
+        self,
+        agent: Agent[Any],
+        context_wrapper: RunContextWrapper[Any],
+        new_activation: bool = False,
+    ) -> str | None:
+        """Returns the agent's system prompt, resolving its instructions only if there is no cached
+        value for the current scope and key.
+
+        Args:
+            agent: The agent whose instructions to resolve.
+            context_wrapper: The context of the current run, which holds the per-run entries.
+            new_activation: Whether this is the first turn of the agent since it was handed off to.
+        """
+        key = self.key(context_wrapper, agent) if self.key is not None else None
+
+        if self.scope == "ttl":
+            assert self.ttl is not None
+            entry_key = (agent.name, agent.instructions, key)
+            now = time.monotonic()
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(entry_key)
+                self._record_on_span(hit=True)
+                return entry[0]
+            prompt = await agent.get_system_prompt(context_wrapper)
+            self._entries[entry_key] = (prompt, now + self.ttl)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._record_on_span(hit=False)
+            return prompt
+
+        run_entries = context_wrapper._instructions
+        run_entry = run_entries.get(id(agent))
+        if (
+            run_entry is not None
+            and run_entry[0] == key
+            and not (self.scope == "activation" and new_activation)
+        ):
+            self._record_on_span(hit=True)
+            return run_entry[1]
+        prompt = await agent.get_system_prompt(context_wrapper)
+        run_entries[id(agent)] = (key, prompt)
+        self._record_on_span(hit=False)
+        return prompt
+
+    def _record_on_span(self, hit: bool) -> None:
+        span = get_current_span()
+        if span is not None and isinstance(span.span_data, AgentSpanData):
+            stats = span.span_data.instructions_cache or {"hits": 0, "misses": 0}
+            stats["hits" if hit else "misses"] += 1
+            span.span_data.instructions_cache = stats
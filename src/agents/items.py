@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import abc
 import copy
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union
+import dataclasses
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union, cast
 
 from openai.types.responses import (
     Response,
@@ -20,10 +21,11 @@ from openai.types.responses import (
 )
 from openai.types.responses.response_input_item_param import ComputerCallOutput, FunctionCallOutput
 from openai.types.responses.response_reasoning_item import ResponseReasoningItem
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing_extensions import TypeAlias
 
 from .exceptions import AgentsException, ModelBehaviorError
+from .tokens import TokenEstimate
 from .usage import Usage
 
 if TYPE_CHECKING:
@@ -55,14 +57,27 @@ class RunItemBase(Generic[T], abc.ABC):
     (i.e. `openai.types.responses.ResponseInputItemParam`).
     """
 
+    _input_item: TResponseInputItem | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """The cached result of `to_input_item()`."""
+
     def to_input_item(self) -> TResponseInputItem:
-        """Converts this item into an input item suitable for passing to the model."""
+        """Converts this item into an input item suitable for passing to the model. The conversion
+        happens once per item; the returned item is shared and should be treated as read-only.
+        """
         if isinstance(self.raw_item, dict):
             # We know that input items are dicts, so we can ignore the type error
             return self.raw_item  # type: ignore
         elif isinstance(self.raw_item, BaseModel):
-            # All output items are Pydantic models that can be converted to input items.
-            return self.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            # All output items are Pydantic models that can be converted to input items. Dumping a
+            # model is relatively expensive, and the same item is sent to the model on every
+            # subsequent turn, so we only do it once.
+            input_item = self._input_item
+            if input_item is None:
+                input_item = cast(TResponseInputItem, self.raw_item.model_dump(exclude_unset=True))
+                self._input_item = input_item
+            return input_item
         else:
             raise AgentsException(f"Unexpected raw item type: {type(self.raw_item)}")
 
@@ -157,6 +172,8 @@ RunItem: TypeAlias = Union[
 ]
 """An item generated by an agent."""
 
+_output_item_adapter: TypeAdapter[TResponseOutputItem] = TypeAdapter(TResponseOutputItem)
+
 
 @dataclass
 class ModelResponse:
@@ -173,6 +190,10 @@ class ModelResponse:
     be passed to `Runner.run`.
     """
 
+    input_token_estimate: TokenEstimate | None = None
+    """A local estimate of the input tokens of the request, made before it was sent. None if the
+    model doesn't support estimates."""
+
     def to_input_items(self) -> list[TResponseInputItem]:
         """Convert the output into a list of input items suitable for passing to the model."""
         # We happen to know that the shape of the Pydantic output items are the same as the
@@ -180,6 +201,29 @@ class ModelResponse:
         # This is also tested via unit tests.
         return [it.model_dump(exclude_unset=True) for it in self.output]  # type: ignore
 
+    def to_json_dict(self) -> dict[str, Any]:
+        """Converts the response to a JSON-compatible dict, for storage. See `from_json_dict`."""
+        estimate = self.input_token_estimate
+        return {
+            "output": [item.model_dump(mode="json", exclude_unset=True) for item in self.output],
+            "usage": dataclasses.asdict(self.usage),
+            "response_id": self.response_id,
+            "input_token_estimate": estimate.to_json_dict() if estimate else None,
+        }
+
+    @classmethod
+    def from_json_dict(cls, data: dict[str, Any]) -> ModelResponse:
+        """Rebuilds a response from the output of `to_json_dict`."""
+        estimate = data.get("input_token_estimate")
+        # Unknown usage fields are ignored, so that stored responses outlive changes to `Usage`.
+        usage_fields = {f.name for f in dataclasses.fields(Usage)}
+        return cls(
+            output=[_output_item_adapter.validate_python(item) for item in data["output"]],
+            usage=Usage(**{k: v for k, v in data["usage"].items() if k in usage_fields}),
+            response_id=data["response_id"],
+            input_token_estimate=TokenEstimate(**estimate) if estimate else None,
+        )
+
 
 class ItemHelpers:
     @classmethod
@@ -2,6 +2,7 @@ from typing import Any, Generic
 
 from .agent import Agent
 from .run_context import RunContextWrapper, TContext
+from .timings import PhaseTiming
 from .tool import Tool
 
 
@@ -53,6 +54,16 @@ class RunHooks(Generic[TContext]):
         """Called after a tool is invoked."""
         pass
 
+    async def on_turn_end(
+        self,
+        context: RunContextWrapper[TContext],
+        agent: Agent[TContext],
+        timings: list[PhaseTiming],
+    ) -> None:
+        """Called after each turn, with the phase timings of that turn. The output guardrails run
+        after the last turn, so their timings are only in `RunResult.timings`."""
+        pass
+
 
 class AgentHooks(Generic[TContext]):
     """A class that receives callbacks on various lifecycle events for a specific agent. You can
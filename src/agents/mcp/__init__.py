@@ -1,4 +1,5 @@
 try:
+    from .pool import MCPServerPool
     from .server import (
         MCPServer,
         MCPServerSse,
@@ -13,6 +14,7 @@ from .util import MCPUtil
 
 __all__ = [
     "MCPServer",
+    "MCPServerPool",
     "MCPServerSse",
     "MCPServerSseParams",
     "MCPServerStdio",
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Awaitable
+from typing import Any, Callable, TypeVar
+
+import anyio
+import httpx
+from mcp import ClientSession, Tool as MCPTool
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult
+
+from ..exceptions import AgentsException, UserError
+from ..logger import logger
+from .server import MCPServer
+
+T = TypeVar("T")
+
+# Errors that mean the connection to the server is broken, as opposed to e.g. invalid arguments.
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    httpx.TransportError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+_MAX_RECONNECT_DELAY = 30.0
+
+
+class _PoolSession:
+    """One server of the pool. Its whole lifetime, from `connect()` to `cleanup()`, runs in a
+    single task, because MCP transports must be closed by the task that opened them."""
+
+    def __init__(self, index: int, attempt: int) -> None:
+        self.index = index
+        self.attempt = attempt
+        """The number of restarts in a row that failed to connect, before this one. Zero for the
+        sessions the pool connected with, which are never retried."""
+        self.server: MCPServer | None = None
+        self.in_flight = 0
+        self.healthy = False
+        self.ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.stop = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+
+class MCPServerPool(MCPServer):
+    """Spreads the tool calls of one logical MCP server over several sessions, e.g. several
+    subprocesses of a stdio server, instead of multiplexing them over a single connection.
+
+    Each call goes to the healthy session with the fewest calls in flight. A session whose call
+    times out or fails with a transport error, or that fails a health check, is assumed to have
+    crashed: it is closed and replaced with a new one in the background. Other errors, such as
+    MCP error responses, are raised without restarting the session. Calls that could not be sent
+    because the session was already closed are retried once on another session. A replacement
+    that fails to connect is retried with exponential backoff.
+
+    ```python
+    pool = MCPServerPool(
+        lambda: MCPServerStdio({"command": "python", "args": ["server.py"]}),
+        size=4,
+    )
+    async with pool:
+        agent = Agent(name="Assistant", mcp_servers=[pool])
+    ```
+    """
+
+    def __init__(
+        self,
+        server_factory: Callable[[], MCPServer],
+        size: int,
+        name: str | None = None,
+        health_check_interval: float | None = 30,
+        health_check_timeout: float = 5,
+        reconnect_delay: float = 1,
+    ):
+        """
+        Args:
+            server_factory: Creates a new, unconnected server. Called once per session, and again
+                whenever a session is restarted.
+            size: The number of sessions to keep connected.
+            name: A readable name for the pool. If not provided, we'll create one from the name of
+                the servers.
+            health_check_interval: The number of seconds between health checks, which ping every
+                session and restart the ones that don't respond. None disables health checks.
+            health_check_timeout: The number of seconds a session has to respond to a health check.
+            reconnect_delay: The number of seconds to wait before retrying a restart that failed
+                to connect. Doubles with every failed attempt, up to 30 seconds.
+        """
+        if size < 1:
+            raise UserError("MCPServerPool size must be at least 1")
+        self.server_factory = server_factory
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.reconnect_delay = reconnect_delay
+        self.restarts = 0
+        """The number of sessions that have been restarted since the pool connected, including
+        retries of restarts that failed to connect."""
+
+        self._name = name
+        self._sessions: list[_PoolSession] = []
+        self._health_task: asyncio.Task[None] | None = None
+        # The tasks of replaced sessions that are still closing, awaited by `cleanup()`.
+        self._retired: set[asyncio.Task[None]] = set()
+        self._next_index = itertools.count()
+
+    @property
+    def name(self) -> str:
+        """A readable name for the pool."""
+        if self._name:
+            return self._name
+        for session in self._sessions:
+            if session.server is not None:
+                return f"pool: {session.server.name}"
+        return "MCP server pool"
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.cleanup()
+
+    async def connect(self):
+        """Connect every session of the pool."""
+        if self._sessions:
+            raise UserError("MCPServerPool is already connected")
+        self._sessions = [self._start_session(attempt=0) for _ in range(self.size)]
+        try:
+            await asyncio.gather(*(session.ready for session in self._sessions))
+        except BaseException:
+            await self.cleanup()
+            raise
+        if self.health_check_interval is not None:
+            self._health_task = asyncio.create_task(self._check_health_forever())
+
+    async def cleanup(self):
+        """Close every session of the pool."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.stop.set()
+        await asyncio.gather(
+            *(session.task for session in sessions if session.task is not None),
+            *self._retired,
+            return_exceptions=True,
+        )
+
+    async def list_tools(self) -> list[MCPTool]:
+        """List the tools available on the server, using the least loaded session."""
+        return await self._dispatch(lambda server: server.list_tools())
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        """Invoke a tool on the least loaded session."""
+        return await self._dispatch(lambda server: server.call_tool(tool_name, arguments))
+
+    async def _dispatch(self, request: Callable[[MCPServer], Awaitable[T]]) -> T:
+        for attempt in range(2):
+            session = await self._acquire()
+            assert session.server is not None
+            session.in_flight += 1
+            try:
+                return await request(session.server)
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError) as e:
+                # The session was already closed, so the request never reached the server and can
+                # safely be sent to another session.
+                self._restart(session, e)
+                if attempt > 0:
+                    raise
+            except McpError as e:
+                # The server answered with an error, so the session itself is fine, unless it
+                # didn't answer in time.
+                if e.error.code == httpx.codes.REQUEST_TIMEOUT:
+                    self._restart(session, e)
+                raise
+            except _TRANSPORT_ERRORS as e:
+                self._restart(session, e)
+                raise
+            finally:
+                session.in_flight -= 1
+        raise AssertionError("unreachable")
+
+    async def _acquire(self) -> _PoolSession:
+        if not self._sessions:
+            raise UserError("Server not initialized. Make sure you call `connect()` first.")
+        while True:
+            healthy = [session for session in self._sessions if session.healthy]
+            if healthy:
+                return min(healthy, key=lambda session: session.in_flight)
+            # Every session is restarting, so we wait for the first one to come back.
+            pending = [session.ready for session in self._sessions if not session.ready.done()]
+            if not pending:
+                raise AgentsException(f"No healthy sessions in MCP server pool {self.name}")
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+    def _start_session(self, attempt: int) -> _PoolSession:
+        session = _PoolSession(next(self._next_index), attempt)
+        session.task = asyncio.create_task(self._run_session(session))
+        return session
+
+    async def _run_session(self, session: _PoolSession) -> None:
+        server = self.server_factory()
+        connect_error: Exception | None = None
+        try:
+            await server.connect()
+            session.server = server
+            session.healthy = True
+            session.ready.set_result(None)
+            await session.stop.wait()
+        except Exception as e:
+            if not session.ready.done():
+                connect_error = e
+                session.ready.set_exception(e)
+                # Retrieved here, so that a failed restart isn't reported as never retrieved.
+                session.ready.exception()
+        finally:
+            session.healthy = False
+            if not session.ready.done():
+                session.ready.cancel()
+            await server.cleanup()
+
+        if connect_error is not None and session.attempt > 0:
+            # A restart that failed to connect is retried, rather than leaving the pool a session
+            # short until the next health check, if any.
+            delay = min(self.reconnect_delay * 2 ** (session.attempt - 1), _MAX_RECONNECT_DELAY)
+            try:
+                await asyncio.wait_for(session.stop.wait(), delay)
+            except asyncio.TimeoutError:
+                self._restart(session, connect_error)
+
+    def _restart(self, session: _PoolSession, error: Exception) -> None:
+        if session not in self._sessions:
+            return  # Already replaced.
+        logger.warning(f"Restarting MCP session {session.index} of {self.name}: {error!r}")
+        session.healthy = False
+        session.stop.set()
+        if session.task is not None and not session.task.done():
+            self._retired.add(session.task)
+            session.task.add_done_callback(self._retired.discard)
+        # Count the failed attempts in a row, so that retries back off.
+        attempt = 1 if session.server is not None else session.attempt + 1
+        self._sessions[self._sessions.index(session)] = self._start_session(attempt)
+        self.restarts += 1
+
+    async def _check_health_forever(self) -> None:
+        assert self.health_check_interval is not None
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(*(self._check_health(s) for s in list(self._sessions)))
+
+    async def _check_health(self, session: _PoolSession) -> None:
+        if not session.ready.done():
+            return  # Still connecting.
+        if not session.healthy or session.server is None:
+            self._restart(session, AgentsException("The session failed to connect"))
+            return
+        client_session = getattr(session.server, "session", None)
+        try:
+            if isinstance(client_session, ClientSession):
+                await asyncio.wait_for(client_session.send_ping(), self.health_check_timeout)
+            else:
+                await asyncio.wait_for(session.server.list_tools(), self.health_check_timeout)
+        except Exception as e:
+            self._restart(session, e)
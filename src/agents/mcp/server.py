@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import time
 from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from datetime import timedelta
 from pathlib import Path
@@ -10,11 +11,20 @@ from typing import Any, Literal
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from mcp import ClientSession, StdioServerParameters, Tool as MCPTool, stdio_client
 from mcp.client.sse import sse_client
-from mcp.types import CallToolResult, JSONRPCMessage
+from mcp.shared.session import RequestResponder
+from mcp.types import (
+    CallToolResult,
+    ClientResult,
+    JSONRPCMessage,
+    ServerNotification,
+    ServerRequest,
+    ToolListChangedNotification,
+)
 from typing_extensions import NotRequired, TypedDict
 
 from ..exceptions import UserError
 from ..logger import logger
+from ..tracing import MCPListToolsSpanData, get_current_span
 
 
 class MCPServer(abc.ABC):
@@ -55,7 +65,12 @@ class MCPServer(abc.ABC):
 class _MCPServerWithClientSession(MCPServer, abc.ABC):
     """Base class for MCP servers that use a `ClientSession` to communicate with the server."""
 
-    def __init__(self, cache_tools_list: bool, client_session_timeout_seconds: float | None):
+    def __init__(
+        self,
+        cache_tools_list: bool,
+        client_session_timeout_seconds: float | None,
+        cache_tools_ttl: float | None = None,
+    ):
         """
         Args:
             cache_tools_list: Whether to cache the tools list. If `True`, the tools list will be
@@ -66,17 +81,32 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
             (by avoiding a round-trip to the server every time).
 
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+
+            cache_tools_ttl: If set, the tools list is cached, and once it is older than this
+            many seconds, `list_tools()` keeps returning it while it is refreshed in the
+            background. Whenever caching is enabled, a `tools/list_changed` notification from the
+            server invalidates the cache and starts a refresh right away.
         """
+        if cache_tools_ttl is not None and cache_tools_ttl <= 0:
+            raise UserError("cache_tools_ttl must be positive")
         self.session: ClientSession | None = None
         self.exit_stack: AsyncExitStack = AsyncExitStack()
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self.cache_tools_list = cache_tools_list
+        self.cache_tools_ttl = cache_tools_ttl
 
         self.client_session_timeout_seconds = client_session_timeout_seconds
 
         # The cache is always dirty at startup, so that we fetch tools at least once
         self._cache_dirty = True
         self._tools_list: list[MCPTool] | None = None
+        # Bumped on every invalidation, so that a fetch that was already in flight doesn't mark the
+        # cache as clean.
+        self._cache_generation = 0
+        self._tools_fetched_at = 0.0
+        self._last_refresh_latency: float | None = None
+        self._refresh_task: asyncio.Task[list[MCPTool]] | None = None
+        self._refresh_generation = 0
 
     @abc.abstractmethod
     def create_streams(
@@ -100,6 +130,7 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
     def invalidate_tools_cache(self):
         """Invalidate the tools cache."""
         self._cache_dirty = True
+        self._cache_generation += 1
 
     async def connect(self):
         """Connect to the server."""
@@ -113,6 +144,7 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
                     timedelta(seconds=self.client_session_timeout_seconds)
                     if self.client_session_timeout_seconds
                     else None,
+                    message_handler=self._handle_session_message,
                 )
             )
             await session.initialize()
@@ -127,16 +159,29 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
         if not self.session:
             raise UserError("Server not initialized. Make sure you call `connect()` first.")
 
+        caching = self.cache_tools_list or self.cache_tools_ttl is not None
+
         # Return from cache if caching is enabled, we have tools, and the cache is not dirty
-        if self.cache_tools_list and not self._cache_dirty and self._tools_list:
+        if caching and not self._cache_dirty and self._tools_list:
+            cache_age = time.monotonic() - self._tools_fetched_at
+            if self.cache_tools_ttl is not None and cache_age >= self.cache_tools_ttl:
+                # Stale while revalidate: this call still gets the cached tools.
+                self._start_tools_refresh()
+            self._record_on_span(cache_age)
             return self._tools_list
 
-        # Reset the cache dirty to False
-        self._cache_dirty = False
-
-        # Fetch the tools from the server
-        self._tools_list = (await self.session.list_tools()).tools
-        return self._tools_list
+        refresh = self._refresh_task
+        if (
+            refresh is not None
+            and not refresh.done()
+            and self._refresh_generation == self._cache_generation
+        ):
+            # A refresh that started after the last invalidation is already in flight.
+            tools = await asyncio.shield(refresh)
+        else:
+            tools = await self._fetch_tools()
+        self._record_on_span(0.0 if caching else None)
+        return tools
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
         """Invoke a tool on the server."""
@@ -148,6 +193,10 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
     async def cleanup(self):
         """Cleanup the server."""
         async with self._cleanup_lock:
+            if self._refresh_task is not None:
+                self._refresh_task.cancel()
+                await asyncio.gather(self._refresh_task, return_exceptions=True)
+                self._refresh_task = None
             try:
                 await self.exit_stack.aclose()
             except Exception as e:
@@ -155,6 +204,56 @@ class _MCPServerWithClientSession(MCPServer, abc.ABC):
             finally:
                 self.session = None
 
+    async def _fetch_tools(self) -> list[MCPTool]:
+        assert self.session is not None
+        generation = self._cache_generation
+        start = time.monotonic()
+        tools = (await self.session.list_tools()).tools
+        now = time.monotonic()
+        self._last_refresh_latency = now - start
+        # If the cache was invalidated while we were fetching, the list may already be outdated.
+        if generation == self._cache_generation:
+            self._tools_list = tools
+            self._tools_fetched_at = now
+            self._cache_dirty = False
+        return tools
+
+    def _start_tools_refresh(self) -> None:
+        if self.session is None:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_generation = self._cache_generation
+        self._refresh_task = asyncio.create_task(self._fetch_tools())
+        self._refresh_task.add_done_callback(self._on_refresh_done)
+
+    def _on_refresh_done(self, task: asyncio.Task[list[MCPTool]]) -> None:
+        if task.cancelled():
+            return
+        if (error := task.exception()) is not None:
+            logger.warning(f"Error refreshing the tools of MCP server {self.name}: {error}")
+        elif self._cache_dirty:
+            # The tools list changed again while we were fetching it.
+            self._start_tools_refresh()
+
+    async def _handle_session_message(
+        self,
+        message: RequestResponder[ServerRequest, ClientResult] | ServerNotification | Exception,
+    ) -> None:
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            self.invalidate_tools_cache()
+            if self.cache_tools_list or self.cache_tools_ttl is not None:
+                # Fetch the new list right away, so that the next turn doesn't wait for it.
+                self._start_tools_refresh()
+
+    def _record_on_span(self, cache_age: float | None) -> None:
+        span = get_current_span()
+        if span is not None and isinstance(span.span_data, MCPListToolsSpanData):
+            span.span_data.cache_age = cache_age
+            span.span_data.refresh_latency = self._last_refresh_latency
+
 
 class MCPServerStdioParams(TypedDict):
     """Mirrors `mcp.client.stdio.StdioServerParameters`, but lets you pass params without another
@@ -197,6 +296,7 @@ class MCPServerStdio(_MCPServerWithClientSession):
         cache_tools_list: bool = False,
         name: str | None = None,
         client_session_timeout_seconds: float | None = 5,
+        cache_tools_ttl: float | None = None,
     ):
         """Create a new MCP server based on the stdio transport.
 
@@ -214,8 +314,12 @@ class MCPServerStdio(_MCPServerWithClientSession):
             name: A readable name for the server. If not provided, we'll create one from the
                 command.
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+            cache_tools_ttl: If set, the tools list is cached, and once it is older than this
+                many seconds, `list_tools()` keeps returning it while it is refreshed in the
+                background. The cache is also invalidated whenever the server sends a
+                `tools/list_changed` notification.
         """
-        super().__init__(cache_tools_list, client_session_timeout_seconds)
+        super().__init__(cache_tools_list, client_session_timeout_seconds, cache_tools_ttl)
 
         self.params = StdioServerParameters(
             command=params["command"],
@@ -273,6 +377,7 @@ class MCPServerSse(_MCPServerWithClientSession):
         cache_tools_list: bool = False,
         name: str | None = None,
         client_session_timeout_seconds: float | None = 5,
+        cache_tools_ttl: float | None = None,
     ):
         """Create a new MCP server based on the HTTP with SSE transport.
 
@@ -292,8 +397,13 @@ class MCPServerSse(_MCPServerWithClientSession):
                 URL.
 
             client_session_timeout_seconds: the read timeout passed to the MCP ClientSession.
+
+            cache_tools_ttl: If set, the tools list is cached, and once it is older than this
+                many seconds, `list_tools()` keeps returning it while it is refreshed in the
+                background. The cache is also invalidated whenever the server sends a
+                `tools/list_changed` notification.
         """
-        super().__init__(cache_tools_list, client_session_timeout_seconds)
+        super().__init__(cache_tools_list, client_session_timeout_seconds, cache_tools_ttl)
 
         self.params = params
         self._name = name or f"sse: {self.params['url']}"
@@ -1,5 +1,10 @@
+import asyncio
+import copy
 import functools
+import hashlib
 import json
+import weakref
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from agents.strict_schema import ensure_strict_json_schema
@@ -9,7 +14,7 @@ from ..exceptions import AgentsException, ModelBehaviorError, UserError
 from ..logger import logger
 from ..run_context import RunContextWrapper
 from ..tool import FunctionTool, Tool
-from ..tracing import FunctionSpanData, get_current_span, mcp_tools_span
+from ..tracing import FunctionSpanData, SpanError, get_current_span, mcp_tools_span
 
 if TYPE_CHECKING:
     from mcp.types import Tool as MCPTool
@@ -17,18 +22,52 @@ if TYPE_CHECKING:
     from .server import MCPServer
 
 
+@dataclass
+class _ConvertedTools:
+    fingerprint: str
+    convert_schemas_to_strict: bool
+    tools: list[Tool]
+
+
 class MCPUtil:
     """Set of utilities for interop between MCP and Agents SDK tools."""
 
+    # The converted tools of each server, reused for as long as the server lists the same tools.
+    _converted_tools: "weakref.WeakKeyDictionary[MCPServer, _ConvertedTools]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     @classmethod
     async def get_all_function_tools(
-        cls, servers: list["MCPServer"], convert_schemas_to_strict: bool
+        cls,
+        servers: list["MCPServer"],
+        convert_schemas_to_strict: bool,
+        list_tools_timeout: float | None = None,
     ) -> list[Tool]:
-        """Get all function tools from a list of MCP servers."""
+        """Get all function tools from a list of MCP servers. The servers are listed concurrently.
+
+        Args:
+            servers: The MCP servers.
+            convert_schemas_to_strict: Whether to convert the tool schemas to strict mode.
+            list_tools_timeout: The maximum number of seconds to wait for each server to list its
+                tools. A server that takes longer fails the whole call.
+        """
+        tasks = [
+            asyncio.create_task(
+                cls.get_function_tools(server, convert_schemas_to_strict, list_tools_timeout)
+            )
+            for server in servers
+        ]
+        try:
+            tools_per_server = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
         tools = []
         tool_names: set[str] = set()
-        for server in servers:
-            server_tools = await cls.get_function_tools(server, convert_schemas_to_strict)
+        for server_tools in tools_per_server:
             server_tool_names = {tool.name for tool in server_tools}
             if len(server_tool_names & tool_names) > 0:
                 raise UserError(
@@ -42,15 +81,49 @@ class MCPUtil:
 
     @classmethod
     async def get_function_tools(
-        cls, server: "MCPServer", convert_schemas_to_strict: bool
+        cls,
+        server: "MCPServer",
+        convert_schemas_to_strict: bool,
+        list_tools_timeout: float | None = None,
     ) -> list[Tool]:
-        """Get all function tools from a single MCP server."""
+        """Get all function tools from a single MCP server. The converted tools are cached, and
+        reused for as long as the server lists the same tools."""
 
         with mcp_tools_span(server=server.name) as span:
-            tools = await server.list_tools()
+            try:
+                tools = await asyncio.wait_for(server.list_tools(), list_tools_timeout)
+            except asyncio.TimeoutError as e:
+                message = f"Timed out listing the tools of MCP server {server.name}"
+                span.set_error(SpanError(message=message, data={"timeout": list_tools_timeout}))
+                raise AgentsException(f"{message} after {list_tools_timeout} seconds") from e
             span.span_data.result = [tool.name for tool in tools]
 
-        return [cls.to_function_tool(tool, server, convert_schemas_to_strict) for tool in tools]
+        fingerprint = cls._fingerprint(tools)
+        cached = cls._converted_tools.get(server)
+        if (
+            cached is not None
+            and cached.fingerprint == fingerprint
+            and cached.convert_schemas_to_strict == convert_schemas_to_strict
+        ):
+            return list(cached.tools)
+
+        converted: list[Tool] = [
+            cls.to_function_tool(tool, server, convert_schemas_to_strict) for tool in tools
+        ]
+        cls._converted_tools[server] = _ConvertedTools(
+            fingerprint=fingerprint,
+            convert_schemas_to_strict=convert_schemas_to_strict,
+            tools=converted,
+        )
+        return list(converted)
+
+    @staticmethod
+    def _fingerprint(tools: list["MCPTool"]) -> str:
+        digest = hashlib.sha256()
+        for tool in tools:
+            digest.update(tool.model_dump_json().encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
 
     @classmethod
     def to_function_tool(
@@ -58,7 +131,8 @@ class MCPUtil:
     ) -> FunctionTool:
         """Convert an MCP tool to an Agents SDK function tool."""
         invoke_func = functools.partial(cls.invoke_mcp_tool, server, tool)
-        schema, is_strict = tool.inputSchema, False
+        # Converted schemas are cached, so the tool's own schema is left untouched.
+        schema, is_strict = copy.deepcopy(tool.inputSchema), False
 
         # MCP spec doesn't require the inputSchema to have `properties`, but OpenAI spec does.
         if "properties" not in schema:
@@ -73,6 +73,16 @@ class ModelSettings:
     """Additional headers to provide with the request.
     Defaults to None if not provided."""
 
+    emit_tool_calls_early: bool | None = None
+    """Whether Chat Completions models emit each streamed function call as soon as the model moves
+    on to the next one, rather than at the end of the stream. Streamed runs set this when
+    `RunConfig.eager_tool_execution` is enabled. Defaults to False if not provided."""
+
+    estimate_input_tokens: bool | None = None
+    """Whether to estimate the input tokens of each request locally before sending it. The
+    estimate is recorded on the model span and on `ModelResponse.input_token_estimate`.
+    Defaults to False if not provided."""
+
     def resolve(self, override: ModelSettings | None) -> ModelSettings:
         """Produce a new ModelSettings by overlaying any non-None values from the
         override on top of this instance."""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass, field
 
 from openai import AsyncStream
@@ -36,6 +36,7 @@ class StreamingState:
     text_content_index_and_output: tuple[int, ResponseOutputText] | None = None
     refusal_content_index_and_output: tuple[int, ResponseOutputRefusal] | None = None
     function_calls: dict[int, ResponseFunctionToolCall] = field(default_factory=dict)
+    emitted_function_calls: set[int] = field(default_factory=set)
 
 
 class ChatCmplStreamHandler:
@@ -44,7 +45,17 @@ class ChatCmplStreamHandler:
         cls,
         response: Response,
         stream: AsyncStream[ChatCompletionChunk],
+        emit_tool_calls_early: bool = False,
     ) -> AsyncIterator[TResponseStreamEvent]:
+        """Converts a Chat Completions stream into Responses stream events.
+
+        Args:
+            response: The response skeleton to report in the created and completed events.
+            stream: The Chat Completions stream.
+            emit_tool_calls_early: Whether to emit each function call's events as soon as the model
+                moves on to the next call, when its arguments are final, instead of emitting all
+                of them at the end of the stream.
+        """
         usage: CompletionUsage | None = None
         state = StreamingState()
 
@@ -159,10 +170,17 @@ class ChatCmplStreamHandler:
 
             # Handle tool calls
             # Because we don't know the name of the function until the end of the stream, we'll
-            # save everything and yield events at the end
+            # save everything and yield events at the end. With `emit_tool_calls_early`, a call's
+            # events are yielded once the model has moved on to the next call instead, so that
+            # consumers can start running it while the rest of the response is still streaming.
             if delta.tool_calls:
                 for tc_delta in delta.tool_calls:
                     if tc_delta.index not in state.function_calls:
+                        if emit_tool_calls_early:
+                            for index in list(state.function_calls):
+                                if index < tc_delta.index:
+                                    for event in cls._function_call_events(state, index):
+                                        yield event
                         state.function_calls[tc_delta.index] = ResponseFunctionToolCall(
                             id=FAKE_RESPONSES_ID,
                             arguments="",
@@ -180,9 +198,7 @@ class ChatCmplStreamHandler:
                     ) or ""
                     state.function_calls[tc_delta.index].call_id += tc_delta.id or ""
 
-        function_call_starting_index = 0
         if state.text_content_index_and_output:
-            function_call_starting_index += 1
             # Send end event for this content part
             yield ResponseContentPartDoneEvent(
                 content_index=state.text_content_index_and_output[0],
@@ -193,7 +209,6 @@ class ChatCmplStreamHandler:
             )
 
         if state.refusal_content_index_and_output:
-            function_call_starting_index += 1
             # Send end event for this content part
             yield ResponseContentPartDoneEvent(
                 content_index=state.refusal_content_index_and_output[0],
@@ -203,39 +218,10 @@ class ChatCmplStreamHandler:
                 type="response.content_part.done",
             )
 
-        # Actually send events for the function calls
-        for function_call in state.function_calls.values():
-            # First, a ResponseOutputItemAdded for the function call
-            yield ResponseOutputItemAddedEvent(
-                item=ResponseFunctionToolCall(
-                    id=FAKE_RESPONSES_ID,
-                    call_id=function_call.call_id,
-                    arguments=function_call.arguments,
-                    name=function_call.name,
-                    type="function_call",
-                ),
-                output_index=function_call_starting_index,
-                type="response.output_item.added",
-            )
-            # Then, yield the args
-            yield ResponseFunctionCallArgumentsDeltaEvent(
-                delta=function_call.arguments,
-                item_id=FAKE_RESPONSES_ID,
-                output_index=function_call_starting_index,
-                type="response.function_call_arguments.delta",
-            )
-            # Finally, the ResponseOutputItemDone
-            yield ResponseOutputItemDoneEvent(
-                item=ResponseFunctionToolCall(
-                    id=FAKE_RESPONSES_ID,
-                    call_id=function_call.call_id,
-                    arguments=function_call.arguments,
-                    name=function_call.name,
-                    type="function_call",
-                ),
-                output_index=function_call_starting_index,
-                type="response.output_item.done",
-            )
+        # Send events for the function calls that haven't been sent yet
+        for index in list(state.function_calls):
+            for event in cls._function_call_events(state, index):
+                yield event
 
         # Finally, send the Response completed event
         outputs: list[ResponseOutputItem] = []
@@ -290,3 +276,51 @@ class ChatCmplStreamHandler:
             response=final_response,
             type="response.completed",
         )
+
+    @classmethod
+    def _function_call_events(
+        cls, state: StreamingState, index: int
+    ) -> Iterator[TResponseStreamEvent]:
+        """Yields the events for a completed function call, unless they were already sent."""
+        if index in state.emitted_function_calls:
+            return
+        state.emitted_function_calls.add(index)
+
+        function_call = state.function_calls[index]
+        output_index = 0
+        if state.text_content_index_and_output:
+            output_index += 1
+        if state.refusal_content_index_and_output:
+            output_index += 1
+
+        # First, a ResponseOutputItemAdded for the function call
+        yield ResponseOutputItemAddedEvent(
+            item=ResponseFunctionToolCall(
+                id=FAKE_RESPONSES_ID,
+                call_id=function_call.call_id,
+                arguments=function_call.arguments,
+                name=function_call.name,
+                type="function_call",
+            ),
+            output_index=output_index,
+            type="response.output_item.added",
+        )
+        # Then, yield the args
+        yield ResponseFunctionCallArgumentsDeltaEvent(
+            delta=function_call.arguments,
+            item_id=FAKE_RESPONSES_ID,
+            output_index=output_index,
+            type="response.function_call_arguments.delta",
+        )
+        # Finally, the ResponseOutputItemDone
+        yield ResponseOutputItemDoneEvent(
+            item=ResponseFunctionToolCall(
+                id=FAKE_RESPONSES_ID,
+                call_id=function_call.call_id,
+                arguments=function_call.arguments,
+                name=function_call.name,
+                type="function_call",
+            ),
+            output_index=output_index,
+            type="response.output_item.done",
+        )
@@ -12,6 +12,7 @@ from ..tool import Tool
 
 if TYPE_CHECKING:
     from ..model_settings import ModelSettings
+    from ..tokens import TokenEstimate
 
 
 class ModelTracing(enum.Enum):
@@ -96,6 +97,27 @@ class Model(abc.ABC):
         """
         pass
 
+    def estimate_input_tokens(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> TokenEstimate | None:
+        """Estimates the number of input tokens a request would use, locally and without sending
+        it. Models that support this size the exact payload they would send. The default
+        implementation returns None.
+
+        Args:
+            system_instructions: The system instructions to use.
+            input: The input items to the model, in OpenAI Responses format.
+            tools: The tools available to the model.
+            output_schema: The output schema to use.
+            handoffs: The handoffs available to the model.
+        """
+        return None
+
 
 class ModelProvider(abc.ABC):
     """The base interface for a model provider.
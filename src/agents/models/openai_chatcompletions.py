@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import time
 from collections.abc import AsyncIterator
-from typing import TYPE_CHECKING, Any, Literal, cast, overload
+from typing import TYPE_CHECKING, Any, Literal, Union, cast, overload
 
-from openai import NOT_GIVEN, AsyncOpenAI, AsyncStream
+from openai import NOT_GIVEN, AsyncOpenAI, AsyncStream, NotGiven
 from openai.types import ChatModel
-from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessageParam
+from openai.types.chat.chat_completion_tool_param import ChatCompletionToolParam
+from openai.types.chat.completion_create_params import ResponseFormat
 from openai.types.responses import Response
 
 from .. import _debug
@@ -15,6 +17,8 @@ from ..agent_output import AgentOutputSchemaBase
 from ..handoffs import Handoff
 from ..items import ModelResponse, TResponseInputItem, TResponseStreamEvent
 from ..logger import logger
+from ..timings import add_phase
+from ..tokens import TokenEstimate, get_default_token_estimator
 from ..tool import Tool
 from ..tracing import generation_span
 from ..tracing.span_data import GenerationSpanData
@@ -29,6 +33,13 @@ from .interface import Model, ModelTracing
 if TYPE_CHECKING:
     from ..model_settings import ModelSettings
 
+# The messages, tools and response format of a request, converted to the Chat Completions format.
+_ConvertedRequest = tuple[
+    list[ChatCompletionMessageParam],
+    list[ChatCompletionToolParam],
+    Union[ResponseFormat, NotGiven],
+]
+
 
 class OpenAIChatCompletionsModel(Model):
     def __init__(
@@ -58,6 +69,15 @@ class OpenAIChatCompletionsModel(Model):
             model_config=model_settings.to_json_dict() | {"base_url": str(self._client.base_url)},
             disabled=tracing.is_disabled(),
         ) as span_generation:
+            converted, estimate = self._prepare_request(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                span_generation,
+            )
             response = await self._fetch_response(
                 system_instructions,
                 input,
@@ -68,6 +88,7 @@ class OpenAIChatCompletionsModel(Model):
                 span_generation,
                 tracing,
                 stream=False,
+                converted=converted,
             )
 
             if _debug.DONT_LOG_MODEL_DATA:
@@ -81,7 +102,17 @@ class OpenAIChatCompletionsModel(Model):
                 Usage(
                     requests=1,
                     input_tokens=response.usage.prompt_tokens,
+                    cached_input_tokens=(
+                        response.usage.prompt_tokens_details.cached_tokens or 0
+                        if response.usage.prompt_tokens_details
+                        else 0
+                    ),
                     output_tokens=response.usage.completion_tokens,
+                    reasoning_tokens=(
+                        response.usage.completion_tokens_details.reasoning_tokens or 0
+                        if response.usage.completion_tokens_details
+                        else 0
+                    ),
                     total_tokens=response.usage.total_tokens,
                 )
                 if response.usage
@@ -100,6 +131,7 @@ class OpenAIChatCompletionsModel(Model):
                 output=items,
                 usage=usage,
                 response_id=None,
+                input_token_estimate=estimate,
             )
 
     async def stream_response(
@@ -122,6 +154,15 @@ class OpenAIChatCompletionsModel(Model):
             model_config=model_settings.to_json_dict() | {"base_url": str(self._client.base_url)},
             disabled=tracing.is_disabled(),
         ) as span_generation:
+            converted, _ = self._prepare_request(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                span_generation,
+            )
             response, stream = await self._fetch_response(
                 system_instructions,
                 input,
@@ -132,10 +173,13 @@ class OpenAIChatCompletionsModel(Model):
                 span_generation,
                 tracing,
                 stream=True,
+                converted=converted,
             )
 
             final_response: Response | None = None
-            async for chunk in ChatCmplStreamHandler.handle_stream(response, stream):
+            async for chunk in ChatCmplStreamHandler.handle_stream(
+                response, stream, emit_tool_calls_early=bool(model_settings.emit_tool_calls_early)
+            ):
                 yield chunk
 
                 if chunk.type == "response.completed":
@@ -162,6 +206,7 @@ class OpenAIChatCompletionsModel(Model):
         span: Span[GenerationSpanData],
         tracing: ModelTracing,
         stream: Literal[True],
+        converted: _ConvertedRequest | None = None,
     ) -> tuple[Response, AsyncStream[ChatCompletionChunk]]: ...
 
     @overload
@@ -176,6 +221,7 @@ class OpenAIChatCompletionsModel(Model):
         span: Span[GenerationSpanData],
         tracing: ModelTracing,
         stream: Literal[False],
+        converted: _ConvertedRequest | None = None,
     ) -> ChatCompletion: ...
 
     async def _fetch_response(
@@ -189,17 +235,17 @@ class OpenAIChatCompletionsModel(Model):
         span: Span[GenerationSpanData],
         tracing: ModelTracing,
         stream: bool = False,
+        converted: _ConvertedRequest | None = None,
     ) -> ChatCompletion | tuple[Response, AsyncStream[ChatCompletionChunk]]:
-        converted_messages = Converter.items_to_messages(input)
-
-        if system_instructions:
-            converted_messages.insert(
-                0,
-                {
-                    "content": system_instructions,
-                    "role": "system",
-                },
+        if converted is None:
+            start = time.perf_counter()
+            converted = self._convert_request(
+                system_instructions, input, tools, output_schema, handoffs
             )
+            add_phase("convert_input", start)
+        converted_messages, converted_tools, response_format = converted
+
+        start = time.perf_counter()
         if tracing.include_data():
             span.span_data.input = converted_messages
 
@@ -211,12 +257,6 @@ class OpenAIChatCompletionsModel(Model):
             else NOT_GIVEN
         )
         tool_choice = Converter.convert_tool_choice(model_settings.tool_choice)
-        response_format = Converter.convert_response_format(output_schema)
-
-        converted_tools = [Converter.tool_to_openai(tool) for tool in tools] if tools else []
-
-        for handoff in handoffs:
-            converted_tools.append(Converter.convert_handoff_tool(handoff))
 
         if _debug.DONT_LOG_MODEL_DATA:
             logger.debug("Calling LLM")
@@ -235,6 +275,7 @@ class OpenAIChatCompletionsModel(Model):
         stream_options = ChatCmplHelpers.get_stream_options_param(
             self._get_client(), model_settings, stream=stream
         )
+        add_phase("build_request", start)
 
         ret = await self._get_client().chat.completions.create(
             model=self.model,
@@ -278,6 +319,75 @@ class OpenAIChatCompletionsModel(Model):
         )
         return response, ret
 
+    def estimate_input_tokens(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> TokenEstimate:
+        return self._estimate_converted(
+            self._convert_request(system_instructions, input, tools, output_schema, handoffs)
+        )
+
+    def _prepare_request(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        span: Span[GenerationSpanData],
+    ) -> tuple[_ConvertedRequest, TokenEstimate | None]:
+        start = time.perf_counter()
+        converted = self._convert_request(
+            system_instructions, input, tools, output_schema, handoffs
+        )
+        add_phase("convert_input", start)
+
+        estimate = None
+        if model_settings.estimate_input_tokens:
+            # Estimated on the converted payload, so the request isn't converted a second time.
+            estimate = self._estimate_converted(converted)
+            span.span_data.input_token_estimate = estimate.to_json_dict()
+        return converted, estimate
+
+    def _estimate_converted(self, converted: _ConvertedRequest) -> TokenEstimate:
+        messages, converted_tools, response_format = converted
+        return get_default_token_estimator().estimate(
+            messages,
+            tools=converted_tools,
+            response_format=response_format if response_format is not NOT_GIVEN else None,
+        )
+
+    def _convert_request(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> _ConvertedRequest:
+        converted_messages = Converter.items_to_messages(input)
+
+        if system_instructions:
+            converted_messages.insert(
+                0,
+                {
+                    "content": system_instructions,
+                    "role": "system",
+                },
+            )
+
+        converted_tools = [Converter.tool_to_openai(tool) for tool in tools] if tools else []
+
+        for handoff in handoffs:
+            converted_tools.append(Converter.convert_handoff_tool(handoff))
+
+        return converted_messages, converted_tools, Converter.convert_response_format(output_schema)
+
     def _get_client(self) -> AsyncOpenAI:
         if self._client is None:
             self._client = AsyncOpenAI()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import time
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Literal, overload
@@ -21,10 +22,14 @@ from .. import _debug
 from ..agent_output import AgentOutputSchemaBase
 from ..exceptions import UserError
 from ..handoffs import Handoff
-from ..items import ItemHelpers, ModelResponse, TResponseInputItem
+from ..items import ModelResponse, TResponseInputItem
 from ..logger import logger
+from ..timings import add_phase
+from ..tokens import TokenEstimate, get_default_token_estimator
 from ..tool import ComputerTool, FileSearchTool, FunctionTool, Tool, WebSearchTool
 from ..tracing import SpanError, response_span
+from ..tracing.span_data import ResponseSpanData
+from ..tracing.spans import Span
 from ..usage import Usage
 from ..version import __version__
 from .interface import Model, ModelTracing
@@ -73,6 +78,15 @@ class OpenAIResponsesModel(Model):
     ) -> ModelResponse:
         with response_span(disabled=tracing.is_disabled()) as span_response:
             try:
+                estimate = self._maybe_estimate(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    span_response,
+                )
                 response = await self._fetch_response(
                     system_instructions,
                     input,
@@ -92,16 +106,7 @@ class OpenAIResponsesModel(Model):
                         f"{json.dumps([x.model_dump() for x in response.output], indent=2)}\n"
                     )
 
-                usage = (
-                    Usage(
-                        requests=1,
-                        input_tokens=response.usage.input_tokens,
-                        output_tokens=response.usage.output_tokens,
-                        total_tokens=response.usage.total_tokens,
-                    )
-                    if response.usage
-                    else Usage()
-                )
+                usage = Usage.from_response_usage(response.usage)
 
                 if tracing.include_data():
                     span_response.span_data.response = response
@@ -123,6 +128,7 @@ class OpenAIResponsesModel(Model):
             output=response.output,
             usage=usage,
             response_id=response.id,
+            input_token_estimate=estimate,
         )
 
     async def stream_response(
@@ -141,6 +147,15 @@ class OpenAIResponsesModel(Model):
         """
         with response_span(disabled=tracing.is_disabled()) as span_response:
             try:
+                self._maybe_estimate(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    span_response,
+                )
                 stream = await self._fetch_response(
                     system_instructions,
                     input,
@@ -175,6 +190,43 @@ class OpenAIResponsesModel(Model):
                 logger.error(f"Error streaming response: {e}")
                 raise
 
+    def estimate_input_tokens(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> TokenEstimate:
+        """Estimates the input tokens of a request. When continuing from a previous response, only
+        the new input is counted, not the history stored by the server."""
+        response_format = Converter.get_response_format(output_schema)
+        return get_default_token_estimator().estimate(
+            input,
+            system_instructions=system_instructions,
+            tools=Converter.convert_tools(tools, handoffs).tools,
+            response_format=response_format if response_format is not NOT_GIVEN else None,
+        )
+
+    def _maybe_estimate(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        span: Span[ResponseSpanData],
+    ) -> TokenEstimate | None:
+        if not model_settings.estimate_input_tokens:
+            return None
+        # The input is sent as is, so only the tool definitions are converted for the estimate.
+        estimate = self.estimate_input_tokens(
+            system_instructions, input, tools, output_schema, handoffs
+        )
+        span.span_data.input_token_estimate = estimate.to_json_dict()
+        return estimate
+
     @overload
     async def _fetch_response(
         self,
@@ -212,8 +264,15 @@ class OpenAIResponsesModel(Model):
         previous_response_id: str | None,
         stream: Literal[True] | Literal[False] = False,
     ) -> Response | AsyncStream[ResponseStreamEvent]:
-        list_input = ItemHelpers.input_to_new_input_list(input)
+        start = time.perf_counter()
+        # The input is only read from here on, so there is no need to copy it. The runner hands us
+        # a fresh list on every call.
+        list_input: list[TResponseInputItem] = (
+            [{"content": input, "role": "user"}] if isinstance(input, str) else input
+        )
+        add_phase("convert_input", start)
 
+        start = time.perf_counter()
         parallel_tool_calls = (
             True
             if model_settings.parallel_tool_calls and tools and len(tools) > 0
@@ -238,6 +297,7 @@ class OpenAIResponsesModel(Model):
                 f"Response format: {response_format}\n"
                 f"Previous response id: {previous_response_id}\n"
             )
+        add_phase("build_request", start)
 
         return await self._client.responses.create(
             previous_response_id=self._non_null_or_not_given(previous_response_id),
@@ -8,15 +8,21 @@ from typing import TYPE_CHECKING, Any, cast
 
 from typing_extensions import TypeVar
 
+from ._conversation_log import ConversationLog
 from ._run_impl import QueueCompleteSentinel
 from .agent import Agent
 from .agent_output import AgentOutputSchemaBase
 from .exceptions import InputGuardrailTripwireTriggered, MaxTurnsExceeded
-from .guardrail import InputGuardrailResult, OutputGuardrailResult
-from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem
+from .guardrail import (
+    InputGuardrailResult,
+    OutputGuardrailResult,
+    StreamingOutputGuardrailResult,
+)
+from .items import ModelResponse, RunItem, TResponseInputItem
 from .logger import logger
 from .run_context import RunContextWrapper
 from .stream_events import StreamEvent
+from .timings import RunTimings
 from .tracing import Trace
 from .util._pretty_print import pretty_print_result, pretty_print_run_result_streaming
 
@@ -54,11 +60,24 @@ class RunResultBase(abc.ABC):
     context_wrapper: RunContextWrapper[Any]
     """The context wrapper for the agent run."""
 
+    checkpoint_id: str | None = field(default=None, init=False)
+    """The ID the run was checkpointed under, if `RunConfig.checkpoint_store` was set. Can be passed
+    to `Runner.resume`."""
+
+    _conversation_log: ConversationLog | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     @abc.abstractmethod
     def last_agent(self) -> Agent[Any]:
         """The last agent that was run."""
 
+    @property
+    def timings(self) -> RunTimings:
+        """The per-phase timings of the run. Shorthand for `context_wrapper.timings`."""
+        return self.context_wrapper.timings
+
     def final_output_as(self, cls: type[T], raise_if_incorrect_type: bool = False) -> T:
         """A convenience method to cast the final output to a specific type. By default, the cast
         is only for the typechecker. If you set `raise_if_incorrect_type` to True, we'll raise a
@@ -78,11 +97,14 @@ class RunResultBase(abc.ABC):
         return cast(T, self.final_output)
 
     def to_input_list(self) -> list[TResponseInputItem]:
-        """Creates a new input list, merging the original input with all the new items generated."""
-        original_items: list[TResponseInputItem] = ItemHelpers.input_to_new_input_list(self.input)
-        new_items = [item.to_input_item() for item in self.new_items]
-
-        return original_items + new_items
+        """Creates a new input list, merging the original input with all the new items generated.
+        The list is new, but the items in it are shared with the run and should not be mutated in
+        place.
+        """
+        if self._conversation_log is None:
+            self._conversation_log = ConversationLog(self.input)
+        self._conversation_log.sync(self.input, self.new_items)
+        return self._conversation_log.to_input_list()
 
     @property
     def last_response_id(self) -> str | None:
@@ -135,6 +157,13 @@ class RunResultStreaming(RunResultBase):
     is_complete: bool = False
     """Whether the agent has finished running."""
 
+    streaming_output_guardrail_results: list[StreamingOutputGuardrailResult] = field(
+        default_factory=list
+    )
+    """The results of the streaming output guardrails, one per checked chunk, in the order the
+    checks finished. Updates as the run progresses.
+    """
+
     # Queues that the background run_loop writes to
     _event_queue: asyncio.Queue[StreamEvent | QueueCompleteSentinel] = field(
         default_factory=asyncio.Queue, repr=False
@@ -216,21 +245,13 @@ class RunResultStreaming(RunResultBase):
             if guardrail_result.output.tripwire_triggered:
                 self._stored_exception = InputGuardrailTripwireTriggered(guardrail_result)
 
-        # Check the tasks for any exceptions
-        if self._run_impl_task and self._run_impl_task.done():
-            exc = self._run_impl_task.exception()
-            if exc and isinstance(exc, Exception):
-                self._stored_exception = exc
-
-        if self._input_guardrails_task and self._input_guardrails_task.done():
-            exc = self._input_guardrails_task.exception()
-            if exc and isinstance(exc, Exception):
-                self._stored_exception = exc
-
-        if self._output_guardrails_task and self._output_guardrails_task.done():
-            exc = self._output_guardrails_task.exception()
-            if exc and isinstance(exc, Exception):
-                self._stored_exception = exc
+        # Check the tasks for any exceptions. A cancelled task has none to report.
+        tasks = (self._run_impl_task, self._input_guardrails_task, self._output_guardrails_task)
+        for task in tasks:
+            if task and task.done() and not task.cancelled():
+                exc = task.exception()
+                if exc and isinstance(exc, Exception):
+                    self._stored_exception = exc
 
     def _cleanup_tasks(self):
         if self._run_impl_task and not self._run_impl_task.done():
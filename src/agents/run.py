@@ -1,35 +1,68 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import copy
+import dataclasses
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Coroutine, Iterable, Mapping
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
-from typing import Any, cast
+from typing import Any, Literal, cast
 
-from openai.types.responses import ResponseCompletedEvent
+from openai.types.responses import (
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItemDoneEvent,
+    ResponseTextDeltaEvent,
+)
 
+from ._conversation_log import ConversationLog
 from ._run_impl import (
     AgentToolUseTracker,
+    EagerToolRuns,
     NextStepFinalOutput,
     NextStepHandoff,
     NextStepRunAgain,
     QueueCompleteSentinel,
     RunImpl,
     SingleStepResult,
+    StreamingGuardrailChecks,
     TraceCtxManager,
     get_model_tracing_impl,
 )
+from ._run_scope import reset_current_run_config, set_current_run_config
 from .agent import Agent
-from .agent_output import AgentOutputSchema, AgentOutputSchemaBase
+from .agent_graph import AgentGraph, CompiledAgent, get_handoffs, get_output_schema, resolve_model
+from .agent_output import AgentOutputSchemaBase
+from .batch import BatchInput, BatchRun
+from .checkpoint import (
+    CheckpointStore,
+    RestoredRun,
+    RunCheckpointer,
+    new_checkpoint_id,
+    restore_run,
+)
 from .exceptions import (
     AgentsException,
     InputGuardrailTripwireTriggered,
     MaxTurnsExceeded,
     ModelBehaviorError,
     OutputGuardrailTripwireTriggered,
+    UserError,
 )
-from .guardrail import InputGuardrail, InputGuardrailResult, OutputGuardrail, OutputGuardrailResult
-from .handoffs import Handoff, HandoffInputFilter, handoff
-from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem
+from .fanout import FanoutPolicy
+from .guardrail import (
+    InputGuardrail,
+    InputGuardrailResult,
+    OutputGuardrail,
+    OutputGuardrailResult,
+    StreamingOutputGuardrail,
+)
+from .handoffs import Handoff, HandoffInputFilter
+from .history import HistoryPolicy
+from .instructions import InstructionsCache
+from .items import ItemHelpers, ModelResponse, RunItem, TResponseInputItem, TResponseStreamEvent
 from .lifecycle import RunHooks
 from .logger import logger
 from .model_settings import ModelSettings
@@ -38,14 +71,21 @@ from .models.multi_provider import MultiProvider
 from .result import RunResult, RunResultStreaming
 from .run_context import RunContextWrapper, TContext
 from .stream_events import AgentUpdatedStreamEvent, RawResponsesStreamEvent
-from .tool import Tool
-from .tracing import Span, SpanError, agent_span, get_current_trace, trace
+from .timings import add_phase, record_phase, reset_current_timings, set_current_timings
+from .tool import Tool, _runs_in_process
+from .tool_output import ToolOutputBudget
+from .tracing import Span, SpanError, agent_span, get_current_span, get_current_trace, trace
 from .tracing.span_data import AgentSpanData
 from .usage import Usage
 from .util import _coro, _error_tracing
+from .util._concurrency import ConcurrencyLimits
 
 DEFAULT_MAX_TURNS = 10
 
+# Used for agents without an instructions cache when `RunConfig.stable_prompt_prefix` is set. The
+# "run" scope keeps its entries in the run context, so sharing the instance is safe.
+_STABLE_PREFIX_INSTRUCTIONS_CACHE = InstructionsCache(scope="run")
+
 
 @dataclass
 class RunConfig:
@@ -70,12 +110,31 @@ class RunConfig:
     agent. See the documentation in `Handoff.input_filter` for more details.
     """
 
+    fanout_policy: FanoutPolicy | None = None
+    """If set, a turn that requests several handoffs runs all of the target agents concurrently as
+    sub-runs, instead of only following the first handoff, and this policy combines their outputs
+    into the final output of the run. Also combines the copies of handoffs with `fanout` > 1, for
+    which it defaults to `FirstValidOutput()`. See `FirstValidOutput`, `Quorum` and `MergeOutputs`.
+    """
+
     input_guardrails: list[InputGuardrail[Any]] | None = None
     """A list of input guardrails to run on the initial run input."""
 
     output_guardrails: list[OutputGuardrail[Any]] | None = None
     """A list of output guardrails to run on the final output of the run."""
 
+    streaming_output_guardrails: list[StreamingOutputGuardrail[Any]] | None = None
+    """A list of streaming output guardrails to run on the streamed output text of every agent in
+    the run. Only used by `Runner.run_streamed()`.
+    """
+
+    defer_tools_until_input_guardrails: bool = False
+    """The first turn starts while the input guardrails are still running, and is cancelled as soon
+    as one of them trips. If True, the first turn's tools, handoffs and other side effects also wait
+    until every input guardrail has passed, so nothing is executed for input that gets rejected.
+    The model call still starts right away.
+    """
+
     tracing_disabled: bool = False
     """Whether tracing is disabled for the agent run. If disabled, we will not trace the agent run.
     """
@@ -105,6 +164,110 @@ class RunConfig:
     An optional dictionary of additional metadata to include with the trace.
     """
 
+    agent_graph: AgentGraph | None = None
+    """A compiled agent graph (see `AgentGraph.compile`) to share across runs. If not provided, each
+    run compiles the agents it encounters on first use.
+    """
+
+    eager_tool_execution: bool = False
+    """In streaming runs, start each function tool as soon as the model has finished streaming its
+    call, rather than waiting for the whole response. The results are collected as usual once the
+    response is complete, and tools that are still running are cancelled if the turn is abandoned.
+    Note that tool hooks may therefore fire before the response is complete.
+
+    Calls are only started once their arguments are final. With Chat Completions models, that is
+    when the model moves on to the next call, so the last call of a response starts when the
+    response completes. If the final response has different arguments for a call that was
+    started, the run fails with a `ModelBehaviorError` rather than running the tool again.
+    """
+
+    tool_timeout: float | None = None
+    """The maximum number of seconds a function tool call may run for, unless the tool sets its own
+    `timeout`. A call that takes longer is cancelled, and the model is told that the tool timed out.
+    """
+
+    stable_prompt_prefix: bool = False
+    """Keep the prefix of every model request, i.e. the system prompt, the tools and the handoffs,
+    byte-identical and identically ordered across turns and runs, to maximise provider-side prompt
+    cache hits. Tools and handoffs are sorted by name, and agents without an `instructions_cache`
+    get a `"run"`-scoped one, so dynamic instructions are frozen for the rest of the run. Check
+    `Usage.cached_input_tokens` to see how many input tokens were cached.
+    """
+
+    max_concurrent_tool_calls: int | None = None
+    """The maximum number of function tool calls in flight at once, across every run that uses this
+    run config."""
+
+    tool_concurrency_limits: dict[str, int] | None = None
+    """The maximum number of concurrent calls per function tool, keyed by tool name. Each tool has
+    its own limit, shared by every run that uses this run config; tools of different agents that
+    happen to have the same name don't share slots. A tool's own `max_concurrency` applies as well.
+    """
+
+    history_policy: HistoryPolicy | None = None
+    """Compacts the conversation history before each model call, e.g. to keep it within a token
+    budget. Only the input sent to the model is affected; the run's items are kept in full. See
+    `SlidingWindowPolicy`, `DropToolOutputsPolicy` and `SummarizingPolicy`.
+    """
+
+    tool_output_budget: ToolOutputBudget | None = None
+    """Limits the size of function tool outputs before they are added to the conversation, for
+    tools that don't set their own `output_budget`."""
+
+    tool_executor: Literal["inline", "thread"] | Executor = "thread"
+    """Where synchronous function tools run, unless the tool specifies its own executor. Defaults
+    to a thread pool shared by all tools, so that a blocking tool doesn't stall other runs on the
+    event loop. See `ToolExecutor` for the options. Running tools in a process can only be
+    configured on the tool itself, where the function is checked when it is decorated, so
+    `"process"` and process pools are rejected here.
+    """
+
+    model_concurrency_limits: dict[str, int] | None = None
+    """The maximum number of in-flight requests per model, keyed by model name (as configured on
+    the agent or run config, or the resolved model's `model` attribute). Limits are shared by every
+    run that uses this run config, including runs started from within those runs, such as agents
+    used as tools. Runs with another run config have their own limits.
+    """
+
+    checkpoint_store: CheckpointStore | None = None
+    """Durably records the state of the run after every turn, so that an interrupted run can be
+    continued with `Runner.resume` instead of starting over. See `JSONLCheckpointStore`. Streamed
+    runs can't be resumed, so `Runner.run_streamed` rejects a run config with a checkpoint store.
+    """
+
+    checkpoint_id: str | None = None
+    """The ID to checkpoint the run under. Defaults to a new random ID, which is available as the
+    result's `checkpoint_id`. Set it yourself to be able to resume a run that never returned. Not
+    allowed with `Runner.run_many`, which checkpoints each run under its own ID.
+    """
+
+    _concurrency_limits: ConcurrencyLimits = field(
+        default_factory=ConcurrencyLimits, repr=False, compare=False
+    )
+    """The slots of the concurrency limits above. Kept by `dataclasses.replace`, so that configs
+    derived from this one, e.g. for sub-runs, share them."""
+
+    def __post_init__(self) -> None:
+        if _runs_in_process(self.tool_executor):
+            raise UserError(
+                "RunConfig.tool_executor can't run tools in a process, because a function can only "
+                "be checked for that when it is decorated. Pass executor='process' to "
+                "function_tool instead."
+            )
+
+
+def sub_run_config(run_config: RunConfig) -> RunConfig:
+    """Returns the config for a run started from within another run, such as a fan-out branch or an
+    agent used as a tool. The parent's run-level guardrails and checkpointing don't apply to it."""
+    return dataclasses.replace(
+        run_config,
+        input_guardrails=None,
+        output_guardrails=None,
+        streaming_output_guardrails=None,
+        checkpoint_store=None,
+        checkpoint_id=None,
+    )
+
 
 class Runner:
     @classmethod
@@ -149,12 +312,95 @@ class Runner:
             A run result containing all the inputs, guardrail results and the output of the last
             agent. Agents may perform handoffs, so we don't know the specific type of the output.
         """
+        return await cls._run(
+            starting_agent,
+            input,
+            context=context,
+            max_turns=max_turns,
+            hooks=hooks,
+            run_config=run_config,
+            previous_response_id=previous_response_id,
+        )
+
+    @classmethod
+    async def resume(
+        cls,
+        checkpoint_id: str,
+        agent_registry: Mapping[str, Agent[Any]],
+        *,
+        context: Any | None = None,
+        max_turns: int | None = None,
+        hooks: RunHooks[Any] | None = None,
+        run_config: RunConfig | None = None,
+    ) -> RunResult:
+        """Resume a checkpointed run from its last completed turn, without calling the model again
+        for the turns that already completed. The run continues to be checkpointed under the same
+        ID.
+
+        Only the state of the run is checkpointed, so the context must be passed again. Input
+        guardrails are not run again. If the run had already produced a final output, the output
+        guardrails are run and the result is returned right away.
+
+        Args:
+            checkpoint_id: The ID of the checkpoint, i.e. `RunConfig.checkpoint_id` or the
+                `checkpoint_id` of an earlier result.
+            agent_registry: The agents of the run, keyed by name. Must include every agent that
+                appears in the checkpoint.
+            context: The context to run the agent with.
+            max_turns: The maximum number of turns, including those that already completed.
+                Defaults to the maximum of the original run.
+            hooks: An object that receives callbacks on various lifecycle events.
+            run_config: Global settings for the entire agent run. Must include the
+                `checkpoint_store` that holds the checkpoint.
+
+        Returns:
+            A run result, as if the run had never been interrupted.
+        """
+        store = run_config.checkpoint_store if run_config else None
+        if run_config is None or store is None:
+            raise UserError("Resuming a run requires a checkpoint_store in the run config")
+        run_config = dataclasses.replace(run_config, checkpoint_id=checkpoint_id)
+
+        records = await store.load(checkpoint_id)
+        if records is None:
+            raise UserError(f"Checkpoint {checkpoint_id} not found")
+        restored = restore_run(records, agent_registry)
+
+        return await cls._run(
+            restored.agent,
+            restored.original_input,
+            context=context,
+            max_turns=max_turns if max_turns is not None else restored.max_turns,
+            hooks=hooks,
+            run_config=run_config,
+            previous_response_id=restored.previous_response_id,
+            restored=restored,
+        )
+
+    @classmethod
+    async def _run(
+        cls,
+        starting_agent: Agent[TContext],
+        input: str | list[TResponseInputItem],
+        *,
+        context: TContext | None,
+        max_turns: int,
+        hooks: RunHooks[TContext] | None,
+        run_config: RunConfig | None,
+        previous_response_id: str | None,
+        restored: RestoredRun | None = None,
+        context_wrapper: RunContextWrapper[TContext] | None = None,
+        run_input_guardrails: bool = True,
+    ) -> RunResult:
+        # Sub-runs, such as fan-out branches and agents used as tools, pass their own context
+        # wrapper to keep track of their usage separately from the parent run.
         if hooks is None:
             hooks = RunHooks[Any]()
         if run_config is None:
             run_config = RunConfig()
 
         tool_use_tracker = AgentToolUseTracker()
+        agent_graph = run_config.agent_graph or AgentGraph()
 
         with TraceCtxManager(
             workflow_name=run_config.workflow_name,
@@ -167,24 +413,59 @@ class Runner:
             original_input: str | list[TResponseInputItem] = copy.deepcopy(input)
             generated_items: list[RunItem] = []
             model_responses: list[ModelResponse] = []
+            conversation = ConversationLog(original_input)
 
-            context_wrapper: RunContextWrapper[TContext] = RunContextWrapper(
-                context=context,  # type: ignore
-            )
+            if context_wrapper is None:
+                context_wrapper = RunContextWrapper(
+                    context=context,  # type: ignore
+                )
 
             input_guardrail_results: list[InputGuardrailResult] = []
 
             current_span: Span[AgentSpanData] | None = None
             current_agent = starting_agent
             should_run_agent_start_hooks = True
+            if restored is not None:
+                current_turn = restored.turn
+                original_input = restored.original_input
+                generated_items = list(restored.generated_items)
+                model_responses = list(restored.model_responses)
+                conversation = ConversationLog(original_input)
+                context_wrapper.usage = restored.usage
+                context_wrapper.usage_by_agent = restored.usage_by_agent
+                tool_use_tracker = restored.tool_use_tracker
+                should_run_agent_start_hooks = restored.handed_off
+            checkpointer = cls._get_checkpointer(
+                run_config, max_turns, previous_response_id, restored
+            )
+            run_config_token = set_current_run_config(run_config)
+            timings_token = set_current_timings(context_wrapper.timings)
 
             try:
+                if restored is not None and restored.is_complete:
+                    # The run was interrupted after its final turn; only the output guardrails are
+                    # left to run.
+                    return await cls._complete_run(
+                        agent=current_agent,
+                        final_output=restored.final_output,
+                        original_input=original_input,
+                        generated_items=generated_items,
+                        model_responses=model_responses,
+                        input_guardrail_results=input_guardrail_results,
+                        context_wrapper=context_wrapper,
+                        run_config=run_config,
+                        conversation=conversation,
+                        checkpointer=checkpointer,
+                    )
+
                 while True:
+                    context_wrapper.timings.begin_turn(current_turn + 1, current_agent.name)
                     # Start an agent span if we don't have one. This span is ended if the current
                     # agent changes, or if the agent loop ends.
                     if current_span is None:
-                        handoff_names = [h.agent_name for h in cls._get_handoffs(current_agent)]
-                        if output_schema := cls._get_output_schema(current_agent):
+                        compiled_agent = agent_graph.get(current_agent)
+                        handoff_names = [h.agent_name for h in compiled_agent.handoffs]
+                        if output_schema := compiled_agent.output_schema:
                             output_type_name = output_schema.name()
                         else:
                             output_type_name = "str"
@@ -196,7 +477,10 @@ class Runner:
                         )
                         current_span.start(mark_as_current=True)
 
-                        all_tools = await cls._get_all_tools(current_agent)
+                        with record_phase("list_tools"):
+                            all_tools = await compiled_agent.get_all_tools(
+                                run_config.stable_prompt_prefix
+                            )
                         current_span.span_data.tools = [t.name for t in all_tools]
 
                     current_turn += 1
@@ -215,62 +499,88 @@ class Runner:
                     )
 
                     if current_turn == 1:
-                        input_guardrail_results, turn_result = await asyncio.gather(
+                        tools_gate: asyncio.Event | None = None
+                        if run_config.defer_tools_until_input_guardrails:
+                            tools_gate = asyncio.Event()
+                        (
+                            input_guardrail_results,
+                            turn_result,
+                        ) = await cls._run_turn_with_input_guardrails(
                             cls._run_input_guardrails(
                                 starting_agent,
                                 starting_agent.input_guardrails
-                                + (run_config.input_guardrails or []),
+                                + (run_config.input_guardrails or [])
+                                if run_input_guardrails
+                                else [],
                                 copy.deepcopy(input),
                                 context_wrapper,
                             ),
                             cls._run_single_turn(
                                 agent=current_agent,
+                                compiled_agent=compiled_agent,
                                 all_tools=all_tools,
                                 original_input=original_input,
                                 generated_items=generated_items,
+                                conversation=conversation,
                                 hooks=hooks,
                                 context_wrapper=context_wrapper,
                                 run_config=run_config,
                                 should_run_agent_start_hooks=should_run_agent_start_hooks,
                                 tool_use_tracker=tool_use_tracker,
                                 previous_response_id=previous_response_id,
+                                remaining_turns=max_turns - current_turn,
+                                tools_gate=tools_gate,
                             ),
+                            tools_gate,
                         )
                     else:
                         turn_result = await cls._run_single_turn(
                             agent=current_agent,
+                            compiled_agent=compiled_agent,
                             all_tools=all_tools,
                             original_input=original_input,
                             generated_items=generated_items,
+                            conversation=conversation,
                             hooks=hooks,
                             context_wrapper=context_wrapper,
                             run_config=run_config,
                             should_run_agent_start_hooks=should_run_agent_start_hooks,
                             tool_use_tracker=tool_use_tracker,
                             previous_response_id=previous_response_id,
+                            remaining_turns=max_turns - current_turn,
                         )
                     should_run_agent_start_hooks = False
 
                     model_responses.append(turn_result.model_response)
                     original_input = turn_result.original_input
                     generated_items = turn_result.generated_items
-
-                    if isinstance(turn_result.next_step, NextStepFinalOutput):
-                        output_guardrail_results = await cls._run_output_guardrails(
-                            current_agent.output_guardrails + (run_config.output_guardrails or []),
+                    if checkpointer:
+                        await checkpointer.save_turn(
+                            current_turn,
                             current_agent,
-                            turn_result.next_step.output,
-                            context_wrapper,
+                            turn_result,
+                            context_wrapper.usage,
+                            tool_use_tracker,
+                            context_wrapper.usage_by_agent,
                         )
-                        return RunResult(
-                            input=original_input,
-                            new_items=generated_items,
-                            raw_responses=model_responses,
+                    await hooks.on_turn_end(
+                        context_wrapper,
+                        current_agent,
+                        context_wrapper.timings.for_turn(current_turn),
+                    )
+
+                    if isinstance(turn_result.next_step, NextStepFinalOutput):
+                        return await cls._complete_run(
+                            agent=current_agent,
                             final_output=turn_result.next_step.output,
-                            _last_agent=current_agent,
+                            original_input=original_input,
+                            generated_items=generated_items,
+                            model_responses=model_responses,
                             input_guardrail_results=input_guardrail_results,
-                            output_guardrail_results=output_guardrail_results,
                             context_wrapper=context_wrapper,
+                            run_config=run_config,
+                            conversation=conversation,
+                            checkpointer=checkpointer,
                         )
                     elif isinstance(turn_result.next_step, NextStepHandoff):
                         current_agent = cast(Agent[TContext], turn_result.next_step.new_agent)
@@ -284,9 +594,98 @@ class Runner:
                             f"Unknown next step type: {type(turn_result.next_step)}"
                         )
             finally:
+                reset_current_run_config(run_config_token)
+                reset_current_timings(timings_token)
                 if current_span:
                     current_span.finish(reset_current=True)
 
+    @classmethod
+    async def _complete_run(
+        cls,
+        *,
+        agent: Agent[TContext],
+        final_output: Any,
+        original_input: str | list[TResponseInputItem],
+        generated_items: list[RunItem],
+        model_responses: list[ModelResponse],
+        input_guardrail_results: list[InputGuardrailResult],
+        context_wrapper: RunContextWrapper[TContext],
+        run_config: RunConfig,
+        conversation: ConversationLog,
+        checkpointer: RunCheckpointer | None,
+    ) -> RunResult:
+        output_guardrail_results = await cls._run_output_guardrails(
+            agent.output_guardrails + (run_config.output_guardrails or []),
+            agent,
+            final_output,
+            context_wrapper,
+        )
+        result = RunResult(
+            input=original_input,
+            new_items=generated_items,
+            raw_responses=model_responses,
+            final_output=final_output,
+            _last_agent=agent,
+            input_guardrail_results=input_guardrail_results,
+            output_guardrail_results=output_guardrail_results,
+            context_wrapper=context_wrapper,
+        )
+        result._conversation_log = conversation
+        if checkpointer:
+            result.checkpoint_id = checkpointer.checkpoint_id
+        return result
+
+    @classmethod
+    async def _run_turn_with_input_guardrails(
+        cls,
+        guardrails: Coroutine[Any, Any, list[InputGuardrailResult]],
+        turn: Coroutine[Any, Any, SingleStepResult],
+        tools_gate: asyncio.Event | None,
+    ) -> tuple[list[InputGuardrailResult], SingleStepResult]:
+        """Runs the first turn speculatively alongside the input guardrails. Whichever fails first
+        tears down the other, so a tripwire cancels the in-flight model call and any tools it
+        started. `tools_gate` is opened once the guardrails pass."""
+        guardrails_task = asyncio.create_task(guardrails)
+        turn_task = asyncio.create_task(turn)
+        if tools_gate is not None:
+            guardrails_task.add_done_callback(
+                lambda task: tools_gate.set()
+                if not task.cancelled() and task.exception() is None
+                else None
+            )
+        try:
+            await asyncio.wait({guardrails_task, turn_task}, return_when=asyncio.FIRST_EXCEPTION)
+            for task in (guardrails_task, turn_task):
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise cast(BaseException, task.exception())
+            return guardrails_task.result(), turn_task.result()
+        finally:
+            for task in (guardrails_task, turn_task):
+                task.cancel()
+            # Wait for the cancelled work to wind down, so it can't outlive the run. This also
+            # retrieves the exception of the task that lost the race, if it failed as well.
+            await asyncio.gather(guardrails_task, turn_task, return_exceptions=True)
+
+    @classmethod
+    def _get_checkpointer(
+        cls,
+        run_config: RunConfig,
+        max_turns: int,
+        previous_response_id: str | None,
+        restored: RestoredRun | None = None,
+    ) -> RunCheckpointer | None:
+        if run_config.checkpoint_store is None:
+            return None
+        checkpoint_id = run_config.checkpoint_id or new_checkpoint_id()
+        logger.debug(f"Checkpointing run as {checkpoint_id}")
+        return RunCheckpointer(
+            run_config.checkpoint_store,
+            checkpoint_id,
+            max_turns=max_turns,
+            previous_response_id=previous_response_id,
+            restored=restored,
+        )
+
     @classmethod
     def run_sync(
         cls,
@@ -390,6 +789,9 @@ class Runner:
             hooks = RunHooks[Any]()
         if run_config is None:
             run_config = RunConfig()
+        if run_config.checkpoint_store is not None:
+            # `Runner.resume` can't stream, so a streamed run is never checkpointed.
+            raise UserError("Streamed runs can't be checkpointed; use Runner.run instead")
 
         # If there's already a trace, we don't create a new one. In addition, we can't end the
         # trace here, because the actual work is done in `stream_events` and this method ends
@@ -406,7 +808,7 @@ class Runner:
             )
         )
 
-        output_schema = cls._get_output_schema(starting_agent)
+        output_schema = (run_config.agent_graph or AgentGraph()).get(starting_agent).output_schema
         context_wrapper: RunContextWrapper[TContext] = RunContextWrapper(
             context=context  # type: ignore
         )
@@ -442,6 +844,78 @@ class Runner:
         )
         return streamed_result
 
+    @classmethod
+    def run_many(
+        cls,
+        starting_agent: Agent[TContext],
+        inputs: Iterable[BatchInput],
+        *,
+        context: TContext | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        hooks: RunHooks[TContext] | None = None,
+        run_config: RunConfig | None = None,
+        max_concurrency: int = 8,
+        per_model_limits: dict[str, int] | None = None,
+    ) -> BatchRun:
+        """Run a workflow over many inputs concurrently, starting at the given agent for each one.
+        The returned batch contains a method you can use to receive each `RunResult` as soon as its
+        run completes, and aggregate throughput and latency statistics.
+
+        All runs share the same run config, and therefore the same model provider (and HTTP
+        client), agent graph and trace processors. Each run gets its own trace. A run that raises
+        (e.g. `MaxTurnsExceeded`) is reported as a failed item; the rest of the batch carries on.
+
+        Args:
+            starting_agent: The starting agent for each run.
+            inputs: The inputs to run. Inputs are consumed lazily, as runs complete.
+            context: The context to run each agent with.
+            max_turns: The maximum number of turns for each run.
+            hooks: An object that receives callbacks on various lifecycle events, for every run.
+            run_config: Global settings shared by every run in the batch.
+            max_concurrency: The maximum number of runs in flight at once.
+            per_model_limits: The maximum number of in-flight model requests per model name. These
+                are added to `RunConfig.model_concurrency_limits`. The batch then gets its own
+                concurrency limits, shared by its runs only, so batches can use different limits.
+
+        Returns:
+            A batch object that streams results as they complete.
+        """
+        if max_concurrency < 1:
+            raise UserError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+        run_config = run_config or RunConfig()
+        if run_config.checkpoint_id is not None:
+            # Every run of the batch would append to the same checkpoint.
+            raise UserError(
+                "run_many can't use a fixed checkpoint_id; each run is checkpointed under its own "
+                "ID, available as the result's checkpoint_id"
+            )
+        replacements: dict[str, Any] = {}
+        if run_config.agent_graph is None:
+            replacements["agent_graph"] = AgentGraph.compile(starting_agent)
+        if per_model_limits:
+            replacements["model_concurrency_limits"] = {
+                **(run_config.model_concurrency_limits or {}),
+                **per_model_limits,
+            }
+            replacements["_concurrency_limits"] = ConcurrencyLimits()
+        if replacements:
+            run_config = dataclasses.replace(run_config, **replacements)
+
+        async def run(input: BatchInput) -> RunResult:
+            return await cls.run(
+                starting_agent,
+                input,
+                context=context,
+                max_turns=max_turns,
+                hooks=hooks,
+                run_config=run_config,
+            )
+
+        batch = BatchRun(max_concurrency=max_concurrency)
+        batch._start(run, inputs)
+        return batch
+
     @classmethod
     async def _run_input_guardrails_with_queue(
         cls,
@@ -451,6 +925,7 @@ class Runner:
         context: RunContextWrapper[TContext],
         streamed_result: RunResultStreaming,
         parent_span: Span[Any],
+        tools_gate: asyncio.Event | None = None,
     ):
         queue = streamed_result._input_guardrail_queue
 
@@ -478,12 +953,28 @@ class Runner:
                     )
                 queue.put_nowait(result)
                 guardrail_results.append(result)
+                if result.output.tripwire_triggered:
+                    # The run is over, so stop paying for the model call and tools in flight.
+                    cls._stop_streamed_run(streamed_result)
+                    for t in guardrail_tasks:
+                        t.cancel()
+                    return
         except Exception:
             for t in guardrail_tasks:
                 t.cancel()
+            cls._stop_streamed_run(streamed_result)
             raise
 
         streamed_result.input_guardrail_results = guardrail_results
+        if tools_gate is not None:
+            tools_gate.set()
+
+    @classmethod
+    def _stop_streamed_run(cls, streamed_result: RunResultStreaming) -> None:
+        streamed_result.is_complete = True
+        streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
+        if streamed_result._run_impl_task and not streamed_result._run_impl_task.done():
+            streamed_result._run_impl_task.cancel()
 
     @classmethod
     async def _run_streamed_impl(
@@ -505,19 +996,28 @@ class Runner:
         current_turn = 0
         should_run_agent_start_hooks = True
         tool_use_tracker = AgentToolUseTracker()
+        conversation = ConversationLog(streamed_result.input)
+        streamed_result._conversation_log = conversation
+        agent_graph = run_config.agent_graph or AgentGraph()
+
+        tools_gate: asyncio.Event | None = None
 
         streamed_result._event_queue.put_nowait(AgentUpdatedStreamEvent(new_agent=current_agent))
+        run_config_token = set_current_run_config(run_config)
+        timings_token = set_current_timings(context_wrapper.timings)
 
         try:
             while True:
                 if streamed_result.is_complete:
                     break
 
+                context_wrapper.timings.begin_turn(current_turn + 1, current_agent.name)
                 # Start an agent span if we don't have one. This span is ended if the current
                 # agent changes, or if the agent loop ends.
                 if current_span is None:
-                    handoff_names = [h.agent_name for h in cls._get_handoffs(current_agent)]
-                    if output_schema := cls._get_output_schema(current_agent):
+                    compiled_agent = agent_graph.get(current_agent)
+                    handoff_names = [h.agent_name for h in compiled_agent.handoffs]
+                    if output_schema := compiled_agent.output_schema:
                         output_type_name = output_schema.name()
                     else:
                         output_type_name = "str"
@@ -529,7 +1029,10 @@ class Runner:
                     )
                     current_span.start(mark_as_current=True)
 
-                    all_tools = await cls._get_all_tools(current_agent)
+                    with record_phase("list_tools"):
+                        all_tools = await compiled_agent.get_all_tools(
+                            run_config.stable_prompt_prefix
+                        )
                     tool_names = [t.name for t in all_tools]
                     current_span.span_data.tools = tool_names
                 current_turn += 1
@@ -547,21 +1050,25 @@ class Runner:
                     break
 
                 if current_turn == 1:
+                    if run_config.defer_tools_until_input_guardrails:
+                        tools_gate = asyncio.Event()
                     # Run the input guardrails in the background and put the results on the queue
                     streamed_result._input_guardrails_task = asyncio.create_task(
                         cls._run_input_guardrails_with_queue(
                             starting_agent,
                             starting_agent.input_guardrails + (run_config.input_guardrails or []),
-                            copy.deepcopy(ItemHelpers.input_to_new_input_list(starting_input)),
+                            ItemHelpers.input_to_new_input_list(starting_input),
                             context_wrapper,
                             streamed_result,
                             current_span,
+                            tools_gate,
                         )
                     )
                 try:
                     turn_result = await cls._run_single_turn_streamed(
                         streamed_result,
                         current_agent,
+                        compiled_agent,
                         hooks,
                         context_wrapper,
                         run_config,
@@ -569,6 +1076,9 @@ class Runner:
                         tool_use_tracker,
                         all_tools,
                         previous_response_id,
+                        conversation,
+                        max_turns - current_turn,
+                        tools_gate,
                     )
                     should_run_agent_start_hooks = False
 
@@ -577,6 +1087,11 @@ class Runner:
                     ]
                     streamed_result.input = turn_result.original_input
                     streamed_result.new_items = turn_result.generated_items
+                    await hooks.on_turn_end(
+                        context_wrapper,
+                        current_agent,
+                        context_wrapper.timings.for_turn(current_turn),
+                    )
 
                     if isinstance(turn_result.next_step, NextStepHandoff):
                         current_agent = turn_result.next_step.new_agent
@@ -624,6 +1139,13 @@ class Runner:
 
             streamed_result.is_complete = True
         finally:
+            if not streamed_result.is_complete:
+                # The run failed outside of a turn, e.g. while listing tools, so the consumer still
+                # has to be woken up to see the error.
+                streamed_result.is_complete = True
+                streamed_result._event_queue.put_nowait(QueueCompleteSentinel())
+            reset_current_run_config(run_config_token)
+            reset_current_timings(timings_token)
             if current_span:
                 current_span.finish(reset_current=True)
             if streamed_result.trace:
@@ -634,6 +1156,7 @@ class Runner:
         cls,
         streamed_result: RunResultStreaming,
         agent: Agent[TContext],
+        compiled_agent: CompiledAgent[TContext],
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
@@ -641,85 +1164,150 @@ class Runner:
         tool_use_tracker: AgentToolUseTracker,
         all_tools: list[Tool],
         previous_response_id: str | None,
+        conversation: ConversationLog,
+        remaining_turns: int,
+        tools_gate: asyncio.Event | None = None,
     ) -> SingleStepResult:
         if should_run_agent_start_hooks:
-            await asyncio.gather(
-                hooks.on_agent_start(context_wrapper, agent),
-                (
-                    agent.hooks.on_start(context_wrapper, agent)
-                    if agent.hooks
-                    else _coro.noop_coroutine()
-                ),
-            )
+            with record_phase("hooks"):
+                await asyncio.gather(
+                    hooks.on_agent_start(context_wrapper, agent),
+                    (
+                        agent.hooks.on_start(context_wrapper, agent)
+                        if agent.hooks
+                        else _coro.noop_coroutine()
+                    ),
+                )
 
-        output_schema = cls._get_output_schema(agent)
+        output_schema = compiled_agent.output_schema
 
         streamed_result.current_agent = agent
         streamed_result._current_agent_output_schema = output_schema
 
-        system_prompt = await agent.get_system_prompt(context_wrapper)
+        with record_phase("system_prompt"):
+            system_prompt = await cls._get_system_prompt(
+                agent, context_wrapper, run_config, should_run_agent_start_hooks
+            )
 
-        handoffs = cls._get_handoffs(agent)
-        model = cls._get_model(agent, run_config)
+        handoffs = compiled_agent.get_handoffs(run_config.stable_prompt_prefix)
+        model = compiled_agent.get_model(run_config)
         model_settings = agent.model_settings.resolve(run_config.model_settings)
         model_settings = RunImpl.maybe_reset_tool_choice(agent, tool_use_tracker, model_settings)
 
         final_response: ModelResponse | None = None
 
-        input = ItemHelpers.input_to_new_input_list(streamed_result.input)
-        input.extend([item.to_input_item() for item in streamed_result.new_items])
-
-        # 1. Stream the output events
-        async for event in model.stream_response(
-            system_prompt,
-            input,
-            model_settings,
-            all_tools,
-            output_schema,
-            handoffs,
-            get_model_tracing_impl(
-                run_config.tracing_disabled, run_config.trace_include_sensitive_data
-            ),
-            previous_response_id=previous_response_id,
-        ):
-            if isinstance(event, ResponseCompletedEvent):
-                usage = (
-                    Usage(
-                        requests=1,
-                        input_tokens=event.response.usage.input_tokens,
-                        output_tokens=event.response.usage.output_tokens,
-                        total_tokens=event.response.usage.total_tokens,
-                    )
-                    if event.response.usage
-                    else Usage()
-                )
-                final_response = ModelResponse(
-                    output=event.response.output,
-                    usage=usage,
-                    response_id=event.response.id,
+        with record_phase("prepare_input"):
+            conversation.sync(streamed_result.input, streamed_result.new_items)
+            input = conversation.to_input_list()
+            if run_config.history_policy is not None:
+                input = await run_config.history_policy.compact(
+                    input, agent=agent, context_wrapper=context_wrapper, run_config=run_config
                 )
-                context_wrapper.usage.add(usage)
 
-            streamed_result._event_queue.put_nowait(RawResponsesStreamEvent(data=event))
+        eager_tool_runs = (
+            EagerToolRuns(
+                agent=agent,
+                all_tools=all_tools,
+                handoffs=handoffs,
+                hooks=hooks,
+                context_wrapper=context_wrapper,
+                config=run_config,
+                parent_span=get_current_span(),
+            )
+            # Tools that have to wait for the input guardrails can't start early.
+            if run_config.eager_tool_execution and (tools_gate is None or tools_gate.is_set())
+            else None
+        )
 
-        # 2. At this point, the streaming is complete for this turn of the agent loop.
-        if not final_response:
-            raise ModelBehaviorError("Model did not produce a final response!")
+        streaming_guardrails = agent.streaming_output_guardrails + (
+            run_config.streaming_output_guardrails or []
+        )
+        guardrail_checks = (
+            StreamingGuardrailChecks(
+                agent=agent,
+                guardrails=streaming_guardrails,
+                context_wrapper=context_wrapper,
+                results=streamed_result.streaming_output_guardrail_results,
+            )
+            if streaming_guardrails
+            else None
+        )
 
-        # 3. Now, we can process the turn as we do in the non-streaming case
-        single_step_result = await cls._get_single_step_result_from_response(
-            agent=agent,
-            original_input=streamed_result.input,
-            pre_step_items=streamed_result.new_items,
-            new_response=final_response,
-            output_schema=output_schema,
-            all_tools=all_tools,
-            handoffs=handoffs,
-            hooks=hooks,
-            context_wrapper=context_wrapper,
-            run_config=run_config,
-            tool_use_tracker=tool_use_tracker,
+        if eager_tool_runs is not None:
+            model_settings = dataclasses.replace(model_settings, emit_tool_calls_early=True)
+
+        stream = cls._stream_with_model_limit(
+            agent,
+            model,
+            run_config,
+            model.stream_response(
+                system_prompt,
+                input,
+                model_settings,
+                all_tools,
+                output_schema,
+                handoffs,
+                get_model_tracing_impl(
+                    run_config.tracing_disabled, run_config.trace_include_sensitive_data
+                ),
+                previous_response_id=previous_response_id,
+            ),
         )
+        try:
+            # 1. Stream the output events
+            async for event in stream:
+                if isinstance(event, ResponseCompletedEvent):
+                    usage = Usage.from_response_usage(event.response.usage)
+                    final_response = ModelResponse(
+                        output=event.response.output,
+                        usage=usage,
+                        response_id=event.response.id,
+                    )
+                    context_wrapper.add_usage(usage, agent.name)
+                elif (
+                    eager_tool_runs
+                    and isinstance(event, ResponseOutputItemDoneEvent)
+                    and isinstance(event.item, ResponseFunctionToolCall)
+                ):
+                    eager_tool_runs.maybe_start(event.item)
+
+                streamed_result._event_queue.put_nowait(RawResponsesStreamEvent(data=event))
+
+                if guardrail_checks:
+                    if isinstance(event, ResponseTextDeltaEvent):
+                        guardrail_checks.add_text(event.delta)
+                    # Stops the model stream, so no more output tokens are generated.
+                    guardrail_checks.raise_if_tripped()
+
+            # 2. At this point, the streaming is complete for this turn of the agent loop.
+            if guardrail_checks:
+                await guardrail_checks.finish()
+            if not final_response:
+                raise ModelBehaviorError("Model did not produce a final response!")
+
+            # 3. Now, we can process the turn as we do in the non-streaming case
+            single_step_result = await cls._get_single_step_result_from_response(
+                agent=agent,
+                original_input=streamed_result.input,
+                pre_step_items=streamed_result.new_items,
+                new_response=final_response,
+                output_schema=output_schema,
+                all_tools=all_tools,
+                handoffs=handoffs,
+                hooks=hooks,
+                context_wrapper=context_wrapper,
+                run_config=run_config,
+                tool_use_tracker=tool_use_tracker,
+                remaining_turns=remaining_turns,
+                eager_tool_runs=eager_tool_runs,
+                tools_gate=tools_gate,
+            )
+        finally:
+            await stream.aclose()
+            if guardrail_checks:
+                guardrail_checks.cancel_unfinished()
+            if eager_tool_runs:
+                eager_tool_runs.cancel_unfinished()
 
         RunImpl.stream_step_result_to_queue(single_step_result, streamed_result._event_queue)
         return single_step_result
@@ -729,36 +1317,50 @@ class Runner:
         cls,
         *,
         agent: Agent[TContext],
+        compiled_agent: CompiledAgent[TContext],
         all_tools: list[Tool],
         original_input: str | list[TResponseInputItem],
         generated_items: list[RunItem],
+        conversation: ConversationLog,
         hooks: RunHooks[TContext],
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
         should_run_agent_start_hooks: bool,
         tool_use_tracker: AgentToolUseTracker,
         previous_response_id: str | None,
+        remaining_turns: int,
+        tools_gate: asyncio.Event | None = None,
     ) -> SingleStepResult:
         # Ensure we run the hooks before anything else
         if should_run_agent_start_hooks:
-            await asyncio.gather(
-                hooks.on_agent_start(context_wrapper, agent),
-                (
-                    agent.hooks.on_start(context_wrapper, agent)
-                    if agent.hooks
-                    else _coro.noop_coroutine()
-                ),
-            )
+            with record_phase("hooks"):
+                await asyncio.gather(
+                    hooks.on_agent_start(context_wrapper, agent),
+                    (
+                        agent.hooks.on_start(context_wrapper, agent)
+                        if agent.hooks
+                        else _coro.noop_coroutine()
+                    ),
+                )
 
-        system_prompt = await agent.get_system_prompt(context_wrapper)
+        with record_phase("system_prompt"):
+            system_prompt = await cls._get_system_prompt(
+                agent, context_wrapper, run_config, should_run_agent_start_hooks
+            )
 
-        output_schema = cls._get_output_schema(agent)
-        handoffs = cls._get_handoffs(agent)
-        input = ItemHelpers.input_to_new_input_list(original_input)
-        input.extend([generated_item.to_input_item() for generated_item in generated_items])
+        output_schema = compiled_agent.output_schema
+        handoffs = compiled_agent.get_handoffs(run_config.stable_prompt_prefix)
+        with record_phase("prepare_input"):
+            conversation.sync(original_input, generated_items)
+            input = conversation.to_input_list()
+            if run_config.history_policy is not None:
+                input = await run_config.history_policy.compact(
+                    input, agent=agent, context_wrapper=context_wrapper, run_config=run_config
+                )
 
         new_response = await cls._get_new_response(
             agent,
+            compiled_agent.get_model(run_config),
             system_prompt,
             input,
             output_schema,
@@ -782,6 +1384,8 @@ class Runner:
             context_wrapper=context_wrapper,
             run_config=run_config,
             tool_use_tracker=tool_use_tracker,
+            remaining_turns=remaining_turns,
+            tools_gate=tools_gate,
         )
 
     @classmethod
@@ -799,17 +1403,24 @@ class Runner:
         context_wrapper: RunContextWrapper[TContext],
         run_config: RunConfig,
         tool_use_tracker: AgentToolUseTracker,
+        remaining_turns: int,
+        eager_tool_runs: EagerToolRuns | None = None,
+        tools_gate: asyncio.Event | None = None,
     ) -> SingleStepResult:
-        processed_response = RunImpl.process_model_response(
-            agent=agent,
-            all_tools=all_tools,
-            response=new_response,
-            output_schema=output_schema,
-            handoffs=handoffs,
-        )
+        with record_phase("process_response"):
+            processed_response = RunImpl.process_model_response(
+                agent=agent,
+                all_tools=all_tools,
+                response=new_response,
+                output_schema=output_schema,
+                handoffs=handoffs,
+            )
 
         tool_use_tracker.add_tool_use(agent, processed_response.tools_used)
 
+        if tools_gate is not None:
+            await tools_gate.wait()
+
         return await RunImpl.execute_tools_and_side_effects(
             agent=agent,
             original_input=original_input,
@@ -820,6 +1431,8 @@ class Runner:
             hooks=hooks,
             context_wrapper=context_wrapper,
             run_config=run_config,
+            remaining_turns=remaining_turns,
+            eager_tool_runs=eager_tool_runs,
         )
 
     @classmethod
@@ -842,21 +1455,23 @@ class Runner:
 
         guardrail_results = []
 
-        for done in asyncio.as_completed(guardrail_tasks):
-            result = await done
-            if result.output.tripwire_triggered:
-                # Cancel all guardrail tasks if a tripwire is triggered.
-                for t in guardrail_tasks:
-                    t.cancel()
-                _error_tracing.attach_error_to_current_span(
-                    SpanError(
-                        message="Guardrail tripwire triggered",
-                        data={"guardrail": result.guardrail.get_name()},
+        try:
+            for done in asyncio.as_completed(guardrail_tasks):
+                result = await done
+                if result.output.tripwire_triggered:
+                    _error_tracing.attach_error_to_current_span(
+                        SpanError(
+                            message="Guardrail tripwire triggered",
+                            data={"guardrail": result.guardrail.get_name()},
+                        )
                     )
-                )
-                raise InputGuardrailTripwireTriggered(result)
-            else:
-                guardrail_results.append(result)
+                    raise InputGuardrailTripwireTriggered(result)
+                else:
+                    guardrail_results.append(result)
+        finally:
+            # Cancel the remaining guardrails if one tripped, or if the run no longer needs them.
+            for t in guardrail_tasks:
+                t.cancel()
 
         return guardrail_results
 
@@ -898,10 +1513,26 @@ class Runner:
 
         return guardrail_results
 
+    @classmethod
+    async def _get_system_prompt(
+        cls,
+        agent: Agent[TContext],
+        context_wrapper: RunContextWrapper[TContext],
+        run_config: RunConfig,
+        new_activation: bool,
+    ) -> str | None:
+        cache = agent.instructions_cache
+        if cache is None and run_config.stable_prompt_prefix:
+            cache = _STABLE_PREFIX_INSTRUCTIONS_CACHE
+        if cache is None or not callable(agent.instructions):
+            return await agent.get_system_prompt(context_wrapper)
+        return await cache.get_system_prompt(agent, context_wrapper, new_activation)
+
     @classmethod
     async def _get_new_response(
         cls,
         agent: Agent[TContext],
+        model: Model,
         system_prompt: str | None,
         input: list[TResponseInputItem],
         output_schema: AgentOutputSchemaBase | None,
@@ -912,57 +1543,79 @@ class Runner:
         tool_use_tracker: AgentToolUseTracker,
         previous_response_id: str | None,
     ) -> ModelResponse:
-        model = cls._get_model(agent, run_config)
         model_settings = agent.model_settings.resolve(run_config.model_settings)
         model_settings = RunImpl.maybe_reset_tool_choice(agent, tool_use_tracker, model_settings)
 
-        new_response = await model.get_response(
-            system_instructions=system_prompt,
-            input=input,
-            model_settings=model_settings,
-            tools=all_tools,
-            output_schema=output_schema,
-            handoffs=handoffs,
-            tracing=get_model_tracing_impl(
-                run_config.tracing_disabled, run_config.trace_include_sensitive_data
-            ),
-            previous_response_id=previous_response_id,
-        )
+        async with cls._model_limit(agent, model, run_config):
+            with record_phase("model_response"):
+                new_response = await model.get_response(
+                    system_instructions=system_prompt,
+                    input=input,
+                    model_settings=model_settings,
+                    tools=all_tools,
+                    output_schema=output_schema,
+                    handoffs=handoffs,
+                    tracing=get_model_tracing_impl(
+                        run_config.tracing_disabled, run_config.trace_include_sensitive_data
+                    ),
+                    previous_response_id=previous_response_id,
+                )
 
-        context_wrapper.usage.add(new_response.usage)
+        context_wrapper.add_usage(new_response.usage, agent.name)
 
         return new_response
 
     @classmethod
-    def _get_output_schema(cls, agent: Agent[Any]) -> AgentOutputSchemaBase | None:
-        if agent.output_type is None or agent.output_type is str:
-            return None
-        elif isinstance(agent.output_type, AgentOutputSchemaBase):
-            return agent.output_type
+    @contextlib.asynccontextmanager
+    async def _model_limit(
+        cls, agent: Agent[Any], model: Model, run_config: RunConfig
+    ) -> AsyncIterator[None]:
+        limits = run_config.model_concurrency_limits
+        if not limits:
+            yield
+            return
+
+        configured_name = run_config.model if run_config.model is not None else agent.model
+        for name in (configured_name, getattr(model, "model", None)):
+            if isinstance(name, str) and name in limits:
+                slots = run_config._concurrency_limits.get(("model", name), limits[name])
+                async with slots.acquire():
+                    yield
+                return
+        yield
 
-        return AgentOutputSchema(agent.output_type)
+    @classmethod
+    async def _stream_with_model_limit(
+        cls,
+        agent: Agent[Any],
+        model: Model,
+        run_config: RunConfig,
+        stream: AsyncIterator[TResponseStreamEvent],
+    ) -> AsyncGenerator[TResponseStreamEvent, None]:
+        async with cls._model_limit(agent, model, run_config):
+            start = time.perf_counter()
+            first_event = True
+            try:
+                async for event in stream:
+                    if first_event:
+                        add_phase("time_to_first_token", start)
+                        first_event = False
+                    yield event
+            finally:
+                # Close the model's stream right away if we stop early, instead of when it's
+                # garbage collected, so the request is aborted.
+                if isinstance(stream, AsyncGenerator):
+                    await stream.aclose()
+            add_phase("stream", start)
 
     @classmethod
-    def _get_handoffs(cls, agent: Agent[Any]) -> list[Handoff]:
-        handoffs = []
-        for handoff_item in agent.handoffs:
-            if isinstance(handoff_item, Handoff):
-                handoffs.append(handoff_item)
-            elif isinstance(handoff_item, Agent):
-                handoffs.append(handoff(handoff_item))
-        return handoffs
+    def _get_output_schema(cls, agent: Agent[Any]) -> AgentOutputSchemaBase | None:
+        return get_output_schema(agent)
 
     @classmethod
-    async def _get_all_tools(cls, agent: Agent[Any]) -> list[Tool]:
-        return await agent.get_all_tools()
+    def _get_handoffs(cls, agent: Agent[Any]) -> list[Handoff]:
+        return get_handoffs(agent)
 
     @classmethod
     def _get_model(cls, agent: Agent[Any], run_config: RunConfig) -> Model:
-        if isinstance(run_config.model, Model):
-            return run_config.model
-        elif isinstance(run_config.model, str):
-            return run_config.model_provider.get_model(run_config.model)
-        elif isinstance(agent.model, Model):
-            return agent.model
-
-        return run_config.model_provider.get_model(agent.model)
+        return resolve_model(agent, run_config)
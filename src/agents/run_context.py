@@ -1,8 +1,11 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from typing import Any, Generic
 
 from typing_extensions import TypeVar
 
+from .timings import RunTimings
 from .usage import Usage
 
 TContext = TypeVar("TContext", default=Any)
@@ -24,3 +27,27 @@ class RunContextWrapper(Generic[TContext]):
     """The usage of the agent run so far. For streamed responses, the usage will be stale until the
     last chunk of the stream is processed.
     """
+
+    usage_by_agent: dict[str, Usage] = field(default_factory=dict)
+    """The usage of the model calls made so far, per agent name. Includes the model calls of
+    sub-runs, such as agents used as tools and fan-out branches.
+    """
+
+    timings: RunTimings = field(default_factory=RunTimings, repr=False, compare=False)
+    """The per-phase timings of the agent run so far."""
+
+    _instructions: dict[int, tuple[Any, str | None]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def add_usage(self, usage: Usage, agent_name: str | None = None) -> None:
+        """Adds usage to the run's usage, and to the usage of `agent_name` if given."""
+        self.usage.add(usage)
+        if agent_name is not None:
+            self.usage_by_agent.setdefault(agent_name, Usage()).add(usage)
+
+    def add_sub_run_usage(self, sub_run: RunContextWrapper[Any]) -> None:
+        """Adds the usage of a sub-run, including its usage per agent, to the run's usage."""
+        self.usage.add(sub_run.usage)
+        for agent_name, usage in sub_run.usage_by_agent.items():
+            self.usage_by_agent.setdefault(agent_name, Usage()).add(usage)
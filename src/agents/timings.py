@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import math
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from .exceptions import UserError
+
+Phase = Literal[
+    "system_prompt",
+    "list_tools",
+    "hooks",
+    "prepare_input",
+    "convert_input",
+    "build_request",
+    "model_response",
+    "time_to_first_token",
+    "stream",
+    "process_response",
+    "tool",
+    "input_guardrail",
+    "output_guardrail",
+]
+"""The phases of a turn that the runner times.
+
+- `system_prompt`: resolving the agent's instructions (`Agent.get_system_prompt`).
+- `list_tools`: listing the agent's tools, including MCP tools (`Agent.get_all_tools`). Happens
+    when an agent starts, not on every turn.
+- `hooks`: the agent start and end hooks, and the tool end hooks.
+- `prepare_input`: building the model input from the run's items, including the history policy.
+- `convert_input`: converting the input into the provider's message format, inside the model.
+- `build_request`: converting tools and the output schema, and assembling the request parameters,
+    inside the model. The HTTP client serializes the request body itself, so that part is counted
+    in `model_response`/`stream`.
+- `model_response`: the model call of a non-streamed turn, from the request to the parsed response.
+- `time_to_first_token`: from the start of a streamed model call to its first event.
+- `stream`: from the start of a streamed model call to its last event.
+- `process_response`: turning the model response into run items (`RunImpl.process_model_response`).
+- `tool`: a single tool execution, named after the tool. Waiting on tool concurrency limits is not
+    included.
+- `input_guardrail`, `output_guardrail`: a single guardrail, named after the guardrail.
+
+Phases can overlap: `convert_input` and `build_request` happen inside `model_response` or `stream`,
+and tools and guardrails may run concurrently with each other and with the model.
+"""
+
+
+@dataclass
+class PhaseTiming:
+    """The timing of a single phase of a run."""
+
+    phase: Phase
+    """The phase that was timed."""
+
+    start: float
+    """When the phase started, as a `time.perf_counter()` value. Only meaningful relative to other
+    timings from the same process."""
+
+    duration: float
+    """How long the phase took, in seconds."""
+
+    turn: int
+    """The turn the phase belongs to, starting at 1."""
+
+    agent: str | None
+    """The name of the agent that was running."""
+
+    name: str | None = None
+    """The tool or guardrail name, for the `tool` and guardrail phases."""
+
+
+@dataclass
+class RunTimings:
+    """The phase timings of a run, in the order the phases finished. Available as
+    `RunContextWrapper.timings` during the run and as `RunResult.timings` after it.
+    """
+
+    entries: list[PhaseTiming] = field(default_factory=list)
+    """All recorded timings."""
+
+    turn: int = 0
+    """The current turn."""
+
+    agent: str | None = None
+    """The name of the current agent."""
+
+    def begin_turn(self, turn: int, agent: str) -> None:
+        """Marks the start of a turn. Phases recorded from here on are attributed to it."""
+        self.turn = turn
+        self.agent = agent
+
+    def record(
+        self, phase: Phase, start: float, *, name: str | None = None, turn: int | None = None
+    ) -> PhaseTiming:
+        """Records a phase that started at `start` (a `time.perf_counter()` value) and just ended.
+
+        Args:
+            phase: The phase.
+            start: When the phase started.
+            name: The tool or guardrail name, if any.
+            turn: The turn to attribute the phase to. Defaults to the current turn.
+        """
+        timing = PhaseTiming(
+            phase=phase,
+            start=start,
+            duration=time.perf_counter() - start,
+            turn=self.turn if turn is None else turn,
+            agent=self.agent,
+            name=name,
+        )
+        self.entries.append(timing)
+        return timing
+
+    def for_turn(self, turn: int) -> list[PhaseTiming]:
+        """Returns the timings of the given turn."""
+        return [timing for timing in self.entries if timing.turn == turn]
+
+    def total(self, phase: Phase, *, turn: int | None = None) -> float:
+        """Returns the summed duration of a phase, for the whole run or for a single turn."""
+        return sum(
+            timing.duration
+            for timing in self.entries
+            if timing.phase == phase and (turn is None or timing.turn == turn)
+        )
+
+    def by_phase(self) -> dict[str, float]:
+        """Returns the summed duration of each phase that was recorded."""
+        totals: dict[str, float] = {}
+        for timing in self.entries:
+            totals[timing.phase] = totals.get(timing.phase, 0.0) + timing.duration
+        return totals
+
+
+_current_timings: contextvars.ContextVar[RunTimings | None] = contextvars.ContextVar(
+    "current_timings", default=None
+)
+
+
+def get_current_timings() -> RunTimings | None:
+    """Returns the timings of the run that the current task belongs to, or None outside of a
+    run."""
+    return _current_timings.get()
+
+
+def set_current_timings(timings: RunTimings | None) -> contextvars.Token[RunTimings | None]:
+    return _current_timings.set(timings)
+
+
+def reset_current_timings(token: contextvars.Token[RunTimings | None]) -> None:
+    _current_timings.reset(token)
+
+
+@contextlib.contextmanager
+def record_phase(phase: Phase, name: str | None = None) -> Iterator[None]:
+    """Times the enclosed block as `phase` of the current run. Does nothing outside of a run.
+
+    Args:
+        phase: The phase.
+        name: The tool or guardrail name, if any.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    turn = timings.turn
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(phase, start, name=name, turn=turn)
+
+
+def add_phase(phase: Phase, start: float, name: str | None = None) -> None:
+    """Records `phase` of the current run as having started at `start` (a `time.perf_counter()`
+    value) and just ended. Does nothing outside of a run.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.record(phase, start, name=name)
+
+
+class LatencyHistogram:
+    """A histogram of durations with logarithmic buckets, so percentiles have a bounded relative
+    error rather than an absolute one. Safe to update from multiple threads.
+
+    Args:
+        growth: The ratio between the bounds of consecutive buckets. Percentiles overestimate by at
+            most this factor.
+        min_value: The upper bound of the first bucket, in seconds.
+    """
+
+    def __init__(self, growth: float = 2**0.25, min_value: float = 1e-6) -> None:
+        if growth <= 1:
+            raise UserError("growth must be greater than 1")
+        self.growth = growth
+        self.min_value = min_value
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: dict[int, int] = {}
+        self._log_growth = math.log(growth)
+        self._lock = threading.Lock()
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return math.ceil(math.log(value / self.min_value) / self._log_growth)
+
+    def _upper_bound(self, bucket: int) -> float:
+        return self.min_value * self.growth**bucket
+
+    def add(self, value: float) -> None:
+        """Adds a duration, in seconds."""
+        bucket = self._bucket(value)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.sum += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Adds all durations of another histogram with the same bucket layout."""
+        if (other.growth, other.min_value) != (self.growth, self.min_value):
+            raise UserError("Can only merge histograms with the same buckets")
+        with other._lock:
+            buckets = dict(other._buckets)
+            count, total, low, high = other.count, other.sum, other.min, other.max
+        with self._lock:
+            for bucket, bucket_count in buckets.items():
+                self._buckets[bucket] = self._buckets.get(bucket, 0) + bucket_count
+            self.count += count
+            self.sum += total
+            self.min = min(self.min, low)
+            self.max = max(self.max, high)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Returns an upper bound of the `p`th percentile (0-100), or 0 if the histogram is
+        empty."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(p / 100 * self.count))
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(self._upper_bound(bucket), self.max)
+            return self.max
+
+    def to_json_dict(self) -> dict[str, Any]:
+        """Returns a JSON-compatible summary with the count, sum, min, max and common
+        percentiles."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class PhaseHistograms:
+    """Aggregates the phase timings of many runs into one `LatencyHistogram` per phase.
+
+    ```python
+    histograms = PhaseHistograms()
+    for question in questions:
+        result = await Runner.run(agent, question)
+        histograms.add(result.timings)
+    print(histograms["model_response"].percentile(99))
+    ```
+
+    Args:
+        by_name: Whether to keep a separate histogram per tool and guardrail, keyed as
+            `"tool:<name>"`, instead of one per phase.
+        growth: Passed to each `LatencyHistogram`.
+        min_value: Passed to each `LatencyHistogram`.
+    """
+
+    def __init__(
+        self, *, by_name: bool = False, growth: float = 2**0.25, min_value: float = 1e-6
+    ) -> None:
+        self.by_name = by_name
+        self.growth = growth
+        self.min_value = min_value
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram(self.growth, self.min_value)
+                self._histograms[key] = histogram
+            return histogram
+
+    def add(self, timings: RunTimings | Iterable[PhaseTiming]) -> None:
+        """Adds every timing of a run, or of a subset of its timings such as a single turn."""
+        entries = timings.entries if isinstance(timings, RunTimings) else timings
+        for timing in entries:
+            key: str = timing.phase
+            if self.by_name and timing.name is not None:
+                key = f"{timing.phase}:{timing.name}"
+            self._get(key).add(timing.duration)
+
+    def __getitem__(self, key: str) -> LatencyHistogram:
+        return self._histograms[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._histograms
+
+    def keys(self) -> list[str]:
+        """Returns the phases (or `phase:name` keys) that have a histogram."""
+        return list(self._histograms)
+
+    def to_json_dict(self) -> dict[str, dict[str, Any]]:
+        """Returns the JSON-compatible summary of every histogram."""
+        return {key: histogram.to_json_dict() for key, histogram in self._histograms.items()}
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import abc
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .logger import logger
+
+# Message framing, per item and for priming the reply, as documented for OpenAI chat models.
+_TOKENS_PER_ITEM = 3
+_TOKENS_PER_REPLY = 3
+_TOKENS_PER_TOOL = 8
+
+# Images are billed by size and detail rather than by the length of their URL or data. This is the
+# cost of a 1024x1024 image at high detail, a reasonable upper-middle estimate.
+_TOKENS_PER_IMAGE = 765
+_IMAGE_KEYS = ("image_url", "file_data")
+
+# Keys whose values are protocol framing or identifiers, not text the model reads.
+_SKIPPED_KEYS = frozenset({"type", "id", "status", "role"})
+
+
+class Tokenizer(abc.ABC):
+    """Counts the tokens in a piece of text. Implementations must not access the network."""
+
+    name: str = "tokenizer"
+    """Identifies the tokenizer in estimates and traces."""
+
+    cache_counts: bool = True
+    """Whether the token estimator should cache this tokenizer's counts. Tokenizers that are
+    cheaper than a cache lookup turn this off."""
+
+    @abc.abstractmethod
+    def count(self, text: str) -> int:
+        """Returns the number of tokens in the text."""
+        pass
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Estimates tokens from the length of the text. Very fast, and usually within 20% for English
+    text and code, but less accurate for other languages."""
+
+    name = "heuristic"
+    cache_counts = False
+
+    def __init__(self, chars_per_token: float = 4.0) -> None:
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Counts tokens exactly, with a byte-pair encoding from the `tiktoken` package.
+
+    `tiktoken` downloads encodings on first use. To work offline, either pre-populate its cache
+    (set `TIKTOKEN_CACHE_DIR`) or pass an `Encoding` you built yourself.
+    """
+
+    def __init__(self, encoding: Any = "o200k_base") -> None:
+        """
+        Args:
+            encoding: The name of a `tiktoken` encoding, or a `tiktoken.Encoding`.
+        """
+        if isinstance(encoding, str):
+            self.name = encoding
+            self._encoding: Any = None
+        else:
+            self.name = encoding.name
+            self._encoding = encoding
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available(encoding: str = "o200k_base") -> bool:
+        """Returns whether `tiktoken` is installed and the encoding can be loaded without network
+        access."""
+        try:
+            import tiktoken.registry
+        except ImportError:
+            return False
+        if encoding in tiktoken.registry.ENCODINGS:
+            return True
+        # Mirrors how tiktoken locates its cache, so that we never trigger a download.
+        default_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+        cache_dir = os.environ.get(
+            "TIKTOKEN_CACHE_DIR", os.environ.get("DATA_GYM_CACHE_DIR", default_dir)
+        )
+        url = f"https://openaipublic.blob.core.windows.net/encodings/{encoding}.tiktoken"
+        cache_key = hashlib.sha1(url.encode()).hexdigest()
+        return bool(cache_dir) and os.path.exists(os.path.join(cache_dir, cache_key))
+
+    def count(self, text: str) -> int:
+        if self._encoding is None:
+            with self._lock:
+                if self._encoding is None:
+                    import tiktoken
+
+                    self._encoding = tiktoken.get_encoding(self.name)
+        return len(self._encoding.encode_ordinary(text))
+
+
+_default_tokenizer: Tokenizer | None = None
+
+
+def get_default_tokenizer() -> Tokenizer:
+    """Returns the tokenizer used by default: a `TiktokenTokenizer` for `o200k_base` if it is
+    available offline, and a `HeuristicTokenizer` otherwise."""
+    global _default_tokenizer
+    if _default_tokenizer is None:
+        if TiktokenTokenizer.is_available("o200k_base"):
+            _default_tokenizer = TiktokenTokenizer("o200k_base")
+        else:
+            logger.debug("tiktoken encoding not available offline, estimating tokens heuristically")
+            _default_tokenizer = HeuristicTokenizer()
+    return _default_tokenizer
+
+
+def set_default_tokenizer(tokenizer: Tokenizer) -> None:
+    """Sets the tokenizer used by the default token estimator."""
+    global _default_tokenizer
+    _default_tokenizer = tokenizer
+
+
+@dataclass
+class TokenEstimate:
+    """A local estimate of the size of a model request, made before it is sent."""
+
+    input_tokens: int
+    """The estimated total number of input tokens."""
+
+    messages: int
+    """The tokens spent on the system instructions and input items."""
+
+    tools: int
+    """The tokens spent on tool and handoff definitions."""
+
+    response_format: int
+    """The tokens spent on the response format."""
+
+    tokenizer: str
+    """The name of the tokenizer that made the estimate."""
+
+    def to_json_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+class TokenEstimator:
+    """Estimates the number of tokens in a model request, without calling the model.
+
+    Counts are cached per string, so estimating a conversation that grew by a few items since the
+    last estimate only tokenizes the text of the new items. The rest of the request is walked to
+    look up the cached counts, which costs about as much as converting it.
+    """
+
+    def __init__(self, tokenizer: Tokenizer | None = None, max_cached_items: int = 8192) -> None:
+        """
+        Args:
+            tokenizer: The tokenizer to use. Defaults to `get_default_tokenizer()`, looked up on
+                each use.
+            max_cached_items: The number of string counts to cache.
+        """
+        self._tokenizer = tokenizer
+        self.max_cached_items = max_cached_items
+        self._counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        return self._tokenizer if self._tokenizer is not None else get_default_tokenizer()
+
+    def count_text(self, text: str) -> int:
+        """Returns the number of tokens in the text."""
+        return self._count_text(text, self.tokenizer)
+
+    def count_item(self, item: Any) -> int:
+        """Returns the number of tokens an input item or message takes up, including its
+        framing."""
+        return _TOKENS_PER_ITEM + self._count_value(item, self.tokenizer)
+
+    def count_definition(self, definition: Any) -> int:
+        """Returns the number of tokens a tool definition or response format takes up."""
+        # Definitions are rendered to the model in a compact format of their own, which their JSON
+        # approximates. Unlike in messages, keys (e.g. parameter names) are part of the text.
+        text = json.dumps(definition, separators=(",", ":"), default=str)
+        return self._count_text(text, self.tokenizer)
+
+    def estimate(
+        self,
+        input: str | Iterable[Any],
+        *,
+        system_instructions: str | None = None,
+        tools: Iterable[Any] = (),
+        response_format: Any = None,
+    ) -> TokenEstimate:
+        """Estimates the size of a request.
+
+        Args:
+            input: The input items or messages, exactly as they will be sent.
+            system_instructions: System instructions sent separately from the input, if any.
+            tools: The tool definitions, exactly as they will be sent.
+            response_format: The response format, exactly as it will be sent, if any.
+        """
+        if isinstance(input, str):
+            input = [{"role": "user", "content": input}]
+        messages = sum(self.count_item(item) for item in input)
+        if system_instructions:
+            messages += _TOKENS_PER_ITEM + self.count_text(system_instructions)
+        tool_tokens = sum(_TOKENS_PER_TOOL + self.count_definition(tool) for tool in tools)
+        format_tokens = self.count_definition(response_format) if response_format else 0
+        return TokenEstimate(
+            input_tokens=messages + tool_tokens + format_tokens + _TOKENS_PER_REPLY,
+            messages=messages,
+            tools=tool_tokens,
+            response_format=format_tokens,
+            tokenizer=self.tokenizer.name,
+        )
+
+    def _count_text(self, text: str, tokenizer: Tokenizer) -> int:
+        if not tokenizer.cache_counts:
+            return tokenizer.count(text)
+        # Strings cache their hash, and the runner passes the same strings from turn to turn, so
+        # looking up an unchanged item's text doesn't rehash it.
+        key = (tokenizer.name, text)
+        with self._lock:
+            result = self._counts.get(key)
+            if result is not None:
+                self._counts.move_to_end(key)
+                return result
+        result = tokenizer.count(text)
+        with self._lock:
+            self._counts[key] = result
+            while len(self._counts) > self.max_cached_items:
+                self._counts.popitem(last=False)
+        return result
+
+    def _count_value(self, value: Any, tokenizer: Tokenizer) -> int:
+        if isinstance(value, str):
+            return self._count_text(value, tokenizer)
+        if isinstance(value, Mapping):
+            total = 0
+            for key, item in value.items():
+                if key in _SKIPPED_KEYS:
+                    continue
+                if key in _IMAGE_KEYS and isinstance(item, str):
+                    total += _TOKENS_PER_IMAGE
+                else:
+                    total += self._count_value(item, tokenizer)
+            return total
+        if isinstance(value, (list, tuple)):
+            return sum(self._count_value(item, tokenizer) for item in value)
+        if value is None or isinstance(value, bool):
+            return 0
+        if isinstance(value, (int, float)):
+            return self._count_text(str(value), tokenizer)
+        # Pydantic models and the like.
+        if hasattr(value, "model_dump"):
+            return self._count_value(value.model_dump(exclude_unset=True), tokenizer)
+        return self._count_text(str(value), tokenizer)
+
+
+_default_estimator = TokenEstimator()
+
+
+def get_default_token_estimator() -> TokenEstimator:
+    """Returns the token estimator used by models, history policies and tool output budgets."""
+    return _default_estimator
+
+
+def set_default_token_estimator(estimator: TokenEstimator) -> None:
+    """Sets the token estimator used by models, history policies and tool output budgets."""
+    global _default_estimator
+    _default_estimator = estimator
@@ -3,7 +3,8 @@ from __future__ import annotations
 import inspect
 import json
 from collections.abc import Awaitable
-from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, Callable, Literal, Union, overload
 
 from openai.types.responses.file_search_tool_param import Filters, RankingOptions
@@ -12,14 +13,25 @@ from pydantic import ValidationError
 from typing_extensions import Concatenate, ParamSpec
 
 from . import _debug
+from ._run_scope import get_current_run_config
 from .computer import AsyncComputer, Computer
-from .exceptions import ModelBehaviorError
+from .exceptions import ModelBehaviorError, UserError
 from .function_schema import DocstringStyle, function_schema
 from .items import RunItem
 from .logger import logger
 from .run_context import RunContextWrapper
+from .tool_cache import ToolCache
+from .tool_output import ToolOutputBudget
 from .tracing import SpanError
 from .util import _error_tracing
+from .util._concurrency import ConcurrencyLimit
+from .util._executors import (
+    get_tool_process_pool,
+    get_tool_thread_pool,
+    register_process_function,
+    run_in_executor,
+    run_in_process,
+)
 from .util._types import MaybeAwaitable
 
 ToolParams = ParamSpec("ToolParams")
@@ -29,6 +41,20 @@ ToolFunctionWithContext = Callable[Concatenate[RunContextWrapper[Any], ToolParam
 
 ToolFunction = Union[ToolFunctionWithoutContext[ToolParams], ToolFunctionWithContext[ToolParams]]
 
+ToolExecutor = Union[Literal["inline", "thread", "process"], Executor]
+"""Where a synchronous function tool runs:
+- `"inline"`: directly on the event loop thread. Only suitable for functions that return quickly,
+  since every other task on the loop is blocked while the function runs.
+- `"thread"`: in a thread pool shared by all tools, so blocking I/O doesn't stall the event loop.
+- `"process"`: in a process pool shared by all tools, so CPU-bound work doesn't hold the GIL. The
+  function must be defined at module level and must not take a context, and its arguments and
+  return value must be picklable.
+- An `Executor` instance: in the given executor. A `ProcessPoolExecutor` has the same requirements
+  as `"process"`.
+
+Async function tools always run on the event loop.
+"""
+
 
 @dataclass
 class FunctionToolResult:
@@ -72,6 +98,36 @@ class FunctionTool:
     """Whether the JSON schema is in strict mode. We **strongly** recommend setting this to True,
     as it increases the likelihood of correct JSON input."""
 
+    timeout: float | None = None
+    """The maximum number of seconds a call to the tool may run for. A call that takes longer is
+    cancelled, and the model is told that the tool timed out. If None, the run config's
+    `tool_timeout` applies."""
+
+    max_concurrency: int | None = None
+    """The maximum number of calls to this tool that may run at once, across every run in the
+    process. Further calls wait for a slot. If None, calls are only limited by the run config."""
+
+    output_budget: ToolOutputBudget | None = None
+    """Limits the size of the tool's output as sent to the model. If None, the run config's
+    `tool_output_budget` applies."""
+
+    exempt_from_output_budget: bool = False
+    """Whether the run config's `tool_output_budget` is skipped for this tool, e.g. because the
+    tool already limits the size of its output. The tool's own `output_budget` still applies."""
+
+    _concurrency_limit: ConcurrencyLimit | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency is not None:
+            if self.max_concurrency < 1:
+                raise UserError(
+                    f"max_concurrency for tool {self.name} must be at least 1, got "
+                    f"{self.max_concurrency}"
+                )
+            self._concurrency_limit = ConcurrencyLimit(self.max_concurrency)
+
 
 @dataclass
 class FileSearchTool:
@@ -152,6 +208,11 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
     strict_mode: bool = True,
+    executor: ToolExecutor | None = None,
+    cache: ToolCache | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    output_budget: ToolOutputBudget | None = None,
 ) -> FunctionTool:
     """Overload for usage as @function_tool (no parentheses)."""
     ...
@@ -166,6 +227,11 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = None,
     strict_mode: bool = True,
+    executor: ToolExecutor | None = None,
+    cache: ToolCache | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    output_budget: ToolOutputBudget | None = None,
 ) -> Callable[[ToolFunction[...]], FunctionTool]:
     """Overload for usage as @function_tool(...)."""
     ...
@@ -180,6 +246,11 @@ def function_tool(
     use_docstring_info: bool = True,
     failure_error_function: ToolErrorFunction | None = default_tool_error_function,
     strict_mode: bool = True,
+    executor: ToolExecutor | None = None,
+    cache: ToolCache | None = None,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    output_budget: ToolOutputBudget | None = None,
 ) -> FunctionTool | Callable[[ToolFunction[...]], FunctionTool]:
     """
     Decorator to create a FunctionTool from a function. By default, we will:
@@ -208,7 +279,26 @@ def function_tool(
             If False, it allows non-strict JSON schemas. For example, if a parameter has a default
             value, it will be optional, additional properties are allowed, etc. See here for more:
             https://platform.openai.com/docs/guides/structured-outputs?api-mode=responses#supported-schemas
+        executor: Where to run the function, if it is synchronous. See `ToolExecutor` for the
+            options. If not provided, the run config's `tool_executor` is used, which defaults to a
+            shared thread pool.
+        cache: If provided, successful results are memoized in this cache, keyed on the tool name
+            and its arguments. Only use this for tools whose results depend solely on their
+            arguments.
+        timeout: The maximum number of seconds a call may run for. A call that takes longer is
+            cancelled, and the model is told that the tool timed out. A synchronous function
+            running in a thread or process can't be interrupted, so it keeps its concurrency slots
+            until it returns.
+        max_concurrency: The maximum number of calls to the tool that may run at once, across
+            every run in the process.
+        output_budget: Limits the size of the tool's output as sent to the model. Outputs over
+            budget are shrunk before they are added to the conversation.
     """
+    if executor is not None and not _is_valid_executor(executor):
+        raise UserError(
+            f"Invalid tool executor {executor!r}. Expected 'inline', 'thread', 'process' or an "
+            "Executor."
+        )
 
     def _create_function_tool(the_func: ToolFunction[...]) -> FunctionTool:
         schema = function_schema(
@@ -219,6 +309,9 @@ def function_tool(
             use_docstring_info=use_docstring_info,
             strict_json_schema=strict_mode,
         )
+        if _runs_in_process(executor):
+            _check_process_function(the_func, schema.takes_context)
+            register_process_function(the_func)
 
         async def _on_invoke_tool_impl(ctx: RunContextWrapper[Any], input: str) -> Any:
             try:
@@ -257,10 +350,15 @@ def function_tool(
                 else:
                     result = await the_func(*args, **kwargs_dict)
             else:
+                resolved_executor = _resolve_executor(executor)
                 if schema.takes_context:
-                    result = the_func(ctx, *args, **kwargs_dict)
+                    result = await _run_sync_function(
+                        resolved_executor, the_func, ctx, *args, **kwargs_dict
+                    )
                 else:
-                    result = the_func(*args, **kwargs_dict)
+                    result = await _run_sync_function(
+                        resolved_executor, the_func, *args, **kwargs_dict
+                    )
 
             if _debug.DONT_LOG_TOOL_DATA:
                 logger.debug(f"Tool {schema.name} completed.")
@@ -271,6 +369,10 @@ def function_tool(
 
         async def _on_invoke_tool(ctx: RunContextWrapper[Any], input: str) -> Any:
             try:
+                if cache is not None:
+                    return await cache.get_or_call(
+                        schema.name, input, lambda: _on_invoke_tool_impl(ctx, input)
+                    )
                 return await _on_invoke_tool_impl(ctx, input)
             except Exception as e:
                 if failure_error_function is None:
@@ -297,6 +399,9 @@ def function_tool(
             params_json_schema=schema.params_json_schema,
             on_invoke_tool=_on_invoke_tool,
             strict_json_schema=strict_mode,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            output_budget=output_budget,
         )
 
     # If func is actually a callable, we were used as @function_tool with no parentheses
@@ -308,3 +413,48 @@ def function_tool(
         return _create_function_tool(real_func)
 
     return decorator
+
+
+def _is_valid_executor(executor: Any) -> bool:
+    return executor in ("inline", "thread", "process") or isinstance(executor, Executor)
+
+
+def _runs_in_process(executor: ToolExecutor | None) -> bool:
+    return executor == "process" or isinstance(executor, ProcessPoolExecutor)
+
+
+def _check_process_function(func: Callable[..., Any], takes_context: bool) -> None:
+    name = getattr(func, "__qualname__", repr(func))
+    if inspect.iscoroutinefunction(func):
+        raise UserError(f"Tool {name} is async, so it can't be run in a process.")
+    if takes_context:
+        raise UserError(
+            f"Tool {name} takes a RunContextWrapper, which can't be sent to another process. Run "
+            "it in a thread instead, or pass the values it needs as arguments."
+        )
+    if not inspect.isfunction(func) or "<locals>" in func.__qualname__:
+        raise UserError(
+            f"Tool {name} must be a function defined at module level to be run in a process."
+        )
+
+
+def _resolve_executor(executor: ToolExecutor | None) -> ToolExecutor:
+    if executor is not None:
+        return executor
+    run_config = get_current_run_config()
+    return run_config.tool_executor if run_config is not None else "thread"
+
+
+async def _run_sync_function(
+    executor: ToolExecutor, func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    if executor == "inline":
+        return func(*args, **kwargs)
+    if executor == "thread":
+        executor = get_tool_thread_pool()
+    elif executor == "process":
+        executor = get_tool_process_pool()
+    assert isinstance(executor, Executor)
+    if isinstance(executor, ProcessPoolExecutor):
+        return await run_in_process(executor, func, *args, **kwargs)
+    return await run_in_executor(executor, func, *args, **kwargs)
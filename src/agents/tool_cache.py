@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from . import _debug
+from .logger import logger
+from .tracing import FunctionSpanData, get_current_span
+
+
+@dataclass
+class ToolCacheEntry:
+    """A cached tool result."""
+
+    value: Any
+    """The output of the tool."""
+
+    expires_at: float | None
+    """The Unix time after which the entry is stale, or None if it never expires."""
+
+    def is_expired(self, now: float | None = None) -> bool:
+        if now is None:
+            now = time.time()
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class ToolCacheBackend(abc.ABC):
+    """Storage for a `ToolCache`. Backends keep entries in least-recently-used order; the cache
+    decides when to evict."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> ToolCacheEntry | None:
+        """Returns the entry for the key, marking it as the most recently used, or None."""
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: ToolCacheEntry) -> None:
+        """Stores the entry, marking it as the most recently used."""
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes the entry for the key, if there is one."""
+        pass
+
+    @abc.abstractmethod
+    def pop_least_recently_used(self) -> None:
+        """Removes the least recently used entry."""
+        pass
+
+    @abc.abstractmethod
+    def keys(self) -> list[str]:
+        """Returns the keys of every stored entry."""
+        pass
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Removes every entry."""
+        pass
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class InMemoryToolCacheBackend(ToolCacheBackend):
+    """Keeps entries in memory, for the lifetime of the process."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, ToolCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> ToolCacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: ToolCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_least_recently_used(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._entries.popitem(last=False)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskToolCacheBackend(ToolCacheBackend):
+    """Keeps entries in a SQLite database, so they survive restarts and can be shared by several
+    processes. Values are pickled, so only cache tools whose outputs are picklable."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            "key TEXT PRIMARY KEY, value BLOB, expires_at REAL, last_used INTEGER)"
+        )
+
+    def get(self, key: str) -> ToolCacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE tool_cache SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+        return ToolCacheEntry(value=pickle.loads(row[0]), expires_at=row[1])
+
+    def set(self, key: str, entry: ToolCacheEntry) -> None:
+        value = pickle.dumps(entry.value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache VALUES (?, ?, ?, ?)",
+                (key, value, entry.expires_at, time.time_ns()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+
+    def pop_least_recently_used(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM tool_cache WHERE key = "
+                "(SELECT key FROM tool_cache ORDER BY last_used LIMIT 1)"
+            )
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM tool_cache")]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0])
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._conn.close()
+
+
+def _canonical_arguments(arguments: str) -> Any:
+    return json.loads(arguments) if arguments else {}
+
+
+class ToolCache:
+    """Memoizes the results of function tools, keyed on the tool name and its arguments. Pass it
+    to `function_tool(cache=...)`; one cache can be shared by several tools, and by every run that
+    uses them.
+
+    Only successful calls are cached. Arguments are compared after parsing, so the formatting and
+    key order of the JSON produced by the model don't matter.
+
+    Cached results can go stale when a tool has side effects elsewhere. Use `invalidate()` to drop
+    them, for example from a tool that writes a file:
+
+    ```python
+    cache = ToolCache(ttl=300)
+
+    @function_tool(cache=cache)
+    def read_file(path: str) -> str: ...
+
+    @function_tool
+    def write_file(path: str, content: str) -> str:
+        ...
+        cache.invalidate("read_file", path=path)
+    ```
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_entries: int | None = 1024,
+        backend: ToolCacheBackend | None = None,
+    ) -> None:
+        """
+        Args:
+            ttl: How long results stay fresh, in seconds. If None, results never expire.
+            max_entries: The maximum number of results to keep. When the cache is full, the least
+                recently used result is evicted. If None, the cache is unbounded.
+            backend: Where to store results. Defaults to an `InMemoryToolCacheBackend`.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend if backend is not None else InMemoryToolCacheBackend()
+
+        self.hits = 0
+        """The number of calls answered from the cache."""
+
+        self.misses = 0
+        """The number of calls that ran the tool."""
+
+        self.evictions = 0
+        """The number of results evicted to stay within `max_entries`."""
+
+        # Calls that are running, so that identical concurrent calls wait for the same result.
+        self._in_flight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future[Any]] = {}
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: str) -> str:
+        """Returns the cache key for a call to the tool with the given JSON arguments."""
+        return json.dumps(
+            [tool_name, _canonical_arguments(arguments)],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+    def get(self, tool_name: str, arguments: str) -> tuple[bool, Any]:
+        """Looks up a result. Returns `(True, value)` on a hit, and `(False, None)` on a miss."""
+        key = self.make_key(tool_name, arguments)
+        entry = self.backend.get(key)
+        if entry is not None and entry.is_expired():
+            self.backend.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry.value
+
+    def set(self, tool_name: str, arguments: str, value: Any) -> None:
+        """Stores a result, evicting the least recently used results if the cache is full."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self.backend.set(
+            self.make_key(tool_name, arguments), ToolCacheEntry(value=value, expires_at=expires_at)
+        )
+        if self.max_entries is not None:
+            while len(self.backend) > self.max_entries:
+                self.backend.pop_least_recently_used()
+                self.evictions += 1
+
+    async def get_or_call(
+        self, tool_name: str, arguments: str, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Returns the cached result for the call, or awaits `call()` and caches its result. An
+        identical call that is already running is waited for instead of started again, and counts
+        as a hit. Records the outcome on the current function span. Calls with invalid JSON
+        arguments bypass the cache."""
+        try:
+            in_flight_key = (asyncio.get_running_loop(), self.make_key(tool_name, arguments))
+        except json.JSONDecodeError:
+            return await call()
+
+        while (in_flight := self._in_flight.get(in_flight_key)) is not None:
+            try:
+                # Shielded, so that cancelling this caller doesn't cancel the call for the others.
+                value = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The call was cancelled by its own caller; start it again.
+                continue
+            self.hits += 1
+            self._record_on_span(True)
+            return value
+
+        hit, value = self.get(tool_name, arguments)
+        self._record_on_span(hit)
+        if hit:
+            if _debug.DONT_LOG_TOOL_DATA:
+                logger.debug(f"Tool {tool_name} result served from cache")
+            else:
+                logger.debug(f"Tool {tool_name} result served from cache: {value}")
+            return value
+
+        future: asyncio.Future[Any] = in_flight_key[0].create_future()
+        self._in_flight[in_flight_key] = future
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, in case nobody else is waiting for it.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[in_flight_key]
+
+        future.set_result(value)
+        self.set(tool_name, arguments, value)
+        return value
+
+    def invalidate(self, tool_name: str | None = None, **arguments: Any) -> int:
+        """Drops cached results. With no arguments, drops everything; otherwise drops the results
+        for the given tool (if any) whose arguments include the given values. Returns the number
+        of results dropped."""
+        if tool_name is None and not arguments:
+            count = len(self.backend)
+            self.backend.clear()
+            return count
+
+        count = 0
+        for key in self.backend.keys():
+            name, args = json.loads(key)
+            if tool_name is not None and name != tool_name:
+                continue
+            if arguments and not (
+                isinstance(args, dict) and all(args.get(k) == v for k, v in arguments.items())
+            ):
+                continue
+            self.backend.delete(key)
+            count += 1
+        return count
+
+    def _record_on_span(self, hit: bool) -> None:
+        span = get_current_span()
+        if span is not None and isinstance(span.span_data, FunctionSpanData):
+            span.span_data.cache = {"hit": hit, "hits": self.hits, "misses": self.misses}
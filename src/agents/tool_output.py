@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import abc
+import json
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .tokens import get_default_token_estimator
+
+if TYPE_CHECKING:
+    from .tool import FunctionTool
+
+
+def estimate_tokens_saved(original: str, reduced: str) -> int:
+    """Estimates how many prompt tokens were saved by sending `reduced` instead of `original`."""
+    estimator = get_default_token_estimator()
+    return max(0, estimator.count_text(original) - estimator.count_text(reduced))
+
+
+class ToolOutputReducer(abc.ABC):
+    """Shrinks a tool output that is over budget. Reducers must be deterministic, so that the same
+    output always produces the same prompt."""
+
+    @abc.abstractmethod
+    def reduce(self, output: str, max_chars: int) -> str:
+        """Returns a version of `output` that is at most `max_chars` characters long."""
+        pass
+
+
+class HeadTailReducer(ToolOutputReducer):
+    """Keeps the beginning and end of the output, and drops the middle."""
+
+    def __init__(self, head_fraction: float = 0.5) -> None:
+        """
+        Args:
+            head_fraction: The share of the budget to spend on the beginning of the output. The
+                rest is spent on the end.
+        """
+        self.head_fraction = head_fraction
+
+    def reduce(self, output: str, max_chars: int) -> str:
+        if len(output) <= max_chars:
+            return output
+        marker = f"\n... [{len(output)} characters, truncated] ...\n"
+        available = max(0, max_chars - len(marker))
+        head = int(available * self.head_fraction)
+        tail = available - head
+        reduced = output[:head] + marker + (output[-tail:] if tail else "")
+        return reduced[:max_chars]
+
+
+class LineWindowReducer(ToolOutputReducer):
+    """Keeps whole lines. With a `pattern`, keeps windows of lines around the lines that match it;
+    otherwise keeps lines from the start. Kept lines are prefixed with their line numbers, so the
+    model can ask for other parts of the output."""
+
+    def __init__(self, pattern: str | None = None, context_lines: int = 3) -> None:
+        """
+        Args:
+            pattern: A regular expression. Lines that match it, and their context, are kept first.
+            context_lines: The number of lines to keep before and after each match.
+        """
+        self.pattern = re.compile(pattern) if pattern is not None else None
+        self.context_lines = context_lines
+
+    def reduce(self, output: str, max_chars: int) -> str:
+        if len(output) <= max_chars:
+            return output
+        lines = output.splitlines()
+        matches = (
+            [i for i, line in enumerate(lines) if self.pattern.search(line)]
+            if self.pattern is not None
+            else []
+        )
+        if matches:
+            windows = [
+                (max(0, i - self.context_lines), min(len(lines), i + self.context_lines + 1))
+                for i in matches
+            ]
+        else:
+            windows = [(0, len(lines))]
+
+        parts: list[str] = []
+        used = 0
+        # Leave room for the marker that says which lines at the end were omitted.
+        reserved = len(f"... [lines {len(lines)}-{len(lines)} omitted]") + 1
+
+        def append(text: str, limit: int = max_chars - reserved) -> bool:
+            nonlocal used
+            if used + len(text) + 1 > limit:
+                return False
+            parts.append(text)
+            used += len(text) + 1
+            return True
+
+        next_line = 0
+        for window_start, window_end in windows:
+            window_start = max(window_start, next_line)
+            if window_start >= window_end:
+                continue
+            if window_start > next_line and not append(
+                f"... [lines {next_line + 1}-{window_start} omitted]"
+            ):
+                break
+            for i in range(window_start, window_end):
+                if not append(f"{i + 1}: {lines[i]}"):
+                    break
+                next_line = i + 1
+            if next_line < window_end:
+                break
+
+        if next_line < len(lines):
+            append(f"... [lines {next_line + 1}-{len(lines)} omitted]", limit=max_chars + 1)
+        return "\n".join(parts)
+
+
+class JsonSummaryReducer(ToolOutputReducer):
+    """Summarizes JSON outputs structurally: long strings are shortened, long arrays keep their
+    first items, and deeply nested values are replaced by a placeholder. Limits are tightened until
+    the summary fits. Outputs that aren't JSON are passed to the `fallback` reducer."""
+
+    def __init__(
+        self,
+        max_items: int = 10,
+        max_string_chars: int = 200,
+        max_depth: int = 6,
+        fallback: ToolOutputReducer | None = None,
+    ) -> None:
+        self.max_items = max_items
+        self.max_string_chars = max_string_chars
+        self.max_depth = max_depth
+        self.fallback = fallback if fallback is not None else HeadTailReducer()
+
+    def reduce(self, output: str, max_chars: int) -> str:
+        if len(output) <= max_chars:
+            return output
+        try:
+            data = json.loads(output)
+        except json.JSONDecodeError:
+            return self.fallback.reduce(output, max_chars)
+
+        max_items, max_string_chars, max_depth = (
+            self.max_items,
+            self.max_string_chars,
+            self.max_depth,
+        )
+        while True:
+            summary = json.dumps(
+                self._summarize(data, max_items, max_string_chars, max_depth), ensure_ascii=False
+            )
+            if len(summary) <= max_chars:
+                return summary
+            if max_items <= 1 and max_string_chars <= 20 and max_depth <= 1:
+                return self.fallback.reduce(summary, max_chars)
+            max_items = max(1, max_items // 2)
+            max_string_chars = max(20, max_string_chars // 2)
+            max_depth = max(1, max_depth - 1)
+
+    def _summarize(self, value: Any, max_items: int, max_string_chars: int, depth: int) -> Any:
+        if isinstance(value, str):
+            if len(value) <= max_string_chars:
+                return value
+            return f"{value[:max_string_chars]}... [{len(value)} characters]"
+        if isinstance(value, list):
+            if depth <= 0:
+                return f"[array of {len(value)} items]"
+            items = [
+                self._summarize(item, max_items, max_string_chars, depth - 1)
+                for item in value[:max_items]
+            ]
+            if len(value) > max_items:
+                items.append(f"... [{len(value) - max_items} more items]")
+            return items
+        if isinstance(value, dict):
+            if depth <= 0:
+                return f"{{object with {len(value)} keys}}"
+            return {
+                key: self._summarize(item, max_items, max_string_chars, depth - 1)
+                for key, item in value.items()
+            }
+        return value
+
+
+class ToolOutputStore:
+    """Keeps the full versions of tool outputs that were reduced, so they can be fetched by
+    reference later, either in code via `get()` or by the model via `as_tool()`."""
+
+    def __init__(self, max_entries: int | None = 256) -> None:
+        """
+        Args:
+            max_entries: The maximum number of outputs to keep. The oldest outputs are dropped
+                first. If None, outputs are kept forever.
+        """
+        self.max_entries = max_entries
+        self._outputs: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, output: str) -> str:
+        """Stores an output, and returns its reference."""
+        ref = f"tool_output_{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._outputs[ref] = output
+            while self.max_entries is not None and len(self._outputs) > self.max_entries:
+                self._outputs.popitem(last=False)
+        return ref
+
+    def get(self, ref: str) -> str | None:
+        """Returns the output stored under the reference, or None if it is unknown or was
+        dropped."""
+        with self._lock:
+            return self._outputs.get(ref)
+
+    def as_tool(self, name: str = "read_tool_output", max_chars: int = 8000) -> FunctionTool:
+        """Returns a tool that lets the model read a stored output, one slice at a time. The tool
+        is exempt from the run config's `tool_output_budget`, since reducing a slice would store it
+        again and the model could never read the full output. Keep `max_chars` within the budget
+        you would otherwise apply."""
+        from .tool import function_tool
+
+        def read_tool_output(ref: str, offset: int = 0) -> str:
+            """Reads part of a tool output that was shortened before being shown to you.
+
+            Args:
+                ref: The reference given in the shortened output.
+                offset: The character offset to start reading from.
+            """
+            output = self.get(ref)
+            if output is None:
+                return f"No stored output with reference {ref!r}."
+            chunk = output[offset : offset + max_chars]
+            end = offset + len(chunk)
+            if end < len(output):
+                chunk += (
+                    f"\n[Characters {offset}-{end} of {len(output)}. Use offset={end} to read on.]"
+                )
+            return chunk
+
+        tool = function_tool(read_tool_output, name_override=name, executor="inline")
+        tool.exempt_from_output_budget = True
+        return tool
+
+
+@dataclass
+class ToolOutputBudget:
+    """Limits the size of tool outputs before they are added to the conversation. Outputs over
+    `max_chars` are shrunk by the `reducer`. If a `store` is set, the full output is kept there
+    and the model is told how to refer to it."""
+
+    max_chars: int
+    """The maximum size of a tool output as sent to the model, in characters."""
+
+    reducer: ToolOutputReducer = field(default_factory=HeadTailReducer)
+    """How to shrink outputs that are over budget."""
+
+    store: ToolOutputStore | None = None
+    """Where to keep the full versions of reduced outputs."""
+
+    def apply(self, output: str) -> tuple[str, str | None]:
+        """Returns the output to send to the model, and the reference of the stored full output
+        (or None if the output was within budget or there is no store)."""
+        if len(output) <= self.max_chars:
+            return output, None
+
+        ref = self.store.put(output) if self.store is not None else None
+        note = f"\n[Output shortened from {len(output)} characters"
+        note += f'; the full output is stored as "{ref}".]' if ref else ".]"
+        reduced = self.reducer.reduce(output, max(0, self.max_chars - len(note)))
+        return reduced + note, ref
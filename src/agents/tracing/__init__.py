@@ -16,6 +16,7 @@ from .create import (
     trace,
     transcription_span,
 )
+from .metrics import MetricsTracingProcessor
 from .processor_interface import TracingProcessor
 from .processors import default_exporter, default_processor
 from .setup import GLOBAL_TRACE_PROVIDER
@@ -67,6 +68,7 @@ __all__ = [
     "SpeechSpanData",
     "TranscriptionSpanData",
     "TracingProcessor",
+    "MetricsTracingProcessor",
     "gen_trace_id",
     "gen_span_id",
     "speech_group_span",
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+from ..logger import logger
+from .processor_interface import TracingProcessor
+from .span_data import (
+    FunctionSpanData,
+    GenerationSpanData,
+    GuardrailSpanData,
+    HandoffSpanData,
+    MCPListToolsSpanData,
+    ResponseSpanData,
+)
+from .spans import Span
+from .traces import Trace
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""The default upper bounds, in seconds, of the latency histogram buckets."""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""The content type of the Prometheus text exposition format."""
+
+_COUNTERS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "model_tokens_total": ("Tokens used by model requests.", ("model", "type")),
+    "model_request_errors_total": ("Model requests that failed.", ("model",)),
+    "tool_errors_total": ("Tool calls that failed.", ("tool",)),
+    "handoffs_total": ("Handoffs between agents.", ("from_agent", "to_agent")),
+    "guardrail_runs_total": ("Guardrails that ran.", ("guardrail",)),
+    "guardrail_triggered_total": ("Guardrails whose tripwire was triggered.", ("guardrail",)),
+    "mcp_list_tools_errors_total": ("MCP list-tools calls that failed.", ("server",)),
+}
+
+_HISTOGRAMS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "model_request_duration_seconds": ("Latency of model requests.", ("model",)),
+    "tool_duration_seconds": ("Latency of tool calls.", ("tool",)),
+    "mcp_list_tools_duration_seconds": ("Latency of MCP list-tools calls.", ("server",)),
+}
+
+# Span types whose duration is measured.
+_TIMED_SPAN_TYPES = (GenerationSpanData, ResponseSpanData, FunctionSpanData, MCPListToolsSpanData)
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, num_buckets: int) -> None:
+        # One count per bucket, plus one for values above the last bound.
+        self.counts = [0] * (num_buckets + 1)
+        self.sum = 0.0
+
+
+class MetricsTracingProcessor(TracingProcessor):
+    """A tracing processor that derives Prometheus metrics from spans, and serves them in the
+    Prometheus text exposition format.
+
+    Collects, per model, the request latency, token usage and errors; per tool, the latency and
+    errors; per agent pair, the handoffs; per guardrail, the runs and tripwire triggers; and per MCP
+    server, the list-tools latency and errors. Metrics are only collected while tracing is enabled,
+    so register this with `set_trace_processors([...])` instead of `add_trace_processor` to collect
+    metrics without exporting traces.
+
+    ```python
+    metrics = MetricsTracingProcessor()
+    add_trace_processor(metrics)
+    metrics.serve(port=9464)
+    ```
+
+    Args:
+        namespace: Prefix of every metric name.
+        latency_buckets: Upper bounds, in seconds, of the latency histogram buckets.
+        path: If set, the metrics are written to this file on `force_flush()` and `shutdown()`,
+            for example for the node exporter's textfile collector.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str = "agents",
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        path: str | Path | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.path = Path(path) if path is not None else None
+        # Aggregates are only touched under this lock, for a few dict updates per span. Runs mostly
+        # share a single event loop thread, so it is rarely contended.
+        self._lock = threading.Lock()
+        self._starts: dict[str, float] = {}
+        self._counters: dict[str, dict[tuple[str, ...], float]] = {name: {} for name in _COUNTERS}
+        self._histograms: dict[str, dict[tuple[str, ...], _HistogramValue]] = {
+            name: {} for name in _HISTOGRAMS
+        }
+        self._server: ThreadingHTTPServer | None = None
+        self._handlers: dict[type[Any], Callable[[Span[Any], float | None], None]] = {
+            GenerationSpanData: self._on_generation_end,
+            ResponseSpanData: self._on_response_end,
+            FunctionSpanData: self._on_function_end,
+            HandoffSpanData: self._on_handoff_end,
+            GuardrailSpanData: self._on_guardrail_end,
+            MCPListToolsSpanData: self._on_mcp_list_tools_end,
+        }
+
+    def on_trace_start(self, trace: Trace) -> None:
+        pass
+
+    def on_trace_end(self, trace: Trace) -> None:
+        pass
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        if isinstance(span.span_data, _TIMED_SPAN_TYPES):
+            self._starts[span.span_id] = time.perf_counter()
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        handler = self._handlers.get(type(span.span_data))
+        if handler is None:
+            return
+        start = self._starts.pop(span.span_id, None)
+        duration = time.perf_counter() - start if start is not None else None
+        try:
+            handler(span, duration)
+        except Exception as e:
+            logger.error(f"Error recording metrics for span {span.span_id}: {e}")
+
+    def _count(self, name: str, labels: tuple[str, ...], value: float = 1) -> None:
+        counter = self._counters[name]
+        counter[labels] = counter.get(labels, 0) + value
+
+    def _observe(self, name: str, labels: tuple[str, ...], value: float | None) -> None:
+        if value is None:
+            return
+        histogram = self._histograms[name]
+        entry = histogram.get(labels)
+        if entry is None:
+            entry = histogram[labels] = _HistogramValue(len(self.latency_buckets))
+        entry.counts[bisect.bisect_left(self.latency_buckets, value)] += 1
+        entry.sum += value
+
+    def _on_model_end(
+        self,
+        span: Span[Any],
+        duration: float | None,
+        model: str,
+        input_tokens: int | None,
+        output_tokens: int | None,
+    ) -> None:
+        labels = (model,)
+        with self._lock:
+            self._observe("model_request_duration_seconds", labels, duration)
+            if input_tokens:
+                self._count("model_tokens_total", (model, "input"), input_tokens)
+            if output_tokens:
+                self._count("model_tokens_total", (model, "output"), output_tokens)
+            if span.error is not None:
+                self._count("model_request_errors_total", labels)
+
+    def _on_generation_end(self, span: Span[GenerationSpanData], duration: float | None) -> None:
+        data = span.span_data
+        usage = data.usage or {}
+        self._on_model_end(
+            span,
+            duration,
+            data.model or "unknown",
+            usage.get("input_tokens"),
+            usage.get("output_tokens"),
+        )
+
+    def _on_response_end(self, span: Span[ResponseSpanData], duration: float | None) -> None:
+        response = span.span_data.response
+        usage = response.usage if response is not None else None
+        self._on_model_end(
+            span,
+            duration,
+            str(response.model) if response is not None else "unknown",
+            usage.input_tokens if usage else None,
+            usage.output_tokens if usage else None,
+        )
+
+    def _on_function_end(self, span: Span[FunctionSpanData], duration: float | None) -> None:
+        labels = (span.span_data.name,)
+        with self._lock:
+            self._observe("tool_duration_seconds", labels, duration)
+            if span.error is not None:
+                self._count("tool_errors_total", labels)
+
+    def _on_handoff_end(self, span: Span[HandoffSpanData], duration: float | None) -> None:
+        data = span.span_data
+        with self._lock:
+            self._count("handoffs_total", (data.from_agent or "", data.to_agent or ""))
+
+    def _on_guardrail_end(self, span: Span[GuardrailSpanData], duration: float | None) -> None:
+        labels = (span.span_data.name,)
+        with self._lock:
+            self._count("guardrail_runs_total", labels)
+            if span.span_data.triggered:
+                self._count("guardrail_triggered_total", labels)
+
+    def _on_mcp_list_tools_end(
+        self, span: Span[MCPListToolsSpanData], duration: float | None
+    ) -> None:
+        labels = (span.span_data.server or "",)
+        with self._lock:
+            self._observe("mcp_list_tools_duration_seconds", labels, duration)
+            if span.error is not None:
+                self._count("mcp_list_tools_errors_total", labels)
+
+    def render(self) -> str:
+        """Returns the current metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+            histograms = {
+                name: {labels: (list(v.counts), v.sum) for labels, v in values.items()}
+                for name, values in self._histograms.items()
+            }
+
+        lines: list[str] = []
+        for name, (help_text, label_names) in _COUNTERS.items():
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(
+                    f"{full_name}{_format_labels(label_names, labels)} {_format_value(value)}"
+                )
+
+        bounds = [_format_value(bound) for bound in self.latency_buckets] + ["+Inf"]
+        for name, (help_text, label_names) in _HISTOGRAMS.items():
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} histogram")
+            for labels, (counts, total) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    bucket_labels = _format_labels(label_names + ("le",), labels + (bound,))
+                    lines.append(f"{full_name}_bucket{bucket_labels} {cumulative}")
+                series_labels = _format_labels(label_names, labels)
+                lines.append(f"{full_name}_sum{series_labels} {_format_value(total)}")
+                lines.append(f"{full_name}_count{series_labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str | Path) -> None:
+        """Writes the current metrics to a file. The file is replaced atomically, so a collector
+        never reads a partially written file."""
+        path = Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves the metrics over HTTP at `/metrics`, from a background thread. Stopped by
+        `shutdown()`.
+
+        Args:
+            port: The port to listen on. Pass 0 to pick a free port; it can then be read from
+                `server.server_address`.
+            host: The interface to listen on. Defaults to the loopback interface only.
+
+        Returns:
+            The running server.
+        """
+        processor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = processor.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="agents-metrics", daemon=True).start()
+        self._server = server
+        return server
+
+    def force_flush(self) -> None:
+        if self.path is not None:
+            self.write_file(self.path)
+
+    def shutdown(self) -> None:
+        self.force_flush()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
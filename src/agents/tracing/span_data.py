@@ -28,10 +28,10 @@ class SpanData(abc.ABC):
 class AgentSpanData(SpanData):
     """
     Represents an Agent Span in the trace.
-    Includes name, handoffs, tools, and output type.
+    Includes name, handoffs, tools, output type, and instructions cache data (if applicable).
     """
 
-    __slots__ = ("name", "handoffs", "tools", "output_type")
+    __slots__ = ("name", "handoffs", "tools", "output_type", "instructions_cache")
 
     def __init__(
         self,
@@ -39,33 +39,50 @@ class AgentSpanData(SpanData):
         handoffs: list[str] | None = None,
         tools: list[str] | None = None,
         output_type: str | None = None,
+        instructions_cache: dict[str, Any] | None = None,
     ):
         self.name = name
         self.handoffs: list[str] | None = handoffs
         self.tools: list[str] | None = tools
         self.output_type: str | None = output_type
+        self.instructions_cache: dict[str, Any] | None = instructions_cache
 
     @property
     def type(self) -> str:
         return "agent"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "type": self.type,
             "name": self.name,
             "handoffs": self.handoffs,
             "tools": self.tools,
             "output_type": self.output_type,
         }
+        # Only agents with an instructions cache report it, so other spans keep their original
+        # payload.
+        if self.instructions_cache is not None:
+            data["instructions_cache"] = self.instructions_cache
+        return data
 
 
 class FunctionSpanData(SpanData):
     """
     Represents a Function Span in the trace.
-    Includes input, output and MCP data (if applicable).
+    Includes input, output, MCP data, tool cache data, timings and output budgeting (if
+    applicable).
     """
 
-    __slots__ = ("name", "input", "output", "mcp_data")
+    __slots__ = (
+        "name",
+        "input",
+        "output",
+        "mcp_data",
+        "cache",
+        "wait_time",
+        "execution_time",
+        "output_budget",
+    )
 
     def __init__(
         self,
@@ -73,30 +90,50 @@ class FunctionSpanData(SpanData):
         input: str | None,
         output: Any | None,
         mcp_data: dict[str, Any] | None = None,
+        cache: dict[str, Any] | None = None,
+        wait_time: float | None = None,
+        execution_time: float | None = None,
+        output_budget: dict[str, Any] | None = None,
     ):
         self.name = name
         self.input = input
         self.output = output
         self.mcp_data = mcp_data
+        self.cache = cache
+        self.wait_time = wait_time
+        self.execution_time = execution_time
+        self.output_budget = output_budget
 
     @property
     def type(self) -> str:
         return "function"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "type": self.type,
             "name": self.name,
             "input": self.input,
             "output": str(self.output) if self.output else None,
             "mcp_data": self.mcp_data,
         }
+        # Optional data is only exported when it was recorded, so spans of tools that don't use
+        # these features keep their original payload.
+        if self.cache is not None:
+            data["cache"] = self.cache
+        if self.wait_time is not None:
+            data["wait_time"] = self.wait_time
+        if self.execution_time is not None:
+            data["execution_time"] = self.execution_time
+        if self.output_budget is not None:
+            data["output_budget"] = self.output_budget
+        return data
 
 
 class GenerationSpanData(SpanData):
     """
     Represents a Generation Span in the trace.
-    Includes input, output, model, model configuration, and usage.
+    Includes input, output, model, model configuration, usage, and the input token estimate made
+    before the request was sent.
     """
 
     __slots__ = (
@@ -105,6 +142,7 @@ class GenerationSpanData(SpanData):
         "model",
         "model_config",
         "usage",
+        "input_token_estimate",
     )
 
     def __init__(
@@ -114,19 +152,21 @@ class GenerationSpanData(SpanData):
         model: str | None = None,
         model_config: Mapping[str, Any] | None = None,
         usage: dict[str, Any] | None = None,
+        input_token_estimate: dict[str, Any] | None = None,
     ):
         self.input = input
         self.output = output
         self.model = model
         self.model_config = model_config
         self.usage = usage
+        self.input_token_estimate = input_token_estimate
 
     @property
     def type(self) -> str:
         return "generation"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data = {
             "type": self.type,
             "input": self.input,
             "output": self.output,
@@ -134,35 +174,44 @@ class GenerationSpanData(SpanData):
             "model_config": self.model_config,
             "usage": self.usage,
         }
+        # Only exported when estimation was enabled, so other spans keep their original payload.
+        if self.input_token_estimate is not None:
+            data["input_token_estimate"] = self.input_token_estimate
+        return data
 
 
 class ResponseSpanData(SpanData):
     """
     Represents a Response Span in the trace.
-    Includes response and input.
+    Includes response, input, and the input token estimate made before the request was sent.
     """
 
-    __slots__ = ("response", "input")
+    __slots__ = ("response", "input", "input_token_estimate")
 
     def __init__(
         self,
         response: Response | None = None,
         input: str | list[ResponseInputItemParam] | None = None,
+        input_token_estimate: dict[str, Any] | None = None,
     ) -> None:
         self.response = response
         # This is not used by the OpenAI trace processors, but is useful for other tracing
         # processor implementations
         self.input = input
+        self.input_token_estimate = input_token_estimate
 
     @property
     def type(self) -> str:
         return "response"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "type": self.type,
             "response_id": self.response.id if self.response else None,
         }
+        if self.input_token_estimate is not None:
+            data["input_token_estimate"] = self.input_token_estimate
+        return data
 
 
 class HandoffSpanData(SpanData):
@@ -350,25 +399,43 @@ class SpeechGroupSpanData(SpanData):
 class MCPListToolsSpanData(SpanData):
     """
     Represents an MCP List Tools Span in the trace.
-    Includes server and result.
+    Includes server and result, and for servers that cache their tools list, the age of the
+    returned list and the latency of the last refresh, in seconds.
     """
 
     __slots__ = (
         "server",
         "result",
+        "cache_age",
+        "refresh_latency",
     )
 
-    def __init__(self, server: str | None = None, result: list[str] | None = None):
+    def __init__(
+        self,
+        server: str | None = None,
+        result: list[str] | None = None,
+        cache_age: float | None = None,
+        refresh_latency: float | None = None,
+    ):
         self.server = server
         self.result = result
+        self.cache_age = cache_age
+        self.refresh_latency = refresh_latency
 
     @property
     def type(self) -> str:
         return "mcp_tools"
 
     def export(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "type": self.type,
             "server": self.server,
             "result": self.result,
         }
+        # Only servers that cache their tools list report these, so other spans keep their
+        # original payload.
+        if self.cache_age is not None:
+            data["cache_age"] = self.cache_age
+        if self.refresh_latency is not None:
+            data["refresh_latency"] = self.refresh_latency
+        return data
@@ -1,5 +1,9 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 
+from openai.types.responses import ResponseUsage
+
 
 @dataclass
 class Usage:
@@ -9,14 +13,48 @@ class Usage:
     input_tokens: int = 0
     """Total input tokens sent, across all requests."""
 
+    cached_input_tokens: int = 0
+    """Input tokens that were served from the provider's prompt cache, across all requests. These
+    are included in `input_tokens`."""
+
     output_tokens: int = 0
     """Total output tokens received, across all requests."""
 
+    reasoning_tokens: int = 0
+    """Output tokens spent on reasoning, across all requests. These are included in
+    `output_tokens`."""
+
     total_tokens: int = 0
     """Total tokens sent and received, across all requests."""
 
-    def add(self, other: "Usage") -> None:
+    tool_output_tokens_saved: int = 0
+    """Estimated tokens kept out of the conversation by tool output budgets. Each saving is counted
+    once, although the smaller output is then sent on every later turn."""
+
+    @classmethod
+    def from_response_usage(cls, usage: ResponseUsage | None) -> Usage:
+        """Builds the usage of a single Responses API request. Token details are optional, since
+        not every provider of the Responses API reports them."""
+        if usage is None:
+            return cls()
+        input_details = getattr(usage, "input_tokens_details", None)
+        output_details = getattr(usage, "output_tokens_details", None)
+        return cls(
+            requests=1,
+            input_tokens=usage.input_tokens,
+            cached_input_tokens=getattr(input_details, "cached_tokens", 0) or 0,
+            output_tokens=usage.output_tokens,
+            reasoning_tokens=getattr(output_details, "reasoning_tokens", 0) or 0,
+            total_tokens=usage.total_tokens,
+        )
+
+    def add(self, other: Usage) -> None:
         self.requests += other.requests if other.requests else 0
         self.input_tokens += other.input_tokens if other.input_tokens else 0
+        self.cached_input_tokens += other.cached_input_tokens if other.cached_input_tokens else 0
         self.output_tokens += other.output_tokens if other.output_tokens else 0
+        self.reasoning_tokens += other.reasoning_tokens if other.reasoning_tokens else 0
         self.total_tokens += other.total_tokens if other.total_tokens else 0
+        self.tool_output_tokens_saved += (
+            other.tool_output_tokens_saved if other.tool_output_tokens_saved else 0
+        )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+
+
+class ConcurrencyLimit:
+    """Caps the number of concurrent holders of a slot, across every task on an event loop.
+
+    Unlike a bare `asyncio.Semaphore`, a limit can be created outside of a running event loop and
+    shared by code running on different loops; each loop gets its own semaphore.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+        self.limit = limit
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = asyncio.Semaphore(self.limit)
+                    self._semaphores[loop] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[float]:
+        """Waits for a free slot and holds it for the duration of the block. Yields the number of
+        seconds spent waiting for the slot."""
+        semaphore = self._get_semaphore()
+        start = time.monotonic()
+        async with semaphore:
+            yield time.monotonic() - start
+
+
+class ConcurrencyLimits:
+    """The concurrency limits of one run config, looked up by key, e.g. a model name. Every run
+    that uses the config shares the same slots.
+
+    A limit that is asked for with a different size than it has is replaced, so that a new size
+    takes effect right away. Calls that already hold a slot of the old limit keep it until they
+    finish.
+    """
+
+    def __init__(self) -> None:
+        self._limits: dict[Hashable, tuple[object, ConcurrencyLimit]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, limit: int, owner: object = None) -> ConcurrencyLimit:
+        """Returns the limit for the given key, creating it with the given size if it doesn't
+        exist yet or has a different size.
+
+        Args:
+            key: The key of the limit.
+            limit: The size of the limit.
+            owner: The object the limit belongs to, for keys that contain its `id()`. The owner is
+                kept alive with the limit, so its id can't be reused by another object.
+        """
+        with self._lock:
+            entry = self._limits.get(key)
+            if entry is None or entry[0] is not owner or entry[1].limit != limit:
+                entry = (owner, ConcurrencyLimit(limit))
+                self._limits[key] = entry
+            return entry[1]
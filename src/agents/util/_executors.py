@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import importlib
+import multiprocessing
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from ..exceptions import UserError
+
+T = TypeVar("T")
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# Functions that can be run in a worker process, keyed by (module, qualname). Tool decorators
+# replace the module attribute with the tool, so functions can't be pickled by reference; instead
+# the worker imports the module, which registers the function again on its side.
+_process_functions: dict[tuple[str, str], Callable[..., Any]] = {}
+
+# Collects the executor futures submitted in the current context, see `track_workers`.
+_tracked_workers: contextvars.ContextVar[list[Future[Any]] | None] = contextvars.ContextVar(
+    "agents_tracked_workers", default=None
+)
+
+
+@contextlib.contextmanager
+def track_workers() -> Iterator[list[Future[Any]]]:
+    """Collects the futures of the work submitted to executors by `run_in_executor` and
+    `run_in_process` within the block. Cancelling the awaiting task doesn't stop work that is
+    already running in a thread or process, so callers can use these to tell when it is done."""
+    workers: list[Future[Any]] = []
+    token = _tracked_workers.set(workers)
+    try:
+        yield workers
+    finally:
+        _tracked_workers.reset(token)
+
+
+async def _submit(executor: Executor, func: Callable[..., T]) -> T:
+    future = executor.submit(func)
+    workers = _tracked_workers.get()
+    if workers is not None:
+        workers.append(future)
+    return await asyncio.wrap_future(future)
+
+
+def get_tool_thread_pool() -> ThreadPoolExecutor:
+    """Returns the thread pool shared by every synchronous tool that doesn't specify its own
+    executor, creating it on first use."""
+    global _thread_pool
+    if _thread_pool is None:
+        with _pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(thread_name_prefix="agents-tool")
+    return _thread_pool
+
+
+def get_tool_process_pool() -> ProcessPoolExecutor:
+    """Returns the process pool shared by every tool that runs in a process, creating it on first
+    use. Workers are kept alive between calls, so only the first calls pay the startup cost."""
+    global _process_pool
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                # Forking a process that runs an event loop and other threads is unsafe, so workers
+                # are always spawned.
+                _process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+async def run_in_executor(
+    executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Runs a blocking function in the given executor without blocking the event loop. The function
+    runs in a copy of the current context, so context vars such as the current trace and span are
+    visible to it."""
+    context = contextvars.copy_context()
+    return await _submit(executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+def _function_key(func: Callable[..., Any]) -> tuple[str, str]:
+    module = func.__module__
+    # Spawned workers import the parent's main module as __mp_main__, and alias it as __main__.
+    if module == "__mp_main__":
+        module = "__main__"
+    return module, func.__qualname__
+
+
+def register_process_function(func: Callable[..., Any]) -> None:
+    """Makes a module-level function available to `run_in_process`."""
+    _process_functions[_function_key(func)] = func
+
+
+def _call_process_function(key: tuple[str, str], args: Any, kwargs: Any) -> Any:
+    if key not in _process_functions:
+        importlib.import_module(key[0])
+    return _process_functions[key](*args, **kwargs)
+
+
+async def run_in_process(
+    executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Runs a function registered with `register_process_function` in a process pool. The
+    arguments and return value must be picklable."""
+    key = _function_key(func)
+    if _process_functions.get(key) is not func:
+        raise UserError(
+            f"{func.__qualname__} can't be run in a process. Set the process executor on the tool "
+            "itself, so that it is checked when the tool is created."
+        )
+    return await _submit(executor, functools.partial(_call_process_function, key, args, kwargs))
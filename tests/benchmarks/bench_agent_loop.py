@@ -0,0 +1,549 @@
+"""Measures the overhead of the agent loop itself, with `FakeModel` standing in for the model.
+
+Covers `Runner.run` and `Runner.run_streamed` against history length, tool count, handoff fan-out
+and output type, as well as the Chat Completions converter and stream handler, span creation and
+the per-span cost of `MetricsTracingProcessor`.
+Results can be written as JSON, and compared against a stored baseline. Run with:
+
+    python -m tests.benchmarks.bench_agent_loop --output results.json
+    python -m tests.benchmarks.bench_agent_loop --baseline results.json
+
+Comparing exits with status 1 if any measurement regressed by more than `--max-regression`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Coroutine
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+from openai.types.completion_usage import CompletionUsage
+from openai.types.responses import Response
+from pydantic import BaseModel
+
+from agents import (
+    Agent,
+    FunctionTool,
+    MetricsTracingProcessor,
+    RunConfig,
+    Runner,
+    TracingProcessor,
+    function_span,
+    generation_span,
+    guardrail_span,
+    handoff_span,
+    set_trace_processors,
+    trace,
+)
+from agents.items import TResponseInputItem
+from agents.models.chatcmpl_converter import Converter
+from agents.models.chatcmpl_stream_handler import ChatCmplStreamHandler
+
+from ..fake_model import FakeModel
+from ..test_responses import get_function_tool_call, get_text_message
+
+FORMAT_VERSION = 1
+
+HISTORY_LENGTHS = (10, 100, 500, 2000)
+TOOL_COUNTS = (1, 10, 100, 500)
+HANDOFF_COUNTS = (1, 10, 50)
+TURNS = 5
+STREAM_CHUNKS = 2000
+SPANS = 2000
+
+
+@dataclass
+class Measurement:
+    benchmark: str
+    """The name of the benchmark."""
+
+    params: dict[str, Any]
+    """The parameters the benchmark ran with."""
+
+    metric: str
+    """What was measured, including its unit."""
+
+    value: float
+
+    higher_is_better: bool = False
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.benchmark}[{params}].{self.metric}"
+
+
+@dataclass
+class Options:
+    repeat: int = 5
+    """The number of times each timing is repeated. The median is reported."""
+
+    quick: bool = False
+    """Run fewer and smaller cases, e.g. to check that the suite works."""
+
+    allocations: bool = True
+    """Also measure peak memory allocations, in a separate pass."""
+
+    def sizes(self, sizes: tuple[int, ...]) -> tuple[int, ...]:
+        return sizes[:2] if self.quick else sizes
+
+
+async def _median_time(fn: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def _peak_kib(fn: Callable[[], Awaitable[Any]]) -> float:
+    tracemalloc.start()
+    try:
+        await fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+async def _measure_run(
+    benchmark: str,
+    params: dict[str, Any],
+    make_run: Callable[[], Awaitable[Any]],
+    turns: int,
+    options: Options,
+) -> list[Measurement]:
+    # One untimed run first, so that one-off costs (imports, schema caches) aren't counted.
+    await make_run()
+    seconds = await _median_time(make_run, options.repeat)
+    results = [Measurement(benchmark, params, "us_per_turn", seconds / turns * 1e6)]
+    if options.allocations:
+        peak = await _peak_kib(make_run)
+        results.append(Measurement(benchmark, params, "peak_alloc_kib", peak))
+    return results
+
+
+async def _run_agent(agent: Agent[Any], input: str | list[TResponseInputItem], streamed: bool):
+    run_config = RunConfig(tracing_disabled=True)
+    if streamed:
+        result = Runner.run_streamed(agent, input=input, run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+        return result
+    return await Runner.run(agent, input=input, run_config=run_config)
+
+
+def _history(length: int) -> list[TResponseInputItem]:
+    """A history of earlier turns, each a user message, a tool call and its output, and a reply."""
+    items: list[Any] = []
+    for i in range(length):
+        kind = i % 4
+        if kind == 0:
+            items.append({"role": "user", "content": f"Please look at file {i}. " * 5})
+        elif kind == 1:
+            call = get_function_tool_call("read_file", json.dumps({"path": f"{i}.py"}))
+            items.append({**call.model_dump(exclude_unset=True), "call_id": f"call_{i}"})
+        elif kind == 2:
+            items.append(
+                {"type": "function_call_output", "call_id": f"call_{i - 1}", "output": "x" * 500}
+            )
+        else:
+            items.append(get_text_message(f"File {i} looks fine. " * 5).model_dump())
+    return items
+
+
+def _tools(count: int) -> list[FunctionTool]:
+    async def invoke(ctx: Any, arguments: str) -> str:
+        return "ok"
+
+    return [
+        FunctionTool(
+            name=f"tool_{i}",
+            description=f"Tool number {i}, which does something useful.",
+            params_json_schema={
+                "type": "object",
+                "properties": {"path": {"type": "string"}, "limit": {"type": "integer"}},
+                "required": ["path", "limit"],
+                "additionalProperties": False,
+            },
+            on_invoke_tool=invoke,
+        )
+        for i in range(count)
+    ]
+
+
+def _tool_turns(model: FakeModel, tool_name: str, turns: int) -> None:
+    for i in range(turns - 1):
+        args = json.dumps({"path": f"{i}.py", "limit": 10})
+        model.set_next_output([get_text_message("..."), get_function_tool_call(tool_name, args)])
+    model.set_next_output([get_text_message("done")])
+
+
+async def bench_history(options: Options) -> list[Measurement]:
+    results = []
+    for streamed in (False, True):
+        for length in options.sizes(HISTORY_LENGTHS):
+            history = _history(length)
+            tools = _tools(1)
+
+            async def run(
+                history: list[Any] = history, tools: list[Any] = tools, streamed: bool = streamed
+            ) -> None:
+                model = FakeModel()
+                _tool_turns(model, "tool_0", TURNS)
+                await _run_agent(Agent(name="bench", model=model, tools=tools), history, streamed)
+
+            params = {"streamed": streamed, "items": length}
+            results += await _measure_run("run.history", params, run, TURNS, options)
+    return results
+
+
+async def bench_tools(options: Options) -> list[Measurement]:
+    results = []
+    for count in options.sizes(TOOL_COUNTS):
+        tools = _tools(count)
+
+        async def run(tools: list[Any] = tools) -> None:
+            model = FakeModel()
+            _tool_turns(model, tools[-1].name, TURNS)
+            await _run_agent(Agent(name="bench", model=model, tools=tools), "go", False)
+
+        results += await _measure_run("run.tools", {"tools": count}, run, TURNS, options)
+    return results
+
+
+async def bench_handoffs(options: Options) -> list[Measurement]:
+    results = []
+    for count in options.sizes(HANDOFF_COUNTS):
+
+        async def run(count: int = count) -> None:
+            model = FakeModel()
+            targets = [Agent(name=f"agent_{i}", model=model) for i in range(count)]
+            triage = Agent(name="triage", model=model, handoffs=list(targets))
+            model.add_multiple_turn_outputs(
+                [
+                    [get_function_tool_call(f"transfer_to_agent_{count - 1}", "{}")],
+                    [get_text_message("done")],
+                ]
+            )
+            await _run_agent(triage, "go", False)
+
+        results += await _measure_run("run.handoffs", {"handoffs": count}, run, 2, options)
+    return results
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    country: str
+
+
+class Customer(BaseModel):
+    name: str
+    addresses: list[Address]
+    tags: list[str]
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float
+
+
+OUTPUT_TYPES: dict[str, tuple[Any, Any]] = {
+    "str": (str, "done"),
+    "list_int": (list[int], {"response": list(range(20))}),
+    "dataclass": (Point, {"response": {"x": 1.0, "y": 2.0}}),
+    "nested_model": (
+        Customer,
+        {
+            "name": "Ada",
+            "addresses": [{"street": "1 Main St", "city": "Paris", "country": "FR"}] * 3,
+            "tags": ["vip"] * 5,
+        },
+    ),
+}
+
+
+async def bench_output_types(options: Options) -> list[Measurement]:
+    results = []
+    for name, (output_type, output) in OUTPUT_TYPES.items():
+        text = output if isinstance(output, str) else json.dumps(output)
+
+        async def run(output_type: Any = output_type, text: str = text) -> None:
+            model = FakeModel()
+            model.set_next_output([get_text_message(text)])
+            agent = Agent(name="bench", model=model, output_type=output_type)
+            await _run_agent(agent, "go", False)
+
+        results += await _measure_run("run.output_type", {"type": name}, run, 1, options)
+    return results
+
+
+async def bench_items_to_messages(options: Options) -> list[Measurement]:
+    results = []
+    for length in options.sizes(HISTORY_LENGTHS):
+        history = _history(length)
+
+        async def convert(history: list[Any] = history) -> None:
+            Converter.items_to_messages(history)
+
+        seconds = await _median_time(convert, options.repeat)
+        results.append(
+            Measurement("converter.items_to_messages", {"items": length}, "us", seconds * 1e6)
+        )
+    return results
+
+
+def _chunks(count: int) -> list[ChatCompletionChunk]:
+    def chunk(delta: ChoiceDelta, usage: CompletionUsage | None = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[Choice(index=0, delta=delta)],
+            usage=usage,
+        )
+
+    text = [chunk(ChoiceDelta(content=f"word{i} ")) for i in range(count // 2)]
+    tool_call = [
+        chunk(
+            ChoiceDelta(
+                tool_calls=[
+                    ChoiceDeltaToolCall(
+                        index=0,
+                        id="call_1" if i == 0 else None,
+                        function=ChoiceDeltaToolCallFunction(
+                            name="read_file" if i == 0 else None, arguments=f'"{i}",'
+                        ),
+                    )
+                ]
+            )
+        )
+        for i in range(count - len(text) - 1)
+    ]
+    usage = CompletionUsage(completion_tokens=count, prompt_tokens=10, total_tokens=count + 10)
+    return text + tool_call + [chunk(ChoiceDelta(), usage)]
+
+
+async def bench_stream_handler(options: Options) -> list[Measurement]:
+    count = STREAM_CHUNKS // 10 if options.quick else STREAM_CHUNKS
+    chunks = _chunks(count)
+    response = Response(
+        id="resp-id",
+        created_at=0,
+        model="fake",
+        object="response",
+        output=[],
+        tool_choice="none",
+        tools=[],
+        parallel_tool_calls=False,
+    )
+
+    async def stream() -> AsyncIterator[ChatCompletionChunk]:
+        for chunk in chunks:
+            yield chunk
+
+    async def handle() -> None:
+        async for _ in ChatCmplStreamHandler.handle_stream(response, stream()):  # type: ignore[arg-type]
+            pass
+
+    await handle()
+    seconds = await _median_time(handle, options.repeat)
+    return [
+        Measurement(
+            "chatcmpl.handle_stream",
+            {"chunks": count},
+            "chunks_per_s",
+            count / seconds,
+            higher_is_better=True,
+        )
+    ]
+
+
+class _DiscardingProcessor(TracingProcessor):
+    def on_trace_start(self, trace: Any) -> None:
+        pass
+
+    def on_trace_end(self, trace: Any) -> None:
+        pass
+
+    def on_span_start(self, span: Any) -> None:
+        pass
+
+    def on_span_end(self, span: Any) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self) -> None:
+        pass
+
+
+async def bench_spans(options: Options) -> list[Measurement]:
+    # Keep spans in process; the benchmark is about creating them, not exporting them.
+    set_trace_processors([_DiscardingProcessor()])
+    count = SPANS // 10 if options.quick else SPANS
+    results = []
+    for enabled in (True, False):
+
+        async def create(enabled: bool = enabled) -> None:
+            with trace("bench", disabled=not enabled):
+                for i in range(count):
+                    with function_span(name="tool", input="{}") as span:
+                        span.span_data.output = str(i)
+
+        seconds = await _median_time(create, options.repeat)
+        results.append(
+            Measurement("tracing.function_span", {"enabled": enabled}, "us", seconds / count * 1e6)
+        )
+    return results
+
+
+async def bench_metrics_processor(options: Options) -> list[Measurement]:
+    set_trace_processors([_DiscardingProcessor()])
+    count = SPANS // 10 if options.quick else SPANS
+    factories: dict[str, Callable[[int], Any]] = {
+        "function": lambda i: function_span(name=f"tool_{i % 10}"),
+        "generation": lambda i: generation_span(
+            model="gpt-4o", usage={"input_tokens": 100, "output_tokens": 10}
+        ),
+        "handoff": lambda i: handoff_span(from_agent="triage", to_agent=f"agent_{i % 10}"),
+        "guardrail": lambda i: guardrail_span(name="guardrail", triggered=i % 2 == 0),
+    }
+    results = []
+    for span_type, factory in factories.items():
+        with trace("bench"):
+            spans = [factory(i) for i in range(count)]
+        processor = MetricsTracingProcessor()
+
+        async def record(
+            processor: MetricsTracingProcessor = processor, spans: list[Any] = spans
+        ) -> None:
+            for span in spans:
+                processor.on_span_start(span)
+                processor.on_span_end(span)
+
+        seconds = await _median_time(record, options.repeat)
+        results.append(
+            Measurement(
+                "tracing.metrics_processor",
+                {"span_type": span_type},
+                "us",
+                seconds / count * 1e6,
+            )
+        )
+    return results
+
+
+BENCHMARKS: dict[str, Callable[[Options], Coroutine[Any, Any, list[Measurement]]]] = {
+    "run.history": bench_history,
+    "run.tools": bench_tools,
+    "run.handoffs": bench_handoffs,
+    "run.output_type": bench_output_types,
+    "converter.items_to_messages": bench_items_to_messages,
+    "chatcmpl.handle_stream": bench_stream_handler,
+    "tracing.function_span": bench_spans,
+    "tracing.metrics_processor": bench_metrics_processor,
+}
+
+
+def run(options: Options | None = None, only: str = "*") -> dict[str, Any]:
+    """Runs the benchmarks whose names match `only`, and returns the results as a JSON-compatible
+    dict."""
+    options = options or Options()
+    measurements: list[Measurement] = []
+    for name, benchmark in BENCHMARKS.items():
+        if fnmatch.fnmatch(name, only):
+            measurements += asyncio.run(benchmark(options))
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {"repeat": options.repeat, "quick": options.quick},
+        "results": [dataclasses.asdict(m) | {"key": m.key} for m in measurements],
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], max_regression: float = 0.2
+) -> list[dict[str, Any]]:
+    """Compares two sets of results, and returns a row per measurement present in both. A row's
+    `change` is positive when the measurement got worse."""
+    baseline_by_key = {result["key"]: result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        before = baseline_by_key.get(result["key"])
+        if before is None or not before["value"]:
+            continue
+        change = result["value"] / before["value"] - 1
+        if result["higher_is_better"]:
+            change = before["value"] / result["value"] - 1
+        rows.append(
+            {
+                "key": result["key"],
+                "baseline": before["value"],
+                "current": result["value"],
+                "change": change,
+                "regressed": change > max_regression,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0] if __doc__ else None)
+    parser.add_argument("--only", default="*", help="Glob of the benchmarks to run.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Run fewer and smaller cases.")
+    parser.add_argument("--no-allocations", action="store_true")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare the results with this JSON file.")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    options = Options(repeat=args.repeat, quick=args.quick, allocations=not args.no_allocations)
+    results = run(options, only=args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        for result in results["results"]:
+            print(f"{result['key']:<70} {result['value']:>14.1f}")
+        return 0
+
+    with open(args.baseline) as f:
+        rows = compare(json.load(f), results, args.max_regression)
+    print(f"{'measurement':<70} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['key']:<70} {row['baseline']:>12.1f} {row['current']:>12.1f} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
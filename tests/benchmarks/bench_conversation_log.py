@@ -0,0 +1,87 @@
+"""Measures the per-turn cost of assembling the model input as the history grows.
+
+Compares the previous approach (deep-copy the original input and re-serialize every generated item
+on every turn) with the `ConversationLog` used by the runner. Run with:
+
+    python -m tests.benchmarks.bench_conversation_log
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from typing import Any
+
+from agents import Agent, ItemHelpers
+from agents._conversation_log import ConversationLog
+from agents.items import MessageOutputItem, RunItem, ToolCallItem, TResponseInputItem
+
+from ..test_responses import get_function_tool_call, get_text_input_item, get_text_message
+
+HISTORY_LENGTHS = (10, 100, 500, 1000, 2000)
+TURNS_PER_SAMPLE = 20
+
+
+def _make_items(agent: Agent[Any], count: int) -> list[RunItem]:
+    items: list[RunItem] = []
+    for i in range(count):
+        if i % 2:
+            items.append(MessageOutputItem(agent=agent, raw_item=get_text_message(f"msg {i}")))  # type: ignore
+        else:
+            items.append(
+                ToolCallItem(agent=agent, raw_item=get_function_tool_call("foo", f'{{"i": {i}}}'))  # type: ignore
+            )
+    return items
+
+
+def _rebuild_input(
+    original_input: list[TResponseInputItem], items: list[RunItem]
+) -> list[TResponseInputItem]:
+    # What the runner used to do on every turn.
+    input = copy.deepcopy(original_input)
+    input.extend(
+        [
+            item.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            for item in items
+        ]
+    )
+    return input
+
+
+def run(
+    history_lengths: tuple[int, ...] = HISTORY_LENGTHS, turns: int = TURNS_PER_SAMPLE
+) -> list[dict[str, Any]]:
+    """Returns the mean per-turn input assembly time (in microseconds) for each history length."""
+    agent = Agent(name="bench")
+    original_input = [get_text_input_item("x" * 200) for _ in range(5)]
+    results = []
+    for length in history_lengths:
+        items = _make_items(agent, length + turns)
+        history = items[:length]
+
+        start = time.perf_counter()
+        for turn in range(turns):
+            _rebuild_input(original_input, history + items[length : length + turn + 1])
+        rebuild_us = (time.perf_counter() - start) / turns * 1e6
+
+        log = ConversationLog(ItemHelpers.input_to_new_input_list(original_input))
+        log.sync(log.original_input, history)
+        start = time.perf_counter()
+        for turn in range(turns):
+            generated = history + items[length : length + turn + 1]
+            log.sync(log.original_input, generated)
+            log.to_input_list()
+        log_us = (time.perf_counter() - start) / turns * 1e6
+
+        results.append({"history_length": length, "rebuild_us": rebuild_us, "log_us": log_us})
+    return results
+
+
+def main() -> None:
+    print(f"{'history':>8} {'rebuild (us/turn)':>18} {'log (us/turn)':>14}")
+    for row in run():
+        print(f"{row['history_length']:>8} {row['rebuild_us']:>18.1f} {row['log_us']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measures how a CPU-bound function tool scales across concurrent runs for each tool executor.
+
+Each sample starts `CONCURRENT_RUNS` runs at once, and every run makes one call to a tool that
+counts primes in pure Python. Inline tools block the event loop, and threaded tools still contend
+for the GIL, so only the process pool spreads the work across cores. Run with:
+
+    python -m tests.benchmarks.bench_tool_executors
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any
+
+from agents import Agent, FunctionTool, RunConfig, Runner, function_tool
+
+from ..fake_model import FakeModel
+from ..test_responses import get_function_tool_call, get_text_message
+
+CONCURRENT_RUNS = 16
+PRIME_LIMIT = 200_000
+
+
+def _count_primes(limit: int) -> int:
+    count = 0
+    for n in range(2, limit):
+        if all(n % d for d in range(2, int(n**0.5) + 1)):
+            count += 1
+    return count
+
+
+@function_tool(name_override="count_primes", executor="inline")
+def count_primes_inline(limit: int) -> int:
+    return _count_primes(limit)
+
+
+@function_tool(name_override="count_primes", executor="thread")
+def count_primes_thread(limit: int) -> int:
+    return _count_primes(limit)
+
+
+@function_tool(name_override="count_primes", executor="process")
+def count_primes_process(limit: int) -> int:
+    return _count_primes(limit)
+
+
+TOOLS: dict[str, FunctionTool] = {
+    "inline": count_primes_inline,
+    "thread": count_primes_thread,
+    "process": count_primes_process,
+}
+
+
+async def _run_batch(tool: FunctionTool, runs: int, limit: int) -> float:
+    agents = []
+    for _ in range(runs):
+        model = FakeModel()
+        model.add_multiple_turn_outputs(
+            [
+                [get_function_tool_call("count_primes", f'{{"limit": {limit}}}')],
+                [get_text_message("done")],
+            ]
+        )
+        agents.append(Agent(name="bench", model=model, tools=[tool]))
+
+    run_config = RunConfig(tracing_disabled=True)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[Runner.run(agent, input="count", run_config=run_config) for agent in agents]
+    )
+    return time.perf_counter() - start
+
+
+async def _run(runs: int, limit: int) -> list[dict[str, Any]]:
+    # Start the process pool's workers before timing, as a long-lived service would.
+    await _run_batch(count_primes_process, os.cpu_count() or 1, 10)
+
+    results = []
+    for executor, tool in TOOLS.items():
+        wall_time = await _run_batch(tool, runs, limit)
+        results.append({"executor": executor, "wall_time_s": wall_time})
+    return results
+
+
+def run(runs: int = CONCURRENT_RUNS, limit: int = PRIME_LIMIT) -> list[dict[str, Any]]:
+    """Returns the wall time (in seconds) to complete `runs` concurrent runs for each executor."""
+    return asyncio.run(_run(runs, limit))
+
+
+def main() -> None:
+    results = run()
+    inline_time = results[0]["wall_time_s"]
+    print(f"{CONCURRENT_RUNS} concurrent runs, {os.cpu_count()} CPUs")
+    print(f"{'executor':>8} {'wall time (s)':>14} {'speedup':>8}")
+    for row in results:
+        speedup = inline_time / row["wall_time_s"]
+        print(f"{row['executor']:>8} {row['wall_time_s']:>14.2f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
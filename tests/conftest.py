@@ -5,6 +5,7 @@ import pytest
 from agents.models import _openai_shared
 from agents.models.openai_chatcompletions import OpenAIChatCompletionsModel
 from agents.models.openai_responses import OpenAIResponsesModel
+from agents.tokens import HeuristicTokenizer, set_default_tokenizer
 from agents.tracing import set_trace_processors
 from agents.tracing.setup import GLOBAL_TRACE_PROVIDER
 
@@ -17,6 +18,12 @@ def setup_span_processor():
     set_trace_processors([SPAN_PROCESSOR_TESTING])
 
 
+# Token estimates would otherwise depend on whether a tiktoken encoding happens to be cached.
+@pytest.fixture(scope="session", autouse=True)
+def use_heuristic_tokenizer():
+    set_default_tokenizer(HeuristicTokenizer())
+
+
 # This fixture will run before each test
 @pytest.fixture(autouse=True)
 def clear_span_processor():
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from typing import Any
 
@@ -132,6 +133,32 @@ class FakeModel(Model):
             )
 
 
+class SlowModel(FakeModel):
+    """Takes `delay` seconds to respond, and records whether the call was cancelled."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.cancelled = False
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().get_response(*args, **kwargs)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        async for event in super().stream_response(*args, **kwargs):
+            yield event
+
+
 def get_response_obj(
     output: list[TResponseOutputItem],
     response_id: str | None = None,
@@ -151,7 +178,11 @@ def get_response_obj(
             input_tokens=usage.input_tokens if usage else 0,
             output_tokens=usage.output_tokens if usage else 0,
             total_tokens=usage.total_tokens if usage else 0,
-            input_tokens_details=InputTokensDetails(cached_tokens=0),
-            output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+            input_tokens_details=InputTokensDetails(
+                cached_tokens=usage.cached_input_tokens if usage else 0
+            ),
+            output_tokens_details=OutputTokensDetails(
+                reasoning_tokens=usage.reasoning_tokens if usage else 0
+            ),
         ),
     )
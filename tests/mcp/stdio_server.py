@@ -0,0 +1,33 @@
+"""A small stdio MCP server for tests. Each process handles one blocking tool call at a time."""
+
+import os
+import time
+
+from mcp.server.fastmcp import Context, FastMCP
+
+server = FastMCP("test")
+
+
+@server.tool()
+def work(seconds: float) -> str:
+    """Blocks for the given number of seconds, and returns the id of the server process."""
+    time.sleep(seconds)
+    return str(os.getpid())
+
+
+@server.tool()
+def crash() -> str:
+    """Exits the server process."""
+    os._exit(1)
+
+
+@server.tool()
+async def add_tool(name: str, ctx: Context) -> str:  # type: ignore[type-arg]
+    """Adds a tool with the given name, and notifies the client that the tools list changed."""
+    server.add_tool(lambda: name, name=name)
+    await ctx.session.send_tool_list_changed()
+    return name
+
+
+if __name__ == "__main__":
+    server.run()
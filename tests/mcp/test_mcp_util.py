@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 from typing import Any
 
 import pytest
@@ -289,3 +291,62 @@ async def test_util_adds_properties():
     assert tool.params_json_schema == snapshot(
         {"type": "object", "description": "Test tool", "properties": {}}
     )
+
+
+class SlowMCPServer(FakeMCPServer):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    async def list_tools(self):
+        await asyncio.sleep(self.delay)
+        return await super().list_tools()
+
+
+@pytest.mark.asyncio
+async def test_servers_are_listed_concurrently():
+    servers: list[MCPServer] = []
+    for i in range(5):
+        server = SlowMCPServer(delay=0.1)
+        server.add_tool(f"tool_{i}", {})
+        servers.append(server)
+
+    start = time.perf_counter()
+    tools = await MCPUtil.get_all_function_tools(servers, convert_schemas_to_strict=False)
+
+    assert time.perf_counter() - start < 0.3
+    assert [tool.name for tool in tools] == [f"tool_{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_slow_server_times_out():
+    fast, slow = FakeMCPServer(), SlowMCPServer(delay=10)
+    fast.add_tool("fast_tool", {})
+    slow.add_tool("slow_tool", {})
+
+    start = time.perf_counter()
+    with pytest.raises(AgentsException, match="Timed out listing the tools"):
+        await MCPUtil.get_all_function_tools(
+            [fast, slow], convert_schemas_to_strict=False, list_tools_timeout=0.05
+        )
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_converted_tools_are_reused_until_the_list_changes():
+    server = FakeMCPServer()
+    server.add_tool("foo", _convertible_schema())
+
+    first = await MCPUtil.get_all_function_tools([server], convert_schemas_to_strict=True)
+    second = await MCPUtil.get_all_function_tools([server], convert_schemas_to_strict=True)
+    assert first[0] is second[0]
+    # The MCP tool's own schema isn't mutated by the conversion.
+    assert server.tools[0].inputSchema == _convertible_schema()
+
+    not_strict = await MCPUtil.get_all_function_tools([server], convert_schemas_to_strict=False)
+    assert not_strict[0] is not first[0]
+
+    server.add_tool("bar", {})
+    changed = await MCPUtil.get_all_function_tools([server], convert_schemas_to_strict=False)
+    assert [tool.name for tool in changed] == ["foo", "bar"]
+    assert changed[0] is not not_strict[0]
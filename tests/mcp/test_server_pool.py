@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import TextContent
+
+from agents import UserError
+from agents.mcp import MCPServer, MCPServerPool, MCPServerStdio
+
+from .helpers import FakeMCPServer
+
+STDIO_SERVER = str(Path(__file__).parent / "stdio_server.py")
+
+
+def _stdio_server() -> MCPServer:
+    return MCPServerStdio(
+        {"command": sys.executable, "args": [STDIO_SERVER]}, client_session_timeout_seconds=2
+    )
+
+
+def _text(result) -> str:
+    assert isinstance(result.content[0], TextContent)
+    return result.content[0].text
+
+
+class FlakyMCPServer(FakeMCPServer):
+    """Fails every health check and tool call once it has been broken, and can be made to fail to
+    connect, or to take a while to close."""
+
+    def __init__(self, fail_connect: bool = False, cleanup_delay: float = 0) -> None:
+        super().__init__()
+        self.broken = False
+        self.fail_connect = fail_connect
+        self.cleanup_delay = cleanup_delay
+        self.closed = False
+
+    async def connect(self):
+        if self.fail_connect:
+            raise ConnectionError("server unavailable")
+
+    async def cleanup(self):
+        await asyncio.sleep(self.cleanup_delay)
+        self.closed = True
+
+    async def list_tools(self):
+        if self.broken:
+            raise ConnectionError("server crashed")
+        return await super().list_tools()
+
+    async def call_tool(self, tool_name, arguments):
+        if self.broken:
+            raise ConnectionError("server crashed")
+        if tool_name == "invalid":
+            raise ValueError("invalid arguments")
+        return await super().call_tool(tool_name, arguments)
+
+
+@pytest.mark.asyncio
+async def test_calls_are_spread_over_the_sessions():
+    async def elapsed(size: int) -> tuple[float, set[str]]:
+        async with MCPServerPool(_stdio_server, size=size) as pool:
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(pool.call_tool("work", {"seconds": 0.3}) for _ in range(4))
+            )
+            return time.perf_counter() - start, {_text(result) for result in results}
+
+    single_elapsed, single_pids = await elapsed(1)
+    pooled_elapsed, pooled_pids = await elapsed(4)
+
+    assert len(single_pids) == 1
+    assert len(pooled_pids) == 4
+    assert single_elapsed >= 1.2
+    assert pooled_elapsed < single_elapsed / 2
+
+
+@pytest.mark.asyncio
+async def test_crashed_session_is_restarted():
+    async with MCPServerPool(_stdio_server, size=2) as pool:
+        with pytest.raises(McpError):
+            await pool.call_tool("crash", {})
+        assert pool.restarts == 1
+
+        results = await asyncio.gather(*(pool.call_tool("work", {"seconds": 0}) for _ in range(4)))
+        assert all(_text(result).isdigit() for result in results)
+        assert pool.restarts == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_call_restarts_the_session():
+    servers: list[FlakyMCPServer] = []
+
+    def factory() -> MCPServer:
+        servers.append(FlakyMCPServer())
+        return servers[-1]
+
+    async with MCPServerPool(factory, size=1, health_check_interval=None) as pool:
+        with pytest.raises(ValueError):
+            await pool.call_tool("invalid", {})
+        assert pool.restarts == 0
+
+        servers[0].broken = True
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("tool", {})
+
+        await pool.call_tool("tool", {})
+        assert pool.restarts == 1
+        assert len(servers) == 2
+        assert servers[1].tool_calls == ["tool"]
+
+
+@pytest.mark.asyncio
+async def test_failed_reconnect_is_retried():
+    servers: list[FlakyMCPServer] = []
+
+    def factory() -> MCPServer:
+        # The first replacement fails to connect.
+        servers.append(FlakyMCPServer(fail_connect=len(servers) == 1))
+        return servers[-1]
+
+    async with MCPServerPool(
+        factory, size=1, health_check_interval=None, reconnect_delay=0.01
+    ) as pool:
+        servers[0].broken = True
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("tool", {})
+
+        for _ in range(100):
+            if len(servers) == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        await pool.call_tool("tool", {})
+        assert pool.restarts == 2
+        assert servers[2].tool_calls == ["tool"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_waits_for_replaced_sessions_to_close():
+    servers: list[FlakyMCPServer] = []
+
+    def factory() -> MCPServer:
+        # The crashed server takes longer to close than its replacement.
+        servers.append(FlakyMCPServer(cleanup_delay=0.1 if not servers else 0))
+        return servers[-1]
+
+    async with MCPServerPool(factory, size=1, health_check_interval=None) as pool:
+        servers[0].broken = True
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("tool", {})
+
+    assert len(servers) == 2
+    assert all(server.closed for server in servers)
+
+
+@pytest.mark.asyncio
+async def test_health_checks_restart_unhealthy_sessions():
+    servers: list[FlakyMCPServer] = []
+
+    def factory() -> MCPServer:
+        servers.append(FlakyMCPServer())
+        return servers[-1]
+
+    async with MCPServerPool(factory, size=2, health_check_interval=0.01) as pool:
+        servers[1].broken = True
+        for _ in range(100):
+            if pool.restarts:
+                break
+            await asyncio.sleep(0.01)
+
+        assert pool.restarts == 1
+        assert len(servers) == 3
+        await pool.list_tools()
+
+
+@pytest.mark.asyncio
+async def test_pool_requires_a_connection_and_a_positive_size():
+    with pytest.raises(UserError):
+        MCPServerPool(FakeMCPServer, size=0)
+
+    pool = MCPServerPool(FakeMCPServer, size=1)
+    with pytest.raises(UserError):
+        await pool.call_tool("tool", {})
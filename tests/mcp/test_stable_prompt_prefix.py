@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import inspect
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from agents import Agent, RunConfig, RunContextWrapper, Runner
+from agents.models.openai_responses import Converter
+
+from ..fake_model import FakeModel
+from ..test_responses import get_function_tool_call, get_text_message
+from .helpers import FakeMCPServer
+
+
+class ShufflingMCPServer(FakeMCPServer):
+    """Lists its tools in a different order every time."""
+
+    async def list_tools(self):
+        self.tools = self.tools[1:] + self.tools[:1]
+        return self.tools
+
+
+class PrefixRecordingModel(FakeModel):
+    """Records the serialized prefix of every request: the system prompt, tools and handoffs."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.prefixes: list[str] = []
+
+    def _record(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        request = inspect.signature(FakeModel.get_response).bind(self, *args, **kwargs).arguments
+        converted = Converter.convert_tools(request["tools"], request["handoffs"])
+        self.prefixes.append(json.dumps([request["system_instructions"], converted.tools]))
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> Any:
+        self._record(args, kwargs)
+        return await super().get_response(*args, **kwargs)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        self._record(args, kwargs)
+        async for event in super().stream_response(*args, **kwargs):
+            yield event
+
+
+def _agent(model: FakeModel) -> Agent[Any]:
+    server = ShufflingMCPServer()
+    for name in ["alpha", "beta", "gamma"]:
+        server.add_tool(name, {})
+    calls = 0
+
+    def instructions(context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+        nonlocal calls
+        calls += 1
+        return f"You are helpful. Call number {calls}."
+
+    return Agent(
+        name="test",
+        instructions=instructions,
+        model=model,
+        mcp_servers=[server],
+        handoffs=[Agent(name="zed"), Agent(name="amy")],
+    )
+
+
+async def _run(agent: Agent[Any], streamed: bool, run_config: RunConfig) -> None:
+    if streamed:
+        result = Runner.run_streamed(agent, input="go", run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+    else:
+        await Runner.run(agent, input="go", run_config=run_config)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_prefix_is_identical_across_turns_and_runs(streamed):
+    model = PrefixRecordingModel()
+    agent = _agent(model)
+    run_config = RunConfig(stable_prompt_prefix=True)
+
+    for _ in range(2):
+        model.add_multiple_turn_outputs(
+            [[get_function_tool_call("beta", "{}")], [get_text_message("done")]]
+        )
+        await _run(agent, streamed, run_config)
+
+    assert len(model.prefixes) == 4
+    # Instructions are frozen per run, so only the tools and handoffs are identical across runs.
+    first_run, second_run = model.prefixes[:2], model.prefixes[2:]
+    assert first_run[0] == first_run[1]
+    assert second_run[0] == second_run[1]
+    assert [json.loads(p)[1] for p in first_run] == [json.loads(p)[1] for p in second_run]
+    tool_names = [tool["name"] for tool in json.loads(first_run[0])[1]]
+    assert tool_names == ["alpha", "beta", "gamma", "transfer_to_amy", "transfer_to_zed"]
+
+
+@pytest.mark.asyncio
+async def test_prefix_follows_the_servers_by_default():
+    model = PrefixRecordingModel()
+    agent = _agent(model)
+
+    for _ in range(2):
+        model.add_multiple_turn_outputs(
+            [[get_function_tool_call("beta", "{}")], [get_text_message("done")]]
+        )
+        await _run(agent, False, RunConfig())
+
+    assert len(set(model.prefixes)) == 4
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from mcp.types import ListToolsResult, Tool as MCPTool
+
+from agents import UserError, trace
+from agents.mcp import MCPServerStdio, MCPUtil
+from agents.tracing import MCPListToolsSpanData
+
+from ..testing_processor import fetch_ordered_spans
+from .helpers import DummyStreamsContextManager, tee
+
+STDIO_SERVER = str(Path(__file__).parent / "stdio_server.py")
+
+
+def _tools(*names: str) -> ListToolsResult:
+    return ListToolsResult(tools=[MCPTool(name=name, inputSchema={}) for name in names])
+
+
+def _slow_list_tools(results: list[ListToolsResult], delay: float) -> Any:
+    async def list_tools() -> ListToolsResult:
+        await asyncio.sleep(delay)
+        return results.pop(0)
+
+    return list_tools
+
+
+@pytest.mark.asyncio
+@patch("mcp.client.stdio.stdio_client", return_value=DummyStreamsContextManager())
+@patch("mcp.client.session.ClientSession.initialize", new_callable=AsyncMock, return_value=None)
+@patch("mcp.client.session.ClientSession.list_tools")
+async def test_expired_tools_are_returned_while_refreshing_in_the_background(
+    mock_list_tools: AsyncMock, mock_initialize: AsyncMock, mock_stdio_client
+):
+    mock_list_tools.side_effect = _slow_list_tools([_tools("old"), _tools("new")], delay=0.05)
+    server = MCPServerStdio(params={"command": tee}, cache_tools_ttl=0.1)
+
+    async with server:
+        assert [tool.name for tool in await server.list_tools()] == ["old"]
+        await asyncio.sleep(0.1)
+
+        # The cache has expired, but the stale list is returned without waiting for the server.
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert [tool.name for tool in await server.list_tools()] == ["old"]
+        assert loop.time() - start < 0.05
+        await asyncio.sleep(0)
+        assert mock_list_tools.call_count == 2
+
+        await asyncio.sleep(0.1)
+        assert [tool.name for tool in await server.list_tools()] == ["new"]
+        assert mock_list_tools.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("mcp.client.stdio.stdio_client", return_value=DummyStreamsContextManager())
+@patch("mcp.client.session.ClientSession.initialize", new_callable=AsyncMock, return_value=None)
+@patch("mcp.client.session.ClientSession.list_tools")
+async def test_cache_age_and_refresh_latency_are_recorded_on_the_span(
+    mock_list_tools: AsyncMock, mock_initialize: AsyncMock, mock_stdio_client
+):
+    mock_list_tools.side_effect = _slow_list_tools([_tools("tool")], delay=0.05)
+    server = MCPServerStdio(params={"command": tee}, cache_tools_ttl=60)
+
+    async with server:
+        with trace("test"):
+            for _ in range(2):
+                await MCPUtil.get_function_tools(server, convert_schemas_to_strict=False)
+
+    first, second = [
+        span.span_data
+        for span in fetch_ordered_spans()
+        if isinstance(span.span_data, MCPListToolsSpanData)
+    ]
+    assert first.cache_age == 0.0
+    assert first.refresh_latency is not None and first.refresh_latency >= 0.05
+    assert second.cache_age is not None and second.cache_age > 0
+    assert second.refresh_latency == first.refresh_latency
+    assert second.export()["cache_age"] == second.cache_age
+    assert "cache_age" not in MCPListToolsSpanData(server="uncached").export()
+
+
+@pytest.mark.asyncio
+async def test_tools_list_changed_notification_invalidates_the_cache():
+    server = MCPServerStdio(
+        {"command": sys.executable, "args": [STDIO_SERVER]}, cache_tools_list=True
+    )
+
+    async with server:
+        assert "extra" not in [tool.name for tool in await server.list_tools()]
+
+        result = await server.call_tool("add_tool", {"name": "extra"})
+        assert not result.isError
+
+        assert "extra" in [tool.name for tool in await server.list_tools()]
+
+
+def test_ttl_must_be_positive():
+    with pytest.raises(UserError):
+        MCPServerStdio(params={"command": tee}, cache_tools_ttl=0)
@@ -47,6 +47,8 @@ def test_all_fields_serialization() -> None:
         extra_query={"foo": "bar"},
         extra_body={"foo": "bar"},
         extra_headers={"foo": "bar"},
+        emit_tool_calls_early=True,
+        estimate_input_tokens=True,
     )
 
     # Verify that every single field is set to a non-None value
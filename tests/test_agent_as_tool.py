@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    Model,
+    ModelProvider,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    ToolCache,
+    Usage,
+    output_guardrail,
+)
+from agents.items import ModelResponse
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+class EchoModel(FakeModel):
+    """Answers every request with the last user message, after a short delay. Records the number
+    of calls and the highest number of calls in flight at once."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        input = kwargs["input"]
+        text = input if isinstance(input, str) else input[-1]["content"]
+        return ModelResponse(
+            output=[get_text_message(f"echo {text}")],
+            usage=Usage(requests=1, input_tokens=5, output_tokens=2, total_tokens=7),
+            response_id=None,
+        )
+
+
+class Provider(ModelProvider):
+    def __init__(self, models: dict[str, Model]) -> None:
+        self.models = models
+
+    def get_model(self, model_name: str | None) -> Model:
+        assert model_name is not None
+        return self.models[model_name]
+
+
+def _orchestrator(tool_calls: list[tuple[str, dict[str, Any]]], **tool_kwargs: Any) -> Any:
+    echo = EchoModel()
+    worker = Agent(name="worker", model="echo")
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call(name, json.dumps(args)) for name, args in tool_calls],
+            [get_text_message("done")],
+        ]
+    )
+    tool = worker.as_tool("ask_worker", "Asks the worker.", **tool_kwargs)
+    orchestrator = Agent(name="orchestrator", model=model, tools=[tool])
+    return orchestrator, echo, RunConfig(model_provider=Provider({"echo": echo}))
+
+
+def _tool_outputs(result: Any) -> list[Any]:
+    return [item.output for item in result.new_items if item.type == "tool_call_output_item"]
+
+
+@pytest.mark.asyncio
+async def test_sub_runs_inherit_the_run_config_and_roll_up_usage():
+    @output_guardrail
+    def reject_all(
+        context: RunContextWrapper[Any], agent: Agent[Any], output: Any
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=agent.name == "worker")
+
+    orchestrator, echo, run_config = _orchestrator([("ask_worker", {"input": "hi"})])
+    run_config.output_guardrails = [reject_all]
+
+    result = await Runner.run(orchestrator, input="go", run_config=run_config)
+
+    # The worker's model was resolved by the parent's provider; the parent's run-level output
+    # guardrails don't apply to the sub-run.
+    assert _tool_outputs(result) == ["echo hi"]
+    assert result.context_wrapper.usage.requests == 1
+    assert result.context_wrapper.usage.total_tokens == 7
+
+
+@pytest.mark.asyncio
+async def test_identical_inputs_share_cached_sub_runs():
+    cache = ToolCache()
+    calls = [("ask_worker", {"input": "hi"})] * 3 + [("ask_worker", {"input": "bye"})]
+    orchestrator, echo, run_config = _orchestrator(calls, cache=cache)
+
+    result = await Runner.run(orchestrator, input="go", run_config=run_config)
+
+    assert _tool_outputs(result) == ["echo hi"] * 3 + ["echo bye"]
+    assert echo.calls == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert result.context_wrapper.usage.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_batched_tool_runs_inputs_concurrently_within_the_limit():
+    orchestrator, echo, run_config = _orchestrator(
+        [("ask_worker", {"inputs": ["a", "b", "c", "d"]})], batched=True, max_concurrency=2
+    )
+
+    result = await Runner.run(orchestrator, input="go", run_config=run_config)
+
+    assert [json.loads(output) for output in _tool_outputs(result)] == [
+        ["echo a", "echo b", "echo c", "echo d"]
+    ]
+    assert echo.calls == 4
+    assert echo.max_in_flight == 2
+    assert result.context_wrapper.usage.requests == 4
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from agents import Agent, AgentGraph, RunConfig, Runner, handoff
+from agents.models.interface import Model, ModelProvider
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool, get_handoff_tool_call, get_text_message
+
+
+class Foo(BaseModel):
+    bar: str
+
+
+class CountingProvider(ModelProvider):
+    def __init__(self, model: Model):
+        self.model = model
+        self.calls = 0
+
+    def get_model(self, model_name: str | None) -> Model:
+        self.calls += 1
+        return self.model
+
+
+def test_compile_walks_handoff_graph():
+    agent_3 = Agent(name="agent_3", output_type=Foo)
+    agent_2 = Agent(name="agent_2", handoffs=[agent_3])
+    agent_1 = Agent(name="agent_1", handoffs=[agent_2, handoff(agent_3)])
+
+    graph = AgentGraph.compile(agent_1)
+
+    assert len(graph) == 3
+    assert agent_1 in graph and agent_2 in graph and agent_3 in graph
+    assert [h.agent_name for h in graph.get(agent_1).handoffs] == ["agent_2", "agent_3"]
+    assert graph.get(agent_1).output_schema is None
+    output_schema = graph.get(agent_3).output_schema
+    assert output_schema is not None
+    assert output_schema.name() == "Foo"
+
+
+def test_compiled_structures_are_reused():
+    agent_2 = Agent(name="agent_2", output_type=Foo)
+    agent_1 = Agent(name="agent_1", handoffs=[agent_2])
+    graph = AgentGraph.compile(agent_1)
+
+    assert graph.get(agent_2).output_schema is graph.get(agent_2).output_schema
+    assert graph.get(agent_1).handoffs[0] is graph.get(agent_1).handoffs[0]
+
+
+def test_clone_is_compiled_separately():
+    agent = Agent(name="agent", output_type=Foo)
+    graph = AgentGraph.compile(agent)
+
+    clone = agent.clone(output_type=str)
+
+    assert clone not in graph
+    assert graph.get(clone).output_schema is None
+    assert graph.get(agent).output_schema is not None
+    assert len(graph) == 2
+
+
+def test_least_recently_used_agents_are_dropped():
+    agent = Agent(name="agent", output_type=Foo)
+    graph = AgentGraph(max_agents=3)
+    node = graph.get(agent)
+
+    for i in range(10):
+        graph.get(agent.clone(name=f"clone_{i}"))
+        assert graph.get(agent) is node
+
+    assert len(graph) == 3
+    assert agent in graph
+
+
+def test_mutated_agent_is_recompiled():
+    agent_2 = Agent(name="agent_2")
+    agent_1 = Agent(name="agent_1", handoffs=[agent_2])
+    graph = AgentGraph.compile(agent_1)
+    compiled = graph.get(agent_1)
+
+    agent_1.handoffs = [agent_2.clone(name="agent_2_clone")]
+
+    assert graph.get(agent_1) is not compiled
+    assert [h.agent_name for h in graph.get(agent_1).handoffs] == ["agent_2_clone"]
+
+
+def test_models_are_resolved_once_per_provider():
+    model = FakeModel()
+    provider = CountingProvider(model)
+    agent = Agent(name="agent", model="some-model")
+    graph = AgentGraph.compile(agent)
+    run_config = RunConfig(model_provider=provider)
+
+    assert graph.get(agent).get_model(run_config) is model
+    assert graph.get(agent).get_model(run_config) is model
+    assert provider.calls == 1
+
+    other_provider = CountingProvider(model)
+    graph.get(agent).get_model(RunConfig(model_provider=other_provider))
+    assert other_provider.calls == 1
+
+
+def test_run_config_model_overrides_agent_model():
+    model = FakeModel()
+    override = FakeModel()
+    agent = Agent(name="agent", model=model)
+    graph = AgentGraph.compile(agent)
+
+    assert graph.get(agent).get_model(RunConfig()) is model
+    assert graph.get(agent).get_model(RunConfig(model=override)) is override
+
+
+@pytest.mark.asyncio
+async def test_graph_is_shared_across_runs():
+    model = FakeModel()
+    provider = CountingProvider(model)
+    agent_2 = Agent(name="agent_2", model="some-model")
+    agent_1 = Agent(
+        name="agent_1",
+        model="some-model",
+        handoffs=[agent_2],
+        tools=[get_function_tool("foo", "result")],
+    )
+    run_config = RunConfig(model_provider=provider, agent_graph=AgentGraph.compile(agent_1))
+
+    for _ in range(3):
+        model.add_multiple_turn_outputs(
+            [[get_handoff_tool_call(agent_2)], [get_text_message("done")]]
+        )
+        result = await Runner.run(agent_1, input="test", run_config=run_config)
+        assert result.final_output == "done"
+        assert result.last_agent == agent_2
+
+    # One lookup per agent, rather than one per turn per run.
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_graph_with_streamed_runs():
+    model = FakeModel()
+    agent = Agent(name="agent", model=model)
+    run_config = RunConfig(agent_graph=AgentGraph.compile(agent))
+
+    for _ in range(2):
+        model.set_next_output([get_text_message("done")])
+        result = Runner.run_streamed(agent, input="test", run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+        assert result.final_output == "done"
+
+
+def test_unhashable_provider_is_not_cached():
+    class UnhashableProvider(CountingProvider):
+        __hash__ = None  # type: ignore
+
+    model = FakeModel()
+    provider: Any = UnhashableProvider(model)
+    agent = Agent(name="agent", model="some-model")
+    graph = AgentGraph.compile(agent)
+
+    graph.get(agent).get_model(RunConfig(model_provider=provider))
+    graph.get(agent).get_model(RunConfig(model_provider=provider))
+    assert provider.calls == 2
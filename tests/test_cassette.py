@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from agents import Agent, ModelSettings, RunConfig, Runner, UserError, function_tool
+from agents.extensions.models.cassette import (
+    Cassette,
+    RecordingModel,
+    RecordingModelProvider,
+    ReplayModel,
+    ReplayModelProvider,
+    request_key,
+)
+from agents.models.interface import Model, ModelProvider
+from agents.result import RunResultBase
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+@function_tool
+def read_file(path: str) -> str:
+    return f"contents of {path}"
+
+
+def _model() -> FakeModel:
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("read_file", json.dumps({"path": "a.txt"}))],
+            [get_text_message("reading b"), get_function_tool_call("read_file", '{"path": "b"}')],
+            [get_text_message("done")],
+        ]
+    )
+    return model
+
+
+async def _run(model: Model, streamed: bool) -> RunResultBase:
+    agent = Agent(name="coder", instructions="Read files.", model=model, tools=[read_file])
+    result: RunResultBase
+    if streamed:
+        result = Runner.run_streamed(agent, input="go")
+        async for _ in result.stream_events():
+            pass
+    else:
+        result = await Runner.run(agent, input="go")
+    return result
+
+
+class SlowStreamModel(FakeModel):
+    """Streams every event after a delay."""
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in super().stream_response(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            yield event
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_replay_reproduces_recorded_run(tmp_path, streamed):
+    path = tmp_path / "run.jsonl.gz"
+    recorded = await _run(RecordingModel(_model(), Cassette(path)), streamed)
+
+    cassette = Cassette.load(path)
+    assert len(cassette.exchanges) == 3
+    assert all(exchange.streamed == streamed for exchange in cassette.exchanges)
+
+    replay = ReplayModel(cassette)
+    for _ in range(2):
+        replayed = await _run(replay, streamed)
+        assert replayed.final_output == "done"
+        assert replayed.to_input_list() == recorded.to_input_list()
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_stream_timing(tmp_path):
+    cassette = Cassette()
+    model = SlowStreamModel()
+    model.set_next_output([get_text_message("done")])
+    recorded = RecordingModel(model, cassette)
+    agent = Agent(name="coder", model=recorded)
+    result = Runner.run_streamed(agent, input="go")
+    async for _ in result.stream_events():
+        pass
+
+    [exchange] = cassette.exchanges
+    assert exchange.events[0][0] >= 0.05
+
+    async def replay(timing: Any) -> float:
+        start = time.perf_counter()
+        result = Runner.run_streamed(
+            agent.clone(model=ReplayModel(cassette, timing=timing)), input="go"
+        )
+        async for _ in result.stream_events():
+            pass
+        assert result.final_output == "done"
+        return time.perf_counter() - start
+
+    assert await replay("recorded") >= 0.05
+    assert await replay("instant") < 0.05
+
+
+def test_request_key_is_normalized():
+    settings = ModelSettings()
+    key = request_key("sys", "hi", settings, [], None, [], None)
+
+    assert key == request_key(
+        "sys", [{"role": "user", "content": "hi"}], settings, [], None, [], None
+    )
+    with_id: Any = {"id": "msg_1", "role": "user", "content": "hi"}
+    assert key == request_key("sys", [with_id], settings, [], None, [], None)
+    assert key != request_key("sys", "hi", settings, [read_file], None, [], None)
+    assert key != request_key("sys", "hi", ModelSettings(temperature=0), [], None, [], None)
+
+
+@pytest.mark.asyncio
+async def test_replay_of_unknown_request_fails(tmp_path):
+    path = tmp_path / "run.jsonl"
+    await _run(RecordingModel(_model(), Cassette(path)), streamed=False)
+
+    agent = Agent(name="coder", instructions="Changed.", model=ReplayModel(Cassette.load(path)))
+    with pytest.raises(UserError, match="No non-streamed exchange"):
+        await Runner.run(agent, input="go")
+
+
+@pytest.mark.asyncio
+async def test_providers_record_and_replay_by_model_name(tmp_path):
+    class FakeProvider(ModelProvider):
+        def __init__(self) -> None:
+            self.model = _model()
+
+        def get_model(self, model_name: str | None) -> Model:
+            return self.model
+
+    cassette = Cassette(tmp_path / "run.jsonl")
+    agent = Agent(name="coder", model="gpt-4o", tools=[read_file])
+
+    recorded = await Runner.run(
+        agent,
+        input="go",
+        run_config=RunConfig(model_provider=RecordingModelProvider(FakeProvider(), cassette)),
+    )
+    replayed = await Runner.run(
+        agent, input="go", run_config=RunConfig(model_provider=ReplayModelProvider(cassette))
+    )
+
+    assert replayed.to_input_list() == recorded.to_input_list()
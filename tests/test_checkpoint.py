@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from agents import (
+    Agent,
+    AgentOutputSchema,
+    JSONLCheckpointStore,
+    RunConfig,
+    Runner,
+    Usage,
+    UserError,
+    function_tool,
+)
+from agents.items import TResponseOutputItem
+
+from .fake_model import FakeModel
+from .test_responses import (
+    get_final_output_message,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_message,
+)
+
+
+class Weather(BaseModel):
+    city: str
+    temperature: float
+
+
+@function_tool
+def read_file(path: str) -> str:
+    return f"contents of {path}"
+
+
+def _agents(model: FakeModel) -> tuple[Agent[Any], Agent[Any]]:
+    worker = Agent(name="worker", model=model, tools=[read_file], output_type=Weather)
+    triage = Agent(name="triage", model=model, handoffs=[worker])
+    return triage, worker
+
+
+def _turn_outputs(worker: Agent[Any]) -> list[list[TResponseOutputItem]]:
+    return [
+        [get_text_message("handing off"), get_handoff_tool_call(worker)],
+        [get_function_tool_call("read_file", json.dumps({"path": "a.txt"}))],
+        [get_function_tool_call("read_file", json.dumps({"path": "b.txt"}))],
+        [get_final_output_message(json.dumps({"city": "Paris", "temperature": 21.5}))],
+    ]
+
+
+def _model() -> FakeModel:
+    model = FakeModel()
+    model.set_hardcoded_usage(Usage(requests=1, input_tokens=10, output_tokens=5, total_tokens=15))
+    return model
+
+
+@pytest.mark.asyncio
+async def test_resume_continues_from_last_completed_turn(tmp_path):
+    expected_model = _model()
+    triage, worker = _agents(expected_model)
+    expected_model.add_multiple_turn_outputs(list(_turn_outputs(worker)))
+    expected = await Runner.run(triage, input="weather?")
+
+    store = JSONLCheckpointStore(tmp_path)
+    model = _model()
+    triage, worker = _agents(model)
+    outputs: list[list[TResponseOutputItem] | Exception] = list(_turn_outputs(worker))
+    model.add_multiple_turn_outputs(outputs[:2] + [ConnectionError("proxy outage")])
+    run_config = RunConfig(checkpoint_store=store, checkpoint_id="run-1")
+
+    with pytest.raises(ConnectionError):
+        await Runner.run(triage, input="weather?", run_config=run_config)
+
+    # A new process, with new agent objects and only the remaining model outputs.
+    model = _model()
+    triage, worker = _agents(model)
+    model.add_multiple_turn_outputs(outputs[2:])
+    result = await Runner.resume(
+        "run-1", {"triage": triage, "worker": worker}, run_config=RunConfig(checkpoint_store=store)
+    )
+
+    assert model.turn_outputs == []
+    assert result.final_output == Weather(city="Paris", temperature=21.5)
+    assert result.last_agent is worker
+    assert result.checkpoint_id == "run-1"
+    assert result.to_input_list() == expected.to_input_list()
+    assert result.raw_responses == expected.raw_responses
+    assert result.context_wrapper.usage == expected.context_wrapper.usage
+    assert [item.agent.name for item in result.new_items] == [
+        item.agent.name for item in expected.new_items
+    ]
+    assert len(store.list_checkpoints()) == 1
+
+
+@pytest.mark.asyncio
+async def test_records_only_contain_new_items(tmp_path):
+    store = JSONLCheckpointStore(tmp_path)
+    model = _model()
+    triage, worker = _agents(model)
+    model.add_multiple_turn_outputs(list(_turn_outputs(worker)))
+
+    result = await Runner.run(
+        triage, input="weather?", run_config=RunConfig(checkpoint_store=store)
+    )
+
+    assert result.checkpoint_id is not None
+    records = await store.load(result.checkpoint_id)
+    assert records is not None
+    assert [record["turn"] for record in records] == [1, 2, 3, 4]
+    assert [record["items_from"] for record in records] == [0, 3, 5, 7]
+    assert ["input" in record for record in records] == [True, False, False, False]
+    assert sum(len(record["items"]) for record in records) == len(result.new_items)
+
+
+@pytest.mark.asyncio
+async def test_resuming_a_complete_run_does_not_call_the_model(tmp_path):
+    store = JSONLCheckpointStore(tmp_path)
+    model = _model()
+    triage, worker = _agents(model)
+    model.add_multiple_turn_outputs(list(_turn_outputs(worker)))
+    run_config = RunConfig(checkpoint_store=store)
+    result = await Runner.run(triage, input="weather?", run_config=run_config)
+    assert result.checkpoint_id is not None
+
+    resumed = await Runner.resume(
+        result.checkpoint_id, {"triage": triage, "worker": worker}, run_config=run_config
+    )
+
+    assert resumed.final_output == result.final_output
+    assert resumed.to_input_list() == result.to_input_list()
+
+
+@pytest.mark.asyncio
+async def test_streamed_runs_cant_be_checkpointed(tmp_path):
+    model = _model()
+    triage, _ = _agents(model)
+    run_config = RunConfig(checkpoint_store=JSONLCheckpointStore(tmp_path))
+
+    with pytest.raises(UserError, match="Streamed runs"):
+        Runner.run_streamed(triage, input="weather?", run_config=run_config)
+
+
+@pytest.mark.asyncio
+async def test_run_many_checkpoints_each_run_separately(tmp_path):
+    store = JSONLCheckpointStore(tmp_path)
+    model = FakeModel()
+    model.add_multiple_turn_outputs([[get_text_message("a")], [get_text_message("b")]])
+    agent = Agent(name="test", model=model)
+
+    with pytest.raises(UserError, match="checkpoint_id"):
+        Runner.run_many(
+            agent, ["a", "b"], run_config=RunConfig(checkpoint_store=store, checkpoint_id="run")
+        )
+
+    batch = Runner.run_many(agent, ["a", "b"], run_config=RunConfig(checkpoint_store=store))
+    results = [item.result async for item in batch.stream_results()]
+
+    ids = {result.checkpoint_id for result in results if result is not None}
+    assert len(ids) == 2
+    assert set(store.list_checkpoints()) == ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "output_type, output, expected",
+    [
+        (list[int], {"response": [1, 2]}, [1, 2]),
+        (AgentOutputSchema(Weather), {"city": "Paris", "temperature": 21.5}, None),
+    ],
+)
+async def test_resume_restores_the_final_output_through_the_output_schema(
+    tmp_path, output_type, output, expected
+):
+    store = JSONLCheckpointStore(tmp_path)
+    model = _model()
+    agent = Agent(name="test", model=model, output_type=output_type)
+    model.set_next_output([get_final_output_message(json.dumps(output))])
+    run_config = RunConfig(checkpoint_store=store)
+    result = await Runner.run(agent, input="weather?", run_config=run_config)
+    assert result.checkpoint_id is not None
+
+    resumed = await Runner.resume(result.checkpoint_id, {"test": agent}, run_config=run_config)
+
+    assert resumed.final_output == result.final_output
+    if expected is not None:
+        assert resumed.final_output == expected
+
+
+@pytest.mark.asyncio
+async def test_partially_written_record_is_ignored(tmp_path):
+    store = JSONLCheckpointStore(tmp_path)
+    await store.append("run", [{"turn": 1}])
+    with open(store.path("run"), "a") as f:
+        f.write('{"turn": 2, "ite')
+
+    assert await store.load("run") == [{"turn": 1}]
+
+    await store.append("run", [{"turn": 2}])
+    assert await store.load("run") == [{"turn": 1}, {"turn": 2}]
+
+
+@pytest.mark.asyncio
+async def test_resume_errors(tmp_path):
+    store = JSONLCheckpointStore(tmp_path)
+    model = _model()
+    triage, worker = _agents(model)
+    model.add_multiple_turn_outputs(list(_turn_outputs(worker)))
+    run_config = RunConfig(checkpoint_store=store, checkpoint_id="run-1")
+    await Runner.run(triage, input="weather?", run_config=run_config)
+
+    with pytest.raises(UserError, match="checkpoint_store"):
+        await Runner.resume("run-1", {"triage": triage, "worker": worker})
+    with pytest.raises(UserError, match="not found"):
+        await Runner.resume("missing", {"triage": triage}, run_config=run_config)
+    with pytest.raises(UserError, match="'worker'"):
+        await Runner.resume("run-1", {"triage": triage}, run_config=run_config)
+    with pytest.raises(UserError, match="Invalid checkpoint ID"):
+        await Runner.resume("../run-1", {"triage": triage}, run_config=run_config)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from agents import Agent, HandoffInputData, MessageOutputItem, Runner, handoff
+from agents._conversation_log import ConversationLog
+from agents.extensions.handoff_filters import remove_all_tools
+from agents.items import ToolCallItem, ToolCallOutputItem
+
+from .fake_model import FakeModel
+from .test_responses import (
+    get_function_tool,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_input_item,
+    get_text_message,
+)
+
+
+def _message_item(agent: Agent[Any], text: str) -> MessageOutputItem:
+    return MessageOutputItem(agent=agent, raw_item=get_text_message(text))  # type: ignore
+
+
+def test_run_item_input_conversion_is_cached():
+    item = _message_item(Agent(name="test"), "hello")
+
+    first = item.to_input_item()
+    assert first == item.raw_item.model_dump(exclude_unset=True)
+    assert item.to_input_item() is first
+
+
+def test_log_appends_incrementally():
+    agent = Agent(name="test")
+    original_input = [get_text_input_item("hi")]
+    log = ConversationLog(original_input)
+    items = [_message_item(agent, "a"), _message_item(agent, "b")]
+
+    log.sync(original_input, items[:1])
+    first_view = log.to_input_list()
+    log.sync(original_input, items)
+    second_view = log.to_input_list()
+
+    assert len(first_view) == 2, "views should not change after they are handed out"
+    assert second_view == [
+        get_text_input_item("hi"),
+        items[0].to_input_item(),
+        items[1].to_input_item(),
+    ]
+    assert second_view[1] is first_view[1], "logged items should not be converted again"
+
+
+def test_string_input_is_converted_once():
+    log = ConversationLog("hello")
+
+    assert log.to_input_list() == [get_text_input_item("hello")]
+    assert log.to_input_list()[0] is log.to_input_list()[0]
+
+
+def test_views_are_copy_on_write():
+    log = ConversationLog([get_text_input_item("hi")])
+
+    view = log.to_input_list()
+    view.append(get_text_input_item("extra"))
+
+    assert len(log) == 1
+    assert log.to_input_list() == [get_text_input_item("hi")]
+
+
+def test_log_rebuilds_when_history_is_rewritten():
+    agent = Agent(name="test")
+    original_input = [get_text_input_item("hi")]
+    tool_call = ToolCallItem(agent=agent, raw_item=get_function_tool_call("foo"))  # type: ignore
+    message = _message_item(agent, "done")
+    log = ConversationLog(original_input)
+    log.sync(original_input, [tool_call, message])
+
+    filtered = remove_all_tools(
+        HandoffInputData(
+            input_history=tuple(original_input),
+            pre_handoff_items=(tool_call, message),
+            new_items=(),
+        )
+    )
+    assert isinstance(filtered.input_history, tuple)
+    new_input = list(filtered.input_history)
+    log.sync(new_input, list(filtered.pre_handoff_items))
+
+    assert log.to_input_list() == [get_text_input_item("hi"), message.to_input_item()]
+    assert log.run_items == [message]
+
+
+@pytest.mark.asyncio
+async def test_runner_sends_incremental_history_to_model():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a"), get_function_tool_call("foo", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent, input="user_message")
+
+    # The second turn should see the original input plus everything generated in the first turn.
+    assert model.last_turn_args["input"] == [
+        get_text_input_item("user_message"),
+        *[item.to_input_item() for item in result.new_items[:3]],
+    ]
+    assert isinstance(result.new_items[2], ToolCallOutputItem)
+    assert result.to_input_list() == [
+        get_text_input_item("user_message"),
+        *[item.to_input_item() for item in result.new_items],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_runner_log_follows_handoff_input_filter():
+    model = FakeModel()
+    agent_2 = Agent(name="test_2", model=model)
+    agent_1 = Agent(
+        name="test_1",
+        model=model,
+        handoffs=[handoff(agent_2, input_filter=remove_all_tools)],
+    )
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a"), get_handoff_tool_call(agent_2)],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = await Runner.run(agent_1, input="user_message")
+
+    assert model.last_turn_args["input"] == [
+        get_text_input_item("user_message"),
+        result.new_items[0].to_input_item(),
+    ]
+    assert result.to_input_list() == [
+        get_text_input_item("user_message"),
+        *[item.to_input_item() for item in result.new_items],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streamed_runner_uses_log():
+    model = FakeModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "tool_result")])
+    model.add_multiple_turn_outputs(
+        [
+            [get_text_message("a"), get_function_tool_call("foo", "")],
+            [get_text_message("done")],
+        ]
+    )
+
+    result = Runner.run_streamed(agent, input="user_message")
+    async for _ in result.stream_events():
+        pass
+
+    assert model.last_turn_args["input"] == [
+        get_text_input_item("user_message"),
+        *[item.to_input_item() for item in result.new_items[:3]],
+    ]
+    assert len(result.to_input_list()) == 5
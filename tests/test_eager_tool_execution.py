@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from openai.types.responses import ResponseCompletedEvent, ResponseOutputItemDoneEvent
+
+from agents import Agent, ModelBehaviorError, RunConfig, Runner, function_tool
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, ToolCallOutputItem, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelTracing
+from agents.tool import Tool
+
+from .fake_model import get_response_obj
+from .test_responses import get_function_tool_call, get_text_message
+
+
+class SlowStreamingModel(Model):
+    """Streams a single tool call, then waits for `release` (or a timeout) before completing the
+    response. The second turn replies with a text message."""
+
+    def __init__(
+        self,
+        release: asyncio.Event,
+        fail_after_tool_call: bool = False,
+        final_arguments: str = "{}",
+    ):
+        self.release = release
+        self.fail_after_tool_call = fail_after_tool_call
+        self.final_arguments = final_arguments
+        self.released_before_completion: bool | None = None
+        self.emit_tool_calls_early: bool | None = None
+        self.turn = 0
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> ModelResponse:
+        raise NotImplementedError()
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        self.turn += 1
+        self.emit_tool_calls_early = model_settings.emit_tool_calls_early
+        if self.turn > 1:
+            yield ResponseCompletedEvent(
+                type="response.completed",
+                response=get_response_obj([get_text_message("done")]),
+            )
+            return
+
+        tool_call = get_function_tool_call("slow_tool", "{}")
+        yield ResponseOutputItemDoneEvent(
+            item=tool_call, output_index=0, type="response.output_item.done"
+        )
+        try:
+            await asyncio.wait_for(self.release.wait(), timeout=0.2)
+            self.released_before_completion = True
+        except asyncio.TimeoutError:
+            self.released_before_completion = False
+
+        if self.fail_after_tool_call:
+            raise RuntimeError("stream failed")
+        final_tool_call = get_function_tool_call("slow_tool", self.final_arguments)
+        yield ResponseCompletedEvent(
+            type="response.completed", response=get_response_obj([final_tool_call])
+        )
+
+
+def _make_agent(model: Model, release: asyncio.Event, tool_state: dict[str, bool]) -> Agent:
+    @function_tool
+    async def slow_tool() -> str:
+        release.set()
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            tool_state["cancelled"] = True
+            raise
+        tool_state["finished"] = True
+        return "tool result"
+
+    return Agent(name="test", model=model, tools=[slow_tool])
+
+
+@pytest.mark.asyncio
+async def test_eager_tool_starts_before_response_completes():
+    release = asyncio.Event()
+    model = SlowStreamingModel(release)
+    tool_state: dict[str, bool] = {}
+    agent = _make_agent(model, release, tool_state)
+
+    result = Runner.run_streamed(
+        agent, input="test", run_config=RunConfig(eager_tool_execution=True)
+    )
+    async for _ in result.stream_events():
+        pass
+
+    assert model.released_before_completion is True
+    assert model.emit_tool_calls_early is True
+    assert tool_state == {"finished": True}
+    assert result.final_output == "done"
+    outputs = [item for item in result.new_items if isinstance(item, ToolCallOutputItem)]
+    assert len(outputs) == 1
+    assert outputs[0].output == "tool result"
+
+
+@pytest.mark.asyncio
+async def test_tools_wait_for_response_without_eager_execution():
+    release = asyncio.Event()
+    model = SlowStreamingModel(release)
+    tool_state: dict[str, bool] = {}
+    agent = _make_agent(model, release, tool_state)
+
+    result = Runner.run_streamed(agent, input="test")
+    async for _ in result.stream_events():
+        pass
+
+    assert model.released_before_completion is False
+    assert not model.emit_tool_calls_early
+    assert result.final_output == "done"
+
+
+@pytest.mark.asyncio
+async def test_eager_tool_is_cancelled_when_stream_fails():
+    release = asyncio.Event()
+    model = SlowStreamingModel(release, fail_after_tool_call=True)
+    tool_state: dict[str, bool] = {}
+    agent = _make_agent(model, release, tool_state)
+
+    result = Runner.run_streamed(
+        agent, input="test", run_config=RunConfig(eager_tool_execution=True)
+    )
+    with pytest.raises(RuntimeError):
+        async for _ in result.stream_events():
+            pass
+
+    await asyncio.sleep(0.1)
+    assert tool_state == {"cancelled": True}
+
+
+@pytest.mark.asyncio
+async def test_changed_tool_call_is_an_error_rather_than_a_rerun():
+    release = asyncio.Event()
+    model = SlowStreamingModel(release, final_arguments='{"changed": true}')
+    tool_state: dict[str, bool] = {}
+    agent = _make_agent(model, release, tool_state)
+
+    result = Runner.run_streamed(
+        agent, input="test", run_config=RunConfig(eager_tool_execution=True)
+    )
+    with pytest.raises(ModelBehaviorError, match="changed after it was started"):
+        async for _ in result.stream_events():
+            pass
+
+    await asyncio.sleep(0.1)
+    assert tool_state == {"cancelled": True}
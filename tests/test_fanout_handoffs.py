@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    FanoutBranchResult,
+    FirstValidOutput,
+    MaxTurnsExceeded,
+    MergeOutputs,
+    Quorum,
+    RunConfig,
+    Runner,
+    Usage,
+    handoff,
+)
+from agents.result import RunResultBase
+
+from .fake_model import FakeModel, SlowModel
+from .test_responses import (
+    get_function_tool,
+    get_function_tool_call,
+    get_handoff_tool_call,
+    get_text_message,
+)
+
+
+def _usage() -> Usage:
+    return Usage(requests=1, input_tokens=10, output_tokens=1, total_tokens=11)
+
+
+def _specialist(name: str, output: str | Exception, delay: float = 0.0) -> Agent[Any]:
+    model = SlowModel(delay)
+    model.set_hardcoded_usage(_usage())
+    model.set_next_output(output if isinstance(output, Exception) else [get_text_message(output)])
+    return Agent(name=name, model=model)
+
+
+def _triage(*specialists: Agent[Any]) -> Agent[Any]:
+    model = FakeModel()
+    model.set_hardcoded_usage(_usage())
+    model.set_next_output([get_handoff_tool_call(agent) for agent in specialists])
+    return Agent(name="triage", model=model, handoffs=list(specialists))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_first_valid_output_wins_and_cancels_the_rest(streamed):
+    fast = _specialist("fast", "fast answer")
+    slow = _specialist("slow", "slow answer", delay=10)
+    triage = _triage(slow, fast)
+    run_config = RunConfig(fanout_policy=FirstValidOutput())
+
+    result: RunResultBase
+    if streamed:
+        result = Runner.run_streamed(triage, input="go", run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+    else:
+        result = await Runner.run(triage, input="go", run_config=run_config)
+
+    assert result.final_output == "fast answer"
+    assert isinstance(slow.model, SlowModel) and slow.model.cancelled
+    # Both handoff calls get an output, followed by the winning branch's items.
+    assert [item.type for item in result.new_items] == [
+        "handoff_call_item",
+        "handoff_call_item",
+        "handoff_output_item",
+        "handoff_output_item",
+        "message_output_item",
+    ]
+    assert result.new_items[-1].agent is fast
+    # The triage agent and the winning branch; the cancelled branch didn't finish a request.
+    assert result.context_wrapper.usage.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_handoff_fanout_reaches_a_quorum():
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_text_message("yes")], [get_text_message("no")], [get_text_message("yes")]]
+    )
+    voter = Agent(name="voter", model=model)
+    triage = Agent(name="triage", model=FakeModel(), handoffs=[handoff(voter, fanout=3)])
+    assert isinstance(triage.model, FakeModel)
+    triage.model.set_next_output([get_handoff_tool_call(voter)])
+
+    result = await Runner.run(triage, input="go", run_config=RunConfig(fanout_policy=Quorum(2)))
+
+    assert result.final_output == "yes"
+
+
+@pytest.mark.asyncio
+async def test_merge_combines_the_successful_branches():
+    merged: list[FanoutBranchResult] = []
+
+    def merge(branches: list[FanoutBranchResult]) -> str:
+        merged.extend(branches)
+        return " + ".join(branch.final_output for branch in branches)
+
+    first = _specialist("first", "one", delay=0.02)
+    second = _specialist("second", "two")
+    broken = _specialist("broken", ValueError("boom"))
+    triage = _triage(first, second, broken)
+
+    result = await Runner.run(
+        triage, input="go", run_config=RunConfig(fanout_policy=MergeOutputs(merge))
+    )
+
+    assert result.final_output == "one + two"
+    assert [branch.agent.name for branch in merged] == ["first", "second"]
+    assert [branch.usage.requests for branch in merged] == [1, 1]
+    assert result.context_wrapper.usage.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_quorum_fails_when_branches_disagree():
+    triage = _triage(_specialist("a", "yes"), _specialist("b", "no"))
+
+    with pytest.raises(Exception, match="quorum of 2"):
+        await Runner.run(triage, input="go", run_config=RunConfig(fanout_policy=Quorum(2)))
+
+
+@pytest.mark.asyncio
+async def test_branches_share_the_run_turn_budget():
+    def _agent_with_turns(name: str, turns: int) -> Agent[Any]:
+        model = FakeModel()
+        for _ in range(turns - 1):
+            model.add_multiple_turn_outputs([[get_function_tool_call("lookup")]])
+        model.add_multiple_turn_outputs([[get_text_message(name)]])
+        return Agent(name=name, model=model, tools=[get_function_tool("lookup", "found")])
+
+    merged: list[FanoutBranchResult] = []
+
+    def merge(branches: list[FanoutBranchResult]) -> str:
+        merged.extend(branches)
+        return " + ".join(branch.final_output for branch in branches)
+
+    # The triage agent takes the first of 3 turns, so each branch may take 2.
+    fits = _agent_with_turns("fits", 2)
+    too_long = _agent_with_turns("too_long", 3)
+    triage = _triage(fits, too_long)
+
+    result = await Runner.run(
+        triage, input="go", max_turns=3, run_config=RunConfig(fanout_policy=MergeOutputs(merge))
+    )
+
+    assert result.final_output == "fits"
+    assert [branch.agent.name for branch in merged] == ["fits"]
+
+    triage = _triage(_agent_with_turns("a", 3), _agent_with_turns("b", 3))
+    with pytest.raises(MaxTurnsExceeded, match=r"Max turns \(2\) exceeded"):
+        await Runner.run(
+            triage, input="go", max_turns=3, run_config=RunConfig(fanout_policy=FirstValidOutput())
+        )
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from typing import Any, Callable, cast
+
+import pytest
+from openai.types.responses import ResponseFunctionToolCall
+
+from agents import (
+    Agent,
+    DropToolOutputsPolicy,
+    HeuristicTokenizer,
+    HistoryPolicy,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    SlidingWindowPolicy,
+    SummarizingPolicy,
+    TokenEstimator,
+    TResponseInputItem,
+    Usage,
+    function_tool,
+)
+from agents.history import estimate_item_tokens, group_items
+from agents.models.chatcmpl_converter import Converter
+from agents.result import RunResultBase
+
+from .fake_model import FakeModel
+from .test_responses import get_text_message
+
+BIG_OUTPUT = "x" * 400
+
+
+def _message(role: str, text: str) -> TResponseInputItem:
+    if role == "assistant":
+        return cast(TResponseInputItem, get_text_message(text).model_dump(exclude_unset=True))
+    return cast(TResponseInputItem, {"role": role, "content": text})
+
+
+def _call(call_id: str) -> TResponseInputItem:
+    return cast(
+        TResponseInputItem,
+        {
+            "type": "function_call",
+            "id": f"fc_{call_id}",
+            "call_id": call_id,
+            "name": "read_file",
+            "arguments": f'{{"path": "{call_id}"}}',
+        },
+    )
+
+
+def _output(call_id: str) -> TResponseInputItem:
+    return cast(
+        TResponseInputItem,
+        {"type": "function_call_output", "call_id": call_id, "output": BIG_OUTPUT},
+    )
+
+
+def _history(turns: int = 8, reasoning: bool = False) -> list[TResponseInputItem]:
+    """A run where every turn makes two parallel tool calls, whose outputs arrive out of order."""
+    items = [_message("user", "Summarize the repository.")]
+    for turn in range(turns):
+        if reasoning:
+            items.append(
+                cast(TResponseInputItem, {"type": "reasoning", "id": f"rs_{turn}", "summary": []})
+            )
+        items.append(_message("assistant", f"Reading files, turn {turn}."))
+        items += [_call(f"{turn}a"), _call(f"{turn}b"), _output(f"{turn}b"), _output(f"{turn}a")]
+    items.append(_message("assistant", "Done."))
+    return items
+
+
+def _as_dict(item: TResponseInputItem) -> dict[str, Any]:
+    return cast(dict[str, Any], item)
+
+
+def assert_valid_for_responses(items: list[TResponseInputItem]) -> None:
+    calls: set[str] = set()
+    outputs: set[str] = set()
+    for i, item in enumerate(items):
+        item_dict = _as_dict(item)
+        if item_dict.get("type") == "function_call":
+            calls.add(item_dict["call_id"])
+        elif item_dict.get("type") == "function_call_output":
+            assert item_dict["call_id"] in calls, f"output without a call: {item_dict}"
+            outputs.add(item_dict["call_id"])
+        elif item_dict.get("type") == "reasoning":
+            assert i + 1 < len(items), "reasoning item at the end of the input"
+    assert calls == outputs
+
+
+def assert_valid_for_chat_completions(items: list[TResponseInputItem]) -> None:
+    pending: set[str] = set()
+    for message in Converter.items_to_messages(items):
+        if message["role"] == "tool":
+            assert message["tool_call_id"] in pending, f"tool message without a call: {message}"
+            pending.remove(message["tool_call_id"])
+            continue
+        # Chat Completions requires every tool call to be answered before the next message.
+        assert not pending, f"unanswered tool calls {pending} before {message}"
+        if message["role"] == "assistant":
+            pending = {tool_call["id"] for tool_call in message.get("tool_calls", [])}
+    assert not pending
+
+
+def _summarizer() -> FakeModel:
+    model = FakeModel()
+    model.add_multiple_turn_outputs([[get_text_message(f"summary {i}")] for i in range(100)])
+    return model
+
+
+POLICIES: dict[str, Callable[[int], HistoryPolicy]] = {
+    "sliding_window": lambda budget: SlidingWindowPolicy(max_tokens=budget),
+    "drop_tool_outputs": lambda budget: DropToolOutputsPolicy(max_tokens=budget),
+    "drop_then_window": lambda budget: DropToolOutputsPolicy(
+        max_tokens=budget, fallback=SlidingWindowPolicy(max_tokens=budget)
+    ),
+    "summarizing": lambda budget: SummarizingPolicy(_summarizer(), max_tokens=budget),
+}
+
+
+async def _compact(policy: HistoryPolicy, items: list[TResponseInputItem]):
+    return await policy.compact(
+        items,
+        agent=Agent(name="test"),
+        context_wrapper=RunContextWrapper(None),
+        run_config=RunConfig(),
+    )
+
+
+def test_group_items_keeps_calls_with_outputs():
+    items = _history(turns=1, reasoning=True)
+
+    assert group_items(items) == [[0], [1, 2], [3, 6], [4, 5], [7]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy_name", POLICIES)
+@pytest.mark.parametrize("reasoning", [False, True])
+async def test_compacted_history_keeps_calls_and_outputs_paired(policy_name, reasoning):
+    items = _history(reasoning=reasoning)
+    total = sum(estimate_item_tokens(item) for item in items)
+
+    for budget in range(50, total + 200, 97):
+        compacted = await _compact(POLICIES[policy_name](budget), items)
+
+        assert_valid_for_responses(compacted)
+        if not reasoning:
+            # Chat Completions models don't accept reasoning items.
+            assert_valid_for_chat_completions(compacted)
+        if budget >= total:
+            assert compacted == items
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_keeps_first_and_most_recent_items():
+    items = _history()
+    policy = SlidingWindowPolicy(max_tokens=600)
+
+    compacted = await _compact(policy, items)
+
+    assert compacted[0] == items[0]
+    assert compacted[-1] == items[-1]
+    indices = [items.index(item) for item in compacted]
+    assert indices == sorted(indices)
+    assert len(compacted) < len(items)
+    assert sum(estimate_item_tokens(item) for item in compacted) <= 600
+
+
+@pytest.mark.asyncio
+async def test_drop_tool_outputs_replaces_oldest_outputs_first():
+    items = _history(turns=3)
+    count = TokenEstimator(HeuristicTokenizer()).count_item
+    total = sum(count(item) for item in items)
+    # Each replaced output saves about 90 tokens, so three have to go.
+    policy = DropToolOutputsPolicy(max_tokens=total - 250, keep_recent=2, token_counter=count)
+
+    compacted = await _compact(policy, items)
+
+    outputs = [_as_dict(item)["output"] for item in compacted if "output" in _as_dict(item)]
+    assert outputs[:3] == [policy.placeholder] * 3
+    assert outputs[-2:] == [BIG_OUTPUT, BIG_OUTPUT]
+    assert len(compacted) == len(items)
+    # The run's own items are left alone.
+    assert all(_as_dict(item).get("output", BIG_OUTPUT) == BIG_OUTPUT for item in items)
+
+
+@pytest.mark.asyncio
+async def test_summarizing_policy_reuses_and_extends_summaries():
+    summarizer = _summarizer()
+    policy = SummarizingPolicy(summarizer, max_tokens=600, keep_recent_tokens=300)
+    items = _history()
+
+    compacted = await _compact(policy, items)
+
+    assert compacted[0] == items[0]
+    assert _as_dict(compacted[1])["content"].endswith("summary 0")
+    transcript = summarizer.last_turn_args["input"][0]["content"]
+    assert "read_file returned: xxx" in transcript
+    assert summarizer.last_turn_args["system_instructions"] == policy.instructions
+
+    assert await _compact(policy, items) == compacted
+    assert len(summarizer.turn_outputs) == 99
+
+    longer = items[:-1] + _history(turns=10)[len(items) - 1 :]
+    compacted = await _compact(policy, longer)
+
+    assert _as_dict(compacted[1])["content"].endswith("summary 1")
+    transcript = summarizer.last_turn_args["input"][0]["content"]
+    assert transcript.startswith("Earlier summary:\nsummary 0")
+
+
+@pytest.mark.asyncio
+async def test_summarizing_policy_attributes_usage_to_the_agent():
+    summarizer = _summarizer()
+    summarizer.set_hardcoded_usage(Usage(requests=1, input_tokens=50, output_tokens=5))
+    policy = SummarizingPolicy(summarizer, max_tokens=600, keep_recent_tokens=300)
+    context_wrapper: RunContextWrapper[None] = RunContextWrapper(None)
+
+    await policy.compact(
+        _history(),
+        agent=Agent(name="test"),
+        context_wrapper=context_wrapper,
+        run_config=RunConfig(),
+    )
+
+    assert context_wrapper.usage.input_tokens == 50
+    assert context_wrapper.usage_by_agent == {"test": context_wrapper.usage}
+
+
+def _read_file_call(i: int) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        id=f"fc_{i}",
+        call_id=f"call_{i}",
+        type="function_call",
+        name="read_file",
+        arguments="{}",
+    )
+
+
+class RecordingModel(FakeModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self.inputs: list[list[TResponseInputItem]] = []
+
+    async def get_response(self, *args, **kwargs):
+        response = await super().get_response(*args, **kwargs)
+        self.inputs.append(self.last_turn_args["input"])
+        return response
+
+    async def stream_response(self, system_instructions, input, *args, **kwargs):
+        self.inputs.append(input)
+        async for event in super().stream_response(system_instructions, input, *args, **kwargs):
+            yield event
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_history_policy_applies_before_every_model_call(streamed):
+    @function_tool
+    def read_file() -> str:
+        return BIG_OUTPUT
+
+    model = RecordingModel()
+    for i in range(6):
+        model.set_next_output([get_text_message(f"turn {i}"), _read_file_call(i)])
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, tools=[read_file])
+    run_config = RunConfig(history_policy=SlidingWindowPolicy(max_tokens=400))
+
+    result: RunResultBase
+    if streamed:
+        result = Runner.run_streamed(agent, input="test", run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+    else:
+        result = await Runner.run(agent, input="test", run_config=run_config)
+
+    assert result.final_output == "done"
+    assert len(model.inputs) == 7
+    for model_input in model.inputs:
+        assert model_input[0] == {"role": "user", "content": "test"}
+        assert sum(estimate_item_tokens(item) for item in model_input) <= 400
+        assert_valid_for_responses(model_input)
+        assert_valid_for_chat_completions(model_input)
+    # The full history is kept on the result.
+    assert len(result.to_input_list()) == 1 + 6 * 3 + 1
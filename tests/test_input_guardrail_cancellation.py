@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    function_tool,
+    input_guardrail,
+)
+
+from .fake_model import FakeModel, SlowModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+def _guardrail(trip: bool, delay: float) -> Any:
+    @input_guardrail
+    async def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        await asyncio.sleep(delay)
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=trip)
+
+    return check_input
+
+
+async def _run(agent: Agent[Any], streamed: bool, run_config: RunConfig | None = None) -> Any:
+    if streamed:
+        result = Runner.run_streamed(agent, input="go", run_config=run_config)
+        async for _ in result.stream_events():
+            pass
+        return result
+    return await Runner.run(agent, input="go", run_config=run_config)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_tripwire_cancels_the_in_flight_model_call(streamed):
+    model = SlowModel(delay=10)
+    model.set_next_output([get_text_message("done")])
+    agent = Agent(name="test", model=model, input_guardrails=[_guardrail(trip=True, delay=0.01)])
+
+    start = time.perf_counter()
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await _run(agent, streamed)
+    await asyncio.sleep(0)
+
+    assert time.perf_counter() - start < 1
+    assert model.cancelled
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed, defer", [(False, False), (False, True), (True, True)])
+async def test_tools_can_be_deferred_until_guardrails_pass(streamed, defer):
+    calls = []
+
+    @function_tool
+    def delete_file(path: str) -> str:
+        calls.append(path)
+        return "deleted"
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("delete_file", json.dumps({"path": "a"}))],
+            [get_text_message("done")],
+        ]
+    )
+    agent = Agent(
+        name="test",
+        model=model,
+        tools=[delete_file],
+        input_guardrails=[_guardrail(trip=True, delay=0.1)],
+    )
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await _run(agent, streamed, RunConfig(defer_tools_until_input_guardrails=defer))
+
+    # Without deferral, the tool runs speculatively before the guardrail trips.
+    assert calls == ([] if defer else ["a"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_deferred_tools_run_once_guardrails_pass(streamed):
+    events = []
+
+    @input_guardrail
+    async def check_input(
+        context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+    ) -> GuardrailFunctionOutput:
+        await asyncio.sleep(0.05)
+        events.append("guardrail")
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    @function_tool
+    def delete_file(path: str) -> str:
+        events.append("tool")
+        return "deleted"
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("delete_file", json.dumps({"path": "a"}))],
+            [get_text_message("done")],
+        ]
+    )
+    agent = Agent(name="test", model=model, tools=[delete_file], input_guardrails=[check_input])
+
+    result = await _run(agent, streamed, RunConfig(defer_tools_until_input_guardrails=True))
+
+    assert result.final_output == "done"
+    assert events == ["guardrail", "tool"]
+    assert len(result.input_guardrail_results) == 1
+
+
+@pytest.mark.asyncio
+async def test_model_errors_are_raised_without_waiting_for_guardrails():
+    model = FakeModel()
+    model.set_next_output(ValueError("model failed"))
+    agent = Agent(name="test", model=model, input_guardrails=[_guardrail(trip=False, delay=10)])
+
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="model failed"):
+        await Runner.run(agent, input="go")
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    InstructionsCache,
+    RunContextWrapper,
+    Runner,
+    UserError,
+    function_tool,
+)
+from agents.items import TResponseOutputItem
+from agents.tracing import AgentSpanData
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_handoff_tool_call, get_text_message
+from .testing_processor import fetch_ordered_spans
+
+
+class CountingInstructions:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+        self.calls += 1
+        return f"You are {agent.name}, call {self.calls}."
+
+
+@function_tool
+def bump(context: RunContextWrapper[dict[str, int]]) -> str:
+    context.context["version"] += 1
+    return "bumped"
+
+
+def _agent(cache: InstructionsCache | None, num_tool_turns: int = 2) -> Agent[Any]:
+    model = FakeModel()
+    turns: list[list[TResponseOutputItem] | Exception] = [
+        [get_function_tool_call("bump", json.dumps({}))] for _ in range(num_tool_turns)
+    ]
+    model.add_multiple_turn_outputs(turns + [[get_text_message("done")]])
+    return Agent(
+        name="test",
+        instructions=CountingInstructions(),
+        instructions_cache=cache,
+        model=model,
+        tools=[bump],
+    )
+
+
+def _calls(agent: Agent[Any]) -> int:
+    assert isinstance(agent.instructions, CountingInstructions)
+    return agent.instructions.calls
+
+
+@pytest.mark.asyncio
+async def test_run_scope_resolves_once_per_run_and_records_hits():
+    agent = _agent(InstructionsCache(scope="run"))
+
+    result = await Runner.run(agent, input="go", context={"version": 0})
+
+    assert result.final_output == "done"
+    assert _calls(agent) == 1
+    [span] = [s for s in fetch_ordered_spans() if isinstance(s.span_data, AgentSpanData)]
+    assert span.span_data.instructions_cache == {"hits": 2, "misses": 1}
+    assert span.span_data.export()["instructions_cache"] == {"hits": 2, "misses": 1}
+    assert "instructions_cache" not in AgentSpanData(name="uncached").export()
+
+
+@pytest.mark.asyncio
+async def test_without_a_cache_instructions_resolve_every_turn():
+    agent = _agent(None)
+
+    await Runner.run(agent, input="go", context={"version": 0})
+
+    assert _calls(agent) == 3
+
+
+@pytest.mark.asyncio
+async def test_key_change_invalidates_the_cached_instructions():
+    agent = _agent(InstructionsCache(key=lambda context, agent: context.context["version"] // 2))
+
+    await Runner.run(agent, input="go", context={"version": 0})
+
+    # The key is 0, 0 and 1 on the three turns.
+    assert _calls(agent) == 2
+
+
+@pytest.mark.asyncio
+async def test_activation_scope_resolves_again_after_a_handoff_back():
+    first_model, second_model = FakeModel(), FakeModel()
+    first = Agent(
+        name="first",
+        instructions=CountingInstructions(),
+        instructions_cache=InstructionsCache(scope="activation"),
+        model=first_model,
+    )
+    second = Agent(name="second", model=second_model, handoffs=[first])
+    first.handoffs = [second]
+    first_model.add_multiple_turn_outputs(
+        [[get_handoff_tool_call(second)], [get_text_message("done")]]
+    )
+    second_model.set_next_output([get_handoff_tool_call(first)])
+
+    await Runner.run(first, input="go")
+
+    assert _calls(first) == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_scope_is_shared_across_runs_until_it_expires():
+    cache = InstructionsCache(scope="ttl", ttl=0.05)
+    agent = _agent(cache, num_tool_turns=0)
+    model = agent.model
+    assert isinstance(model, FakeModel)
+
+    for _ in range(2):
+        model.set_next_output([get_text_message("done")])
+        await Runner.run(agent, input="go", context={"version": 0})
+    assert _calls(agent) == 1
+
+    await asyncio.sleep(0.06)
+    model.set_next_output([get_text_message("done")])
+    await Runner.run(agent, input="go", context={"version": 0})
+    assert _calls(agent) == 2
+
+    cache.invalidate()
+    model.set_next_output([get_text_message("done")])
+    await Runner.run(agent, input="go", context={"version": 0})
+    assert _calls(agent) == 3
+
+
+@pytest.mark.asyncio
+async def test_ttl_scope_keeps_clones_with_other_instructions_apart():
+    cache = InstructionsCache(scope="ttl", ttl=60)
+    agent = _agent(cache, num_tool_turns=0)
+    clone = agent.clone(instructions=CountingInstructions(), model=FakeModel())
+
+    for target in (agent, clone):
+        assert isinstance(target.model, FakeModel)
+        target.model.set_next_output([get_text_message("done")])
+        await Runner.run(target, input="go", context={"version": 0})
+
+    assert _calls(agent) == 1
+    assert _calls(clone) == 1
+
+
+def test_ttl_scope_requires_a_ttl():
+    with pytest.raises(UserError):
+        InstructionsCache(scope="ttl")
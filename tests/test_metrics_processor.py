@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    MetricsTracingProcessor,
+    RunContextWrapper,
+    Runner,
+    function_tool,
+    input_guardrail,
+)
+from agents.tracing import generation_span, set_trace_processors, trace
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_handoff_tool_call, get_text_message
+from .testing_processor import SPAN_PROCESSOR_TESTING
+
+
+@pytest.fixture
+def metrics() -> Iterator[MetricsTracingProcessor]:
+    processor = MetricsTracingProcessor(latency_buckets=(0.1, 1.0))
+    set_trace_processors([SPAN_PROCESSOR_TESTING, processor])
+    try:
+        yield processor
+    finally:
+        set_trace_processors([SPAN_PROCESSOR_TESTING])
+        processor.shutdown()
+
+
+@function_tool
+def read_file(path: str) -> str:
+    return f"contents of {path}"
+
+
+@function_tool
+def delete_file(path: str) -> str:
+    raise PermissionError(path)
+
+
+@input_guardrail
+def allow_all(
+    context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+) -> GuardrailFunctionOutput:
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_derived_from_run_spans(metrics):
+    model = FakeModel(tracing_enabled=True)
+    worker = Agent(name="worker", model=model, tools=[read_file, delete_file])
+    triage = Agent(name="triage", model=model, handoffs=[worker], input_guardrails=[allow_all])
+    model.add_multiple_turn_outputs(
+        [
+            [get_handoff_tool_call(worker)],
+            [
+                get_function_tool_call("read_file", json.dumps({"path": "a"})),
+                get_function_tool_call("delete_file", json.dumps({"path": "a"})),
+            ],
+            [get_text_message("done")],
+        ]
+    )
+    await Runner.run(triage, input="go")
+
+    samples = _samples(metrics.render())
+    assert samples['agents_model_request_duration_seconds_count{model="unknown"}'] == 3
+    assert samples['agents_tool_duration_seconds_count{tool="read_file"}'] == 1
+    assert samples['agents_tool_duration_seconds_bucket{tool="read_file",le="0.1"}'] == 1
+    assert samples['agents_tool_errors_total{tool="delete_file"}'] == 1
+    assert 'agents_tool_errors_total{tool="read_file"}' not in samples
+    assert samples['agents_handoffs_total{from_agent="triage",to_agent="worker"}'] == 1
+    assert samples['agents_guardrail_runs_total{guardrail="allow_all"}'] == 1
+    assert 'agents_guardrail_triggered_total{guardrail="allow_all"}' not in samples
+
+
+def test_render_uses_the_text_exposition_format(metrics):
+    with trace("test"):
+        for _ in range(2):
+            with generation_span(model='gpt-"4o"') as span:
+                span.span_data.usage = {"input_tokens": 10, "output_tokens": 3}
+
+    text = metrics.render()
+    assert "# TYPE agents_model_tokens_total counter" in text
+    assert "# TYPE agents_model_request_duration_seconds histogram" in text
+    samples = _samples(text)
+    assert samples['agents_model_tokens_total{model="gpt-\\"4o\\"",type="input"}'] == 20
+    assert samples['agents_model_tokens_total{model="gpt-\\"4o\\"",type="output"}'] == 6
+    assert [
+        samples[f'agents_model_request_duration_seconds_bucket{{model="gpt-\\"4o\\"",le="{le}"}}']
+        for le in ("0.1", "1", "+Inf")
+    ] == [2, 2, 2]
+    assert text.endswith("\n")
+
+
+def test_serve_and_write_file(metrics, tmp_path):
+    with trace("test"):
+        with generation_span(model="gpt-4o"):
+            pass
+
+    server = metrics.serve(port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    with urllib.request.urlopen(f"{url}/metrics") as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert response.read().decode() == metrics.render()
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(f"{url}/other")
+
+    path = tmp_path / "agents.prom"
+    metrics.write_file(path)
+    assert path.read_text() == metrics.render()
+    assert [p.name for p in tmp_path.iterdir()] == ["agents.prom"]
@@ -284,3 +284,96 @@ async def test_stream_response_yields_events_for_tool_call(monkeypatch) -> None:
     assert output_events[2].delta == "arg1arg2"
     assert output_events[3].type == "response.output_item.done"
     assert output_events[4].type == "response.completed"
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+@pytest.mark.parametrize("early", [False, True])
+async def test_stream_response_emits_tool_calls_once_final(monkeypatch, early) -> None:
+    """
+    Validate that with `emit_tool_calls_early`, each tool call's events are emitted as soon as the
+    model moves on to the next call, and otherwise only at the end of the stream.
+    """
+
+    def tool_call_chunk(
+        index: int, call_id: "str | None", name: "str | None", args: str
+    ) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id="chunk-id",
+            created=1,
+            model="fake",
+            object="chat.completion.chunk",
+            choices=[
+                Choice(
+                    index=0,
+                    delta=ChoiceDelta(
+                        tool_calls=[
+                            ChoiceDeltaToolCall(
+                                index=index,
+                                id=call_id,
+                                function=ChoiceDeltaToolCallFunction(name=name, arguments=args),
+                                type="function",
+                            )
+                        ]
+                    ),
+                )
+            ],
+        )
+
+    chunks = [
+        tool_call_chunk(0, "call-1", "first", '{"a": '),
+        tool_call_chunk(0, None, None, "1}"),
+        tool_call_chunk(1, "call-2", "second", '{"b": '),
+        tool_call_chunk(1, None, None, '"x"}'),
+        tool_call_chunk(2, "call-3", "third", '{"c"'),
+        tool_call_chunk(2, None, None, ": 3}"),
+    ]
+    chunks_sent = 0
+
+    async def fake_stream() -> AsyncIterator[ChatCompletionChunk]:
+        nonlocal chunks_sent
+        for c in chunks:
+            chunks_sent += 1
+            yield c
+
+    async def patched_fetch_response(self, *args, **kwargs):
+        resp = Response(
+            id="resp-id",
+            created_at=0,
+            model="fake-model",
+            object="response",
+            output=[],
+            tool_choice="none",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        return resp, fake_stream()
+
+    monkeypatch.setattr(OpenAIChatCompletionsModel, "_fetch_response", patched_fetch_response)
+    model = OpenAIProvider(use_responses=False).get_model("gpt-4")
+    done_events: list[tuple[int, ResponseFunctionToolCall]] = []
+    async for event in model.stream_response(
+        system_instructions=None,
+        input="",
+        model_settings=ModelSettings(emit_tool_calls_early=early),
+        tools=[],
+        output_schema=None,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+        previous_response_id=None,
+    ):
+        if event.type == "response.output_item.done":
+            assert isinstance(event.item, ResponseFunctionToolCall)
+            done_events.append((chunks_sent, event.item))
+        elif event.type == "response.completed":
+            completed = event.response
+
+    assert [(sent, item.name, item.arguments) for sent, item in done_events] == [
+        (3 if early else 6, "first", '{"a": 1}'),
+        (5 if early else 6, "second", '{"b": "x"}'),
+        (6, "third", '{"c": 3}'),
+    ]
+    assert [item.call_id for _, item in done_events] == ["call-1", "call-2", "call-3"]
+    assert [
+        item.name for item in completed.output if isinstance(item, ResponseFunctionToolCall)
+    ] == ["first", "second", "third"]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+
+from agents import Agent, MaxTurnsExceeded, RunConfig, Runner, UserError
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelTracing
+from agents.tool import Tool
+from agents.usage import Usage
+
+from .test_responses import get_function_tool, get_function_tool_call, get_text_message
+
+
+class EchoModel(Model):
+    """Replies with the last user message after a delay, tracking how many calls are in flight.
+    Inputs starting with "loop" make the model call a tool forever."""
+
+    def __init__(self, model: str = "echo", delay: float = 0.01):
+        self.model = model
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> ModelResponse:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        assert isinstance(input, list)
+        text = input[0]["content"]  # type: ignore[typeddict-item]
+        assert isinstance(text, str)
+        if text.startswith("loop"):
+            output = [get_function_tool_call("foo", "")]
+        else:
+            output = [get_text_message(f"echo: {text}")]
+        return ModelResponse(output=output, usage=Usage(), response_id=None)
+
+    def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        raise NotImplementedError()
+
+
+@pytest.mark.asyncio
+async def test_run_many_streams_all_results():
+    model = EchoModel()
+    agent = Agent(name="test", model=model)
+    inputs = [f"message {i}" for i in range(10)]
+
+    batch = Runner.run_many(agent, inputs, max_concurrency=3)
+    items = [item async for item in batch.stream_results()]
+
+    assert batch.is_complete
+    assert sorted(item.index for item in items) == list(range(10))
+    for item in items:
+        assert item.ok
+        assert item.result is not None
+        assert item.result.final_output == f"echo: {inputs[item.index]}"
+    assert model.max_in_flight <= 3
+
+    stats = batch.stats
+    assert stats.completed == 10
+    assert stats.failed == 0
+    assert stats.succeeded == 10
+    assert stats.throughput > 0
+    assert 0 < stats.latency_p50 <= stats.latency_p90 <= stats.latency_p99
+
+
+@pytest.mark.asyncio
+async def test_run_many_isolates_failures():
+    model = EchoModel()
+    agent = Agent(name="test", model=model, tools=[get_function_tool("foo", "result")])
+
+    batch = Runner.run_many(agent, ["a", "loop", "b"], max_turns=2, max_concurrency=2)
+    items = {item.index: item async for item in batch.stream_results()}
+
+    assert items[0].ok and items[2].ok
+    assert not items[1].ok
+    assert isinstance(items[1].error, MaxTurnsExceeded)
+    assert items[1].result is None
+    assert batch.stats.failed == 1
+    assert batch.stats.succeeded == 2
+
+
+@pytest.mark.asyncio
+async def test_run_many_consumes_inputs_lazily():
+    model = EchoModel()
+    agent = Agent(name="test", model=model)
+    pulled = 0
+
+    def inputs() -> Iterator[str]:
+        nonlocal pulled
+        for i in range(6):
+            pulled += 1
+            yield f"message {i}"
+
+    batch = Runner.run_many(agent, inputs(), max_concurrency=2)
+    stream = batch.stream_results()
+    await stream.__anext__()
+    assert pulled < 6, "inputs should be pulled as capacity frees up"
+
+    remaining = [item async for item in stream]
+    assert len(remaining) == 5
+    assert pulled == 6
+
+
+@pytest.mark.asyncio
+async def test_per_model_limits_cap_in_flight_requests():
+    limited = EchoModel(model="limited-model")
+    unlimited = EchoModel(model="unlimited-model")
+    limited_agent = Agent(name="limited", model=limited)
+    unlimited_agent = Agent(name="unlimited", model=unlimited)
+
+    limited_batch = Runner.run_many(
+        limited_agent,
+        [str(i) for i in range(8)],
+        max_concurrency=8,
+        per_model_limits={"limited-model": 2},
+    )
+    unlimited_batch = Runner.run_many(
+        unlimited_agent,
+        [str(i) for i in range(8)],
+        max_concurrency=8,
+        per_model_limits={"limited-model": 2},
+    )
+    await asyncio.gather(
+        *[_drain(limited_batch.stream_results()), _drain(unlimited_batch.stream_results())]
+    )
+
+    assert limited.max_in_flight == 2
+    assert unlimited.max_in_flight == 8
+
+
+@pytest.mark.asyncio
+async def test_batches_can_use_different_limits_for_the_same_model():
+    for limit in (2, 4):
+        model = EchoModel(model="tuned-model")
+        batch = Runner.run_many(
+            Agent(name="test", model=model),
+            [str(i) for i in range(8)],
+            max_concurrency=8,
+            per_model_limits={"tuned-model": limit},
+        )
+        items = [item async for item in batch.stream_results()]
+
+        assert all(item.ok for item in items)
+        assert model.max_in_flight == limit
+
+
+@pytest.mark.asyncio
+async def test_model_limits_are_shared_across_runs():
+    model = EchoModel(model="shared-model")
+    agent = Agent(name="test", model=model)
+    run_config = RunConfig(model_concurrency_limits={"shared-model": 1})
+
+    await asyncio.gather(
+        *[Runner.run(agent, str(i), run_config=run_config) for i in range(4)],
+    )
+
+    assert model.max_in_flight == 1
+
+    # Another config has its own limits, which may have a different size.
+    other_config = RunConfig(model_concurrency_limits={"shared-model": 3})
+    await asyncio.gather(
+        *[Runner.run(agent, str(i), run_config=other_config) for i in range(4)],
+    )
+
+    assert model.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_run_many_cancel():
+    model = EchoModel(delay=10)
+    agent = Agent(name="test", model=model)
+
+    batch = Runner.run_many(agent, ["a", "b", "c"], max_concurrency=2)
+    await asyncio.sleep(0)
+    batch.cancel()
+    items = [item async for item in batch.stream_results()]
+
+    assert items == []
+    assert batch.is_complete
+
+
+@pytest.mark.asyncio
+async def test_run_many_rejects_invalid_concurrency():
+    with pytest.raises(UserError):
+        Runner.run_many(Agent(name="test"), ["a"], max_concurrency=0)
+
+
+async def _drain(stream: AsyncIterator[Any]) -> None:
+    async for _ in stream:
+        pass
@@ -26,6 +26,7 @@ from agents._run_impl import (
     RunImpl,
     SingleStepResult,
 )
+from agents.run import DEFAULT_MAX_TURNS
 
 from .test_responses import (
     get_final_output_message,
@@ -305,4 +306,5 @@ async def get_execute_result(
         hooks=hooks or RunHooks(),
         context_wrapper=context_wrapper or RunContextWrapper(None),
         run_config=run_config or RunConfig(),
+        remaining_turns=DEFAULT_MAX_TURNS,
     )
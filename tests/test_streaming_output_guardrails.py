@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from openai.types.responses import ResponseTextDeltaEvent
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    StreamedOutputChunk,
+    StreamingOutputGuardrail,
+    StreamingOutputGuardrailTripwireTriggered,
+    UserError,
+    function_tool,
+    streaming_output_guardrail,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+class DeltaModel(FakeModel):
+    """Streams `deltas` as text deltas before the response, and records how many were sent."""
+
+    def __init__(self, deltas: list[str]) -> None:
+        super().__init__()
+        self.deltas = deltas
+        self.sent = 0
+        self.closed = False
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        try:
+            for delta in self.deltas:
+                await asyncio.sleep(0.001)
+                self.sent += 1
+                yield ResponseTextDeltaEvent(
+                    content_index=0,
+                    delta=delta,
+                    item_id="msg",
+                    output_index=0,
+                    type="response.output_text.delta",
+                )
+            async for event in super().stream_response(*args, **kwargs):
+                yield event
+        finally:
+            self.closed = True
+
+
+async def _stream(agent: Agent[Any], run_config: RunConfig | None = None) -> Any:
+    result = Runner.run_streamed(agent, input="go", run_config=run_config)
+    async for _ in result.stream_events():
+        pass
+    return result
+
+
+@pytest.mark.asyncio
+async def test_sentences_are_checked_once_each():
+    checked: list[tuple[str, int, bool]] = []
+
+    @streaming_output_guardrail
+    async def no_secrets(
+        context: RunContextWrapper[Any], agent: Agent[Any], chunk: StreamedOutputChunk
+    ) -> GuardrailFunctionOutput:
+        checked.append((chunk.text, chunk.offset, chunk.final))
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    deltas = ["Pi is ", "3.14. ", "It is ", "irrational! ", "The end"]
+    model = DeltaModel(deltas)
+    model.set_next_output([get_text_message("".join(deltas))])
+    agent = Agent(name="test", model=model, streaming_output_guardrails=[no_secrets])
+
+    result = await _stream(agent)
+
+    assert result.final_output == "".join(deltas)
+    assert sorted(checked, key=lambda c: c[1]) == [
+        ("Pi is 3.14. ", 0, False),
+        ("It is irrational! ", 12, False),
+        ("The end", 30, True),
+    ]
+    assert len(result.streaming_output_guardrail_results) == 3
+
+
+@pytest.mark.asyncio
+async def test_tripwire_stops_the_stream_early():
+    calls = []
+
+    @function_tool
+    def send_email(to: str) -> str:
+        calls.append(to)
+        return "sent"
+
+    @streaming_output_guardrail(every_n_tokens=1)
+    async def no_secrets(
+        context: RunContextWrapper[Any], agent: Agent[Any], chunk: StreamedOutputChunk
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered="secret" in chunk.text)
+
+    deltas = ["The ", "secret ", "is "] + ["blah "] * 100
+    model = DeltaModel(deltas)
+    model.set_next_output(
+        [
+            get_text_message("".join(deltas)),
+            get_function_tool_call("send_email", json.dumps({"to": "a"})),
+        ]
+    )
+    agent = Agent(name="test", model=model, tools=[send_email])
+
+    with pytest.raises(StreamingOutputGuardrailTripwireTriggered) as exc_info:
+        await _stream(agent, RunConfig(streaming_output_guardrails=[no_secrets]))
+
+    assert exc_info.value.guardrail_result.chunk.text == "secret "
+    assert model.sent < 10
+    assert model.closed
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_tripwire_on_the_final_chunk_still_raises():
+    @streaming_output_guardrail
+    def no_secrets(
+        context: RunContextWrapper[Any], agent: Agent[Any], chunk: StreamedOutputChunk
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered="secret" in chunk.text)
+
+    model = DeltaModel(["no sentence ", "end, secret"])
+    model.set_next_output([get_text_message("no sentence end, secret")])
+    agent = Agent(name="test", model=model, streaming_output_guardrails=[no_secrets])
+
+    with pytest.raises(StreamingOutputGuardrailTripwireTriggered) as exc_info:
+        await _stream(agent)
+
+    assert exc_info.value.guardrail_result.chunk.final
+
+
+def test_every_n_tokens_must_be_positive():
+    def allow_all(
+        context: RunContextWrapper[Any], agent: Agent[Any], chunk: StreamedOutputChunk
+    ) -> GuardrailFunctionOutput:
+        return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+    with pytest.raises(UserError):
+        StreamingOutputGuardrail(guardrail_function=allow_all, every_n_tokens=0)
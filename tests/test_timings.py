@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    LatencyHistogram,
+    PhaseHistograms,
+    PhaseTiming,
+    RunContextWrapper,
+    RunHooks,
+    Runner,
+    function_tool,
+    input_guardrail,
+)
+from agents.result import RunResultBase
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+@function_tool
+async def slow_tool(path: str) -> str:
+    await asyncio.sleep(0.02)
+    return f"contents of {path}"
+
+
+@input_guardrail
+def allow_all(
+    context: RunContextWrapper[Any], agent: Agent[Any], input: Any
+) -> GuardrailFunctionOutput:
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+
+class TurnTimingHooks(RunHooks[Any]):
+    def __init__(self) -> None:
+        self.turns: list[tuple[str, list[PhaseTiming]]] = []
+
+    async def on_turn_end(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], timings: list[PhaseTiming]
+    ) -> None:
+        self.turns.append((agent.name, timings))
+
+
+def _agent() -> Agent[Any]:
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("slow_tool", json.dumps({"path": "a.txt"}))],
+            [get_text_message("done")],
+        ]
+    )
+    return Agent(name="coder", model=model, tools=[slow_tool], input_guardrails=[allow_all])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_run_records_phase_timings(streamed):
+    hooks = TurnTimingHooks()
+    result: RunResultBase
+    if streamed:
+        result = Runner.run_streamed(_agent(), input="go", hooks=hooks)
+        async for _ in result.stream_events():
+            pass
+        model_phases = {"time_to_first_token", "stream"}
+    else:
+        result = await Runner.run(_agent(), input="go", hooks=hooks)
+        model_phases = {"model_response"}
+
+    timings = result.timings
+    assert timings is result.context_wrapper.timings
+    first_turn = {timing.phase for timing in timings.for_turn(1)}
+    assert {
+        "list_tools",
+        "hooks",
+        "system_prompt",
+        "prepare_input",
+        "process_response",
+        "tool",
+        "input_guardrail",
+    } | model_phases <= first_turn
+    assert "tool" not in {timing.phase for timing in timings.for_turn(2)}
+
+    [tool_timing] = [timing for timing in timings.entries if timing.phase == "tool"]
+    assert tool_timing.name == "slow_tool"
+    assert tool_timing.agent == "coder"
+    assert tool_timing.duration >= 0.02
+    assert timings.total("tool") == tool_timing.duration
+    assert timings.by_phase()["tool"] == tool_timing.duration
+
+    assert [(name, [t.turn for t in turn]) for name, turn in hooks.turns] == [
+        ("coder", [1] * len(hooks.turns[0][1])),
+        ("coder", [2] * len(hooks.turns[1][1])),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_recorded_outside_of_a_run():
+    result = await Runner.run(_agent(), input="go")
+    count = len(result.timings.entries)
+
+    await slow_tool.on_invoke_tool(RunContextWrapper(None), json.dumps({"path": "b.txt"}))
+
+    assert len(result.timings.entries) == count
+
+
+def test_histogram_percentiles_have_bounded_error():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.mean == pytest.approx(0.0505)
+    for p, exact in [(50, 0.050), (90, 0.090), (99, 0.099)]:
+        assert exact <= histogram.percentile(p) <= exact * histogram.growth
+    assert histogram.percentile(100) == 0.1
+    assert LatencyHistogram().percentile(50) == 0.0
+
+    other = LatencyHistogram()
+    other.add(1.0)
+    histogram.merge(other)
+    assert histogram.count == 101
+    assert histogram.to_json_dict()["max"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_phase_histograms_aggregate_runs():
+    histograms = PhaseHistograms()
+    by_name = PhaseHistograms(by_name=True)
+    for _ in range(3):
+        result = await Runner.run(_agent(), input="go")
+        histograms.add(result.timings)
+        by_name.add(result.timings)
+
+    assert histograms["tool"].count == 3
+    assert histograms["system_prompt"].count == 6
+    assert by_name["tool:slow_tool"].count == 3
+    assert "tool" not in by_name
+    assert json.loads(json.dumps(histograms.to_json_dict()))["tool"]["p50"] >= 0.02
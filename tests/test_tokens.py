@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_message import ChatCompletionMessage
+from pydantic import BaseModel
+
+from agents import (
+    Agent,
+    AgentOutputSchema,
+    HeuristicTokenizer,
+    ModelSettings,
+    ModelTracing,
+    OpenAIChatCompletionsModel,
+    OpenAIResponsesModel,
+    TiktokenTokenizer,
+    TokenEstimator,
+    Tokenizer,
+    Tool,
+    get_default_token_estimator,
+    handoff,
+    trace,
+)
+from agents.tracing import GenerationSpanData
+
+from .test_responses import get_function_tool
+from .testing_processor import fetch_ordered_spans
+
+
+class CountingTokenizer(Tokenizer):
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def count(self, text: str) -> int:
+        self.texts.append(text)
+        return len(text.split())
+
+
+class Weather(BaseModel):
+    city: str
+    temperature: float
+
+
+def test_heuristic_tokenizer():
+    assert HeuristicTokenizer().count("") == 0
+    assert HeuristicTokenizer().count("abcd") == 1
+    assert HeuristicTokenizer().count("abcde") == 2
+    assert HeuristicTokenizer(chars_per_token=2).count("abcd") == 2
+
+
+def test_estimates_are_incremental():
+    tokenizer = CountingTokenizer()
+    estimator = TokenEstimator(tokenizer)
+    items: list[Any] = [
+        {"role": "user", "content": "what is the weather"},
+        {"type": "function_call", "call_id": "1", "name": "weather", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "1", "output": "sunny and warm"},
+    ]
+
+    first = estimator.estimate(items, system_instructions="be brief")
+    assert first.messages == (3 + 4) + (3 + 3) + (3 + 4) + (3 + 2)
+    assert first.tokenizer == "counting"
+
+    tokenizer.texts.clear()
+    items.append({"role": "user", "content": "and tomorrow"})
+    second = estimator.estimate(items, system_instructions="be brief")
+
+    # Only the text of the new item is tokenized.
+    assert tokenizer.texts == ["and tomorrow"]
+    assert second.messages == first.messages + 3 + 2
+
+    # Equal text is recognized, even in different item objects.
+    tokenizer.texts.clear()
+    estimator.estimate([dict(item) for item in items])
+    assert tokenizer.texts == []
+
+
+def test_images_are_not_counted_by_url_length():
+    estimator = TokenEstimator(HeuristicTokenizer())
+    image = {"type": "input_image", "image_url": "data:image/png;base64," + "A" * 100_000}
+
+    assert estimator.count_item({"role": "user", "content": [image]}) < 1000
+
+
+def test_tiktoken_tokenizer_with_local_encoding():
+    tiktoken = pytest.importorskip("tiktoken")
+    # A byte-level encoding that needs no download.
+    encoding = tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    tokenizer = TiktokenTokenizer(encoding)
+
+    assert tokenizer.name == "bytes"
+    assert tokenizer.count("hello") == 5
+
+
+def test_tiktoken_is_not_available_without_a_cached_encoding(monkeypatch, tmp_path):
+    pytest.importorskip("tiktoken")
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+
+    assert not TiktokenTokenizer.is_available("not_an_encoding")
+
+
+@pytest.mark.allow_call_model_methods
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enabled", [False, True])
+async def test_chat_completions_estimate_sizes_the_sent_payload(monkeypatch, enabled) -> None:
+    class DummyCompletions:
+        def __init__(self) -> None:
+            self.kwargs: dict[str, Any] = {}
+
+        async def create(self, **kwargs: Any) -> Any:
+            self.kwargs = kwargs
+            return ChatCompletion(
+                id="resp-id",
+                created=0,
+                model="fake",
+                object="chat.completion",
+                choices=[
+                    Choice(
+                        index=0,
+                        finish_reason="stop",
+                        message=ChatCompletionMessage(role="assistant", content="ok"),
+                    )
+                ],
+            )
+
+    class DummyClient:
+        def __init__(self, completions: DummyCompletions) -> None:
+            self.chat = type("_Chat", (), {"completions": completions})()
+            self.base_url = httpx.URL("http://fake")
+
+    completions = DummyCompletions()
+    client = DummyClient(completions)
+    model = OpenAIChatCompletionsModel(model="gpt-4", openai_client=client)  # type: ignore
+    tools: list[Tool] = [get_function_tool("weather", "sunny")]
+    handoffs = [handoff(Agent(name="forecaster"))]
+    output_schema = AgentOutputSchema(Weather)
+    conversions = 0
+    convert_request = model._convert_request
+
+    def counting_convert_request(*args: Any) -> Any:
+        nonlocal conversions
+        conversions += 1
+        return convert_request(*args)
+
+    monkeypatch.setattr(model, "_convert_request", counting_convert_request)
+
+    with trace(workflow_name="test"):
+        response = await model.get_response(
+            system_instructions="sys",
+            input="what is the weather",
+            model_settings=ModelSettings(estimate_input_tokens=enabled or None),
+            tools=tools,
+            output_schema=output_schema,
+            handoffs=handoffs,
+            tracing=ModelTracing.ENABLED,
+            previous_response_id=None,
+        )
+
+    # The estimate reuses the converted request.
+    assert conversions == 1
+    [span] = [s for s in fetch_ordered_spans() if isinstance(s.span_data, GenerationSpanData)]
+    if not enabled:
+        assert response.input_token_estimate is None
+        assert span.span_data.input_token_estimate is None
+        assert "input_token_estimate" not in span.span_data.export()
+        return
+
+    sent = completions.kwargs
+    expected = get_default_token_estimator().estimate(
+        sent["messages"], tools=sent["tools"], response_format=sent["response_format"]
+    )
+    assert response.input_token_estimate == expected
+    assert expected.tools > 0
+    assert expected.response_format > 0
+    assert span.span_data.export()["input_token_estimate"] == expected.to_json_dict()
+
+
+@pytest.mark.allow_call_model_methods
+def test_responses_estimate_sizes_the_sent_payload() -> None:
+    model = OpenAIResponsesModel(model="gpt-4o", openai_client=None)  # type: ignore
+    tools: list[Tool] = [get_function_tool("weather", "sunny")]
+
+    plain = model.estimate_input_tokens("sys", "what is the weather", [], None, [])
+    full = model.estimate_input_tokens(
+        "sys", "what is the weather", tools, AgentOutputSchema(Weather), []
+    )
+
+    assert plain.tools == 0
+    assert plain.response_format == 0
+    assert full.messages == plain.messages
+    assert full.tools > 0
+    assert full.response_format > 0
+    assert full.input_tokens == full.messages + full.tools + full.response_format + 3
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pytest
+
+from agents import (
+    Agent,
+    DiskToolCacheBackend,
+    FunctionSpanData,
+    RunContextWrapper,
+    Runner,
+    ToolCache,
+    function_tool,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+from .testing_processor import fetch_ordered_spans
+
+
+def _counting_tool(cache: ToolCache, calls: list[str]):
+    @function_tool(cache=cache, executor="inline")
+    def read_file(path: str, encoding: str = "utf-8") -> str:
+        calls.append(path)
+        if path == "missing":
+            raise FileNotFoundError(path)
+        return f"contents of {path}"
+
+    return read_file
+
+
+@pytest.mark.asyncio
+async def test_cache_memoizes_equivalent_arguments():
+    cache = ToolCache()
+    calls: list[str] = []
+    tool = _counting_tool(cache, calls)
+
+    first = await tool.on_invoke_tool(RunContextWrapper(None), '{"path": "a", "encoding": "x"}')
+    second = await tool.on_invoke_tool(RunContextWrapper(None), '{"encoding":"x","path":"a"}')
+    third = await tool.on_invoke_tool(RunContextWrapper(None), '{"path": "b", "encoding": "x"}')
+
+    assert first == second == "contents of a"
+    assert third == "contents of b"
+    assert calls == ["a", "b"]
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached():
+    cache = ToolCache()
+    calls: list[str] = []
+    tool = _counting_tool(cache, calls)
+
+    for _ in range(2):
+        result = await tool.on_invoke_tool(
+            RunContextWrapper(None), '{"path": "missing", "encoding": "x"}'
+        )
+        assert "error" in result.lower()
+
+    assert calls == ["missing", "missing"]
+    assert len(cache.backend) == 0
+
+
+def test_expired_entries_are_misses():
+    cache = ToolCache(ttl=0)
+    cache.set("tool", '{"a": 1}', "value")
+
+    assert cache.get("tool", '{"a": 1}') == (False, None)
+    assert len(cache.backend) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ToolCache(max_entries=2)
+    cache.set("tool", '{"a": 1}', 1)
+    cache.set("tool", '{"a": 2}', 2)
+    cache.get("tool", '{"a": 1}')
+    cache.set("tool", '{"a": 3}', 3)
+
+    assert cache.get("tool", '{"a": 1}') == (True, 1)
+    assert cache.get("tool", '{"a": 2}') == (False, None)
+    assert cache.get("tool", '{"a": 3}') == (True, 3)
+    assert cache.evictions == 1
+
+
+def test_invalidate_by_tool_and_arguments():
+    cache = ToolCache()
+    cache.set("read_file", '{"path": "a", "encoding": "x"}', "a")
+    cache.set("read_file", '{"path": "b", "encoding": "x"}', "b")
+    cache.set("list_dir", '{"path": "a"}', ["a"])
+
+    assert cache.invalidate("read_file", path="a") == 1
+    assert cache.get("read_file", '{"path": "a", "encoding": "x"}') == (False, None)
+    assert cache.get("read_file", '{"path": "b", "encoding": "x"}') == (True, "b")
+    assert cache.get("list_dir", '{"path": "a"}') == (True, ["a"])
+
+    assert cache.invalidate("read_file") == 1
+    assert cache.invalidate() == 1
+    assert len(cache.backend) == 0
+
+
+def test_disk_backend_persists_entries(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    backend = DiskToolCacheBackend(path)
+    cache = ToolCache(max_entries=2, backend=backend)
+    cache.set("tool", '{"a": 1}', {"value": 1})
+    cache.set("tool", '{"a": 2}', {"value": 2})
+    cache.get("tool", '{"a": 1}')
+    cache.set("tool", '{"a": 3}', {"value": 3})
+    backend.close()
+
+    reopened = ToolCache(backend=DiskToolCacheBackend(path))
+    assert reopened.get("tool", '{"a": 1}') == (True, {"value": 1})
+    assert reopened.get("tool", '{"a": 2}') == (False, None)
+    assert reopened.get("tool", '{"a": 3}') == (True, {"value": 3})
+
+
+@pytest.mark.asyncio
+async def test_cache_outcome_is_recorded_on_function_span():
+    cache = ToolCache()
+    calls: list[str] = []
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("read_file", '{"path": "a", "encoding": "x"}')],
+            [get_function_tool_call("read_file", '{"path": "a", "encoding": "x"}')],
+            [get_text_message("done")],
+        ]
+    )
+    agent = Agent(name="test", model=model, tools=[_counting_tool(cache, calls)])
+
+    await Runner.run(agent, input="test")
+
+    assert calls == ["a"]
+    function_spans = [
+        span.span_data
+        for span in fetch_ordered_spans()
+        if isinstance(span.span_data, FunctionSpanData)
+    ]
+    assert [span.cache for span in function_spans] == [
+        {"hit": False, "hits": 0, "misses": 1},
+        {"hit": True, "hits": 1, "misses": 1},
+    ]
+    assert function_spans[1].export()["cache"] == {"hit": True, "hits": 1, "misses": 1}
+
+
+def test_function_span_without_cache_does_not_export_it():
+    assert "cache" not in FunctionSpanData(name="tool", input=None, output=None).export()
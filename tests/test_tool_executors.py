@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from agents import (
+    Agent,
+    ItemHelpers,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    ToolCallOutputItem,
+    UserError,
+    function_tool,
+)
+from agents.tracing import FunctionSpanData, get_current_span
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+
+
+@function_tool(executor="process")
+def process_tool(n: int) -> str:
+    return f"{os.getpid()}:{sum(range(n))}"
+
+
+def _tool_thread_recorder() -> tuple[list[int], Agent]:
+    thread_ids: list[int] = []
+
+    @function_tool
+    def record_thread() -> str:
+        thread_ids.append(threading.get_ident())
+        return "ok"
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("record_thread", "{}")], [get_text_message("done")]]
+    )
+    return thread_ids, Agent(name="test", model=model, tools=[record_thread])
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_run_in_thread_pool_by_default():
+    thread_ids, agent = _tool_thread_recorder()
+
+    result = await Runner.run(agent, input="test")
+
+    assert result.final_output == "done"
+    assert thread_ids and thread_ids[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_run_config_inline_executor_runs_on_loop_thread():
+    thread_ids, agent = _tool_thread_recorder()
+
+    await Runner.run(agent, input="test", run_config=RunConfig(tool_executor="inline"))
+
+    assert thread_ids == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_per_tool_executor_overrides_run_config():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom-tool")
+    thread_names: list[str] = []
+
+    @function_tool(executor=executor)
+    def custom(ctx: RunContextWrapper[str], value: int) -> str:
+        thread_names.append(threading.current_thread().name)
+        return f"{ctx.context}:{value}"
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("custom", '{"value": 3}')], [get_text_message("done")]]
+    )
+    agent = Agent[str](name="test", model=model, tools=[custom])
+
+    result = await Runner.run(
+        agent, input="test", context="ctx", run_config=RunConfig(tool_executor="inline")
+    )
+    executor.shutdown()
+
+    assert thread_names[0].startswith("custom-tool")
+    assert ItemHelpers.text_message_outputs(result.new_items) == "done"
+    tool_output = result.new_items[1]
+    assert isinstance(tool_output, ToolCallOutputItem)
+    assert tool_output.output == "ctx:3"
+
+
+@pytest.mark.asyncio
+async def test_tool_thread_sees_current_span():
+    span_names: list[str | None] = []
+
+    @function_tool
+    def traced() -> str:
+        span = get_current_span()
+        assert span is not None
+        assert isinstance(span.span_data, FunctionSpanData)
+        span_names.append(span.span_data.name)
+        return "ok"
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("traced", "{}")], [get_text_message("done")]]
+    )
+    agent = Agent(name="test", model=model, tools=[traced])
+
+    await Runner.run(agent, input="test")
+
+    assert span_names == ["traced"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_progress_while_a_tool_blocks():
+    entered = threading.Event()
+    release = threading.Event()
+
+    @function_tool
+    def blocking_tool() -> str:
+        entered.set()
+        release.wait(timeout=5)
+        return "unblocked"
+
+    blocked_model = FakeModel()
+    blocked_model.add_multiple_turn_outputs(
+        [[get_function_tool_call("blocking_tool", "{}")], [get_text_message("blocked done")]]
+    )
+    blocked_agent = Agent(name="blocked", model=blocked_model, tools=[blocking_tool])
+    blocked_run = asyncio.create_task(Runner.run(blocked_agent, input="test"))
+
+    while not entered.is_set():
+        await asyncio.sleep(0.01)
+
+    other_agents = []
+    for i in range(5):
+        model = FakeModel()
+        model.set_next_output([get_text_message(f"done {i}")])
+        other_agents.append(Agent(name=f"other_{i}", model=model))
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[Runner.run(agent, input="test") for agent in other_agents]), timeout=2
+    )
+    assert [r.final_output for r in results] == [f"done {i}" for i in range(5)]
+    assert not blocked_run.done()
+
+    release.set()
+    blocked_result = await blocked_run
+    assert blocked_result.final_output == "blocked done"
+
+
+def test_invalid_executor_raises_user_error():
+    with pytest.raises(UserError):
+        function_tool(lambda: "foo", executor="fork")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_in_worker_process():
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("process_tool", '{"n": 10}')], [get_text_message("done")]]
+    )
+    agent = Agent(name="test", model=model, tools=[process_tool])
+
+    result = await Runner.run(agent, input="test")
+
+    tool_output = result.new_items[1]
+    assert isinstance(tool_output, ToolCallOutputItem)
+    pid, total = tool_output.output.split(":")
+    assert int(pid) != os.getpid()
+    assert total == "45"
+
+
+def test_process_executor_rejects_unsupported_functions():
+    def local_function() -> str:
+        return "foo"
+
+    def takes_context(ctx: RunContextWrapper[None]) -> str:
+        return "foo"
+
+    async def async_function() -> str:
+        return "foo"
+
+    for func in (local_function, takes_context, async_function):
+        with pytest.raises(UserError):
+            function_tool(func, executor="process")
+
+
+def test_process_executor_must_be_set_on_the_tool():
+    with pytest.raises(UserError, match="executor='process'"):
+        RunConfig(tool_executor="process")  # type: ignore[arg-type]
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(UserError, match="executor='process'"):
+            RunConfig(tool_executor=pool)
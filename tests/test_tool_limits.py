@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents import (
+    Agent,
+    FunctionSpanData,
+    FunctionTool,
+    RunConfig,
+    Runner,
+    ToolCallOutputItem,
+    UserError,
+    function_tool,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+from .testing_processor import fetch_ordered_spans
+
+
+class InFlightCounter:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run(self, delay: float) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        return "done"
+
+
+def _slow_tool(
+    counter: InFlightCounter,
+    delay: float = 0.02,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+) -> FunctionTool:
+    @function_tool(timeout=timeout, max_concurrency=max_concurrency)
+    async def slow() -> str:
+        return await counter.run(delay)
+
+    return slow
+
+
+def _agent(tool: FunctionTool, parallel_calls: int = 1) -> Agent:
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call(tool.name, "{}") for _ in range(parallel_calls)],
+            [get_text_message("finished")],
+        ]
+    )
+    return Agent(name="test", model=model, tools=[tool])
+
+
+def _tool_outputs(result) -> list[str]:
+    return [item.output for item in result.new_items if isinstance(item, ToolCallOutputItem)]
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_reported_as_tool_output():
+    tool = _slow_tool(InFlightCounter(), delay=5, timeout=0.05)
+
+    result = await Runner.run(_agent(tool), input="test")
+
+    assert result.final_output == "finished"
+    assert _tool_outputs(result) == ["Tool slow timed out after 0.05 seconds."]
+    [span] = [s for s in fetch_ordered_spans() if isinstance(s.span_data, FunctionSpanData)]
+    assert span.error is not None
+    assert span.error["message"] == "Tool timed out"
+    assert span.span_data.execution_time is not None
+    assert span.span_data.wait_time is None
+    exported = span.span_data.export()
+    assert "execution_time" in exported
+    assert "wait_time" not in exported
+
+
+@pytest.mark.asyncio
+async def test_tool_timeout_overrides_run_config():
+    tool = _slow_tool(InFlightCounter(), delay=0.05, timeout=1)
+
+    result = await Runner.run(_agent(tool), input="test", run_config=RunConfig(tool_timeout=0.01))
+
+    assert _tool_outputs(result) == ["done"]
+
+    tool = _slow_tool(InFlightCounter(), delay=5)
+    result = await Runner.run(_agent(tool), input="test", run_config=RunConfig(tool_timeout=0.01))
+
+    assert _tool_outputs(result) == ["Tool slow timed out after 0.01 seconds."]
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_caps_parallel_calls():
+    counter = InFlightCounter()
+    tool = _slow_tool(counter, max_concurrency=2)
+
+    result = await Runner.run(_agent(tool, parallel_calls=5), input="test")
+
+    assert _tool_outputs(result) == ["done"] * 5
+    assert counter.max_in_flight == 2
+    spans = [
+        s.span_data for s in fetch_ordered_spans() if isinstance(s.span_data, FunctionSpanData)
+    ]
+    assert all(span.wait_time is not None for span in spans)
+    assert max(span.wait_time or 0 for span in spans) > 0.01
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_holds_across_runs():
+    counter = InFlightCounter()
+    tool = _slow_tool(counter, max_concurrency=1)
+
+    await asyncio.gather(
+        *[Runner.run(_agent(tool, parallel_calls=2), input="test") for _ in range(3)]
+    )
+
+    assert counter.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_sync_tool_keeps_its_slot_until_it_returns():
+    lock = threading.Lock()
+    in_flight = max_in_flight = 0
+
+    @function_tool(timeout=0.02, max_concurrency=1)
+    def blocking() -> str:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.1)
+        with lock:
+            in_flight -= 1
+        return "done"
+
+    result = await Runner.run(_agent(blocking, parallel_calls=2), input="test")
+    await asyncio.sleep(0.15)
+
+    assert _tool_outputs(result) == ["Tool blocking timed out after 0.02 seconds."] * 2
+    # The second call only started once the thread of the first one had returned.
+    assert max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_run_config_limits():
+    counter = InFlightCounter()
+    tool = _slow_tool(counter)
+    run_config = RunConfig(tool_concurrency_limits={"slow": 3})
+
+    await Runner.run(_agent(tool, parallel_calls=6), input="test", run_config=run_config)
+    assert counter.max_in_flight == 3
+
+    counter = InFlightCounter()
+    tool = _slow_tool(counter)
+    run_config = RunConfig(max_concurrent_tool_calls=2)
+
+    await asyncio.gather(
+        *[
+            Runner.run(_agent(tool, parallel_calls=2), input="test", run_config=run_config)
+            for _ in range(3)
+        ]
+    )
+    assert counter.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_run_configs_can_use_different_limits_for_a_tool():
+    counter = InFlightCounter()
+    tool = _slow_tool(counter)
+
+    for limit in (2, 4):
+        counter.max_in_flight = 0
+        run_config = RunConfig(tool_concurrency_limits={"slow": limit})
+        result = await Runner.run(
+            _agent(tool, parallel_calls=6), input="test", run_config=run_config
+        )
+
+        assert _tool_outputs(result) == ["done"] * 6
+        assert counter.max_in_flight == limit
+
+
+@pytest.mark.asyncio
+async def test_tools_with_the_same_name_have_separate_limits():
+    counter = InFlightCounter()
+    run_config = RunConfig(tool_concurrency_limits={"slow": 1})
+
+    await asyncio.gather(
+        *[
+            Runner.run(_agent(_slow_tool(counter), parallel_calls=2), "test", run_config=run_config)
+            for _ in range(2)
+        ]
+    )
+
+    # Each tool runs one call at a time, but the two tools run at the same time.
+    assert counter.max_in_flight == 2
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(UserError):
+        _slow_tool(InFlightCounter(), max_concurrency=0)
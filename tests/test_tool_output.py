@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from agents import (
+    Agent,
+    FunctionSpanData,
+    HeadTailReducer,
+    JsonSummaryReducer,
+    LineWindowReducer,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    ToolCallOutputItem,
+    ToolOutputBudget,
+    ToolOutputStore,
+    function_tool,
+)
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_text_message
+from .testing_processor import fetch_ordered_spans
+
+FILE_CONTENTS = "\n".join(f"line {i}" for i in range(1, 501))
+
+
+def test_head_tail_reducer_keeps_both_ends():
+    output = "a" * 500 + "b" * 500
+    reduced = HeadTailReducer().reduce(output, 200)
+
+    assert len(reduced) <= 200
+    assert reduced.startswith("aaa")
+    assert reduced.endswith("bbb")
+    assert "1000 characters" in reduced
+
+
+def test_line_window_reducer_keeps_lines_around_matches():
+    reduced = LineWindowReducer(pattern=r"^line 250$", context_lines=2).reduce(FILE_CONTENTS, 300)
+
+    assert len(reduced) <= 300
+    assert reduced.splitlines() == [
+        "... [lines 1-247 omitted]",
+        "248: line 248",
+        "249: line 249",
+        "250: line 250",
+        "251: line 251",
+        "252: line 252",
+        "... [lines 253-500 omitted]",
+    ]
+
+
+def test_line_window_reducer_without_pattern_keeps_whole_lines_from_start():
+    reduced = LineWindowReducer().reduce(FILE_CONTENTS, 100)
+
+    lines = reduced.splitlines()
+    assert len(reduced) <= 100
+    assert lines[0] == "1: line 1"
+    assert lines[-1].startswith("... [lines ")
+    assert lines[-1].endswith("-500 omitted]")
+
+
+def test_json_summary_reducer_is_structural_and_deterministic():
+    data = {
+        "files": [{"path": f"src/file_{i}.py", "size": i} for i in range(100)],
+        "readme": "x" * 5000,
+    }
+    output = json.dumps(data)
+
+    reduced = JsonSummaryReducer().reduce(output, 1000)
+
+    assert len(reduced) <= 1000
+    assert reduced == JsonSummaryReducer().reduce(output, 1000)
+    summary = json.loads(reduced)
+    assert summary["files"][0] == {"path": "src/file_0.py", "size": 0}
+    assert summary["files"][-1].endswith("more items]")
+    assert summary["readme"].endswith("[5000 characters]")
+
+
+def test_json_summary_reducer_falls_back_for_non_json():
+    reduced = JsonSummaryReducer().reduce("not json " * 100, 100)
+
+    assert len(reduced) <= 100
+    assert reduced.startswith("not json")
+
+
+def test_budget_stores_full_output():
+    store = ToolOutputStore()
+    budget = ToolOutputBudget(max_chars=200, store=store)
+
+    reduced, ref = budget.apply(FILE_CONTENTS)
+
+    assert len(reduced) <= 200
+    assert ref is not None
+    assert ref in reduced
+    assert store.get(ref) == FILE_CONTENTS
+    assert budget.apply("short") == ("short", None)
+
+
+def test_store_drops_oldest_outputs():
+    store = ToolOutputStore(max_entries=2)
+    refs = [store.put(str(i)) for i in range(3)]
+
+    assert store.get(refs[0]) is None
+    assert store.get(refs[1]) == "1"
+    assert store.get(refs[2]) == "2"
+
+
+@pytest.mark.asyncio
+async def test_store_tool_reads_slices():
+    store = ToolOutputStore()
+    ref = store.put(FILE_CONTENTS)
+    tool = store.as_tool(max_chars=100)
+
+    first = await tool.on_invoke_tool(RunContextWrapper(None), json.dumps({"ref": ref}))
+    assert first.startswith(FILE_CONTENTS[:100])
+    assert "offset=100" in first
+
+    second = await tool.on_invoke_tool(
+        RunContextWrapper(None), json.dumps({"ref": ref, "offset": 100})
+    )
+    assert second.startswith(FILE_CONTENTS[100:200])
+
+
+@pytest.mark.asyncio
+async def test_budget_applies_to_model_input_and_is_recorded():
+    @function_tool(output_budget=ToolOutputBudget(max_chars=300, reducer=LineWindowReducer()))
+    def read_file() -> str:
+        return FILE_CONTENTS
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [[get_function_tool_call("read_file", "{}")], [get_text_message("done")]]
+    )
+    agent = Agent(name="test", model=model, tools=[read_file])
+
+    result = await Runner.run(agent, input="test")
+
+    [output_item] = [item for item in result.new_items if isinstance(item, ToolCallOutputItem)]
+    assert output_item.output == FILE_CONTENTS
+    sent = output_item.to_input_item()["output"]  # type: ignore[typeddict-item]
+    assert isinstance(sent, str)
+    assert len(sent) <= 300
+    assert sent.startswith("1: line 1\n")
+
+    assert result.context_wrapper.usage.tool_output_tokens_saved > 0
+    [span] = [s for s in fetch_ordered_spans() if isinstance(s.span_data, FunctionSpanData)]
+    assert span.span_data.output_budget is not None
+    assert span.span_data.output_budget["original_chars"] == len(FILE_CONTENTS)
+    assert span.span_data.output_budget["reduced_chars"] == len(sent)
+    assert span.span_data.output_budget["reducer"] == "LineWindowReducer"
+
+
+@pytest.mark.asyncio
+async def test_run_config_budget_applies_to_tools_without_their_own():
+    @function_tool
+    def big() -> str:
+        return "x" * 1000
+
+    @function_tool(output_budget=ToolOutputBudget(max_chars=2000))
+    def allowed() -> str:
+        return "y" * 1000
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("big", "{}"), get_function_tool_call("allowed", "{}")],
+            [get_text_message("done")],
+        ]
+    )
+    agent = Agent(name="test", model=model, tools=[big, allowed])
+
+    result = await Runner.run(
+        agent, input="test", run_config=RunConfig(tool_output_budget=ToolOutputBudget(100))
+    )
+
+    sent = [
+        item.to_input_item()["output"]  # type: ignore[typeddict-item]
+        for item in result.new_items
+        if isinstance(item, ToolCallOutputItem)
+    ]
+    assert len(sent[0]) <= 100
+    assert sent[1] == "y" * 1000
+    exported = [
+        span.span_data.export()
+        for span in fetch_ordered_spans()
+        if isinstance(span.span_data, FunctionSpanData)
+    ]
+    assert ["output_budget" in data for data in exported] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_store_tool_is_exempt_from_the_run_config_budget():
+    store = ToolOutputStore()
+    ref = store.put(FILE_CONTENTS)
+
+    model = FakeModel()
+    model.add_multiple_turn_outputs(
+        [
+            [get_function_tool_call("read_tool_output", json.dumps({"ref": ref}))],
+            [get_text_message("done")],
+        ]
+    )
+    agent = Agent(name="test", model=model, tools=[store.as_tool(max_chars=500)])
+
+    result = await Runner.run(
+        agent,
+        input="test",
+        run_config=RunConfig(tool_output_budget=ToolOutputBudget(max_chars=100, store=store)),
+    )
+
+    [output_item] = [item for item in result.new_items if isinstance(item, ToolCallOutputItem)]
+    sent = output_item.to_input_item()["output"]  # type: ignore[typeddict-item]
+    assert isinstance(sent, str)
+    assert sent.startswith(FILE_CONTENTS[:500])
+    assert result.context_wrapper.usage.tool_output_tokens_saved == 0
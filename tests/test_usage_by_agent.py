@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from openai.types.responses import ResponseUsage
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from agents import Agent, Runner, Usage
+
+from .fake_model import FakeModel
+from .test_responses import get_function_tool_call, get_handoff_tool_call, get_text_message
+
+
+def _usage(cached: int, reasoning: int) -> Usage:
+    return Usage(
+        requests=1,
+        input_tokens=10,
+        cached_input_tokens=cached,
+        output_tokens=5,
+        reasoning_tokens=reasoning,
+        total_tokens=15,
+    )
+
+
+def _agent(name: str, usage: Usage, **kwargs: Any) -> Agent[Any]:
+    model = FakeModel()
+    model.set_hardcoded_usage(usage)
+    return Agent(name=name, model=model, **kwargs)
+
+
+def test_usage_adds_cached_and_reasoning_tokens():
+    usage = _usage(cached=4, reasoning=2)
+    usage.add(_usage(cached=6, reasoning=0))
+
+    assert usage.cached_input_tokens == 10
+    assert usage.reasoning_tokens == 2
+    assert usage.input_tokens == 20
+
+
+def test_usage_from_response_usage():
+    response_usage = ResponseUsage(
+        input_tokens=10,
+        output_tokens=5,
+        total_tokens=15,
+        input_tokens_details=InputTokensDetails(cached_tokens=4),
+        output_tokens_details=OutputTokensDetails(reasoning_tokens=2),
+    )
+
+    assert Usage.from_response_usage(response_usage) == _usage(cached=4, reasoning=2)
+    assert Usage.from_response_usage(None) == Usage()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streamed", [False, True])
+async def test_usage_is_aggregated_per_agent(streamed):
+    helper = _agent("helper", _usage(cached=1, reasoning=1))
+    assert isinstance(helper.model, FakeModel)
+    helper.model.set_next_output([get_text_message("helped")])
+
+    specialist = _agent(
+        "specialist", _usage(cached=8, reasoning=3), tools=[helper.as_tool("ask_helper", "Ask.")]
+    )
+    assert isinstance(specialist.model, FakeModel)
+    specialist.model.add_multiple_turn_outputs(
+        [[get_function_tool_call("ask_helper", '{"input": "hi"}')], [get_text_message("done")]]
+    )
+
+    triage = _agent("triage", _usage(cached=0, reasoning=0), handoffs=[specialist])
+    assert isinstance(triage.model, FakeModel)
+    triage.model.set_next_output([get_handoff_tool_call(specialist)])
+
+    if streamed:
+        result = Runner.run_streamed(triage, input="go")
+        async for _ in result.stream_events():
+            pass
+        context_wrapper = result.context_wrapper
+    else:
+        context_wrapper = (await Runner.run(triage, input="go")).context_wrapper
+
+    by_agent = context_wrapper.usage_by_agent
+    assert {name: usage.requests for name, usage in by_agent.items()} == {
+        "triage": 1,
+        "specialist": 2,
+        "helper": 1,
+    }
+    assert by_agent["specialist"].cached_input_tokens == 16
+    assert by_agent["specialist"].reasoning_tokens == 6
+    assert context_wrapper.usage.requests == 4
+    assert context_wrapper.usage.cached_input_tokens == 17